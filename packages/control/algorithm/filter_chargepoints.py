@@ -1,6 +1,6 @@
 # tested
 import logging
-from typing import List, Optional, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from control import data
 from control.chargepoint.chargepoint import Chargepoint
@@ -8,41 +8,97 @@ from control.chargepoint.chargepoint import Chargepoint
 log = logging.getLogger(__name__)
 
 
-def get_chargepoints_by_mode_and_counter(mode_tuple: Tuple[Optional[str], str, bool],
+ModeTuple = Tuple[Optional[str], str, bool]
+
+
+class ChargemodeIndex:
+    """ Index der Ladepunkte nach (Priorität, Lademodus, Submodus) und der Ladepunkte je Zähler für einen Regelzyklus.
+    Lademodus, Submodus und Priorität werden bei der Aufbereitung in cp.update gesetzt und ändern sich im Algorithmus
+    nicht, der Soll-Strom dagegen schon und wird daher weiterhin bei jeder Abfrage geprüft.
+    """
+
+    def __init__(self, chargepoints: Iterable[Chargepoint]) -> None:
+        self.by_mode: Dict[Tuple[bool, Optional[str], str], List[Chargepoint]] = {}
+        self.by_submode: Dict[Tuple[bool, str], List[Chargepoint]] = {}
+        for cp in chargepoints:
+            control_parameter = cp.data.control_parameter
+            self.by_mode.setdefault(
+                (control_parameter.prio, control_parameter.chargemode, control_parameter.submode), []).append(cp)
+            self.by_submode.setdefault((control_parameter.prio, control_parameter.submode), []).append(cp)
+        self.counter_chargepoints: Dict[str, Set[int]] = {}
+
+    def get_chargepoints(self, mode_tuple: ModeTuple) -> List[Chargepoint]:
+        mode, submode, prio = mode_tuple
+        if mode is None:
+            return self.by_submode.get((prio, submode), [])
+        return self.by_mode.get((prio, mode, submode), [])
+
+    def get_chargepoint_nums_of_counter(self, counter: str) -> Set[int]:
+        if counter not in self.counter_chargepoints:
+            self.counter_chargepoints[counter] = _get_chargepoint_nums_of_counter(counter)
+        return self.counter_chargepoints[counter]
+
+
+_index: Optional[ChargemodeIndex] = None
+
+
+def build_index() -> None:
+    """ erstellt den Index, nachdem Lademodus, Submodus und Priorität aller Ladepunkte für den Zyklus feststehen.
+    """
+    global _index
+    _index = ChargemodeIndex(data.data.cp_data.values())
+
+
+def clear_index() -> None:
+    """ Außerhalb des Regelzyklus können sich Lademodus und Hierarchie ändern, dann wird wieder gesucht.
+    """
+    global _index
+    _index = None
+
+
+def _get_chargepoint_nums_of_counter(counter: str) -> Set[int]:
+    return {int(cp[2:]) for cp in data.data.counter_all_data.get_chargepoints_of_counter(counter)}
+
+
+def get_chargepoints_by_mode_and_counter(mode_tuple: ModeTuple,
                                          counter: str) -> List[Chargepoint]:
-    cps_to_counter = data.data.counter_all_data.get_chargepoints_of_counter(counter)
-    cps_to_counter_ids = [int(cp[2:]) for cp in cps_to_counter]
+    if _index is None:
+        cps_to_counter_ids = _get_chargepoint_nums_of_counter(counter)
+    else:
+        cps_to_counter_ids = _index.get_chargepoint_nums_of_counter(counter)
     cps_by_mode = get_chargepoints_with_required_current_by_chargemode(mode_tuple)
-    return list(filter(lambda cp: cp.num in cps_to_counter_ids, cps_by_mode))
+    return [cp for cp in cps_by_mode if cp.num in cps_to_counter_ids]
 
 # tested
 
 
 def get_chargepoints_by_chargemode(
-        modes: Union[Tuple[Optional[str], str, bool],
-                     Tuple[Tuple[Optional[str], str, bool]]]) -> List[Chargepoint]:
+        modes: Union[ModeTuple, Tuple[ModeTuple]]) -> List[Chargepoint]:
     modes = modes if isinstance(modes[0], Tuple) else (modes,)
     valid_chargepoints: List[Chargepoint] = []
+    # Ein Ladepunkt kann zu mehreren Modi passen (Lademodus None), aber nur einmal aufgenommen werden.
+    added: Set[int] = set()
 
     for mode_tuple in modes:
-        mode = mode_tuple[0]
-        submode = mode_tuple[1]
-        prio = mode_tuple[2]
-
-        for cp in data.data.cp_data.values():
-            if ((cp.data.control_parameter.prio == prio) and
-                (cp.data.control_parameter.chargemode == mode or mode is None) and
-                (cp.data.control_parameter.submode == submode) and
-                    cp not in valid_chargepoints):
+        if _index is not None:
+            chargepoints = _index.get_chargepoints(mode_tuple)
+        else:
+            mode, submode, prio = mode_tuple
+            chargepoints = [cp for cp in data.data.cp_data.values()
+                            if ((cp.data.control_parameter.prio == prio) and
+                                (cp.data.control_parameter.chargemode == mode or mode is None) and
+                                (cp.data.control_parameter.submode == submode))]
+        for cp in chargepoints:
+            if id(cp) not in added:
+                added.add(id(cp))
                 valid_chargepoints.append(cp)
     return valid_chargepoints
 
 
 def get_chargepoints_with_required_current_by_chargemode(
-        modes: Union[Tuple[Optional[str], str, bool],
-                     Tuple[Tuple[Optional[str], str, bool]]]) -> List[Chargepoint]:
+        modes: Union[ModeTuple, Tuple[ModeTuple]]) -> List[Chargepoint]:
     cps_by_mode = get_chargepoints_by_chargemode(modes)
-    return list(filter(lambda cp: cp.data.control_parameter.required_current != 0, cps_by_mode))
+    return [cp for cp in cps_by_mode if cp.data.control_parameter.required_current != 0]
 
 
 def get_preferenced_chargepoint_charging(
@@ -67,48 +123,43 @@ def get_preferenced_chargepoint_charging(
 # tested
 
 
+# Bedingungen in der Reihenfolge, in der sie geprüft werden: geringste Mindeststromstärke, niedrigster SoC,
+# geringste Lademenge, frühester Ansteck-Zeitpunkt, niedrigste Ladepunktnummer.
+PREFERENCE_CONDITIONS = (
+    lambda cp: cp.data.control_parameter.required_current,
+    lambda cp: cp.data.set.charging_ev_data.data.get.soc or 0,
+    lambda cp: cp.data.set.log.imported_since_plugged,
+    lambda cp: cp.data.set.plug_time,
+    lambda cp: cp.num,
+)
+
+
 def _get_preferenced_chargepoint(valid_chargepoints: List[Chargepoint]) -> List:
     """ermittelt die Ladepunkte in der Reihenfolge, in der sie geladen/gestoppt werden sollen. Die Bedingungen
     sind:
     geringste Mindeststromstärke, niedrigster SoC, frühester Ansteck-Zeitpunkt(Einschalten)/Lademenge(Abschalten),
     niedrigste Ladepunktnummer.
+    Haben mehrere Ladepunkte den gleichen kleinsten Wert, wird ab dann für alle weiteren Ladepunkte nach der nächsten
+    Bedingung geordnet. Je Bedingung wird daher einmal sortiert und der Reihe nach übernommen, solange der kleinste
+    Wert eindeutig ist.
     """
     preferenced_chargepoints = []
-    chargepoints = dict.fromkeys(valid_chargepoints)
     try:
-        # Bedingungen in der Reihenfolge, in der sie geprüft werden.
-        condition_types = ("min_current", "soc", "imported_since_plugged", "plug_in", "num")
-        # Bedingung, die geprüft wird (entspricht Index von condition_types)
+        remaining = list(dict.fromkeys(valid_chargepoints))
+        # Bedingung, die geprüft wird (entspricht Index von PREFERENCE_CONDITIONS)
         condition = 0
-        if chargepoints:
-            while len(chargepoints) > 0:
-                # entsprechend der Bedingung die Values im Dictionary füllen
-                if condition_types[condition] == "min_current":
-                    chargepoints.update(
-                        (cp, cp.data.control_parameter.required_current)
-                        for cp in chargepoints.keys())
-                elif condition_types[condition] == "soc":
-                    chargepoints.update(
-                        (cp, cp.data.set.charging_ev_data.data.get.soc or 0) for cp in chargepoints.keys())
-                elif condition_types[condition] == "plug_in":
-                    chargepoints.update((cp, cp.data.set.plug_time)
-                                        for cp in chargepoints.keys())
-                elif condition_types[condition] == "imported_since_plugged":
-                    chargepoints.update((cp, cp.data.set.log.imported_since_plugged) for cp in chargepoints.keys())
-                else:
-                    chargepoints.update((cp, cp.num) for cp in chargepoints.keys())
-
-                # kleinsten Value im Dictionary ermitteln
-                extreme_value = min(chargepoints.values())
-                # dazugehörige Keys ermitteln
-                extreme_cp = [
-                    key for key in chargepoints if chargepoints[key] == extreme_value]
-                if len(extreme_cp) > 1:
+        while remaining:
+            values = [PREFERENCE_CONDITIONS[condition](cp) for cp in remaining]
+            order = sorted(range(len(remaining)), key=values.__getitem__)
+            position = 0
+            while position < len(order):
+                if position + 1 < len(order) and values[order[position]] == values[order[position+1]]:
                     # Wenn es mehrere LP gibt, die den gleichen Minimalwert haben, nächste Bedingung prüfen.
                     condition += 1
-                else:
-                    preferenced_chargepoints.append(extreme_cp[0])
-                    chargepoints.pop(extreme_cp[0])
+                    break
+                preferenced_chargepoints.append(remaining[order[position]])
+                position += 1
+            remaining = [remaining[i] for i in order[position:]]
         if preferenced_chargepoints:
             log.debug(f"Geordnete Ladepunkte {[cp.num for cp in preferenced_chargepoints]}")
         return preferenced_chargepoints
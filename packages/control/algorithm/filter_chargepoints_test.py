@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+import random
 from typing import List, Optional, Tuple
 from unittest.mock import Mock
 
@@ -163,3 +164,80 @@ def test_get_chargepoints_by_mode_and_counter(chargepoints_of_counter: List[str]
 
     # assertion
     assert valid_chargepoints == expected_chargepoints
+
+
+def test_chargemode_index_equals_scan(monkeypatch):
+    # setup
+    random.seed(3)
+    modes = [Chargemode.SCHEDULED_CHARGING, Chargemode.INSTANT_CHARGING, Chargemode.PV_CHARGING,
+             Chargemode.TIME_CHARGING]
+    chargepoints = {}
+    for num in range(1, 41):
+        cp = Chargepoint(num, None)
+        cp.data.control_parameter.prio = random.choice([True, False])
+        cp.data.control_parameter.chargemode = random.choice(modes)
+        cp.data.control_parameter.submode = random.choice(modes)
+        cp.data.control_parameter.required_current = random.choice([0, 6, 16])
+        chargepoints[f"cp{num}"] = cp
+    data.data.cp_data = chargepoints
+    counter_cps = {f"counter{i}": [f"cp{num}" for num in range(1, 41) if num % (i + 2) == 0] for i in range(3)}
+    monkeypatch.setattr(CounterAll, "get_chargepoints_of_counter", lambda self, counter: counter_cps[counter])
+    data.data.counter_all_data = CounterAll()
+    mode_tuples = [(mode, submode, prio) for mode in modes + [None] for submode in modes for prio in (True, False)]
+
+    def query():
+        return ([filter_chargepoints.get_chargepoints_by_chargemode(tuple(mode_tuples[i:i+3]))
+                 for i in range(len(mode_tuples))] +
+                [filter_chargepoints.get_chargepoints_by_mode_and_counter(mode_tuple, counter)
+                 for mode_tuple in mode_tuples for counter in counter_cps])
+
+    expected = query()
+
+    # execution
+    filter_chargepoints.build_index()
+    try:
+        indexed = query()
+    finally:
+        filter_chargepoints.clear_index()
+
+    # evaluation
+    assert indexed == expected
+
+
+def _get_preferenced_chargepoint_by_elimination(valid_chargepoints: List[Chargepoint]) -> List:
+    # bisherige Umsetzung: je Ladepunkt das Minimum der aktuellen Bedingung ermitteln
+    preferenced_chargepoints = []
+    chargepoints = dict.fromkeys(valid_chargepoints)
+    condition = 0
+    while chargepoints:
+        chargepoints.update((cp, filter_chargepoints.PREFERENCE_CONDITIONS[condition](cp)) for cp in chargepoints)
+        extreme_value = min(chargepoints.values())
+        extreme_cp = [key for key in chargepoints if chargepoints[key] == extreme_value]
+        if len(extreme_cp) > 1:
+            condition += 1
+        else:
+            preferenced_chargepoints.append(extreme_cp[0])
+            chargepoints.pop(extreme_cp[0])
+    return preferenced_chargepoints
+
+
+def test_get_preferenced_chargepoint_equals_elimination():
+    # setup
+    random.seed(7)
+    for _ in range(300):
+        chargepoints = []
+        for num in random.sample(range(1, 100), random.randint(1, 12)):
+            cp = Chargepoint(num, None)
+            ev = Ev(0)
+            ev.data = EvData(get=Get(soc=random.choice([None, 0, 20, 50, 80])))
+            cp.data = ChargepointData(
+                set=Set(plug_time=f"10/31/2022, 0{random.randint(6, 8)}:00:00",
+                        log=Log(imported_since_plugged=random.choice([0, 100, 2000])), charging_ev_data=ev),
+                control_parameter=ControlParameter(required_current=random.choice([6, 10, 16])))
+            chargepoints.append(cp)
+
+        # execution
+        preferenced_chargepoints = filter_chargepoints._get_preferenced_chargepoint(chargepoints)
+
+        # evaluation
+        assert preferenced_chargepoints == _get_preferenced_chargepoint_by_elimination(chargepoints)
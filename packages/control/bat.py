@@ -2,12 +2,14 @@ from dataclasses import dataclass, field
 import logging
 from typing import List
 
+from dataclass_utils import track_changes
 from dataclass_utils.factories import currents_list_factory
 from helpermodules.constants import NO_ERROR
 
 log = logging.getLogger(__name__)
 
 
+@track_changes
 @dataclass
 class Get:
     currents: List[float] = field(default_factory=currents_list_factory, metadata={
@@ -30,6 +32,7 @@ def get_factory() -> Get:
     return Get()
 
 
+@track_changes
 @dataclass
 class Set:
     power_limit: float = field(default=None, metadata={"topic": "set/power_limit"})
@@ -39,6 +42,7 @@ def set_factory() -> Set:
     return Set()
 
 
+@track_changes
 @dataclass
 class BatData:
     get: Get = field(default_factory=get_factory)
@@ -26,6 +26,7 @@ from control import data
 from control.algorithm.chargemodes import CONSIDERED_CHARGE_MODES_CHARGING
 from control.algorithm.filter_chargepoints import get_chargepoints_with_required_current_by_chargemode
 from control.pv import Pv
+from dataclass_utils import track_changes
 from helpermodules.constants import NO_ERROR
 from modules.common.abstract_device import AbstractDevice
 
@@ -65,6 +66,7 @@ class ManualMode(Enum):
     MANUAL_DISCHARGE = "manual_discharge"  # in DE nicht erlaubt
 
 
+@track_changes
 @dataclass
 class Config:
     configured: bool = field(default=False, metadata={"topic": "config/configured"})
@@ -88,6 +90,7 @@ def config_factory() -> Config:
     return Config()
 
 
+@track_changes
 @dataclass
 class Get:
     power_limit_controllable: bool = field(default=False, metadata={"topic": "get/power_limit_controllable"})
@@ -105,6 +108,7 @@ def get_factory() -> Get:
     return Get()
 
 
+@track_changes
 @dataclass
 class Set:
     charging_power_left: float = field(default=0, metadata={"topic": "set/charging_power_left"})
@@ -117,6 +121,7 @@ def set_factory() -> Set:
     return Set()
 
 
+@track_changes
 @dataclass
 class BatAllData:
     config: Config = field(default_factory=config_factory)
@@ -1,15 +1,15 @@
-from helpermodules.utils.json_file_handler import write_and_check
 from helpermodules import timecheck
 import copy
 import datetime
 from enum import Enum
-import json
 import logging
-import os
 import pathlib
 from typing import Any, Dict, List, Optional, Tuple
 
 from control import data
+from control.chargelog import chargelog_storage
+from helpermodules.measurement_logging import write_log
+from helpermodules.measurement_logging.log_storage import read_log
 from helpermodules.measurement_logging.process_log import (
     FILE_ERRORS, CalculationType, _analyse_energy_source, _process_entries, get_totals)
 
@@ -299,26 +299,8 @@ def _create_entry(chargepoint, charging_ev):
 
 
 def write_new_entry(new_entry):
-    # json-Objekt in Datei einfügen
-    (_get_parent_file() / "data"/"charge_log").mkdir(mode=0o755, parents=True, exist_ok=True)
-    filepath = str(_get_parent_file() / "data" / "charge_log" /
-                   (timecheck.create_timestamp_YYYYMM() + ".json"))
-    try:
-        if os.path.exists(filepath) and os.path.getsize(filepath) == 0:
-            content = []
-        else:
-            with open(filepath, "r", encoding="utf-8") as json_file:
-                try:
-                    content = json.load(json_file)
-                except json.decoder.JSONDecodeError:
-                    corrupt_path = f"{filepath}.unparsable_{timecheck.create_timestamp()}"
-                    os.rename(filepath, corrupt_path)
-                    log.error(f"ChargeLog: Korrupte Datei umbenannt nach {corrupt_path}")
-                    content = []
-    except FileNotFoundError:
-        content = []
-    content.append(new_entry)
-    write_and_check(filepath, content)
+    # json-Objekt an Datei anhängen
+    chargelog_storage.append_entry(new_entry, timecheck.create_timestamp_YYYYMM())
     log.debug(f"Neuer Ladelog-Eintrag: {new_entry}")
 
 
@@ -394,8 +376,23 @@ def _get_reference_position(cp, create_log_entry: bool) -> ReferenceTime:
             return ReferenceTime.MIDDLE
 
 
-def _get_reference_entries() -> Tuple[List[Dict], List]:
-    processed_entries = {}
+# zuletzt aufbereitete Referenz-Einträge, nach Zeitstempel des aktuellen Log-Eintrags
+_processed_reference_entries: Dict[int, Tuple[Dict, List]] = {}
+
+
+def _get_reference_entries() -> Tuple[Dict, List]:
+    reference_entries = write_log.get_reference_entries()
+    if reference_entries is None:
+        # Seit dem Start wurde noch kein Log-Eintrag geschrieben, Referenz aus dem Tages-Log lesen.
+        return _process_reference_entries(_read_reference_entries())
+    timestamp = reference_entries[-1]["timestamp"]
+    if timestamp not in _processed_reference_entries:
+        _processed_reference_entries.clear()
+        _processed_reference_entries[timestamp] = _process_reference_entries(reference_entries)
+    return _processed_reference_entries[timestamp]
+
+
+def _read_reference_entries() -> List:
     reference_entries = []
     try:
         entries = get_todays_daily_log()["entries"]
@@ -405,14 +402,21 @@ def _get_reference_entries() -> Tuple[List[Dict], List]:
             date_day_before = (datetime.datetime.now() + datetime.timedelta(days=-1)).strftime("%Y%m%d")
             entries_day_before = get_daily_log(date_day_before)["entries"]
             reference_entries = [entries_day_before[-1], entries[0]]
+    except Exception:
+        log.exception("Fehler beim Lesen der zwei letzten Logeinträge")
+    return reference_entries
+
+
+def _process_reference_entries(reference_entries: List) -> Tuple[Dict, List]:
+    processed_entries = {}
+    try:
         processed_entries["entries"] = copy.deepcopy(reference_entries)
         processed_entries["entries"] = _process_entries(processed_entries["entries"], CalculationType.ENERGY)
         processed_entries["totals"] = get_totals(processed_entries["entries"], False)
         processed_entries = _analyse_energy_source(processed_entries)
     except Exception:
         log.exception("Fehler beim Zusammenstellen der zwei letzten Logeinträge")
-    finally:
-        return processed_entries, reference_entries
+    return processed_entries, reference_entries
 
 
 def get_todays_daily_log():
@@ -420,10 +424,8 @@ def get_todays_daily_log():
 
 
 def get_daily_log(day):
-    filepath = str(_get_parent_file() / "data" / "daily_log" / f"{day}.json")
     try:
-        with open(filepath, "r", encoding="utf-8") as json_file:
-            return json.load(json_file)
+        return read_log(_get_parent_file() / "data" / "daily_log", day)
     except FILE_ERRORS:
         return []
 
@@ -0,0 +1,254 @@
+""" Ablage des Ladelogs.
+
+Bisher wurde je Monat ein json-Array <JJJJMM>.json geschrieben, das für jeden neuen Ladevorgang vollständig eingelesen
+und neu geschrieben und für jede Abfrage vollständig eingelesen wurde. Im neuen Format wird jeder Ladevorgang als
+Zeile an <JJJJMM>.jsonl angehängt. Zu jedem Eintrag wird in <JJJJMM>.index.jsonl eine kurze Zeile mit Position und
+Länge des Eintrags sowie den Filterkriterien (Ladepunkt, Fahrzeug, ID-Tag, Lademodus, Priorität, Beginn) angehängt.
+Abfragen lesen nur den Index und die passenden Einträge.
+
+Monate im alten Format werden beim nächsten Schreiben bzw. bei der Aktualisierung der Konfiguration überführt und
+bis dahin wie bisher vollständig eingelesen.
+"""
+import datetime
+import json
+import logging
+import os
+import pathlib
+import threading
+from typing import Dict, Iterable, List, Optional
+
+log = logging.getLogger("chargelog")
+
+LEGACY_SUFFIX = ".json"
+ENTRIES_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".index.jsonl"
+TIME_FORMAT = "%m/%d/%Y, %H:%M:%S"
+# Geschrieben wird im Regel-Thread, abgefragt im Thread der Kommandos. Eine Abfrage darf den Index nicht zwischen dem
+# Schreiben eines Eintrags und dem Anhängen seines Index-Eintrags neu erstellen, sonst stünde der Eintrag doppelt im
+# Index. Außerdem würden sich gleichzeitige Neuerstellungen die temporäre Datei teilen.
+_lock = threading.RLock()
+
+
+def _get_charge_log_path() -> pathlib.Path:
+    return pathlib.Path(__file__).resolve().parents[3] / "data" / "charge_log"
+
+
+def _legacy_path(month: str) -> pathlib.Path:
+    return _get_charge_log_path() / f"{month}{LEGACY_SUFFIX}"
+
+
+def _entries_path(month: str) -> pathlib.Path:
+    return _get_charge_log_path() / f"{month}{ENTRIES_SUFFIX}"
+
+
+def _index_path(month: str) -> pathlib.Path:
+    return _get_charge_log_path() / f"{month}{INDEX_SUFFIX}"
+
+
+def _to_timestamp(time: Optional[str]) -> Optional[float]:
+    try:
+        return datetime.datetime.strptime(time, TIME_FORMAT).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _index_record(entry: Dict, offset: int, length: int) -> Dict:
+    def get(section: str, key: str):
+        try:
+            return entry[section][key]
+        except (KeyError, TypeError):
+            return None
+    return {"offset": offset,
+            "length": length,
+            "chargepoint": get("chargepoint", "id"),
+            "vehicle": get("vehicle", "id"),
+            "rfid": get("vehicle", "rfid"),
+            "chargemode": get("vehicle", "chargemode"),
+            "prio": get("vehicle", "prio"),
+            "begin": _to_timestamp(get("time", "begin"))}
+
+
+def _encode(entry: Dict) -> bytes:
+    return json.dumps(entry).encode("utf-8") + b"\n"
+
+
+def append_entry(entry: Dict, month: str) -> None:
+    """ hängt einen Ladevorgang an das Ladelog des Monats an.
+    """
+    with _lock:
+        _get_charge_log_path().mkdir(mode=0o755, parents=True, exist_ok=True)
+        migrate_month(month)
+        index = _read_index(month)
+        with open(_entries_path(month), "ab") as file:
+            offset = file.tell()
+            line = _encode(entry)
+            file.write(line)
+        if index is not None:
+            with open(_index_path(month), "a", encoding="utf-8") as file:
+                file.write(json.dumps(_index_record(entry, offset, len(line))) + "\n")
+        else:
+            _rebuild_index(month)
+
+
+def write_entries(entries: List[Dict], month: str) -> None:
+    """ schreibt das Ladelog eines Monats vollständig neu, z.B. nach dem Import von Daten.
+    """
+    with _lock:
+        _get_charge_log_path().mkdir(mode=0o755, parents=True, exist_ok=True)
+        entries_path = _entries_path(month)
+        temp_path = entries_path.with_name(entries_path.name + ".tmp")
+        with open(temp_path, "wb") as file:
+            for entry in entries:
+                if len(entry) > 0:
+                    file.write(_encode(entry))
+        os.replace(temp_path, entries_path)
+        _rebuild_index(month)
+        if _legacy_path(month).is_file():
+            _legacy_path(month).unlink()
+
+
+def read_entries(month: str) -> List[Dict]:
+    """ liest alle Ladevorgänge eines Monats. Existiert kein Ladelog, wird ein FileNotFoundError geworfen.
+    """
+    try:
+        with open(_entries_path(month), "r", encoding="utf-8") as file:
+            return [entry for entry in (_parse_line(line) for line in file if line.strip()) if entry is not None]
+    except FileNotFoundError:
+        with open(_legacy_path(month), "r", encoding="utf-8") as file:
+            return [entry for entry in json.load(file) if len(entry) > 0]
+
+
+def _parse_line(line) -> Optional[Dict]:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        log.warning(f"Ungültiger Eintrag im Ladelog wird übersprungen: {line[:100]}")
+        return None
+
+
+def migrate_month(month: str) -> bool:
+    """ überführt das Ladelog eines Monats im bisherigen Format in das neue Format.
+    """
+    with _lock:
+        legacy_path = _legacy_path(month)
+        if not legacy_path.is_file():
+            return False
+        if legacy_path.stat().st_size == 0:
+            entries = []
+        else:
+            with open(legacy_path, "r", encoding="utf-8") as file:
+                try:
+                    entries = json.load(file)
+                except json.decoder.JSONDecodeError:
+                    corrupt_path = f"{legacy_path}.unparsable_{int(datetime.datetime.now().timestamp())}"
+                    os.rename(legacy_path, corrupt_path)
+                    log.error(f"ChargeLog: Korrupte Datei umbenannt nach {corrupt_path}")
+                    return False
+        if _entries_path(month).is_file():
+            # z.B. nach Wiederherstellen einer Sicherung liegen beide Formate vor.
+            entries = entries + [entry for entry in read_entries(month) if entry not in entries]
+        write_entries(entries, month)
+        log.debug(f"Ladelog {legacy_path} in das neue Format überführt.")
+        return True
+
+
+def migrate_all() -> None:
+    for path in sorted(_get_charge_log_path().glob(f"*{LEGACY_SUFFIX}")):
+        try:
+            if path.stem.isdigit():
+                migrate_month(path.stem)
+        except Exception:
+            log.exception(f"Ladelog {path} konnte nicht in das neue Format überführt werden.")
+
+
+def _rebuild_index(month: str) -> List[Dict]:
+    index = []
+    offset = 0
+    with open(_entries_path(month), "rb") as file:
+        for line in file:
+            entry = _parse_line(line)
+            if entry is not None and len(entry) > 0:
+                index.append(_index_record(entry, offset, len(line)))
+            offset += len(line)
+    index_path = _index_path(month)
+    temp_path = index_path.with_name(index_path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.writelines(json.dumps(record) + "\n" for record in index)
+    os.replace(temp_path, index_path)
+    return index
+
+
+def _read_index(month: str) -> Optional[List[Dict]]:
+    """ liest den Index. Passt er nicht zur Datei mit den Einträgen, z.B. nach einem Stromausfall zwischen dem
+    Schreiben des Eintrags und des Index, wird None zurückgegeben.
+    """
+    try:
+        with open(_index_path(month), "r", encoding="utf-8") as file:
+            index = [json.loads(line) for line in file if line.strip()]
+        size = _entries_path(month).stat().st_size
+    except FileNotFoundError:
+        return None if _entries_path(month).is_file() else []
+    except json.JSONDecodeError:
+        return None
+    if (index[-1]["offset"] + index[-1]["length"] if index else 0) != size:
+        return None
+    return index
+
+
+def _matches(record: Dict, filter: Dict) -> bool:
+    chargepoint_filter = filter.get("chargepoint", {})
+    vehicle_filter = filter.get("vehicle", {})
+    if chargepoint_filter.get("id") and record["chargepoint"] not in chargepoint_filter["id"]:
+        return False
+    if vehicle_filter.get("id") and record["vehicle"] not in vehicle_filter["id"]:
+        return False
+    if vehicle_filter.get("tag") and record["rfid"] not in vehicle_filter["tag"]:
+        return False
+    if vehicle_filter.get("chargemode") and record["chargemode"] not in vehicle_filter["chargemode"]:
+        return False
+    if "prio" in vehicle_filter and vehicle_filter["prio"] is not record["prio"]:
+        return False
+    return True
+
+
+def _in_time_range(record: Dict, begin: Optional[float], end: Optional[float]) -> bool:
+    if begin is None and end is None:
+        return True
+    if record["begin"] is None:
+        return False
+    return (begin is None or record["begin"] >= begin) and (end is None or record["begin"] < end)
+
+
+def query(months: Iterable[str], filter: Dict,
+          begin: Optional[float] = None, end: Optional[float] = None) -> Optional[List[Dict]]:
+    """ gibt die Ladevorgänge der Monate zurück, die zum Filter und zum Zeitraum (Beginn des Ladevorgangs) passen.
+    Gibt es für keinen der Monate ein Ladelog, wird None zurückgegeben.
+    """
+    found = False
+    entries = []
+    for month in months:
+        with _lock:
+            if _entries_path(month).is_file():
+                index = _read_index(month)
+                if index is None:
+                    index = _rebuild_index(month)
+                found = True
+                matching = [record for record in index
+                            if _in_time_range(record, begin, end) and _matches(record, filter)]
+                if matching:
+                    with open(_entries_path(month), "rb") as file:
+                        for record in matching:
+                            file.seek(record["offset"])
+                            entries.append(json.loads(file.read(record["length"])))
+            elif _legacy_path(month).is_file():
+                found = True
+                for entry in read_entries(month):
+                    record = _index_record(entry, 0, 0)
+                    if _in_time_range(record, begin, end) and _matches(record, filter):
+                        entries.append(entry)
+    return entries if found else None
+
+
+def months_of_year(year: str) -> List[str]:
+    return sorted({path.name[:6] for path in _get_charge_log_path().glob(f"{year}??.json*")
+                   if path.name[:6].isdigit()})
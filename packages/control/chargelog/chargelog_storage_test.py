@@ -0,0 +1,112 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from control.chargelog import chargelog_storage
+from control.chargelog.process_chargelog import get_log_data
+
+
+def entry(chargepoint: int, vehicle: int, rfid: str = "123", begin: str = "06/16/2025, 15:00:00"):
+    return {"chargepoint": {"id": chargepoint, "name": f"LP {chargepoint}"},
+            "vehicle": {"id": vehicle, "name": "Auto", "chargemode": "instant_charging", "prio": False, "rfid": rfid},
+            "time": {"begin": begin, "end": "06/16/2025, 16:00:00", "time_charged": "1:00"},
+            "data": {"range_charged": 100, "imported_since_mode_switch": 1000, "power": 1000, "costs": 0.95}}
+
+
+@pytest.fixture
+def charge_log_path(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(chargelog_storage, "_get_charge_log_path", lambda: tmp_path)
+    return tmp_path
+
+
+def request(chargepoints=None, vehicles=None, tags=None, month="06"):
+    return {"year": 2025, "month": month, "filter": {"chargepoint": {"id": chargepoints or []},
+                                                     "vehicle": {"id": vehicles or [], "tag": tags or []}}}
+
+
+def test_query_filters_by_index(charge_log_path: Path):
+    # setup
+    for chargepoint, vehicle, rfid in ((1, 1, "a"), (2, 1, "b"), (1, 2, "c")):
+        chargelog_storage.append_entry(entry(chargepoint, vehicle, rfid), "202506")
+
+    # execution and evaluation
+    assert len(get_log_data(request())["entries"]) == 3
+    assert get_log_data(request(chargepoints=[1]))["entries"] == [entry(1, 1, "a"), entry(1, 2, "c")]
+    assert get_log_data(request(vehicles=[1], tags=["b"]))["entries"] == [entry(2, 1, "b")]
+    assert get_log_data(request(chargepoints=[3])) == {"entries": [], "totals": None}
+    assert get_log_data(request(month="07")) == {"entries": [], "totals": {}}
+
+
+def test_query_time_range_over_year(charge_log_path: Path):
+    # setup
+    chargelog_storage.append_entry(entry(1, 1, begin="05/16/2025, 15:00:00"), "202505")
+    chargelog_storage.append_entry(entry(1, 1, begin="06/16/2025, 15:00:00"), "202506")
+
+    # execution
+    entries = chargelog_storage.query(chargelog_storage.months_of_year("2025"), {},
+                                      begin=chargelog_storage._to_timestamp("06/01/2025, 00:00:00"))
+
+    # evaluation
+    assert entries == [entry(1, 1, begin="06/16/2025, 15:00:00")]
+    assert len(get_log_data({"year": 2025, "filter": {"chargepoint": {}, "vehicle": {}}})["entries"]) == 2
+
+
+def test_rebuild_index_after_incomplete_write(charge_log_path: Path):
+    # setup
+    chargelog_storage.append_entry(entry(1, 1), "202506")
+    # Stromausfall nach dem Schreiben des Eintrags, vor dem Schreiben des Index
+    with open(charge_log_path / "202506.jsonl", "a") as file:
+        file.write(json.dumps(entry(2, 1)) + "\n")
+
+    # execution
+    chargelog_storage.append_entry(entry(3, 1), "202506")
+
+    # evaluation
+    assert chargelog_storage.query(["202506"], {"chargepoint": {"id": [2, 3]}}) == [entry(2, 1), entry(3, 1)]
+
+
+def test_append_migrates_legacy_month(charge_log_path: Path):
+    # setup
+    with open(charge_log_path / "202506.json", "w") as file:
+        json.dump([entry(1, 1), {}], file)
+
+    # execution
+    legacy_entries = chargelog_storage.query(["202506"], {})
+    chargelog_storage.append_entry(entry(2, 1), "202506")
+
+    # evaluation
+    assert legacy_entries == [entry(1, 1)]
+    assert not (charge_log_path / "202506.json").exists()
+    assert chargelog_storage.read_entries("202506") == [entry(1, 1), entry(2, 1)]
+
+
+def test_query_during_append_does_not_duplicate_entry(charge_log_path: Path, monkeypatch):
+    # setup
+    chargelog_storage.append_entry(entry(1, 1), "202506")
+    entry_written = threading.Event()
+    index_path = chargelog_storage._index_path
+    calls = []
+
+    def slow_index_path(month):
+        if threading.current_thread() is writer:
+            calls.append(month)
+            if len(calls) == 2:
+                # Eintrag ist geschrieben, der Index-Eintrag noch nicht
+                entry_written.set()
+                time.sleep(0.2)
+        return index_path(month)
+    monkeypatch.setattr(chargelog_storage, "_index_path", slow_index_path)
+    writer = threading.Thread(target=chargelog_storage.append_entry, args=(entry(2, 1), "202506"))
+
+    # execution
+    writer.start()
+    entry_written.wait(1)
+    during_append = chargelog_storage.query(["202506"], {})
+    writer.join()
+
+    # evaluation
+    assert during_append == [entry(1, 1), entry(2, 1)]
+    assert chargelog_storage.query(["202506"], {}) == [entry(1, 1), entry(2, 1)]
@@ -8,6 +8,7 @@ from control import data
 from control.chargelog import chargelog
 from control.chargelog.chargelog import calc_energy_costs
 from control.chargepoint.chargepoint import Chargepoint
+from helpermodules.measurement_logging import write_log
 
 
 @pytest.fixture()
@@ -66,6 +67,38 @@ def test_calc_charge_cost_reference_middle(mock_data, monkeypatch):
     assert round(cp.data.set.log.costs, 5) == 0.5
 
 
+def test_calc_charge_cost_cached_reference_entries(mock_data, monkeypatch):
+    # setup
+    cps = []
+    for _ in range(2):
+        cp = Chargepoint(4, None)
+        cp.data.set.log.imported_since_plugged = cp.data.set.log.imported_since_mode_switch = 3950
+        cp.data.set.log.timestamp_mode_switch = 1652682600  # 8:30
+        cp.data.get.imported = 4050
+        cp.data.set.log.charged_energy_by_source = {'bat': 100, 'cp': 0, 'grid': 100, 'pv': 100}
+        cps.append(cp)
+    entries = mock_daily_log(monkeypatch)["entries"]
+    monkeypatch.setattr(write_log, "_reference_entries", None)
+    write_log._set_reference_entries(*entries)
+    mock_read = Mock(side_effect=AssertionError("Tages-Log wurde gelesen"))
+    monkeypatch.setattr(chargelog, "get_todays_daily_log", mock_read)
+    monkeypatch.setattr(chargelog, "_processed_reference_entries", {})
+    process_spy = Mock(wraps=chargelog._process_reference_entries)
+    monkeypatch.setattr(chargelog, "_process_reference_entries", process_spy)
+
+    # execution
+    for cp in cps:
+        calc_energy_costs(cp)
+
+    # evaluation
+    mock_read.assert_not_called()
+    assert process_spy.call_count == 1
+    for cp in cps:
+        assert cp.data.set.log.charged_energy_by_source == {
+            'grid': 1243, 'pv': 386, 'bat': 671, 'cp': 0.0}
+        assert round(cp.data.set.log.costs, 5) == 0.5
+
+
 def test_calc_charge_cost_reference_start(mock_data, monkeypatch):
     cp = Chargepoint(4, None)
     cp.data.set.log.imported_since_plugged = cp.data.set.log.imported_since_mode_switch = 100
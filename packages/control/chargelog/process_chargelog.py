@@ -1,8 +1,7 @@
-import json
 import logging
-import pathlib
 from typing import Dict
 
+from control.chargelog import chargelog_storage
 from helpermodules import timecheck
 
 
@@ -19,71 +18,19 @@ def get_log_data(request: Dict):
     """
     log_data = {"entries": [], "totals": {}}
     try:
-        # Datei einlesen
-        filepath = str(_get_parent_file() / "data" / "charge_log" /
-                       (str(request["year"]) + str(request["month"]) + ".json"))
-        try:
-            with open(filepath, "r", encoding="utf-8") as json_file:
-                charge_log = json.load(json_file)
-        except FileNotFoundError:
+        if request.get("month"):
+            months = [str(request["year"]) + str(request["month"])]
+        else:
+            # ohne Monat wird das gesamte Jahr abgefragt
+            months = chargelog_storage.months_of_year(str(request["year"]))
+        # Liste mit gefilterten Einträgen aus dem Index erstellen
+        entries = chargelog_storage.query(months, request["filter"])
+        if entries is None:
             log.debug("Kein Ladelog für %s gefunden!" % (str(request)))
             return log_data
-        # Liste mit gefilterten Einträgen erstellen
-        for entry in charge_log:
-            if len(entry) > 0:
-                if (
-                    "id" in request["filter"]["chargepoint"] and
-                    len(request["filter"]["chargepoint"]["id"]) > 0 and
-                    entry["chargepoint"]["id"] not in request["filter"]["chargepoint"]["id"]
-                ):
-                    log.debug(
-                        "Verwerfe Eintrag wegen Ladepunkt ID: %s != %s" %
-                        (str(entry["chargepoint"]["id"]), str(request["filter"]["chargepoint"]["id"]))
-                    )
-                    continue
-                if (
-                    "id" in request["filter"]["vehicle"] and
-                    len(request["filter"]["vehicle"]["id"]) > 0 and
-                    entry["vehicle"]["id"] not in request["filter"]["vehicle"]["id"]
-                ):
-                    log.debug(
-                        "Verwerfe Eintrag wegen Fahrzeug ID: %s != %s" %
-                        (str(entry["vehicle"]["id"]), str(request["filter"]["vehicle"]["id"]))
-                    )
-                    continue
-                if (
-                    "tag" in request["filter"]["vehicle"] and
-                    len(request["filter"]["vehicle"]["tag"]) > 0 and
-                    entry["vehicle"]["rfid"] not in request["filter"]["vehicle"]["tag"]
-                ):
-                    log.debug(
-                        "Verwerfe Eintrag wegen ID Tag: %s != %s" %
-                        (str(entry["vehicle"]["rfid"]), str(request["filter"]["vehicle"]["tag"]))
-                    )
-                    continue
-                if (
-                    "chargemode" in request["filter"]["vehicle"] and
-                    len(request["filter"]["vehicle"]["chargemode"]) > 0 and
-                    entry["vehicle"]["chargemode"] not in request["filter"]["vehicle"]["chargemode"]
-                ):
-                    log.debug(
-                        "Verwerfe Eintrag wegen Lademodus: %s != %s" %
-                        (str(entry["vehicle"]["chargemode"]), str(request["filter"]["vehicle"]["chargemode"]))
-                    )
-                    continue
-                if (
-                    "prio" in request["filter"]["vehicle"] and
-                    request["filter"]["vehicle"]["prio"] is not entry["vehicle"]["prio"]
-                ):
-                    log.debug(
-                        "Verwerfe Eintrag wegen Priorität: %s != %s" %
-                        (str(entry["vehicle"]["prio"]), str(request["filter"]["vehicle"]["prio"]))
-                    )
-                    continue
-
-                # wenn wir hier ankommen, passt der Eintrag zum Filter
-                log_data["entries"].append(entry)
-            log_data["totals"] = get_totals_of_filtered_log_data(log_data)
+        log.debug(f"{len(entries)} Einträge passen zum Filter {request['filter']}")
+        log_data["entries"] = entries
+        log_data["totals"] = get_totals_of_filtered_log_data(log_data)
     except Exception:
         log.exception("Fehler im Ladelog-Modul")
     return log_data
@@ -119,7 +66,3 @@ def get_totals_of_filtered_log_data(log_data: Dict) -> Dict:
             "power": power_sum,
             "costs": costs_sum,
         }
-
-
-def _get_parent_file() -> pathlib.Path:
-    return pathlib.Path(__file__).resolve().parents[3]
@@ -3,11 +3,13 @@ import logging
 
 from control import data
 from control.chargepoint.chargepoint_state import ChargepointState
+from dataclass_utils import track_changes
 
 
 log = logging.getLogger(__name__)
 
 
+@track_changes
 @dataclass
 class AllGet:
     daily_imported: float = field(default=0, metadata={"topic": "get/daily_imported"})
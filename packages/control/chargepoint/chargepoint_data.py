@@ -6,6 +6,7 @@ from control.chargepoint.chargepoint_template import CpTemplate
 from control.chargepoint.control_parameter import ControlParameter, control_parameter_factory
 from control.ev.charge_template import ChargeTemplate
 from control.ev.ev import Ev
+from dataclass_utils import track_changes
 from dataclass_utils.factories import currents_list_factory, empty_dict_factory, voltages_list_factory
 from helpermodules.constants import NO_ERROR
 from modules.chargepoints.openwb_pro.chargepoint_module import EvseSignaling
@@ -152,6 +153,7 @@ def log_factory() -> Log:
     return Log()
 
 
+@track_changes
 @dataclass
 class Set:
     charge_template: ChargeTemplate = field(default_factory=charge_template_factory,
@@ -225,6 +227,7 @@ def config_factory() -> Config:
     return Config()
 
 
+@track_changes
 @dataclass
 class ChargepointData:
     control_parameter: ControlParameter = field(default_factory=control_parameter_factory)
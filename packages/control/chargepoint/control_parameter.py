@@ -4,9 +4,11 @@ from typing import List, Optional
 from control.chargepoint.chargepoint_state import ChargepointState
 from control.chargemode import Chargemode as Chargemode_enum
 from control.limiting_value import LoadmanagementLimit, loadmanagement_limit_factory
+from dataclass_utils import track_changes
 from dataclass_utils.factories import currents_list_factory
 
 
+@track_changes
 @dataclass
 class ControlParameter:
     chargemode: Chargemode_enum = field(default=Chargemode_enum.STOP, metadata={
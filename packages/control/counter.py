@@ -13,6 +13,7 @@ from control.algorithm.utils import get_medium_charging_current
 from control.chargemode import Chargemode
 from control.chargepoint.chargepoint import Chargepoint
 from control.chargepoint.chargepoint_state import ChargepointState
+from dataclass_utils import track_changes
 from dataclass_utils.factories import currents_list_factory, voltages_list_factory
 from helpermodules import timecheck
 from helpermodules.constants import NO_ERROR
@@ -36,6 +37,7 @@ class ControlRangeState(Enum):
     ABOVE = 1
 
 
+@track_changes
 @dataclass
 class Config:
     max_power_errorcase: float = field(default=7000, metadata={"topic": "get/max_power_errorcase"})
@@ -48,6 +50,7 @@ def config_factory() -> Config:
     return Config()
 
 
+@track_changes
 @dataclass
 class Get:
     powers: List[float] = field(default_factory=currents_list_factory, metadata={
@@ -73,6 +76,7 @@ def get_factory() -> Get:
     return Get()
 
 
+@track_changes
 @dataclass
 class Set:
     error_timer: Optional[float] = field(default=None, metadata={"topic": "set/error_timer"})
@@ -87,6 +91,7 @@ def set_factory() -> Set:
     return Set()
 
 
+@track_changes
 @dataclass
 class CounterData:
     config: Config = field(default_factory=config_factory)
@@ -1,6 +1,5 @@
 """Zähler-Logik
 """
-import copy
 from dataclasses import dataclass, field
 import logging
 import re
@@ -8,6 +7,7 @@ from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from control import data
 from control.counter import Counter
+from dataclass_utils import track_changes
 from dataclass_utils.factories import empty_list_factory
 from helpermodules.messaging import MessageType, pub_system_message
 from helpermodules.pub import Pub
@@ -18,6 +18,7 @@ from modules.common.simcount import SimCounter
 log = logging.getLogger(__name__)
 
 
+@track_changes
 @dataclass
 class Config:
     home_consumption_source_id: Optional[str] = field(
@@ -30,6 +31,7 @@ def config_factory() -> Config:
     return Config()
 
 
+@track_changes
 @dataclass
 class Set:
     loadmanagement_active: bool = field(
@@ -48,6 +50,7 @@ class Set:
         default=0, metadata={"topic": "set/disengageable_smarthome_power"})
 
 
+@track_changes
 @dataclass
 class Get:
     hierarchy: List = field(default_factory=empty_list_factory, metadata={
@@ -62,6 +65,7 @@ def set_factory() -> Set:
     return Set()
 
 
+@track_changes
 @dataclass
 class CounterAllData:
     config: Config = field(default_factory=config_factory)
@@ -69,18 +73,83 @@ class CounterAllData:
     set: Set = field(default_factory=set_factory)
 
 
+class HierarchyIndex:
+    """ abgeleiteter, flacher Index der Zählerhierarchie, damit die Abfragen der Hierarchie nicht bei jedem Aufruf
+    den Baum rekursiv durchsuchen. Bei mehrfach vergebenen IDs gilt wie bei der rekursiven Suche der erste Eintrag
+    in Tiefensuche.
+    """
+
+    def __init__(self, hierarchy: List) -> None:
+        self.hierarchy = hierarchy
+        # Einträge der obersten Ebene und aller Ebenen unterhalb des ersten Eintrags
+        self.entries: Dict[int, Dict] = {}
+        # Einträge unterhalb des ersten Eintrags der obersten Ebene
+        self.nested_entries: Dict[int, Dict] = {}
+        self.parents: Dict[int, Dict] = {}
+        # Pfad vom direkt übergeordneten Element bis zum ersten Eintrag der obersten Ebene
+        self.paths_to_root: Dict[int, List[int]] = {}
+        # id(Eintrag) -> Ladepunkte unterhalb des Eintrags
+        self.chargepoints: Dict[int, List[str]] = {}
+        self.elements_per_level: List[List[Dict[str, Union[int, str]]]] = []
+        for item in hierarchy:
+            self.entries.setdefault(item["id"], item)
+        for item in hierarchy:
+            self._add_levels(item, 0)
+        if hierarchy:
+            self.chargepoints[id(hierarchy[0])] = []
+            self._add_children(hierarchy[0], [hierarchy[0]], [hierarchy[0]])
+
+    def _add_levels(self, child: Dict, index: int) -> None:
+        if len(self.elements_per_level) == index:
+            self.elements_per_level.append([])
+        self.elements_per_level[index].append({"type": child["type"], "id": child["id"]})
+        for child in child["children"]:
+            self._add_levels(child, index+1)
+
+    def _add_children(self, parent: Dict, path: List[Dict], counting: List[Dict]) -> None:
+        """ path: alle übergeordneten Einträge, counting: übergeordnete Einträge bis zum nächsten Ladepunkt, denen
+        Ladepunkte zugeordnet werden
+        """
+        for child in parent["children"]:
+            self.parents.setdefault(child["id"], parent)
+        for child in parent["children"]:
+            if child["id"] not in self.nested_entries:
+                self.nested_entries[child["id"]] = child
+                self.entries.setdefault(child["id"], child)
+                self.paths_to_root[child["id"]] = [entry["id"] for entry in reversed(path)]
+            self.chargepoints[id(child)] = []
+            if child["type"] == ComponentType.CHARGEPOINT.value:
+                for entry in counting:
+                    self.chargepoints[id(entry)].append(f"cp{child['id']}")
+                self._add_children(child, path + [child], [child])
+            else:
+                self._add_children(child, path + [child], counting + [child])
+
+
 class CounterAll:
     MISSING_EVU_COUNTER = "Bitte erst einen EVU-Zähler konfigurieren."
 
     def __init__(self):
         self.data = CounterAllData()
-        # Hilfsvariablen für die rekursiven Funktionen
-        self.connected_counters = []
-        self.connected_chargepoints = []
+        # Hilfsvariable für die rekursive Funktion
         self.childless = []
+        self._hierarchy_index: Optional[HierarchyIndex] = None
         self.sim_counter = SimCounter("", "", prefix="bezug")
         self.sim_counter.topic = "openWB/set/counter/set/"
 
+    def _get_hierarchy_index(self) -> HierarchyIndex:
+        """ gibt den Index der Hierarchie zurück und baut ihn neu auf, wenn die Hierarchie ersetzt wurde (zB beim
+        Empfang des Topics oder beim Kopieren der Daten). Änderungen innerhalb der Hierarchie müssen den Index mit
+        _invalidate_hierarchy_index verwerfen.
+        """
+        index = self._hierarchy_index
+        if index is None or index.hierarchy is not self.data.get.hierarchy:
+            index = self._hierarchy_index = HierarchyIndex(self.data.get.hierarchy)
+        return index
+
+    def _invalidate_hierarchy_index(self) -> None:
+        self._hierarchy_index = None
+
     def get_evu_counter(self) -> Counter:
         return data.data.counter_data[f"counter{self.get_id_evu_counter()}"]
 
@@ -185,8 +254,8 @@ class CounterAll:
     def get_elements_for_downstream_calculation(self, id: int):
         """returns a list of elements that are relevant for the calculation of the counter values based on the
         downstream components, eg home consumption or virtual counter."""
-        elements = copy.deepcopy(self.get_entry_of_element(id)["children"])
-        elements_to_sum_up = elements
+        elements = self.get_entry_of_element(id)["children"]
+        elements_to_sum_up = list(elements)
         for element in elements:
             if element["type"] == ComponentType.INVERTER.value:
                 elements_to_sum_up.extend(self._add_hybrid_bat(element['id']))
@@ -212,57 +281,25 @@ class CounterAll:
     def get_chargepoints_of_counter(self, counter: str) -> List[str]:
         """ gibt eine Liste der Ladepunkte, die in den folgenden Zweigen des Zählers sind, zurück.
         """
-        self.connected_chargepoints.clear()
+        index = self._get_hierarchy_index()
         if counter == self.get_evu_counter_str():
             counter_object = self.data.get.hierarchy[0]
         else:
-            counter_object = self.__get_entry(
-                self.data.get.hierarchy[0],
-                int(counter[7:]),
-                self.__get_entry_of_element)
-        try:
-            self._get_all_cp_connected_to_counter(counter_object)
-        except KeyError:
-            # Kein Ladepunkt unter dem Zähler
-            pass
-        return self.connected_chargepoints
-
-    def _get_all_cp_connected_to_counter(self, child: Dict) -> None:
-        """ Rekursive Funktion, die alle Ladepunkte ermittelt, die an den angegebenen Zähler angeschlossen sind.
-        """
-        # Alle Objekte der Ebene durchgehen
-        for child in child["children"]:
-            try:
-                if child["type"] == ComponentType.CHARGEPOINT.value:
-                    self.connected_chargepoints.append(f"cp{child['id']}")
-                # Wenn das Objekt noch Kinder hat, diese ebenfalls untersuchen.
-                elif len(child["children"]) != 0:
-                    self._get_all_cp_connected_to_counter(child)
-            except Exception:
-                log.exception("Fehler in der allgemeinen Zähler-Klasse")
+            counter_object = index.nested_entries.get(int(counter[7:]), {})
+        return list(index.chargepoints.get(id(counter_object), []))
 
     def get_counters_to_check(self, num: int) -> List[str]:
         """ ermittelt alle Zähler im Zweig des Ladepunkts.
         """
-        self.connected_counters.clear()
-        self.__get_all_counter_in_branch(self.data.get.hierarchy[0], num)
-        return self.connected_counters
+        return [f"counter{id}" for id in self._get_hierarchy_index().paths_to_root.get(num, [])]
 
     def get_entry_of_element(self, id_to_find: int) -> Dict:
-        item = self.__is_id_in_top_level(id_to_find)
-        if item:
-            return item
-        else:
-            return self.__get_entry(self.data.get.hierarchy[0], id_to_find, self.__get_entry_of_element)
+        return self._get_hierarchy_index().entries.get(id_to_find, {})
 
     def get_entry_of_parent(self, id_to_find: int) -> Dict:
         if self.__is_id_in_top_level(id_to_find):
             return {}
-        for child in self.data.get.hierarchy[0]["children"]:
-            if child["id"] == id_to_find:
-                return self.data.get.hierarchy[0]
-        else:
-            return self.__get_entry(self.data.get.hierarchy[0], id_to_find, self.__get_entry_of_parent)
+        return self._get_hierarchy_index().parents.get(id_to_find, {})
 
     def __is_id_in_top_level(self, id_to_find: int) -> Dict:
         for item in self.data.get.hierarchy:
@@ -271,52 +308,11 @@ class CounterAll:
         else:
             return {}
 
-    def __get_all_counter_in_branch(self, child: Dict, id_to_find: int) -> bool:
-        """ Rekursive Funktion, die alle Zweige durchgeht, bis der entsprechende Ladepunkt gefunden wird und dann alle
-        Zähler in diesem Pfad der Liste anhängt.
-        """
-        parent_id = child["id"]
-        for child in child["children"]:
-            if child["id"] == id_to_find:
-                self.connected_counters.append(f"counter{parent_id}")
-                return True
-            if len(child["children"]) != 0:
-                found = self.__get_all_counter_in_branch(child, id_to_find)
-                if found:
-                    self.connected_counters.append(f"counter{parent_id}")
-                    return True
-        else:
-            return False
-
-    def __get_entry(self, child: Dict, id_to_find: int, func: Callable[[Dict, int], bool]) -> Dict:
-        for child in child["children"]:
-            found = func(child, id_to_find)
-            if found:
-                return child
-            if len(child["children"]) != 0:
-                entry = self.__get_entry(child, id_to_find, func)
-                if entry:
-                    return entry
-        else:
-            return {}
-
-    def __get_entry_of_element(self, child: Dict, id_to_find: int) -> bool:
-        if child["id"] == id_to_find:
-            return True
-        else:
-            return False
-
-    def __get_entry_of_parent(self, child: Dict, id_to_find: int) -> bool:
-        for child2 in child["children"]:
-            if child2["id"] == id_to_find:
-                return True
-        else:
-            return False
-
     def hierarchy_add_item_aside(self, new_id: int, new_type: ComponentType, id_to_find: int) -> None:
         """ ruft die rekursive Funktion zum Hinzufügen eines Zählers oder Ladepunkts in die Zählerhierarchie auf
         derselben Ebene wie das angegebene Element.
         """
+        self._invalidate_hierarchy_index()
         if self.__is_id_in_top_level(id_to_find):
             self.data.get.hierarchy.append({"id": new_id, "type": new_type.value, "children": []})
         else:
@@ -337,6 +333,7 @@ class CounterAll:
         """ruft die rekursive Funktion zum Löschen eines Elements. Je nach Flag werden die Kinder gelöscht oder auf die
         Ebene des gelöschten Elements gehoben.
         """
+        self._invalidate_hierarchy_index()
         item = self.__is_id_in_top_level(id_to_find)
         if item:
             if keep_children:
@@ -375,6 +372,7 @@ class CounterAll:
     def hierarchy_add_item_below(self, new_id: int, new_type: ComponentType, id_to_find: int) -> None:
         """ruft die rekursive Funktion zum Hinzufügen eines Elements als Kind des angegebenen Elements.
         """
+        self._invalidate_hierarchy_index()
         item = self.__is_id_in_top_level(id_to_find)
         if item:
             item["children"].append({"id": new_id, "type": new_type.value, "children": []})
@@ -404,19 +402,7 @@ class CounterAll:
             return False
 
     def get_list_of_elements_per_level(self) -> List[List[Dict[str, Union[int, str]]]]:
-        elements_per_level: List[List[Dict[str, Union[int, str]]]] = []
-        for item in self.data.get.hierarchy:
-            list(zip(elements_per_level, self._get_list_of_elements_per_level(elements_per_level, item, 0)))
-        return elements_per_level
-
-    def _get_list_of_elements_per_level(self, elements_per_level: List, child: Dict, index: int) -> List:
-        try:
-            elements_per_level[index].extend([{"type": child["type"], "id": child["id"]}])
-        except IndexError:
-            elements_per_level.insert(index, [{"type": child["type"], "id": child["id"]}])
-        for child in child["children"]:
-            elements_per_level = self._get_list_of_elements_per_level(elements_per_level, child, index+1)
-        return elements_per_level
+        return [[dict(element) for element in level] for level in self._get_hierarchy_index().elements_per_level]
 
     def validate_hierarchy(self):
         try:
@@ -6,7 +6,7 @@ import copy
 import logging
 from threading import Event, Lock
 from functools import wraps
-from typing import Dict
+from typing import Any, Dict, Iterator, Tuple
 from control.bat import Bat
 from control.bat_all import BatAll
 from control.chargepoint.chargepoint import Chargepoint
@@ -85,6 +85,12 @@ class Data:
         self._pv_data: Dict[str, Pv] = {}
         self._pv_all_data = PvAll()
         self._system_data = {}
+        # Kopien der Objekte, die während des Regelzyklus nur gelesen werden, je Name und Key:
+        # (Generation in SubData, Original-Objekt, Kopie)
+        self._snapshots: Dict[str, Dict[str, Tuple[int, Any, Any]]] = {}
+        # zuletzt geloggter Zustand je Eintrag von print_all und Anzahl Zyklen seit der letzten vollständigen Ausgabe
+        self._printed_state: Dict[Tuple[str, str], str] = {}
+        self._print_all_cycles = 0
 
     # getter-Funktion, der Zugriff erfolgt wie bei einem Zugriff auf eine öffentliche Variable.
     @property
@@ -258,31 +264,66 @@ class Data:
         self._system_data = value
 
     def print_all(self):
-        self._print_dictionaries(self._bat_data)
-        log.info(f"bat_all_data\n{self._bat_all_data.data}")
-        log.info(f"cp_all_data\n{self._cp_all_data.data}")
-        self._print_dictionaries(self._cp_data)
-        self._print_dictionaries(self._cp_template_data)
-        self._print_dictionaries(self._counter_data)
-        log.info(f"counter_all_data\n{self._counter_all_data.data}")
-        self._print_dictionaries(self._ev_charge_template_data)
-        self._print_dictionaries(self._ev_data)
-        self._print_dictionaries(self._ev_template_data)
-        log.info(f"general_data\n{self._general_data.data}")
-        log.info(f"general_data-display\n{self._general_data.data.extern_display_mode}")
-        log.info(f"graph_data\n{self._graph_data.data}")
-        self._print_io_actions(self._io_actions)
-        self._print_dictionaries(self._io_states)
-        log.info(f"optional_data\n{self._optional_data.data}")
-        self._print_dictionaries(self._pv_data)
-        log.info(f"pv_all_data\n{self._pv_all_data.data}")
-        self._print_dictionaries(self._system_data)
-        self._print_device_config(self._system_data)
-        self._print_io_device_config(self._system_data)
+        """ loggt zu Debug-Zwecken den Zustand aller Daten. Wenn das Log-Level die Meldungen verwerfen würde, wird der
+        Zustand nicht formatiert. Ist in openWB/system/debug_full_state_interval ein Intervall größer 1 eingestellt,
+        wird nur in jedem n-ten Zyklus der vollständige Zustand geloggt, dazwischen nur die Einträge, die sich seit dem
+        vorherigen Zyklus geändert haben.
+        """
+        if not log.isEnabledFor(logging.INFO):
+            # Nach dem Herabsetzen des Log-Levels wieder mit dem vollständigen Zustand beginnen.
+            self._printed_state = {}
+            self._print_all_cycles = 0
+            return
+        full_interval = self._get_full_state_interval()
+        full = self._print_all_cycles % full_interval == 0
+        self._print_all_cycles += 1
+        state = {}
+        unchanged = []
+        for section, key, value in self._state_entries():
+            if full_interval > 1:
+                state[(section, key)] = value
+            if full or self._printed_state.get((section, key)) != value:
+                log.info(f"{key}\n{value}")
+            else:
+                unchanged.append(key)
+        if unchanged:
+            log.info(f"Unverändert seit dem vorherigen Zyklus: {', '.join(unchanged)}")
+        self._printed_state = state
         log.info("\n")
 
-    def _print_dictionaries(self, data):
-        """ gibt zu Debug-Zwecken für jeden Key im übergebenen Dictionary das Dictionary aus.
+    def _get_full_state_interval(self) -> int:
+        try:
+            return max(int(self._system_data["system"].data.get("debug_full_state_interval", 1)), 1)
+        except KeyError:
+            return 1
+
+    def _state_entries(self) -> Iterator[Tuple[str, str, str]]:
+        """ liefert für jeden Eintrag von print_all Bereich, Name und formatierten Zustand.
+        """
+        yield from self._dictionary_entries("bat", self._bat_data)
+        yield "bat_all", "bat_all_data", str(self._bat_all_data.data)
+        yield "cp_all", "cp_all_data", str(self._cp_all_data.data)
+        yield from self._dictionary_entries("cp", self._cp_data)
+        yield from self._dictionary_entries("cp_template", self._cp_template_data)
+        yield from self._dictionary_entries("counter", self._counter_data)
+        yield "counter_all", "counter_all_data", str(self._counter_all_data.data)
+        yield from self._dictionary_entries("ev_charge_template", self._ev_charge_template_data)
+        yield from self._dictionary_entries("ev", self._ev_data)
+        yield from self._dictionary_entries("ev_template", self._ev_template_data)
+        yield "general", "general_data", str(self._general_data.data)
+        yield "general", "general_data-display", str(self._general_data.data.extern_display_mode)
+        yield "graph", "graph_data", str(self._graph_data.data)
+        yield from self._io_action_entries(self._io_actions)
+        yield from self._dictionary_entries("io_states", self._io_states)
+        yield "optional", "optional_data", str(self._optional_data.data)
+        yield from self._dictionary_entries("pv", self._pv_data)
+        yield "pv_all", "pv_all_data", str(self._pv_all_data.data)
+        yield from self._dictionary_entries("system", self._system_data)
+        yield from self._device_config_entries(self._system_data)
+        yield from self._io_device_config_entries(self._system_data)
+
+    def _dictionary_entries(self, section: str, data) -> Iterator[Tuple[str, str, str]]:
+        """ liefert zu Debug-Zwecken für jeden Key im übergebenen Dictionary das Dictionary.
 
         Parameter
         ---------
@@ -292,37 +333,38 @@ class Data:
             try:
                 if not isinstance(data[key], dict):
                     try:
-                        log.info(key+"\n"+str(data[key].data))
+                        yield section, key, str(data[key].data)
                     except AttributeError:
                         # Devices haben kein data-Dict
                         pass
                 else:
-                    log.info(key+"\n"+"Klasse fehlt")
+                    yield section, key, "Klasse fehlt"
             except Exception:
                 log.exception("Fehler im Data-Modul")
 
-    def _print_device_config(self, data: Dict[str, AbstractDevice]):
+    def _device_config_entries(self, data: Dict[str, AbstractDevice]) -> Iterator[Tuple[str, str, str]]:
         for key, value in data.items():
             try:
                 if isinstance(value, AbstractDevice):
-                    log.info(f"{key}\n{dataclass_utils.asdict(value.device_config)}")
+                    yield "device_config", key, str(dataclass_utils.asdict(value.device_config))
                     for comp_key, comp_value in value.components.items():
-                        log.info(f"{comp_key}\n{dataclass_utils.asdict(comp_value.component_config)}")
+                        yield (f"device_config/{key}", comp_key,
+                               str(dataclass_utils.asdict(comp_value.component_config)))
             except Exception:
                 log.exception("Fehler im Data-Modul")
 
-    def _print_io_device_config(self, data: Dict[str, AbstractIoDevice]):
+    def _io_device_config_entries(self, data: Dict[str, AbstractIoDevice]) -> Iterator[Tuple[str, str, str]]:
         for key, value in data.items():
             try:
                 if isinstance(value, AbstractIoDevice):
-                    log.info(f"{key}\n{dataclass_utils.asdict(value.config)}")
+                    yield "io_device_config", key, str(dataclass_utils.asdict(value.config))
             except Exception:
                 log.exception("Fehler im Data-Modul")
 
-    def _print_io_actions(self, data: IoActions):
+    def _io_action_entries(self, data: IoActions) -> Iterator[Tuple[str, str, str]]:
         for key, value in data.actions.items():
             try:
-                log.info(f"{key}\n{dataclass_utils.asdict(value.config)}")
+                yield "io_action", str(key), str(dataclass_utils.asdict(value.config))
             except Exception:
                 log.exception("Fehler im Data-Modul")
 
@@ -381,7 +423,7 @@ class Data:
                 self.cp_data[cp].data = copy.deepcopy(SubData.cp_data[cp].chargepoint.data)
                 self.cp_data[cp].chargepoint_module = SubData.cp_data[cp].chargepoint.chargepoint_module
         self.cp_all_data = copy.deepcopy(SubData.cp_all_data)
-        self.cp_template_data = copy.deepcopy(SubData.cp_template_data)
+        self.cp_template_data = self.__copy_on_write("cp_template_data", SubData.cp_template_data)
         for chargepoint in self.cp_data:
             try:
                 if "cp" in chargepoint:
@@ -444,16 +486,16 @@ class Data:
                 self.__copy_counter_data()
                 self.__copy_system_data()
                 self.__copy_module_data()
-                self.graph_data = copy.deepcopy(SubData.graph_data)
+                self.graph_data = self.__copy_on_write("graph_data", {"graph": SubData.graph_data})["graph"]
             except Exception:
                 log.exception("Fehler im Prepare-Modul")
 
     def __copy_ev_data(self) -> None:
         self.ev_data.clear()
-        for ev in SubData.ev_data:
-            self.ev_data[ev] = copy.deepcopy(SubData.ev_data[ev])
-        self.ev_template_data = copy.deepcopy(SubData.ev_template_data)
-        self.ev_charge_template_data = copy.deepcopy(SubData.ev_charge_template_data)
+        self.ev_data.update(self.__copy_on_write("ev_data", SubData.ev_data))
+        self.ev_template_data = self.__copy_on_write("ev_template_data", SubData.ev_template_data)
+        self.ev_charge_template_data = self.__copy_on_write("ev_charge_template_data",
+                                                            SubData.ev_charge_template_data)
         for vehicle in self.ev_data:
             try:
                 self.ev_data[vehicle].charge_template = self.ev_charge_template_data["ct" + str(
@@ -464,6 +506,23 @@ class Data:
             except Exception:
                 log.exception("Fehler im Prepare-Modul für EV "+str(vehicle))
 
+    def __copy_on_write(self, name: str, source: Dict[str, Any]) -> Dict[str, Any]:
+        """ kopiert nur die Objekte neu, deren Generation sich seit dem letzten Kopieren geändert hat oder die in
+        SubData durch ein neues Objekt ersetzt wurden. Darf nur für Objekte verwendet werden, die während des
+        Regelzyklus nicht verändert werden, da die Kopie über mehrere Zyklen wiederverwendet wird.
+        """
+        snapshot = self._snapshots.get(name, {})
+        new_snapshot = {}
+        for key, value in list(source.items()):
+            # Generation vor dem Kopieren lesen, damit eine zwischenzeitliche Änderung im nächsten Zyklus kopiert wird.
+            generation = SubData.generations.get(f"{name}/{key}", 0)
+            cached = snapshot.get(key)
+            if cached is None or cached[0] != generation or cached[1] is not value:
+                cached = (generation, value, copy.deepcopy(value))
+            new_snapshot[key] = cached
+        self._snapshots[name] = new_snapshot
+        return {key: cached[2] for key, cached in new_snapshot.items()}
+
 
 class ModuleDataReceivedContext:
     """ Moduldaten erst kopieren, wenn alle Daten vom Broker empfangen wurden."""
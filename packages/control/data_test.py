@@ -0,0 +1,119 @@
+import logging
+from threading import Event
+from unittest.mock import Mock
+
+import pytest
+
+from control import data
+from control.chargepoint.chargepoint_template import CpTemplate
+from control.io_device import IoActions
+from helpermodules.subdata import SubData
+from helpermodules.system import System
+
+
+@pytest.fixture
+def data_() -> data.Data:
+    event = Event()
+    event.set()
+    data.data_init(event)
+    return data.data
+
+
+def test_copy_data_reuses_unchanged_templates(data_: data.Data, monkeypatch):
+    # setup
+    monkeypatch.setattr(SubData, "cp_template_data", {"cpt0": CpTemplate(), "cpt1": CpTemplate()})
+    monkeypatch.setattr(SubData, "generations", {})
+    data_.copy_data()
+    first_copy = dict(data_.cp_template_data)
+
+    # execution
+    SubData.cp_template_data["cpt1"].data.name = "geändert"
+    SubData.bump_generation("cp_template_data", "cpt1")
+    data_.copy_data()
+
+    # evaluation
+    assert data_.cp_template_data["cpt0"] is first_copy["cpt0"]
+    assert data_.cp_template_data["cpt1"] is not first_copy["cpt1"]
+    assert data_.cp_template_data["cpt1"].data.name == "geändert"
+    assert data_.cp_template_data["cpt1"] is not SubData.cp_template_data["cpt1"]
+
+
+def test_copy_data_copies_replaced_and_drops_removed_templates(data_: data.Data, monkeypatch):
+    # setup
+    monkeypatch.setattr(SubData, "cp_template_data", {"cpt0": CpTemplate(), "cpt1": CpTemplate()})
+    monkeypatch.setattr(SubData, "generations", {})
+    data_.copy_data()
+    first_copy = dict(data_.cp_template_data)
+
+    # execution
+    SubData.cp_template_data["cpt0"] = CpTemplate()
+    SubData.cp_template_data.pop("cpt1")
+    data_.copy_data()
+
+    # evaluation
+    assert data_.cp_template_data["cpt0"] is not first_copy["cpt0"]
+    assert "cpt1" not in data_.cp_template_data
+
+
+def test_print_all_skipped_below_info(data_: data.Data, caplog):
+    # setup
+    data_.io_actions = IoActions()
+    data_.cp_template_data = {"cpt0": Mock(spec=CpTemplate)}
+    caplog.set_level(logging.WARNING, logger="control.data")
+
+    # execution
+    data_.print_all()
+
+    # evaluation
+    assert caplog.records == []
+    assert data_.cp_template_data["cpt0"].mock_calls == []
+
+
+def test_print_all_full_dump_by_default(data_: data.Data, caplog):
+    # setup
+    data_.io_actions = IoActions()
+    data_.cp_template_data = {"cpt0": CpTemplate()}
+    caplog.set_level(logging.INFO, logger="control.data")
+
+    # execution
+    data_.print_all()
+    first = [record.getMessage() for record in caplog.records]
+    caplog.clear()
+    data_.print_all()
+
+    # evaluation
+    assert [record.getMessage() for record in caplog.records] == first
+    assert data_._printed_state == {}
+
+
+def test_print_all_logs_changes_between_full_dumps(data_: data.Data, caplog):
+    # setup
+    system = System()
+    system.data["debug_full_state_interval"] = 3
+    data_.system_data = {"system": system}
+    data_.io_actions = IoActions()
+    data_.cp_template_data = {"cpt0": CpTemplate(), "cpt1": CpTemplate()}
+    caplog.set_level(logging.INFO, logger="control.data")
+
+    def printed_keys():
+        keys = [record.getMessage().split("\n")[0] for record in caplog.records]
+        caplog.clear()
+        return keys
+
+    # execution
+    data_.print_all()
+    full = printed_keys()
+    data_.cp_template_data["cpt1"].data.name = "geändert"
+    data_.print_all()
+    changed = printed_keys()
+    data_.print_all()
+    unchanged = printed_keys()
+    data_.print_all()
+    full_again = printed_keys()
+
+    # evaluation
+    assert "cpt0" in full and "cpt1" in full and "general_data" in full
+    assert changed[0] == "cpt1"
+    assert changed[1].startswith("Unverändert seit dem vorherigen Zyklus: ") and "cpt0" in changed[1]
+    assert unchanged[0].startswith("Unverändert seit dem vorherigen Zyklus: ")
+    assert full_again == full
@@ -213,6 +213,23 @@ def test_get_entry_of_parent(params: ParamsItem):
     assert actual == params.expected_return
 
 
+def test_hierarchy_index_rebuilt_on_change():
+    # setup
+    c = hierarchy_cp()
+    assert c.get_chargepoints_of_counter("counter4") == ["cp5", "cp6"]
+
+    # execution
+    c.hierarchy_add_item_below(8, ComponentType.CHARGEPOINT, 4)
+    added = c.get_chargepoints_of_counter("counter4")
+    c.data.get.hierarchy = [{"id": 0, "type": "counter", "children": [{"id": 8, "type": "cp", "children": []}]}]
+    replaced = c.get_counters_to_check(8)
+
+    # evaluation
+    assert added == ["cp5", "cp6", "cp8"]
+    assert c.get_counters_to_check(5) == []
+    assert replaced == ["counter0"]
+
+
 def test_empty_hierarchy():
     # execution
     c = hierarchy_empty()
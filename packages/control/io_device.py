@@ -1,8 +1,9 @@
 from dataclasses import dataclass, field
-from typing import Dict, Optional, Union
+from typing import Dict, List, Optional, Tuple, Type, Union
 from control import data
 from control.limiting_value import LimitingValue
 from helpermodules.constants import NO_ERROR
+from modules.common.abstract_io import AbstractIoAction
 from modules.common.utils.component_parser import get_io_name_by_id
 from modules.io_actions.controllable_consumers.dimming.api_eebus import DimmingEebus
 from modules.io_actions.controllable_consumers.dimming.api_io import DimmingIo
@@ -58,51 +59,64 @@ class IoActions:
     def __init__(self):
         self.actions: Dict[int, Union[DimmingIo, DimmingEebus, DimmingDirectControl,
                                       RippleControlReceiver, StepwiseControlEebus, StepwiseControlIo]] = {}
+        # je Regelzyklus: (Typ, ID) des Geräts -> (Aktion, Gerät aus der Konfiguration der Aktion)
+        self._device_index: Optional[Dict[Tuple[str, int], List[Tuple[AbstractIoAction, Dict]]]] = None
 
     def setup(self):
         for action in self.actions.values():
             action.setup()
 
+    def build_device_index(self) -> None:
+        """ ordnet den Geräten einmal je Regelzyklus die Aktionen zu, damit das Lastmanagement nicht für jeden
+        Ladepunkt und Zähler alle Aktionen und deren Geräte durchsuchen muss. Die Aktionen werden zu Beginn jedes
+        Regelzyklus neu kopiert, daher muss der Index nicht zurückgesetzt werden.
+        """
+        device_index = {}
+        for action in self.actions.values():
+            for d in action.config.configuration.devices:
+                device_index.setdefault((d.get("type"), d.get("id")), []).append((action, d))
+        self._device_index = device_index
+
+    def _get_action(self, device: Dict, action_types: Tuple[Type, ...]) -> Optional[AbstractIoAction]:
+        if self._device_index is None:
+            candidates = ((action, d) for action in self.actions.values()
+                          for d in action.config.configuration.devices)
+        else:
+            candidates = self._device_index.get((device.get("type"), device.get("id")), [])
+        for action, d in candidates:
+            if isinstance(action, action_types) and d == device:
+                return action
+        return None
+
     def _check_fault_state_io_device(self, io_device: int) -> None:
         if data.data.io_states[f"io_states{io_device}"].data.get.fault_state == 2:
             raise ValueError(LimitingValue.CONTROLLABLE_CONSUMERS_ERROR.value.format(get_io_name_by_id(io_device)))
 
     def dimming_get_import_power_left(self, device: Dict) -> Optional[float]:
-        for action in self.actions.values():
-            if isinstance(action, (DimmingIo, DimmingEebus)):
-                for d in action.config.configuration.devices:
-                    if device == d:
-                        self._check_fault_state_io_device(action.config.configuration.io_device)
-                        return action.dimming_get_import_power_left()
-        else:
-            return None
+        action = self._get_action(device, (DimmingIo, DimmingEebus))
+        if action is not None:
+            self._check_fault_state_io_device(action.config.configuration.io_device)
+            return action.dimming_get_import_power_left()
+        return None
 
     def dimming_set_import_power_left(self, device: Dict, used_power: float) -> Optional[float]:
-        for action in self.actions.values():
-            if isinstance(action, (DimmingIo, DimmingEebus)):
-                for d in action.config.configuration.devices:
-                    if d == device:
-                        return action.dimming_set_import_power_left(used_power)
+        action = self._get_action(device, (DimmingIo, DimmingEebus))
+        if action is not None:
+            return action.dimming_set_import_power_left(used_power)
 
     def dimming_via_direct_control(self, device: Dict) -> Optional[float]:
-        for action in self.actions.values():
-            if isinstance(action, DimmingDirectControl):
-                for d in action.config.configuration.devices:
-                    if device == d:
-                        self._check_fault_state_io_device(action.config.configuration.io_device)
-                        return action.dimming_via_direct_control()
-        else:
-            return None
+        action = self._get_action(device, (DimmingDirectControl,))
+        if action is not None:
+            self._check_fault_state_io_device(action.config.configuration.io_device)
+            return action.dimming_via_direct_control()
+        return None
 
     def ripple_control_receiver(self, device: Dict) -> float:
-        for action in self.actions.values():
-            if isinstance(action, RippleControlReceiver):
-                for d in action.config.configuration.devices:
-                    if device == d:
-                        self._check_fault_state_io_device(action.config.configuration.io_device)
-                        return action.ripple_control_receiver()
-        else:
-            return 1
+        action = self._get_action(device, (RippleControlReceiver,))
+        if action is not None:
+            self._check_fault_state_io_device(action.config.configuration.io_device)
+            return action.ripple_control_receiver()
+        return 1
 
     def stepwise_control(self, device_id: int) -> Optional[float]:
         for action in self.actions.values():
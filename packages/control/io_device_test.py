@@ -0,0 +1,53 @@
+from unittest.mock import Mock
+
+import pytest
+
+from control import data
+from control.io_device import IoActions, IoStates
+from modules.io_actions.controllable_consumers.dimming_direct_control.api import DimmingDirectControl
+from modules.io_actions.controllable_consumers.dimming_direct_control.config import (DimmingDirectControlConfig,
+                                                                                     DimmingDirectControlSetup)
+from modules.io_actions.controllable_consumers.ripple_control_receiver.api import RippleControlReceiver
+from modules.io_actions.controllable_consumers.ripple_control_receiver.config import (RippleControlReceiverConfig,
+                                                                                      RippleControlReceiverSetup)
+
+
+@pytest.fixture
+def io_actions() -> IoActions:
+    data.data_init(Mock())
+    data.data.io_states = {"io_states1": IoStates(1)}
+    data.data.io_states["io_states1"].data.get.digital_input = {"SofortLa": True}
+    io_actions = IoActions()
+    io_actions.actions = {
+        0: DimmingDirectControl(DimmingDirectControlSetup(id=0, configuration=DimmingDirectControlConfig(
+            io_device=1, input_pattern=[{"value": True, "matrix": {"SofortLa": True}}],
+            devices=[{"type": "cp", "id": 3}, {"type": "io", "id": 2, "digital_output": "Dim"}]))),
+        1: RippleControlReceiver(RippleControlReceiverSetup(id=1, configuration=RippleControlReceiverConfig(
+            io_device=1, input_pattern=[{"value": 0.5, "matrix": {"SofortLa": True}}],
+            devices=[{"type": "cp", "id": 3}, {"type": "cp", "id": 4}]))),
+        2: RippleControlReceiver(RippleControlReceiverSetup(id=2, configuration=RippleControlReceiverConfig(
+            io_device=1, input_pattern=[{"value": 0, "matrix": {"SofortLa": True}}],
+            devices=[{"type": "cp", "id": 4}, {"type": "cp", "id": 5}]))),
+    }
+    return io_actions
+
+
+def test_device_index_equals_scan(io_actions: IoActions):
+    # setup
+    devices = [{"type": "cp", "id": num} for num in range(2, 7)] + [
+        {"type": "io", "id": 2}, {"type": "io", "id": 2, "digital_output": "Dim"}]
+
+    def query():
+        return [(io_actions.ripple_control_receiver(device),
+                 io_actions.dimming_via_direct_control(device),
+                 io_actions.dimming_get_import_power_left(device)) for device in devices]
+
+    expected = query()
+
+    # execution
+    io_actions.build_device_index()
+    indexed = query()
+
+    # evaluation
+    assert indexed == expected
+    assert [value for value, _, _ in indexed] == [1, 0.5, 0.5, 0, 1, 1, 1]
@@ -1,6 +1,6 @@
 import logging
 import operator
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from control import data
 from control.chargepoint.chargepoint import Chargepoint
@@ -12,6 +12,28 @@ from modules.common.utils.component_parser import get_component_name_by_id
 
 log = logging.getLogger(__name__)
 
+# je Regelzyklus: ID -> Name der Zähler, die das Lastmanagement begrenzt haben. Ohne Zwischenspeicher würden für jede
+# Meldung alle Komponenten aller Geräte durchsucht.
+_counter_names: Optional[Dict[int, str]] = None
+
+
+def build_counter_names() -> None:
+    global _counter_names
+    _counter_names = {}
+
+
+def clear_counter_names() -> None:
+    global _counter_names
+    _counter_names = None
+
+
+def _get_counter_name(num: int) -> str:
+    if _counter_names is None:
+        return get_component_name_by_id(num)
+    if num not in _counter_names:
+        _counter_names[num] = get_component_name_by_id(num)
+    return _counter_names[num]
+
 
 class Loadmanagement:
     def get_available_currents(self,
@@ -85,7 +107,7 @@ class Loadmanagement:
                 available_currents = list(map(operator.sub, available_currents, max_exceeding))
                 log.debug(f"Schieflast {max_exceeding}A korrigieren: {available_currents}")
                 limit = LoadmanagementLimit(
-                    LimitingValue.UNBALANCED_LOAD.value.format(get_component_name_by_id(counter.num)),
+                    LimitingValue.UNBALANCED_LOAD.value.format(_get_counter_name(counter.num)),
                     LimitingValue.UNBALANCED_LOAD)
             elif phases_to_use == 3:
                 log.debug("Schieflastkorrektur nicht möglich, da alle Phasen genutzt werden.")
@@ -115,7 +137,7 @@ class Loadmanagement:
                         # bei einphasig angeschlossenen Wallboxen ist die Spannung der anderen Phasen 0V
                         currents[i] = 0.0
                 log.debug(f"Leistungsüberschreitung auf {raw_power_left}W korrigieren: {available_currents}")
-                limit = LoadmanagementLimit(LimitingValue.POWER.value.format(get_component_name_by_id(counter.num)),
+                limit = LoadmanagementLimit(LimitingValue.POWER.value.format(_get_counter_name(counter.num)),
                                             LimitingValue.POWER)
         return currents, limit
 
@@ -130,7 +152,7 @@ class Loadmanagement:
             available_currents[i] = min(missing_currents[i], raw_currents_left[i])
         if available_currents != missing_currents:
             log.debug(f"Stromüberschreitung {missing_currents}W korrigieren: {available_currents}")
-            limit = LoadmanagementLimit(LimitingValue.CURRENT.value.format(get_component_name_by_id(counter.num)),
+            limit = LoadmanagementLimit(LimitingValue.CURRENT.value.format(_get_counter_name(counter.num)),
                                         LimitingValue.CURRENT)
         return available_currents, limit
 
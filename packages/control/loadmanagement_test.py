@@ -53,3 +53,21 @@ def test_limit_by_current(
 
     # assertion
     assert currents == expected_currents
+
+
+def test_counter_name_cached_per_cycle(monkeypatch):
+    # setup
+    counter_name_mock = Mock(return_value=COUNTER_NAME)
+    monkeypatch.setattr(loadmanagement, "get_component_name_by_id", counter_name_mock)
+    loadmanagement.build_counter_names()
+
+    # execution
+    try:
+        for _ in range(3):
+            Loadmanagement()._limit_by_current(Counter(0), [5, 10, 15], [5, 8, 5])
+    finally:
+        loadmanagement.clear_counter_names()
+    Loadmanagement()._limit_by_current(Counter(0), [5, 10, 15], [5, 8, 5])
+
+    # evaluation
+    assert counter_name_mock.call_count == 2
@@ -3,7 +3,8 @@
 
 import logging
 
-from control import data
+from control import data, loadmanagement
+from control.algorithm import filter_chargepoints
 from modules.common.component_type import ComponentType
 
 
@@ -17,6 +18,7 @@ class Prepare:
     def setup_algorithm(self) -> None:
         """ bereitet die Daten für den Algorithmus vor und startet diesen.
         """
+        filter_chargepoints.clear_index()
         try:
             data.data.pv_all_data.calc_power_for_all_components()
             data.data.bat_all_data.calc_power_for_all_components()
@@ -29,12 +31,16 @@ class Prepare:
                         data.data.counter_data[f"counter{element['id']}"].setup_counter()
             for cp in data.data.cp_data.values():
                 cp.update(data.data.ev_data)
+            # Lademodus, Submodus und Priorität stehen fest.
+            filter_chargepoints.build_index()
             # Nach cp update, da für die Speicher-Sperre der Lademodus bekannt sein muss.
             data.data.bat_all_data.setup_bat()
             data.data.cp_all_data.get_cp_sum()
             data.data.cp_all_data.no_charge()
             data.data.counter_all_data.set_home_consumption()
             data.data.io_actions.setup()
+            data.data.io_actions.build_device_index()
+            loadmanagement.build_counter_names()
         except Exception:
             log.exception("Fehler im Prepare-Modul")
         data.data.print_all()
@@ -4,10 +4,11 @@ import logging
 from threading import Thread
 from typing import List
 
+from control.algorithm import filter_chargepoints
 from control.bat_all import get_controllable_bat_components
 from control.chargelog import chargelog
 from control.chargepoint import chargepoint
-from control import data
+from control import data, loadmanagement
 from control.chargepoint.chargepoint_state import ChargepointState
 from helpermodules.pub import Pub
 from helpermodules.utils._thread_handler import joined_thread_handler
@@ -25,6 +26,9 @@ class Process:
         pass
 
     def process_algorithm_results(self) -> None:
+        # Beim Verarbeiten können Ladepunkte zurückgesetzt werden, der Index des Algorithmus ist dann veraltet.
+        filter_chargepoints.clear_index()
+        loadmanagement.clear_counter_names()
         try:
             modules_threads: List[Thread] = []
             log.info("# Ladung starten.")
@@ -1,2 +1,3 @@
 from dataclass_utils._dataclass_asdict import asdict
 from dataclass_utils._dataclass_from_dict import dataclass_from_dict
+from dataclass_utils._dataclass_change_tracking import track_changes
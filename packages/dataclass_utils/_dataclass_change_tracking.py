@@ -0,0 +1,73 @@
+from typing import Any, Dict, Optional, Tuple
+
+# Platzhalter für Felder, die vor der ersten Zuweisung noch nicht existiert haben (Zuweisung im __init__).
+MISSING = object()
+
+
+class ChangeTracker:
+    """ merkt sich für jede Instanz einer mit track_changes dekorierten Klasse die Felder, die seit dem Start der
+    Aufzeichnung zugewiesen wurden, und den Wert vor der ersten Zuweisung.
+    """
+
+    def __init__(self) -> None:
+        # id der Instanz -> (Instanz, {Feldname: Wert vor der ersten Zuweisung})
+        # Die Referenz auf die Instanz verhindert, dass die id während der Aufzeichnung neu vergeben wird.
+        self._changes: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
+
+    def record(self, instance: Any, name: str) -> None:
+        entry = self._changes.get(id(instance))
+        if entry is None:
+            entry = self._changes[id(instance)] = (instance, {})
+        if name not in entry[1]:
+            entry[1][name] = instance.__dict__.get(name, MISSING)
+
+    def changes(self, instance: Any) -> Dict[str, Any]:
+        """ gibt die zugewiesenen Felder der Instanz mit ihrem ursprünglichen Wert zurück.
+        """
+        entry = self._changes.get(id(instance))
+        if entry is None or entry[0] is not instance:
+            return {}
+        return entry[1]
+
+    def original(self, instance: Any, name: str) -> Any:
+        """ gibt den Wert des Felds zum Start der Aufzeichnung zurück.
+        """
+        changes = self.changes(instance)
+        if name in changes:
+            return changes[name]
+        return getattr(instance, name, MISSING)
+
+
+_tracker: Optional[ChangeTracker] = None
+
+
+def start_tracking() -> ChangeTracker:
+    """ startet die Aufzeichnung der Zuweisungen für alle Threads. Es kann immer nur eine Aufzeichnung aktiv sein.
+    """
+    global _tracker
+    _tracker = ChangeTracker()
+    return _tracker
+
+
+def stop_tracking() -> None:
+    global _tracker
+    _tracker = None
+
+
+def is_tracked(cls: type) -> bool:
+    return getattr(cls, "__track_changes__", False)
+
+
+def track_changes(cls):
+    """ Klassen-Dekorator für Dataclasses: Zuweisungen an Attribute werden während einer aktiven Aufzeichnung im
+    ChangeTracker vermerkt. Änderungen innerhalb von Listen und Dictionaries werden nicht erkannt.
+    """
+    def __setattr__(self, name: str, value: Any) -> None:
+        tracker = _tracker
+        if tracker is not None:
+            tracker.record(self, name)
+        object.__setattr__(self, name, value)
+
+    cls.__setattr__ = __setattr__
+    cls.__track_changes__ = True
+    return cls
@@ -1,12 +1,14 @@
 from dataclasses import fields, is_dataclass
+import copy
 from enum import Enum
+import functools
 import logging
-from threading import Event
-from typing import Dict, List, Tuple
+from typing import Any, Dict, Tuple
 from control import data
 
-from control.data import Data
 from dataclass_utils._dataclass_asdict import asdict
+from dataclass_utils._dataclass_change_tracking import (MISSING, ChangeTracker, is_tracked, start_tracking,
+                                                        stop_tracking)
 from helpermodules.pub import Pub
 
 
@@ -63,82 +65,167 @@ log = logging.getLogger(__name__)
 #     def __init__(self) -> None:
 #         self.data = SampleData()
 
+# Klassen, die mit @track_changes dekoriert sind, merken sich während des Zyklus, welche Felder zugewiesen wurden. Beim
+# Verlassen des Kontextmanagers werden für diese nur die zugewiesenen Felder verglichen. Werte, die Listen, Dictionaries
+# oder Klassen sind, können auch ohne Zuweisung verändert werden. Diese und alle Werte aus nicht dekorierten Klassen
+# werden daher beim Betreten des Kontextmanagers gespeichert und beim Verlassen verglichen.
+
+
+SCALAR_TYPES = (str, int, float, bool, type(None), Enum)
+
+
+@functools.lru_cache(maxsize=None)
+def _field_plan(cls: type) -> Tuple[Dict[str, str], Tuple[str, ...]]:
+    """ gibt die Felder mit Topic und die Felder ohne Topic der Klasse zurück.
+    """
+    topics = {}
+    others = []
+    for f in fields(cls):
+        if f.metadata.get("topic"):
+            topics[f.name] = f.metadata["topic"]
+        else:
+            others.append(f.name)
+    return topics, tuple(others)
+
+
+def _comparable(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    elif isinstance(value, SCALAR_TYPES) or value is MISSING:
+        return value
+    elif isinstance(value, (dict, list, tuple)):
+        return copy.deepcopy(value)
+    else:
+        return asdict(value)
+
 
 class ChangedValuesHandler:
-    def __init__(self, event_module_update_completed: Event) -> None:
-        self.prev_data: Data = Data(event_module_update_completed)
+    def __init__(self) -> None:
+        self.tracker = ChangeTracker()
+        # Topic-Prefix -> Dataclass-Instanz, deren Werte veröffentlicht werden
+        self.roots: Dict[str, Any] = {}
+        # Topic -> (Topic-Prefix, Pfad der Attribute ab der Dataclass-Instanz, Wert beim Betreten des Kontextmanagers)
+        self.snapshots: Dict[str, Tuple[str, Tuple[str, ...], Any]] = {}
+
+    def _get_roots(self) -> Dict[str, Any]:
+        roots = {"openWB/set/bat/": data.data.bat_all_data.data,
+                 "openWB/set/chargepoint/": data.data.cp_all_data.data.get,
+                 "openWB/set/counter/": data.data.counter_all_data.data,
+                 "openWB/set/optional/": data.data.optional_data.data}
+        for value in data.data.cp_data.values():
+            roots[f"openWB/set/chargepoint/{value.num}/"] = value.data
+        for value in data.data.bat_data.values():
+            roots[f"openWB/set/bat/{value.num}/"] = value.data
+        for value in data.data.counter_data.values():
+            roots[f"openWB/set/counter/{value.num}/"] = value.data
+        return roots
 
     def store_initial_values(self):
         try:
-            # speichern der Daten zum Zyklus-Beginn, um später die geänderten Werte zu ermitteln
-            self.prev_data.copy_data()
+            # speichern der Werte zum Zyklus-Beginn, die nicht über die Zuweisungen nachverfolgt werden können
+            self.roots = self._get_roots()
+            self.snapshots = {}
+            for topic_prefix, root in self.roots.items():
+                self._store_snapshot(topic_prefix, root, (), is_tracked(type(root)))
         except Exception as e:
             log.exception(e)
+        finally:
+            self.tracker = start_tracking()
+
+    def _store_snapshot(self, topic_prefix: str, data_inst, path: Tuple[str, ...], tracked: bool) -> None:
+        topics, others = _field_plan(type(data_inst))
+        for name, topic in topics.items():
+            try:
+                value = getattr(data_inst, name)
+                if tracked is False or not isinstance(value, SCALAR_TYPES):
+                    self.snapshots[f"{topic_prefix}{topic}"] = (topic_prefix, path + (name,), _comparable(value))
+            except Exception as e:
+                log.exception(e)
+        for name in others:
+            value = getattr(data_inst, name)
+            if is_dataclass(value):
+                self._store_snapshot(topic_prefix, value, path + (name,), tracked and is_tracked(type(value)))
 
     def pub_changed_values(self):
         try:
+            stop_tracking()
             # veröffentlichen der geänderten Werte
-            self._update_value("openWB/set/bat/", self.prev_data.bat_all_data.data, data.data.bat_all_data.data)
-            self._update_value("openWB/set/chargepoint/", self.prev_data.cp_all_data.data.get,
-                               data.data.cp_all_data.data.get)
-            self._update_value("openWB/set/counter/", self.prev_data.counter_all_data.data,
-                               data.data.counter_all_data.data)
-            self._update_value("openWB/set/optional/", self.prev_data.optional_data.data,
-                               data.data.optional_data.data)
-            for key, value in data.data.cp_data.items():
-                self._update_value(f"openWB/set/chargepoint/{value.num}/", self.prev_data.cp_data[key].data, value.data)
-            for key, value in data.data.bat_data.items():
-                self._update_value(f"openWB/set/bat/{value.num}/", self.prev_data.bat_data[key].data, value.data)
-            for key, value in data.data.counter_data.items():
-                self._update_value(f"openWB/set/counter/{value.num}/",
-                                   self.prev_data.counter_data[key].data, value.data)
-            # chargepoint, ev template, autolock, time and scheduled charging plans mutable_by_algorithm immer false
-        except Exception as e:
-            log.exception(e)
-
-    def _update_value(self, topic_prefix, data_inst_previous, data_inst):
-        try:
-            for f in fields(data_inst):
+            roots = self._get_roots()
+            for topic, (topic_prefix, path, previous_value) in self.snapshots.items():
                 try:
-                    changed = False
-                    value = getattr(data_inst, f.name)
-                    if isinstance(value, Enum):
-                        value = value.value
-                    previous_value = getattr(data_inst_previous, f.name)
-                    if isinstance(previous_value, Enum):
-                        previous_value = previous_value.value
-                    if hasattr(f, "metadata"):
-                        if f.metadata.get("topic"):
-                            if isinstance(value, (str, int, float, Dict, List, Tuple)):
-                                if previous_value != value:
-                                    changed = True
-                            elif isinstance(value, (bool, type(None))):
-                                if previous_value is not value:
-                                    changed = True
-                            else:
-                                dict_prev = dict(asdict(previous_value))
-                                dict_current = dict(asdict(value))
-                                if dict_prev != dict_current:
-                                    changed = True
-                                    value = asdict(value)
-                                    previous_value = asdict(previous_value)
-
-                            if changed:
-                                topic = f"{topic_prefix}{f.metadata['topic']}"
-                                Pub().pub(topic, value)
-                                log.debug(f"Topic {topic}, Payload {value}, vorherige Payload: {previous_value}")
-                            continue
-                    if is_dataclass(value):
-                        self._update_value(topic_prefix, previous_value, value)
+                    if topic_prefix in roots:
+                        value = functools.reduce(getattr, path, roots[topic_prefix])
+                        self._pub_if_changed(topic, previous_value, _comparable(value))
                 except Exception as e:
                     log.exception(e)
+            for topic_prefix, root in roots.items():
+                previous_root = self.roots.get(topic_prefix)
+                if previous_root is root:
+                    self._update_tracked_value(topic_prefix, root)
+                elif previous_root is not None:
+                    self._update_value(topic_prefix, previous_root, root)
+            # chargepoint, ev template, autolock, time and scheduled charging plans mutable_by_algorithm immer false
         except Exception as e:
             log.exception(e)
+        finally:
+            self.tracker = ChangeTracker()
+            self.roots = {}
+            self.snapshots = {}
+
+    def _update_tracked_value(self, topic_prefix: str, data_inst) -> None:
+        """ vergleicht nur die Felder, die während des Zyklus zugewiesen wurden.
+        """
+        if is_tracked(type(data_inst)) is False:
+            # Werte wurden vollständig in den Snapshots gespeichert
+            return
+        topics, others = _field_plan(type(data_inst))
+        changes = self.tracker.changes(data_inst)
+        for name, previous_value in changes.items():
+            try:
+                topic = topics.get(name)
+                if topic is not None and f"{topic_prefix}{topic}" not in self.snapshots:
+                    self._pub_if_changed(f"{topic_prefix}{topic}", _comparable(previous_value),
+                                         _comparable(getattr(data_inst, name)))
+            except Exception as e:
+                log.exception(e)
+        for name in others:
+            value = getattr(data_inst, name)
+            if is_dataclass(value):
+                previous_value = changes.get(name, value)
+                if previous_value is value:
+                    self._update_tracked_value(topic_prefix, value)
+                else:
+                    self._update_value(topic_prefix, previous_value, value)
+
+    def _update_value(self, topic_prefix: str, data_inst_previous, data_inst) -> None:
+        """ vergleicht alle Felder einer Instanz, die während des Zyklus durch eine neue ersetzt wurde, mit den
+        ursprünglichen Werten der vorherigen Instanz.
+        """
+        if is_dataclass(data_inst_previous) is False:
+            return
+        topics, others = _field_plan(type(data_inst))
+        for name, topic in topics.items():
+            try:
+                if f"{topic_prefix}{topic}" not in self.snapshots:
+                    self._pub_if_changed(f"{topic_prefix}{topic}",
+                                         _comparable(self.tracker.original(data_inst_previous, name)),
+                                         _comparable(getattr(data_inst, name)))
+            except Exception as e:
+                log.exception(e)
+        for name in others:
+            value = getattr(data_inst, name)
+            if is_dataclass(value):
+                self._update_value(topic_prefix, self.tracker.original(data_inst_previous, name), value)
+
+    def _pub_if_changed(self, topic: str, previous_value, value) -> None:
+        if previous_value != value:
+            Pub().pub(topic, value)
+            log.debug(f"Topic {topic}, Payload {value}, vorherige Payload: {previous_value}")
 
 
 class ChangedValuesContext:
-    def __init__(self, event_module_update_completed: Event):
-        self.changed_values_handler = ChangedValuesHandler(event_module_update_completed)
+    def __init__(self):
+        self.changed_values_handler = ChangedValuesHandler()
 
     def __enter__(self):
         self.changed_values_handler.store_initial_values()
@@ -5,8 +5,11 @@ from unittest.mock import Mock
 
 import pytest
 
+from control import data
+from control.chargepoint.chargepoint import Chargepoint
+from control.chargepoint.control_parameter import ControlParameter
 from dataclass_utils.factories import currents_list_factory
-from helpermodules.changed_values_handler import ChangedValuesHandler
+from helpermodules.changed_values_handler import ChangedValuesContext, ChangedValuesHandler
 
 NONE_TYPE = type(None)
 
@@ -105,12 +108,53 @@ cases = [
 @pytest.mark.parametrize("params", cases, ids=[c.name for c in cases])
 def test_update_value(params: Params, mock_pub: Mock, monkeypatch):
     # setup
-    handler = ChangedValuesHandler(Mock())
+    handler = ChangedValuesHandler()
 
     # execution
     handler._update_value("openWB/", SampleData(), params.sample_data)
 
     # evaluation
-    assert len(mock_pub.method_calls) - 1 == params.expected_calls
+    assert len(mock_pub.method_calls) == params.expected_calls
     if params.expected_calls > 0:
-        assert mock_pub.method_calls[1].args == params.expected_pub_call
+        assert mock_pub.method_calls[0].args == params.expected_pub_call
+
+
+@pytest.fixture
+def data_cp() -> Chargepoint:
+    data.data_init(Mock())
+    data.data.cp_data = {"cp3": Chargepoint(3, None)}
+    data.data.cp_data["cp3"].data.config.ev = 0
+    return data.data.cp_data["cp3"]
+
+
+def test_changed_values_context_assigned_values(data_cp: Chargepoint, mock_pub: Mock):
+    # setup
+    mock_pub.reset_mock()
+
+    # execution
+    with ChangedValuesContext():
+        data_cp.data.set.current = 16
+        data_cp.data.set.current_prev = 0
+        data.data.counter_all_data.data.get.hierarchy.append({"id": 0, "type": "counter", "children": []})
+        data.data.bat_all_data.data.set.regulate_up = True
+
+    # evaluation
+    assert [c.args for c in mock_pub.method_calls if c.args] == [
+        ("openWB/set/counter/get/hierarchy", [{"id": 0, "type": "counter", "children": []}]),
+        ("openWB/set/bat/set/regulate_up", True),
+        ("openWB/set/chargepoint/3/set/current", 16)]
+
+
+def test_changed_values_context_replaced_instance(data_cp: Chargepoint, mock_pub: Mock):
+    # setup
+    data_cp.data.control_parameter.min_current = 8
+    mock_pub.reset_mock()
+
+    # execution
+    with ChangedValuesContext():
+        data_cp.data.control_parameter.phases = 3
+        data_cp.data.control_parameter = ControlParameter(min_current=8, phases=1)
+
+    # evaluation
+    assert [c.args for c in mock_pub.method_calls if c.args] == [
+        ("openWB/set/chargepoint/3/control_parameter/phases", 1)]
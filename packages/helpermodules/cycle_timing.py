@@ -0,0 +1,92 @@
+""" Laufzeitmessung der Abschnitte des Regelzyklus und der Abfragen der Geräte/Ladepunkte.
+
+Die Dauer wird je Abschnitt bzw. Abfrage für die letzten WINDOW Zyklen vorgehalten. Median, 90%-Perzentil und
+Maximum werden in ms im Topic openWB/system/cycle_timing veröffentlicht. Abschnitte und Abfragen, die seit WINDOW Zyklen
+nicht mehr gemessen wurden (z.B. gelöschte Geräte), werden verworfen.
+"""
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock
+from typing import Deque, Dict, Optional
+
+from helpermodules.pub import Pub
+
+log = logging.getLogger(__name__)
+
+WINDOW = 60
+# Anteil am Regelintervall, ab dem für einen Abschnitt oder eine Abfrage gewarnt wird
+WARNING_SHARE = 0.5
+
+
+class CycleTimer:
+    def __init__(self, window: int = WINDOW) -> None:
+        self.window = window
+        self.lock = Lock()
+        self.phases: Dict[str, Deque[float]] = {}
+        self.tasks: Dict[str, Deque[float]] = {}
+        self.cycle = 0
+        # Name -> Zyklus der letzten Messung
+        self.phases_seen: Dict[str, int] = {}
+        self.tasks_seen: Dict[str, int] = {}
+
+    @contextmanager
+    def measure(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(self.phases, self.phases_seen, phase, time.perf_counter() - start)
+
+    def record_task(self, name: str, duration: float) -> None:
+        self._record(self.tasks, self.tasks_seen, name, duration)
+
+    def _record(self, durations: Dict[str, Deque[float]], seen: Dict[str, int], name: str, duration: float) -> None:
+        with self.lock:
+            if name not in durations:
+                durations[name] = deque(maxlen=self.window)
+            durations[name].append(duration)
+            seen[name] = self.cycle
+
+    def statistics(self) -> Dict:
+        with self.lock:
+            return {"phases": {name: _percentiles(values) for name, values in self.phases.items()},
+                    "tasks": {name: _percentiles(values) for name, values in self.tasks.items()}}
+
+    def check_control_interval(self, control_interval: float) -> None:
+        """ warnt, wenn ein Abschnitt oder eine Abfrage im letzten Zyklus mehr als WARNING_SHARE des Regelintervalls
+        benötigt hat.
+        """
+        with self.lock:
+            latest = [(name, self.phases[name][-1]) for name, cycle in self.phases_seen.items() if cycle == self.cycle]
+            latest.extend([(name, self.tasks[name][-1])
+                           for name, cycle in self.tasks_seen.items() if cycle == self.cycle])
+        for name, duration in latest:
+            if duration > control_interval * WARNING_SHARE:
+                log.warning(f"{name} benötigte {duration:.2f}s und damit mehr als {WARNING_SHARE*100:.0f}% des "
+                            f"Regelintervalls von {control_interval}s.")
+
+    def publish(self, additional: Optional[Dict] = None) -> None:
+        Pub().pub("openWB/set/system/cycle_timing", self.statistics() | (additional or {}))
+
+    def end_cycle(self) -> None:
+        """ schließt den Zyklus ab und verwirft Abschnitte und Abfragen, die seit WINDOW Zyklen nicht gemessen wurden.
+        """
+        with self.lock:
+            for durations, seen in ((self.phases, self.phases_seen), (self.tasks, self.tasks_seen)):
+                for name in [name for name, cycle in seen.items() if self.cycle - cycle >= self.window]:
+                    durations.pop(name)
+                    seen.pop(name)
+            self.cycle += 1
+
+
+def _percentiles(values: Deque[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {"p50": round(ordered[len(ordered)//2] * 1000, 1),
+            "p90": round(ordered[min(int(len(ordered) * 0.9), len(ordered) - 1)] * 1000, 1),
+            "max": round(ordered[-1] * 1000, 1),
+            "count": len(ordered)}
+
+
+cycle_timer = CycleTimer()
@@ -0,0 +1,54 @@
+from unittest.mock import Mock
+
+from helpermodules import cycle_timing
+from helpermodules.cycle_timing import CycleTimer
+
+
+def test_statistics_over_window():
+    # setup
+    timer = CycleTimer(window=10)
+
+    # execution
+    for duration in range(1, 21):
+        timer.record_task("device1", duration / 1000)
+
+    # evaluation
+    assert timer.statistics()["tasks"]["device1"] == {"p50": 16.0, "p90": 20.0, "max": 20.0, "count": 10}
+
+
+def test_check_control_interval_warns_for_slow_task(monkeypatch):
+    # setup
+    timer = CycleTimer()
+    mock_log = Mock()
+    monkeypatch.setattr(cycle_timing, "log", mock_log)
+    with timer.measure("calc_current"):
+        pass
+    timer.record_task("device1", 6)
+
+    # execution
+    timer.check_control_interval(10)
+
+    # evaluation
+    assert mock_log.warning.call_count == 1
+    assert "device1" in mock_log.warning.call_args.args[0]
+
+
+def test_stale_task_not_checked_and_pruned_after_window(monkeypatch):
+    # setup
+    timer = CycleTimer(window=3)
+    mock_log = Mock()
+    monkeypatch.setattr(cycle_timing, "log", mock_log)
+    timer.record_task("device1", 6)
+    timer.end_cycle()
+
+    # execution
+    statistics = []
+    for _ in range(4):
+        timer.record_task("device2", 0.1)
+        timer.check_control_interval(10)
+        statistics.append(set(timer.statistics()["tasks"]))
+        timer.end_cycle()
+
+    # evaluation
+    assert mock_log.warning.call_count == 0
+    assert statistics == [{"device1", "device2"}]*3 + [{"device2"}]
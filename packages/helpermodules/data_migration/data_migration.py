@@ -8,7 +8,6 @@ from dataclasses import asdict
 import datetime
 from functools import reduce
 from itertools import groupby
-import json
 import logging
 from operator import itemgetter
 import os
@@ -20,12 +19,14 @@ from threading import Thread
 from typing import Callable, Dict, List, Optional, Union
 
 from control import data
+from control.chargelog import chargelog_storage
 from control.ev import ev
 from dataclass_utils import dataclass_from_dict
 import dataclass_utils
 from helpermodules.broker import BrokerClient
 from helpermodules.data_migration.id_mapping import MapId
 from helpermodules.hardware_configuration import update_hardware_configuration
+from helpermodules.measurement_logging.log_storage import read_log, write_log
 from helpermodules.measurement_logging.process_log import get_totals, string_to_float, string_to_int
 from helpermodules.measurement_logging.write_log import LegacySmartHomeLogData, get_names
 from helpermodules.timecheck import convert_timedelta_to_time_string, get_difference
@@ -153,15 +154,13 @@ class MigrateData:
         def convert(old_file_name: str) -> None:
             try:
                 new_entries = self._charge_log_file_entries(old_file_name)
-                filepath = f"./data/charge_log/{old_file_name[:-4]}.json"
                 content = []
                 try:
-                    with open(filepath, "r") as jsonFile:
-                        content = json.load(jsonFile)
+                    content = chargelog_storage.read_entries(old_file_name[:-4])
                 except FileNotFoundError:
                     pass
                 new_entries.extend(content)
-                write_and_check(filepath, new_entries)
+                chargelog_storage.write_entries(new_entries, old_file_name[:-4])
             except Exception:
                 log.exception(f"Fehler beim Konvertieren des Lade-Logs vom {old_file_name}")
 
@@ -279,21 +278,18 @@ class MigrateData:
 
                 pathlib.Path(f'./data/{folder}_log').mkdir(mode=0o755,
                                                            parents=True, exist_ok=True)
-                filepath = f"./data/{folder}_log/"+old_file_name[:-4]+".json"
+                log_folder = pathlib.Path(f'./data/{folder}_log')
                 try:
-                    with open(filepath, "r") as jsonFile:
-                        content = json.load(jsonFile)
+                    content = read_log(log_folder, old_file_name[:-4])
                 except FileNotFoundError:
-                    write_and_check(filepath, {"entries": [], "totals": {}})
-                    with open(filepath, "r") as jsonFile:
-                        content = json.load(jsonFile)
+                    content = {"entries": [], "totals": {}}
                 entries = content["entries"]
                 merger = self.merge_list_of_records('date')
                 merged_entries = merger(new_entries + entries)
                 content["totals"] = get_totals(merged_entries)
                 content["entries"] = merged_entries
                 content["names"] = get_names(content["totals"], LegacySmartHomeLogData().sh_names)
-                write_and_check(filepath, content)
+                write_log(log_folder, old_file_name[:-4], content)
             except Exception:
                 log.exception(f"Fehler beim Konvertieren des Logs vom {old_file_name}")
 
@@ -1,13 +1,13 @@
+from collections import deque
 from dataclasses import dataclass, field
 import json
-from pathlib import Path
 import time
 import datetime
 import logging
+from typing import Deque, Dict, List, Tuple
 
 from control import data
 from helpermodules.pub import Pub
-from helpermodules.utils.run_command import run_command
 from modules.common.fault_state import FaultStateLevel
 
 log = logging.getLogger(__name__)
@@ -27,12 +27,68 @@ class GraphData:
     config: Config = field(default_factory=config_factory)
 
 
+class LiveValues:
+    """ Ringpuffer der Live-Werte im Hauptprozess, ersetzt ramdisk/graph_live.json und das 1.9er graphing.sh.
+
+    Die retained Topics entsprechen denen von graphing.sh: alllivevaluesJson enthält die letzten CHUNK_SIZE Werte,
+    alllivevaluesJson1 bis alllivevaluesJson<CHUNK_COUNT> die ältesten Werte in Abschnitten zu CHUNK_SIZE Werten,
+    zeilenweise als json. Die Abschnitte richten sich nach der fortlaufenden Nummer der Werte, sodass sich je Zyklus
+    nur der älteste (gekürzte) und der neueste Abschnitt ändern. Nur geänderte Abschnitte werden veröffentlicht.
+    """
+    CHUNK_SIZE = 50
+    CHUNK_COUNT = 16
+    TOPIC = "openWB/graph/alllivevaluesJson"
+
+    def __init__(self, size: int) -> None:
+        # (fortlaufende Nummer, json-Zeile)
+        self.values: Deque[Tuple[int, str]] = deque(maxlen=size)
+        self.sequence = 0
+        self.published: Dict[str, str] = {}
+
+    def resize(self, size: int) -> None:
+        if size != self.values.maxlen:
+            self.values = deque(self.values, maxlen=size)
+
+    def append(self, data_line: Dict) -> None:
+        self.values.append((self.sequence, json.dumps(data_line, separators=(',', ':'))))
+        self.sequence += 1
+
+    def _snapshot(self) -> Dict[str, str]:
+        chunks: List[List[str]] = []
+        chunk_number = None
+        for sequence, line in self.values:
+            if sequence // self.CHUNK_SIZE != chunk_number:
+                if len(chunks) == self.CHUNK_COUNT:
+                    break
+                chunk_number = sequence // self.CHUNK_SIZE
+                chunks.append([])
+            chunks[-1].append(line)
+        latest = [line for _, line in list(self.values)[-self.CHUNK_SIZE:]]
+        snapshot = {self.TOPIC: "\n".join(latest)}
+        for i in range(self.CHUNK_COUNT):
+            snapshot[f"{self.TOPIC}{i+1}"] = "\n".join(chunks[i]) if i < len(chunks) else "-"
+        return snapshot
+
+    def changed_topics(self) -> Dict[str, str]:
+        """ gibt die Topics zurück, deren Inhalt sich seit dem letzten Aufruf geändert hat.
+        """
+        changed = {topic: payload for topic, payload in self._snapshot().items()
+                   if self.published.get(topic) != payload}
+        self.published.update(changed)
+        return changed
+
+
+# Der Ringpuffer gehört dem Hauptprozess und nicht dem Graph-Objekt, da data.data.graph_data bei jeder Änderung der
+# Graph-Konfiguration durch eine neue Kopie aus SubData ersetzt wird.
+live_values = LiveValues(Config().duration*6)
+
+
 class Graph:
     def __init__(self) -> None:
         self.data = GraphData()
 
     def pub_graph_data(self):
-        """ schreibt die Graph-Daten, sodass sie zu dem 1.9er graphing.sh passen.
+        """ veröffentlicht den neuesten Wert und die geänderten Abschnitte des Live-Graphen.
         """
         def _convert_to_kW(value): return round(value/1000, 3)
 
@@ -62,9 +118,10 @@ class Graph:
 
             Pub().pub("openWB/set/graph/lastlivevaluesJson", data_line)
             Pub().pub("openWB/set/system/lastlivevaluesJson", data_line)
-            with open(str(Path(__file__).resolve().parents[2] / "ramdisk"/"graph_live.json"), "a") as f:
-                f.write(f"{json.dumps(data_line, separators=(',', ':'))}\n")
-            run_command([str(Path(__file__).resolve().parents[2] / "runs"/"graphing.sh"),
-                         str(self.data.config.duration*6)])
+            live_values.resize(self.data.config.duration*6)
+            live_values.append(data_line)
+            # Die Abschnitte werden als Text und nicht als json veröffentlicht.
+            for topic, payload in live_values.changed_topics().items():
+                Pub().pub(topic, payload, no_json=True)
         except Exception:
             log.exception("Fehler im Graph-Modul")
@@ -0,0 +1,97 @@
+from threading import Event
+from unittest.mock import Mock
+
+from control import data
+from control.counter import Counter
+from control.counter_all import CounterAll
+from helpermodules import graph, pub
+from helpermodules.graph import Graph, LiveValues
+from helpermodules.subdata import SubData
+
+TOPIC = LiveValues.TOPIC
+
+
+def test_live_values_chunks():
+    # setup
+    live_values = LiveValues(120)
+
+    # execution
+    for i in range(130):
+        live_values.append({"timestamp": i})
+    changed = live_values.changed_topics()
+
+    # evaluation
+    assert changed[TOPIC].split("\n") == [f'{{"timestamp":{i}}}' for i in range(80, 130)]
+    assert changed[f"{TOPIC}1"].split("\n") == [f'{{"timestamp":{i}}}' for i in range(10, 50)]
+    assert changed[f"{TOPIC}2"].split("\n") == [f'{{"timestamp":{i}}}' for i in range(50, 100)]
+    assert changed[f"{TOPIC}3"].split("\n") == [f'{{"timestamp":{i}}}' for i in range(100, 130)]
+    assert all(changed[f"{TOPIC}{i}"] == "-" for i in range(4, LiveValues.CHUNK_COUNT + 1))
+
+
+def test_live_values_publish_only_changed_chunks():
+    # setup
+    live_values = LiveValues(120)
+    for i in range(130):
+        live_values.append({"timestamp": i})
+    live_values.changed_topics()
+
+    # execution
+    live_values.append({"timestamp": 130})
+    changed = live_values.changed_topics()
+
+    # evaluation
+    assert set(changed) == {TOPIC, f"{TOPIC}1", f"{TOPIC}3"}
+    assert changed[f"{TOPIC}1"].startswith('{"timestamp":11}\n')
+    assert changed[f"{TOPIC}3"].endswith('{"timestamp":130}')
+
+
+def test_live_values_resize():
+    # setup
+    live_values = LiveValues(120)
+    for i in range(130):
+        live_values.append({"timestamp": i})
+
+    # execution
+    live_values.resize(30)
+
+    # evaluation
+    assert [sequence for sequence, _ in live_values.values] == list(range(100, 130))
+
+
+def test_live_values_survive_graph_config_change(monkeypatch):
+    # setup
+    event = Event()
+    event.set()
+    data.data_init(event)
+    monkeypatch.setattr(graph, "live_values", LiveValues(Graph().data.config.duration*6))
+    mock_pub = Mock()
+    monkeypatch.setattr(pub.Pub, "instance", mock_pub)
+    monkeypatch.setattr(SubData, "graph_data", Graph())
+    monkeypatch.setattr(SubData, "generations", {})
+    # andere Tests hinterlassen Mocks in SubData
+    monkeypatch.setattr(SubData, "cp_data", {})
+    monkeypatch.setattr(SubData, "ev_data", {})
+
+    def copy_data():
+        data.data.copy_data()
+        data.data.counter_all_data = CounterAll()
+        data.data.counter_all_data.data.get.hierarchy = [{"id": 0, "type": "counter", "children": []}]
+        data.data.counter_data = {"counter0": Counter(0)}
+    copy_data()
+    for _ in range(5):
+        data.data.graph_data.pub_graph_data()
+    graph_before = data.data.graph_data
+
+    # execution
+    SubData.graph_data.data.config.duration = 120
+    SubData.bump_generation("graph_data", "graph")
+    copy_data()
+    data.data.graph_data.pub_graph_data()
+
+    # evaluation
+    assert data.data.graph_data is not graph_before
+    assert data.data.graph_data.data.config.duration == 120
+    assert [sequence for sequence, _ in graph.live_values.values] == list(range(6))
+    assert graph.live_values.values.maxlen == 720
+    latest = [call.args[1] for call in mock_pub.pub.call_args_list if call.args[0] == LiveValues.TOPIC][-1]
+    assert len(latest.split("\n")) == 6
@@ -1,40 +1,58 @@
+from collections import deque
+import atexit
 import functools
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, RotatingFileHandler
 from pathlib import Path
+import queue
 import sys
 import threading
+import typing
 import typing_extensions
 import re
-import io
 import os
-import shutil
 
 FORMAT_STR_DETAILED = '%(asctime)s - {%(name)s:%(lineno)s} - {%(levelname)s:%(threadName)s} - %(message)s'
 FORMAT_STR_SHORT = '%(asctime)s - %(message)s'
 RAMDISK_PATH = str(Path(__file__).resolve().parents[2]) + '/ramdisk/'
 PERSISTENT_LOG_PATH = str(Path(__file__).resolve().parents[2]) + '/data/log/'
 NUMBER_OF_LOGFILES = 3
+# Anzahl Log-Einträge, die auf das Schreiben warten können. Ist die Warteschlange voll, werden neue Einträge
+# verworfen (ASYNC_LOG_BLOCK = False) oder der loggende Thread wartet (ASYNC_LOG_BLOCK = True).
+ASYNC_LOG_QUEUE_SIZE = 10000
+ASYNC_LOG_BLOCK = False
 
 KNOWN_SENSITIVE_FIELDS = [
     'password', 'secret', 'token', 'apikey', 'access_token',
     'refresh_token', 'accesstoken', 'refreshtoken'
 ]
+# Muster mit Platzhalter {fields} für die Alternation aller zu schwärzenden Felder. Alle Muster werden zu einem
+# regulären Ausdruck zusammengefasst, sodass jede Nachricht nur einmal durchsucht wird.
 REDACTION_PATTERNS = [
-    (r'({field})[=:]([^\s&]+)', r'\1=***REDACTED***'),  # field=value, i.e. for URL query parameters
-    (r'"{field}":\s*"(.*?)"', r'"{field}": "***REDACTED***"'),  # "field": "value", JSON formatted data
-    (r'\'{field}\':\s*\'(.*?)\'', r"'{field}': '***REDACTED***'")  # 'field': 'value', JSON formatted data
+    r'(?P<query>{fields})[=:][^\s&]+',  # field=value, i.e. for URL query parameters
+    r'"(?P<json>{fields})":\s*".*?"',  # "field": "value", JSON formatted data
+    r"'(?P<dict>{fields})':\s*'.*?'"  # 'field': 'value', JSON formatted data
 ]
 
 
+@functools.lru_cache(maxsize=64)
+def _compile_redaction(fields: typing.Tuple[str, ...]) -> typing.Tuple[typing.Pattern, typing.Dict[str, str]]:
+    alternation = "|".join(re.escape(field) for field in fields)
+    pattern = re.compile("|".join(p.replace("{fields}", alternation) for p in REDACTION_PATTERNS), re.IGNORECASE)
+    names: typing.Dict[str, str] = {}
+    for field in fields:
+        names.setdefault(field.casefold(), field)
+    return pattern, names
+
+
 def redact_sensitive_info(message: str, additional_fields: list = None) -> str:
     """
     Redacts sensitive information from the given message.
 
     This function replaces occurrences of known sensitive fields and their values
     in the message with a redaction placeholder (***REDACTED***). The fields to be
-    redacted are defined in the KNOWN_SENSITIVE_FIELDS list. The function uses
-    predefined patterns to identify and replace the sensitive information.
+    redacted are defined in the KNOWN_SENSITIVE_FIELDS list. Messages that do not
+    contain any of the fields are returned without applying the patterns.
 
     Args:
         message (str): The log message to be redacted.
@@ -42,13 +60,20 @@ def redact_sensitive_info(message: str, additional_fields: list = None) -> str:
     Returns:
         str: The redacted log message.
     """
-    fields_to_redact = KNOWN_SENSITIVE_FIELDS + (additional_fields or [])
-    for field in fields_to_redact:
-        for pattern, replacement in REDACTION_PATTERNS:
-            pattern = pattern.replace('{field}', field)
-            replacement = replacement.replace('{field}', field)
-            message = re.sub(pattern, replacement, message, flags=re.IGNORECASE)
-    return message
+    fields = tuple(KNOWN_SENSITIVE_FIELDS + (additional_fields or []))
+    folded = message.casefold()
+    if not any(field.casefold() in folded for field in fields):
+        return message
+    pattern, names = _compile_redaction(fields)
+
+    def replace(match: typing.Match) -> str:
+        if match.group("query") is not None:
+            return f"{match.group('query')}=***REDACTED***"
+        elif match.group("json") is not None:
+            return f'"{names[match.group("json").casefold()]}": "***REDACTED***"'
+        else:
+            return f"'{names[match.group('dict').casefold()]}': '***REDACTED***'"
+    return pattern.sub(replace, message)
 
 
 class RedactingFilter(logging.Filter):
@@ -89,8 +114,7 @@ class RedactingFilter(logging.Filter):
         message = record.getMessage()  # required for lazy formatting like urllib3
 
         additional_fields = getattr(record, 'redact_fields', '')
-        fields_to_redact = KNOWN_SENSITIVE_FIELDS + [
-            field.strip() for field in additional_fields.split(',') if field.strip()]
+        fields_to_redact = [field.strip() for field in additional_fields.split(',') if field.strip()]
         record.msg = redact_sensitive_info(message, fields_to_redact)
         record.args = ()
         return True
@@ -109,50 +133,41 @@ def filter_pos(name: str, record) -> bool:
 
 
 class InMemoryLogHandler(logging.Handler):
+    """ Ringpuffer der formatierten Log-Zeilen eines Regelzyklus. Die Größe wird je Zeile mitgezählt, überschreitet
+    sie max_size_mb, werden die ältesten Zeilen verworfen. Die Logs der vorherigen Zyklen werden für das
+    zusammengefasste "latest"-Log im Speicher gehalten.
+    """
+
     def __init__(self, base_handler=None, max_size_mb=50):
         super().__init__()
         self.base_handler = base_handler
-        self.log_stream = io.StringIO()
+        self.lines: typing.Deque[str] = deque()
+        self.size = 0
         self.has_warning_or_error = False
         self.max_size_bytes = max_size_mb * 1024 * 1024  # Convert MB to bytes
-        self.line_count = 0
+        self.previous_logs: typing.Deque[str] = deque(maxlen=NUMBER_OF_LOGFILES-1)
 
     def emit(self, record):
         if self.base_handler is None or self.base_handler.filter(record):
-            msg = self.format(record)
-            self.log_stream.write(msg + '\n')
-            self.line_count += 1
-
-            # Check size every 100 lines to avoid performance overhead
-            if self.line_count % 100 == 0:
-                current_size = len(self.log_stream.getvalue().encode('utf-8'))
-                if current_size > self.max_size_bytes:
-                    self._truncate_logs()
+            msg = self.format(record) + '\n'
+            self.lines.append(msg)
+            # Anzahl Zeichen statt Bytes, um die Zeile nicht zu kodieren
+            self.size += len(msg)
+            while self.size > self.max_size_bytes and len(self.lines) > 1:
+                self.size -= len(self.lines.popleft())
 
             if record.levelno >= logging.WARNING:
                 self.has_warning_or_error = True
 
-    def _truncate_logs(self):
-        """Keep only the last 25% of logs when size limit is exceeded"""
-        current_logs = self.log_stream.getvalue()
-        lines = current_logs.split('\n')
-
-        # Keep only the last 25% of lines
-        keep_count = max(100, len(lines) // 4)  # At least 100 lines
-        kept_lines = lines[-keep_count:]
-
-        # Reset the stream with truncated content
-        self.log_stream = io.StringIO()
-        self.log_stream.write('\n'.join(kept_lines))
-        self.line_count = len(kept_lines)
-
-    def get_logs(self):
-        return self.log_stream.getvalue()
+    def get_logs(self) -> str:
+        with self.lock:
+            return ''.join(self.lines)
 
     def clear(self):
-        self.log_stream = io.StringIO()
-        self.has_warning_or_error = False
-        self.line_count = 0
+        with self.lock:
+            self.lines.clear()
+            self.size = 0
+            self.has_warning_or_error = False
 
 
 def clear_in_memory_log_handler(logger_name: str = None) -> None:
@@ -170,66 +185,120 @@ def clear_in_memory_log_handler(logger_name: str = None) -> None:
 def write_logs_to_file(logger_name: str = None) -> None:
     global in_memory_log_handlers
 
-    def rotate_logs(base_path: str, name: str):
-        # Rotate the log files
-        for i in range(NUMBER_OF_LOGFILES-1, 0, -1):
-            src = os.path.join(base_path, f'{name}.previous{i}.log')
-            dst = os.path.join(base_path, f'{name}.previous{i+1}.log')
-            if os.path.exists(src):
-                shutil.move(src, dst)
-        # Move the current log to previous1
-        current_log = os.path.join(base_path, f'{name}.current.log')
-        if os.path.exists(current_log):
-            shutil.move(current_log, os.path.join(base_path, f'{name}.previous1.log'))
-
-    def combine_logs(base_path: str, name: str):
-        latest_log_path = os.path.join(base_path, f'{name}.latest.log')
-        with open(latest_log_path, 'w') as latest_log:
-            for i in range(NUMBER_OF_LOGFILES-1, -1, -1):
-                log_file = os.path.join(
-                    base_path, f'{name}.previous{i}.log') if i > 0 else os.path.join(base_path, f'{name}.current.log')
-                if os.path.exists(log_file):
-                    with open(log_file, 'r') as f:
-                        latest_log.write(f.read())
+    def write_logs(name: str, handler: InMemoryLogHandler):
+        logs = handler.get_logs()
+        if logs:
+            with open(os.path.join(RAMDISK_PATH, f'{name}.current.log'), 'w') as f:
+                f.write(logs)
+            # Logs der vorherigen Durchläufe aus dem Speicher, nicht aus den Dateien
+            with open(os.path.join(RAMDISK_PATH, f'{name}.latest.log'), 'w') as f:
+                f.writelines(handler.previous_logs)
+                f.write(logs)
+            handler.previous_logs.append(logs)
+
+            # If any warning or error messages were logged, create a -warning copy
+            if handler.has_warning_or_error:
+                with open(os.path.join(RAMDISK_PATH, f'{name}.latest-warning.log'), 'w') as f:
+                    f.write(logs)
 
     if logger_name is None:
         # Write logs for all in-memory log handlers
         for name, handler in in_memory_log_handlers.items():
-            logs = handler.get_logs()
-            if logs:
-                rotate_logs(RAMDISK_PATH, name)
-                with open(os.path.join(RAMDISK_PATH, f'{name}.current.log'), 'w') as f:
-                    f.write(logs)
-                combine_logs(RAMDISK_PATH, name)
-
-                # If any warning or error messages were logged, create a -warning copy
-                if handler.has_warning_or_error:
-                    with open(os.path.join(RAMDISK_PATH, f'{name}.latest-warning.log'), 'w') as f:
-                        f.write(logs)
-
+            write_logs(name, handler)
     else:
         # Write logs for specified in-memory log handler
         if logger_name in in_memory_log_handlers:
-            handler = in_memory_log_handlers[logger_name]
-            logs = handler.get_logs()
-            if logs:
-                rotate_logs(RAMDISK_PATH, logger_name)
-                with open(os.path.join(RAMDISK_PATH, f'{logger_name}.current.log'), 'w') as f:
-                    f.write(logs)
-                combine_logs(RAMDISK_PATH, logger_name)
+            write_logs(logger_name, in_memory_log_handlers[logger_name])
 
-                # If any warning or error messages were logged, create a -warning copy
-                if handler.has_warning_or_error:
-                    with open(os.path.join(RAMDISK_PATH, f'{logger_name}.latest-warning.log'), 'w') as f:
-                        f.write(logs)
+
+class AsyncLogWriter:
+    """ Schreibt die Log-Einträge der Datei-Handler in einem eigenen Thread, damit langsame Schreibzugriffe und
+    Rotationen auf der SD-Karte nicht die Regelung, die Geräte-Threads oder die MQTT-Callbacks aufhalten.
+    """
+
+    def __init__(self, max_size: int = ASYNC_LOG_QUEUE_SIZE, block: bool = ASYNC_LOG_BLOCK) -> None:
+        self.queue: queue.Queue = queue.Queue(max_size)
+        self.block = block
+        self.dropped = 0
+        self.reported_dropped = 0
+        self.lock = threading.Lock()
+        self.thread: typing.Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self._run, name="log writer", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """ schreibt die verbliebenen Einträge und beendet den Thread.
+        """
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put((None, None))
+            self.thread.join()
+
+    def put(self, handler: logging.Handler, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put((handler, record), block=self.block)
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            handler, record = self.queue.get()
+            if handler is None:
+                break
+            self._write(handler, record)
+            if self.dropped != self.reported_dropped:
+                self._report_dropped(handler)
+
+    def _write(self, handler: logging.Handler, record: logging.LogRecord) -> None:
+        # Die Filter wurden bereits im loggenden Thread angewendet.
+        handler.acquire()
+        try:
+            handler.emit(record)
+        finally:
+            handler.release()
+
+    def _report_dropped(self, handler: logging.Handler) -> None:
+        with self.lock:
+            dropped = self.dropped - self.reported_dropped
+            self.reported_dropped = self.dropped
+        self._write(handler, logging.makeLogRecord({
+            "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING", "threadName": "log writer",
+            "msg": f"{dropped} Log-Einträge verworfen, da die Warteschlange voll war."}))
+
+
+class AsyncHandler(QueueHandler):
+    """ Gibt die Einträge an den AsyncLogWriter weiter. Filter des Datei-Handlers, z.B. die Schwärzung, werden im
+    loggenden Thread angewendet, Formatieren und Schreiben im Thread des AsyncLogWriter.
+    """
+
+    def __init__(self, target: logging.Handler, writer: AsyncLogWriter) -> None:
+        super().__init__(writer.queue)
+        # nur Nachricht und Traceback zusammenführen, sonst setzt logging.basicConfig das Standardformat
+        self.setFormatter(logging.Formatter("%(message)s"))
+        self.target = target
+        self.writer = writer
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return super().filter(record) and self.target.filter(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.writer.put(self.target, record)
 
 
 def setup_logging() -> None:
     def mb_to_bytes(megabytes: int) -> int:
         return megabytes * 1000000
 
-    global in_memory_log_handlers
+    global in_memory_log_handlers, async_log_writer
     in_memory_log_handlers = {name: InMemoryLogHandler() for name in ["main", "internal_chargepoint"]}
+    async_log_writer = AsyncLogWriter()
+    async_log_writer.start()
+    atexit.register(async_log_writer.stop)
+
+    def to_async(handler: logging.Handler) -> AsyncHandler:
+        return AsyncHandler(handler, async_log_writer)
     # to do: add smarthome and soc to in_memory_log_handlers, needs updates in individual thread calls
 
     # Main logger
@@ -238,10 +307,10 @@ def setup_logging() -> None:
     main_file_handler.addFilter(RedactingFilter())
     in_memory_log_handlers["main"] = InMemoryLogHandler(main_file_handler)
     in_memory_log_handlers["main"].setFormatter(logging.Formatter(FORMAT_STR_DETAILED))
-    logging.basicConfig(level=logging.DEBUG, handlers=[main_file_handler, in_memory_log_handlers["main"]])
-    logging.getLogger().handlers[0].addFilter(functools.partial(filter_neg, "soc"))
-    logging.getLogger().handlers[0].addFilter(functools.partial(filter_neg, "Internal Chargepoint"))
-    logging.getLogger().handlers[0].addFilter(functools.partial(filter_neg, "smarthome"))
+    main_file_handler.addFilter(functools.partial(filter_neg, "soc"))
+    main_file_handler.addFilter(functools.partial(filter_neg, "Internal Chargepoint"))
+    main_file_handler.addFilter(functools.partial(filter_neg, "smarthome"))
+    logging.basicConfig(level=logging.DEBUG, handlers=[to_async(main_file_handler), in_memory_log_handlers["main"]])
 
     # Chargelog logger
     chargelog_log = logging.getLogger("chargelog")
@@ -250,7 +319,7 @@ def setup_logging() -> None:
         RAMDISK_PATH + 'chargelog.log', maxBytes=mb_to_bytes(2), backupCount=1)
     chargelog_file_handler.setFormatter(logging.Formatter(FORMAT_STR_SHORT))
     chargelog_file_handler.addFilter(RedactingFilter())
-    chargelog_log.addHandler(chargelog_file_handler)
+    chargelog_log.addHandler(to_async(chargelog_file_handler))
 
     # Data migration logger
     data_migration_log = logging.getLogger("data_migration")
@@ -259,7 +328,7 @@ def setup_logging() -> None:
         PERSISTENT_LOG_PATH + 'data_migration.log', maxBytes=mb_to_bytes(1), backupCount=1)
     data_migration_file_handler.setFormatter(logging.Formatter(FORMAT_STR_SHORT))
     data_migration_file_handler.addFilter(RedactingFilter())
-    data_migration_log.addHandler(data_migration_file_handler)
+    data_migration_log.addHandler(to_async(data_migration_file_handler))
 
     # MQTT logger
     mqtt_log = logging.getLogger("mqtt")
@@ -267,7 +336,7 @@ def setup_logging() -> None:
     mqtt_file_handler = RotatingFileHandler(RAMDISK_PATH + 'mqtt.log', maxBytes=mb_to_bytes(3), backupCount=1)
     mqtt_file_handler.setFormatter(logging.Formatter(FORMAT_STR_SHORT))
     mqtt_file_handler.addFilter(RedactingFilter())
-    mqtt_log.addHandler(mqtt_file_handler)
+    mqtt_log.addHandler(to_async(mqtt_file_handler))
 
     # Steuve control command logger
     steuve_control_command_log = logging.getLogger("steuve_control_command")
@@ -275,7 +344,7 @@ def setup_logging() -> None:
     steuve_control_command_file_handler = RotatingFileHandler(
         PERSISTENT_LOG_PATH + 'steuve_control_command.log', maxBytes=mb_to_bytes(80), backupCount=1)
     steuve_control_command_file_handler.setFormatter(logging.Formatter(FORMAT_STR_SHORT))
-    steuve_control_command_log.addHandler(steuve_control_command_file_handler)
+    steuve_control_command_log.addHandler(to_async(steuve_control_command_file_handler))
 
     # Garbage collector logger
     garbage_collector_log = logging.getLogger("garbage_collector")
@@ -283,7 +352,7 @@ def setup_logging() -> None:
     garbage_collector_file_handler = RotatingFileHandler(
         RAMDISK_PATH + 'garbage_collector.log', maxBytes=mb_to_bytes(0.5), backupCount=1)
     garbage_collector_file_handler.setFormatter(logging.Formatter(FORMAT_STR_SHORT))
-    garbage_collector_log.addHandler(garbage_collector_file_handler)
+    garbage_collector_log.addHandler(to_async(garbage_collector_file_handler))
 
     # tracemalloc logger
     tracemalloc_log = logging.getLogger("tracemalloc")
@@ -291,14 +360,14 @@ def setup_logging() -> None:
     tracemalloc_file_handler = RotatingFileHandler(
         RAMDISK_PATH + 'tracemalloc.log', maxBytes=mb_to_bytes(0.5), backupCount=1)
     tracemalloc_file_handler.setFormatter(logging.Formatter(FORMAT_STR_SHORT))
-    tracemalloc_log.addHandler(tracemalloc_file_handler)
+    tracemalloc_log.addHandler(to_async(tracemalloc_file_handler))
 
     # Smarthome logger
     smarthome_log_handler = RotatingFileHandler(RAMDISK_PATH + 'smarthome.log', maxBytes=mb_to_bytes(1), backupCount=1)
     smarthome_log_handler.setFormatter(logging.Formatter(FORMAT_STR_SHORT))
     smarthome_log_handler.addFilter(functools.partial(filter_pos, "smarthome"))
     smarthome_log_handler.addFilter(RedactingFilter())
-    logging.getLogger().addHandler(smarthome_log_handler)
+    logging.getLogger().addHandler(to_async(smarthome_log_handler))
 
     # SoC logger
     soc_log_handler = RotatingFileHandler(RAMDISK_PATH + 'soc.log', maxBytes=mb_to_bytes(2), backupCount=1)
@@ -307,7 +376,7 @@ def setup_logging() -> None:
     soc_log_handler.addFilter(RedactingFilter())
     in_memory_log_handlers["soc"] = InMemoryLogHandler(soc_log_handler)
     in_memory_log_handlers["soc"].setFormatter(logging.Formatter(FORMAT_STR_DETAILED))
-    logging.getLogger().addHandler(soc_log_handler)
+    logging.getLogger().addHandler(to_async(soc_log_handler))
     logging.getLogger().addHandler(in_memory_log_handlers["soc"])
 
     # Internal chargepoint logger
@@ -319,7 +388,7 @@ def setup_logging() -> None:
     internal_chargepoint_log_handler.addFilter(RedactingFilter())
     in_memory_log_handlers["internal_chargepoint"] = InMemoryLogHandler(internal_chargepoint_log_handler)
     in_memory_log_handlers["internal_chargepoint"].setFormatter(logging.Formatter(FORMAT_STR_DETAILED))
-    logging.getLogger().addHandler(internal_chargepoint_log_handler)
+    logging.getLogger().addHandler(to_async(internal_chargepoint_log_handler))
     logging.getLogger().addHandler(in_memory_log_handlers["internal_chargepoint"])
 
     # urllib3 logger
@@ -329,7 +398,7 @@ def setup_logging() -> None:
     urllib3_file_handler.setFormatter(logging.Formatter(FORMAT_STR_DETAILED))
     urllib3_file_handler.addFilter(RedactingFilter())
     urllib3_file_handler.addFilter(functools.partial(filter_pos, "soc"))
-    urllib3_log.addHandler(urllib3_file_handler)
+    urllib3_log.addHandler(to_async(urllib3_file_handler))
 
     logging.getLogger("pymodbus").setLevel(logging.WARNING)
     logging.getLogger("uModbus").setLevel(logging.WARNING)
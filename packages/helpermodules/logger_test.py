@@ -0,0 +1,129 @@
+import logging
+import re
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from helpermodules import logger
+from helpermodules.logger import (KNOWN_SENSITIVE_FIELDS, AsyncHandler, AsyncLogWriter, InMemoryLogHandler,
+                                  RedactingFilter, redact_sensitive_info)
+
+LEGACY_PATTERNS = [
+    (r'({field})[=:]([^\s&]+)', r'\1=***REDACTED***'),
+    (r'"{field}":\s*"(.*?)"', r'"{field}": "***REDACTED***"'),
+    (r'\'{field}\':\s*\'(.*?)\'', r"'{field}': '***REDACTED***'")
+]
+
+
+def legacy_redact(message: str, additional_fields: list = None) -> str:
+    for field in KNOWN_SENSITIVE_FIELDS + (additional_fields or []):
+        for pattern, replacement in LEGACY_PATTERNS:
+            message = re.sub(pattern.replace('{field}', field), replacement.replace('{field}', field), message,
+                             flags=re.IGNORECASE)
+    return message
+
+
+@pytest.mark.parametrize("message", [
+    pytest.param("Neuer Wert für openWB/counter/0/get/power: 1200.5", id="ohne sensible Daten"),
+    pytest.param("GET https://api.example.com/login?user=x&password=geheim&apikey=123 HTTP/1.1", id="URL"),
+    pytest.param('{"username": "x", "Password": "geheim", "access_token": "abc", "refresh_token": "def"}',
+                 id="json"),
+    pytest.param("{'token': 'abc', 'secret': 'xyz', 'id': 1}", id="dict"),
+    pytest.param("Token:abc refreshtoken=def AccessToken: ghi", id="gemischt"),
+])
+def test_redact_sensitive_info_equals_legacy(message: str):
+    # execution and evaluation
+    assert redact_sensitive_info(message, ["user"]) == legacy_redact(message, ["user"])
+
+
+def test_redacting_filter_additional_fields():
+    # setup
+    record = logging.LogRecord("test", logging.DEBUG, __file__, 1, "Daten: %s",
+                               ({"username": "x", "pin": "1234", "password": "geheim"},), None)
+    record.redact_fields = "username, pin"
+
+    # execution
+    RedactingFilter().filter(record)
+
+    # evaluation
+    assert record.msg == ("Daten: {'username': '***REDACTED***', 'pin': '***REDACTED***', "
+                          "'password': '***REDACTED***'}")
+    assert record.args == ()
+
+
+def emit(handler: InMemoryLogHandler, message: str, level: int = logging.DEBUG) -> None:
+    handler.handle(logging.LogRecord("test", level, __file__, 1, message, (), None))
+
+
+def test_in_memory_log_handler_drops_oldest_lines():
+    # setup
+    handler = InMemoryLogHandler(max_size_mb=1)
+    handler.max_size_bytes = 30
+
+    # execution
+    for i in range(10):
+        emit(handler, f"Zeile {i}")
+
+    # evaluation
+    assert handler.get_logs() == "Zeile 7\nZeile 8\nZeile 9\n"
+    assert handler.size == 24
+
+
+def test_write_logs_to_file_keeps_last_runs(tmp_path: Path, monkeypatch):
+    # setup
+    handler = InMemoryLogHandler()
+    monkeypatch.setattr(logger, "RAMDISK_PATH", str(tmp_path))
+    monkeypatch.setattr(logger, "in_memory_log_handlers", {"main": handler}, raising=False)
+
+    # execution
+    for i in range(4):
+        logger.clear_in_memory_log_handler("main")
+        emit(handler, f"Durchlauf {i}", logging.WARNING if i == 1 else logging.DEBUG)
+        logger.write_logs_to_file("main")
+
+    # evaluation
+    assert (tmp_path / "main.current.log").read_text() == "Durchlauf 3\n"
+    assert (tmp_path / "main.latest.log").read_text() == "Durchlauf 1\nDurchlauf 2\nDurchlauf 3\n"
+    assert (tmp_path / "main.latest-warning.log").read_text() == "Durchlauf 1\n"
+
+
+def test_async_handler_writes_in_writer_thread(tmp_path: Path):
+    # setup
+    file_handler = logging.FileHandler(tmp_path / "test.log")
+    file_handler.setFormatter(logging.Formatter("%(threadName)s - %(message)s"))
+    file_handler.addFilter(RedactingFilter())
+    file_handler.addFilter(lambda record: "verwerfen" not in record.getMessage())
+    writer = AsyncLogWriter()
+    writer.start()
+    handler = AsyncHandler(file_handler, writer)
+
+    # execution
+    for message in ("password=geheim", "verwerfen", "Wert %s"):
+        handler.handle(logging.LogRecord("test", logging.DEBUG, __file__, 1, message, (1,) if "%" in message else (),
+                                         None))
+    writer.stop()
+    file_handler.close()
+
+    # evaluation
+    assert (tmp_path / "test.log").read_text().splitlines() == ["MainThread - password=***REDACTED***",
+                                                                "MainThread - Wert 1"]
+
+
+def test_async_log_writer_drops_when_full():
+    # setup
+    target = logging.Handler()
+    target.emit = Mock()
+    writer = AsyncLogWriter(max_size=2)
+    handler = AsyncHandler(target, writer)
+
+    # execution
+    for i in range(5):
+        emit(handler, f"Zeile {i}")
+    writer.start()
+    writer.stop()
+
+    # evaluation
+    assert writer.dropped == 3
+    messages = [call.args[0].getMessage() for call in target.emit.call_args_list]
+    assert messages == ["Zeile 0", "3 Log-Einträge verworfen, da die Warteschlange voll war.", "Zeile 1"]
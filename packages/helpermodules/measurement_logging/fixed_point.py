@@ -0,0 +1,88 @@
+""" Ganzzahlige Festkommaarithmetik für die Berechnung der Log-Einträge.
+
+Bisher wird jeder Wert mit Decimal(str(value)) umgewandelt, berechnet, auf 0.001 gerundet und über einen String
+wieder in einen float umgewandelt. Ein Festkommawert (Ganzzahl, Nachkommastellen) entspricht exakt dem Wert von
+Decimal(str(value)), sodass Summe, Differenz und Produkt mit Ganzzahlen exakt berechnet werden. Gerundet wird wie bei
+Decimal.quantize kaufmännisch auf die gerade Ziffer (ROUND_HALF_EVEN), auch das Vorzeichen von -0.0 bleibt erhalten.
+
+Decimal rechnet mit 28 signifikanten Stellen. Längere Zwischenergebnisse sowie Werte in Exponentialschreibweise,
+nan, inf und -0.0 werden nicht unterstützt, dann wird ein ValueError geworfen und die Berechnung mit Decimal
+durchgeführt.
+"""
+from typing import Tuple, Union
+
+# (Ganzzahl, Anzahl der Nachkommastellen)
+Fixed = Tuple[int, int]
+
+DIGITS = 9
+SCALE = 10**DIGITS
+# Bis zu diesem Betrag ist der Abstand zweier float-Werte kleiner als 1/SCALE, sodass ein Wert mit höchstens DIGITS
+# Nachkommastellen eindeutig ist.
+MAX_SCALED_VALUE = 2**52 / SCALE
+DECIMAL_PRECISION = 10**28
+QUANTIZE_DIGITS = 3
+
+
+def to_fixed(value: float) -> Fixed:
+    if isinstance(value, int):
+        return value, 0
+    if -MAX_SCALED_VALUE < value < MAX_SCALED_VALUE and value != 0:
+        scaled = round(value * SCALE)
+        if scaled / SCALE == value:
+            return scaled, DIGITS
+    # Wert mit mehr Nachkommastellen, z.B. Rundungsfehler beim Aufsummieren
+    text = repr(value)
+    if "e" in text or "n" in text or text.startswith("-0.0") and value == 0:
+        raise ValueError(f"Wert {text} kann nicht als Festkommawert dargestellt werden.")
+    integer_part, _, fraction = text.partition(".")
+    return int(integer_part + fraction), len(fraction)
+
+
+def _check_precision(value: Fixed) -> Fixed:
+    if not -DECIMAL_PRECISION < value[0] < DECIMAL_PRECISION:
+        raise ValueError("Zwischenergebnis überschreitet die Genauigkeit von Decimal.")
+    return value
+
+
+def _align(first: Fixed, second: Fixed) -> Tuple[int, int, int]:
+    digits = max(first[1], second[1])
+    return first[0] * 10**(digits - first[1]), second[0] * 10**(digits - second[1]), digits
+
+
+def add(first: Fixed, second: Fixed) -> Fixed:
+    first_value, second_value, digits = _align(first, second)
+    return _check_precision((first_value + second_value, digits))
+
+
+def subtract(first: Fixed, second: Fixed) -> Fixed:
+    first_value, second_value, digits = _align(first, second)
+    return _check_precision((first_value - second_value, digits))
+
+
+def multiply(first: Fixed, second: Fixed) -> Tuple[Fixed, bool]:
+    """ gibt das Produkt und zurück, ob es negativ ist. Wie bei Decimal ist 0 * -1 negativ.
+    """
+    return _check_precision((first[0] * second[0], first[1] + second[1])), (first[0] < 0) != (second[0] < 0)
+
+
+def quantize(value: Fixed, negative: bool = False) -> float:
+    """ rundet auf QUANTIZE_DIGITS Nachkommastellen (ROUND_HALF_EVEN) und gibt das Ergebnis als float zurück.
+    """
+    integer, digits = value
+    if digits > QUANTIZE_DIGITS:
+        divisor = 10**(digits - QUANTIZE_DIGITS)
+        integer, remainder = divmod(integer, divisor)
+        if 2 * remainder > divisor or (2 * remainder == divisor and integer % 2 == 1):
+            integer += 1
+    else:
+        integer *= 10**(QUANTIZE_DIGITS - digits)
+    _check_precision((integer, QUANTIZE_DIGITS))
+    if integer == 0:
+        return -0.0 if negative or value[0] < 0 else 0.0
+    return integer / 10**QUANTIZE_DIGITS
+
+
+def to_number(value: Fixed) -> Union[float, int]:
+    """ Ohne Nachkommastellen wird wie bei der Umwandlung des Decimal-Strings ein int zurückgegeben.
+    """
+    return value[0] / 10**value[1] if value[1] > 0 else value[0]
@@ -0,0 +1,227 @@
+""" Ablage der Tages- und Monats-Logs.
+
+Bisher wurde je Tag bzw. Monat eine json-Datei {"entries": [...], "names": {...}} geschrieben, die alle 5 Minuten
+vollständig eingelesen und neu geschrieben wurde. Im neuen Format wird jeder Eintrag als eigene Zeile an die Datei
+<Datum>.jsonl angehängt. Namen und ggf. Summen (totals) liegen in der Datei <Datum>.meta.json und werden nur
+geschrieben, wenn sie sich geändert haben.
+
+Die Lesefunktionen liefern für beide Formate das bisherige Dictionary. Dateien im alten Format werden beim nächsten
+Schreiben bzw. bei der Aktualisierung der Konfiguration in das neue Format überführt.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from helpermodules.utils.json_file_handler import write_and_check
+
+log = logging.getLogger(__name__)
+
+LEGACY_SUFFIX = ".json"
+ENTRIES_SUFFIX = ".jsonl"
+META_SUFFIX = ".meta.json"
+# Beim Lesen des letzten Eintrags wird die Datei blockweise vom Ende her gelesen.
+TAIL_BLOCK_SIZE = 4096
+
+
+def _legacy_path(folder: Path, name: str) -> Path:
+    return folder / f"{name}{LEGACY_SUFFIX}"
+
+
+def _entries_path(folder: Path, name: str) -> Path:
+    return folder / f"{name}{ENTRIES_SUFFIX}"
+
+
+def _meta_path(folder: Path, name: str) -> Path:
+    return folder / f"{name}{META_SUFFIX}"
+
+
+def log_exists(folder: Path, name: str) -> bool:
+    return _entries_path(folder, name).is_file() or _legacy_path(folder, name).is_file()
+
+
+def log_signature(folder: Path, name: str) -> Tuple[Optional[Tuple[int, int, int]], ...]:
+    """ gibt Inode, Änderungszeit und Größe der Dateien eines Logs zurück, um zu erkennen, ob das Log seit dem letzten
+    Einlesen geändert oder ersetzt wurde (zB durch Import, Wiederherstellen einer Sicherung oder Migration).
+    """
+    def stat(path: Path) -> Optional[Tuple[int, int, int]]:
+        try:
+            result = path.stat()
+            return (result.st_ino, result.st_mtime_ns, result.st_size)
+        except FileNotFoundError:
+            return None
+    return (stat(_entries_path(folder, name)), stat(_legacy_path(folder, name)))
+
+
+def log_names(folder: Path, prefix: str = "") -> List[str]:
+    """ gibt die sortierten Namen (Datum ohne Endung) aller Logs im Ordner zurück, unabhängig vom Format.
+    """
+    names = set()
+    for path in folder.glob(f"{prefix}*"):
+        if path.name.endswith(META_SUFFIX):
+            continue
+        if path.suffix in (LEGACY_SUFFIX, ENTRIES_SUFFIX) and path.stem.isdigit():
+            names.add(path.stem)
+    return sorted(names)
+
+
+def _parse_line(line: str, path: Path) -> Optional[Dict]:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        # z.B. bei Stromausfall während des Schreibens unvollständig geschriebene Zeile
+        log.warning(f"Ungültige Zeile in {path} wird übersprungen: {line[:100]}")
+        return None
+
+
+def read_entries(folder: Path, name: str) -> List[Dict]:
+    """ liest alle Einträge eines Logs. Existiert das Log nicht, wird ein FileNotFoundError geworfen.
+    """
+    path = _entries_path(folder, name)
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return [entry for entry in (_parse_line(line, path) for line in file if line.strip())
+                    if entry is not None]
+    except FileNotFoundError:
+        with open(_legacy_path(folder, name), "r", encoding="utf-8") as file:
+            return json.load(file)["entries"]
+
+
+def read_meta(folder: Path, name: str) -> Dict:
+    """ liest Namen und ggf. Summen eines Logs.
+    """
+    try:
+        with open(_meta_path(folder, name), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        if _entries_path(folder, name).is_file():
+            return {"names": {}}
+        with open(_legacy_path(folder, name), "r", encoding="utf-8") as file:
+            content = json.load(file)
+        content.pop("entries", None)
+        return content
+
+
+def read_log(folder: Path, name: str) -> Dict:
+    """ liest ein Log im bisherigen Format {"entries": [...], "names": {...}, ...}.
+    """
+    if _entries_path(folder, name).is_file():
+        content = read_meta(folder, name)
+        content["entries"] = read_entries(folder, name)
+        return content
+    with open(_legacy_path(folder, name), "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def read_first_entry(folder: Path, name: str) -> Optional[Dict]:
+    path = _entries_path(folder, name)
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    entry = _parse_line(line, path)
+                    if entry is not None:
+                        return entry
+        return None
+    except FileNotFoundError:
+        entries = read_entries(folder, name)
+        return entries[0] if entries else None
+
+
+def read_last_entry(folder: Path, name: str) -> Optional[Dict]:
+    """ liest den letzten Eintrag, ohne die gesamte Datei einzulesen.
+    """
+    path = _entries_path(folder, name)
+    try:
+        with open(path, "rb") as file:
+            file.seek(0, os.SEEK_END)
+            position = file.tell()
+            tail = b""
+            while position > 0:
+                step = min(TAIL_BLOCK_SIZE, position)
+                position -= step
+                file.seek(position)
+                tail = file.read(step) + tail
+                lines = tail.splitlines()
+                # Die erste Zeile ist erst vollständig, wenn davor ein Zeilenumbruch gelesen wurde.
+                complete = lines if position == 0 else lines[1:]
+                for line in reversed(complete):
+                    if line.strip():
+                        entry = _parse_line(line.decode("utf-8"), path)
+                        if entry is not None:
+                            return entry
+                tail = lines[0] if lines and position > 0 else b""
+        return None
+    except FileNotFoundError:
+        entries = read_entries(folder, name)
+        return entries[-1] if entries else None
+
+
+def append_entry(folder: Path, name: str, entry: Dict, names: Dict) -> None:
+    """ hängt einen Eintrag an das Log an. Die Namen werden nur bei Änderungen geschrieben.
+    """
+    migrate_log(folder, name)
+    path = _entries_path(folder, name)
+    with open(path, "a+b") as file:
+        if file.tell() > 0:
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) != b"\n":
+                # unvollständige letzte Zeile abschließen, damit der neue Eintrag lesbar bleibt
+                file.write(b"\n")
+        file.write(json.dumps(entry).encode("utf-8") + b"\n")
+    try:
+        meta = read_meta(folder, name)
+    except json.JSONDecodeError:
+        log.warning(f"Ungültige Datei {_meta_path(folder, name)} wird neu geschrieben.")
+        meta = {}
+    if meta.get("names") != names:
+        meta["names"] = names
+        write_and_check(str(_meta_path(folder, name)), meta)
+
+
+def write_log(folder: Path, name: str, content: Dict) -> None:
+    """ schreibt ein vollständiges Log {"entries": [...], "names": {...}, ...} im neuen Format, z.B. nach dem Import
+    von Daten. Eine Datei im bisherigen Format wird entfernt.
+    """
+    content = dict(content)
+    entries = content.pop("entries", [])
+    entries_path = _entries_path(folder, name)
+    temp_path = entries_path.with_name(entries_path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.writelines(json.dumps(entry) + "\n" for entry in entries)
+    write_and_check(str(_meta_path(folder, name)), content)
+    # Erst wenn beide Dateien vollständig geschrieben sind, wird die bisherige Datei ersetzt.
+    os.replace(temp_path, entries_path)
+    legacy_path = _legacy_path(folder, name)
+    if legacy_path.is_file():
+        legacy_path.unlink()
+
+
+def migrate_log(folder: Path, name: str) -> bool:
+    """ überführt ein Log im bisherigen Format in das neue Format. Gibt zurück, ob eine Datei überführt wurde.
+    """
+    legacy_path = _legacy_path(folder, name)
+    if not legacy_path.is_file():
+        return False
+    with open(legacy_path, "r", encoding="utf-8") as file:
+        content = json.load(file)
+    if _entries_path(folder, name).is_file():
+        # z.B. nach Wiederherstellen einer Sicherung liegen beide Formate vor.
+        newer_entries = read_entries(folder, name)
+        if newer_entries:
+            content["entries"] = [entry for entry in content["entries"]
+                                  if entry["timestamp"] < newer_entries[0]["timestamp"]]
+        content["entries"].extend(newer_entries)
+        content["names"] = read_meta(folder, name).get("names") or content.get("names", {})
+    write_log(folder, name, content)
+    log.debug(f"Log {legacy_path} in das neue Format überführt.")
+    return True
+
+
+def migrate_log_folder(folder: Path) -> None:
+    for name in log_names(folder):
+        try:
+            migrate_log(folder, name)
+        except Exception:
+            log.exception(f"Log {name} in {folder} konnte nicht in das neue Format überführt werden.")
@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+
+from helpermodules.measurement_logging import log_storage
+from helpermodules.measurement_logging.log_storage import (append_entry, log_names, migrate_log, read_first_entry,
+                                                           read_last_entry, read_log)
+
+
+def entry(timestamp: int):
+    return {"timestamp": timestamp, "date": "09:35", "counter": {"counter0": {"imported": timestamp, "grid": True}}}
+
+
+def write_legacy_log(folder: Path, name: str, entries):
+    with open(folder / f"{name}.json", "w") as file:
+        json.dump({"entries": entries, "names": {"counter0": "EVU"}}, file)
+
+
+def test_append_entry(tmp_path: Path):
+    # execution
+    append_entry(tmp_path, "20250616", entry(1), {"counter0": "EVU"})
+    append_entry(tmp_path, "20250616", entry(2), {"counter0": "EVU"})
+
+    # evaluation
+    assert read_log(tmp_path, "20250616") == {"entries": [entry(1), entry(2)], "names": {"counter0": "EVU"}}
+    assert (tmp_path / "20250616.jsonl").read_text().count("\n") == 2
+
+
+def test_append_entry_migrates_legacy_log(tmp_path: Path):
+    # setup
+    write_legacy_log(tmp_path, "20250616", [entry(1)])
+
+    # execution
+    append_entry(tmp_path, "20250616", entry(2), {"counter0": "EVU"})
+
+    # evaluation
+    assert not (tmp_path / "20250616.json").exists()
+    assert read_log(tmp_path, "20250616") == {"entries": [entry(1), entry(2)], "names": {"counter0": "EVU"}}
+
+
+def test_read_legacy_log(tmp_path: Path):
+    # setup
+    write_legacy_log(tmp_path, "20250616", [entry(1), entry(2)])
+
+    # execution and evaluation
+    assert read_log(tmp_path, "20250616") == {"entries": [entry(1), entry(2)], "names": {"counter0": "EVU"}}
+    assert read_first_entry(tmp_path, "20250616") == entry(1)
+    assert read_last_entry(tmp_path, "20250616") == entry(2)
+
+
+def test_skip_incomplete_line(tmp_path: Path):
+    # setup
+    append_entry(tmp_path, "20250616", entry(1), {})
+    with open(tmp_path / "20250616.jsonl", "a") as file:
+        file.write('{"timestamp": 2, "da')
+
+    # execution
+    last_before_append = read_last_entry(tmp_path, "20250616")
+    append_entry(tmp_path, "20250616", entry(3), {})
+
+    # evaluation
+    assert last_before_append == entry(1)
+    assert read_log(tmp_path, "20250616")["entries"] == [entry(1), entry(3)]
+
+
+def test_read_last_entry_over_several_blocks(tmp_path: Path, monkeypatch):
+    # setup
+    monkeypatch.setattr(log_storage, "TAIL_BLOCK_SIZE", 16)
+    for timestamp in range(1, 6):
+        append_entry(tmp_path, "202506", entry(timestamp), {})
+
+    # execution and evaluation
+    assert read_last_entry(tmp_path, "202506") == entry(5)
+
+
+def test_migrate_log_keeps_newer_entries(tmp_path: Path):
+    # setup
+    append_entry(tmp_path, "20250616", entry(3), {"counter0": "EVU"})
+    write_legacy_log(tmp_path, "20250616", [entry(1), entry(2), entry(3)])
+
+    # execution
+    migrated = migrate_log(tmp_path, "20250616")
+
+    # evaluation
+    assert migrated is True
+    assert read_log(tmp_path, "20250616")["entries"] == [entry(1), entry(2), entry(3)]
+    assert log_names(tmp_path) == ["20250616"]
@@ -1,12 +1,16 @@
 import datetime
 from decimal import Decimal
 from enum import Enum
+import functools
 import json
 import logging
 from pathlib import Path
 from typing import Dict, List, Tuple, Union
 
 from helpermodules import timecheck
+from helpermodules.measurement_logging import fixed_point
+from helpermodules.measurement_logging.log_storage import (log_exists, read_entries, read_first_entry,
+                                                           read_last_entry, read_log)
 from helpermodules.measurement_logging.write_log import (LegacySmartHomeLogData, LogType, create_entry,
                                                          get_previous_entry)
 from helpermodules.messaging import MessageType, pub_system_message
@@ -68,38 +72,43 @@ def get_totals(entries: List, process_entries: bool = True) -> Dict:
     """
     if process_entries:
         entries = _process_entries(entries, CalculationType.ENERGY)
-    totals = {"cp": {}, "counter": {}, "pv": {}, "bat": {}, "sh": {}, "hc": {}}
-    for totals_group in totals.keys():
-        for entry in entries:
-            if totals_group in entry:
-                for entry_module in entry[totals_group]:
-                    try:
-                        if entry_module not in totals[totals_group]:
-                            if totals_group == "hc":
-                                totals[totals_group][entry_module] = {"energy_imported": 0.0}
-                            elif totals_group == "pv":
-                                totals[totals_group][entry_module] = {"energy_exported": 0.0}
-                            else:
-                                totals[totals_group][entry_module] = {"energy_imported": 0.0, "energy_exported": 0.0}
-                                if totals_group == "counter" and "grid" in entry[totals_group][entry_module]:
-                                    totals[totals_group][entry_module]["grid"] = entry[
-                                        totals_group][entry_module]["grid"]
-                        for entry_module_key, entry_module_value in entry[totals_group][entry_module].items():
-                            if "grid" != entry_module_key and entry_module_key in totals[totals_group][entry_module]:
-                                # avoid floating point issues with using Decimal
-                                value = (Decimal(str(totals[totals_group][entry_module][entry_module_key]))
-                                         + Decimal(str(entry_module_value * 1000)))  # totals in Wh!
-                                value.quantize(Decimal('0.001'))
-                                value = f'{value: f}'
-                                # remove trailing zeros
-                                totals[totals_group][entry_module][entry_module_key] = string_to_float(
-                                    value) if "." in value else string_to_int(value)
-
-                    except Exception:
-                        log.exception(f"Fehler beim Berechnen der Summe von {entry_module}; "
-                                      f"group:{totals_group}, module:{entry_module}, key:{entry_module_key}")
+    totals = get_empty_totals()
+    for entry in entries:
+        add_to_totals(totals, entry)
     return totals
 
+
+def get_empty_totals() -> Dict:
+    return {"cp": {}, "counter": {}, "pv": {}, "bat": {}, "sh": {}, "hc": {}}
+
+
+def add_to_totals(totals: Dict, entry: Dict) -> None:
+    """ addiert die Energie eines bereits berechneten Eintrags zu den Summen.
+    """
+    for totals_group in totals.keys():
+        if totals_group in entry:
+            for entry_module in entry[totals_group]:
+                try:
+                    if entry_module not in totals[totals_group]:
+                        if totals_group == "hc":
+                            totals[totals_group][entry_module] = {"energy_imported": 0.0}
+                        elif totals_group == "pv":
+                            totals[totals_group][entry_module] = {"energy_exported": 0.0}
+                        else:
+                            totals[totals_group][entry_module] = {"energy_imported": 0.0, "energy_exported": 0.0}
+                            if totals_group == "counter" and "grid" in entry[totals_group][entry_module]:
+                                totals[totals_group][entry_module]["grid"] = entry[
+                                    totals_group][entry_module]["grid"]
+                    for entry_module_key, entry_module_value in entry[totals_group][entry_module].items():
+                        if "grid" != entry_module_key and entry_module_key in totals[totals_group][entry_module]:
+                            totals[totals_group][entry_module][entry_module_key] = _add_energy(
+                                totals[totals_group][entry_module][entry_module_key],
+                                entry_module_value * 1000)  # totals in Wh!
+
+                except Exception:
+                    log.exception(f"Fehler beim Berechnen der Summe von {entry_module}; "
+                                  f"group:{totals_group}, module:{entry_module}, key:{entry_module_key}")
+
 #     {"entries": [
 #         {
 #             "timestamp": int,
@@ -176,22 +185,20 @@ def get_daily_log(date: str):
 def _collect_daily_log_data(date: str):
     try:
         parent_file = Path(__file__).resolve().parents[3] / "data"/"daily_log"
-        with open(str(parent_file / (date+".json")), "r") as json_file:
-            log_data = json.load(json_file)
-            if date == timecheck.create_timestamp_YYYYMMDD():
-                # beim aktuellen Tag den aktuellen Datensatz ergänzen
-                log_data["entries"].append(create_entry(
-                    LogType.DAILY, LegacySmartHomeLogData(), get_previous_entry(parent_file, log_data)))
-            else:
-                # bei älteren als letzten Datensatz den des nächsten Tags
-                try:
-                    next_date = timecheck.get_relative_date_string(date, day_offset=1)
-                    with open(str(parent_file / (next_date+".json")),
-                              "r") as next_json_file:
-                        next_log_data = json.load(next_json_file)
-                        log_data["entries"].append(next_log_data["entries"][0])
-                except FILE_ERRORS:
-                    pass
+        log_data = read_log(parent_file, date)
+        if date == timecheck.create_timestamp_YYYYMMDD():
+            # beim aktuellen Tag den aktuellen Datensatz ergänzen
+            log_data["entries"].append(create_entry(
+                LogType.DAILY, LegacySmartHomeLogData(), get_previous_entry(parent_file, date, log_data["entries"])))
+        else:
+            # bei älteren als letzten Datensatz den des nächsten Tags
+            try:
+                next_date = timecheck.get_relative_date_string(date, day_offset=1)
+                next_entry = read_first_entry(parent_file, next_date)
+                if next_entry is not None:
+                    log_data["entries"].append(next_entry)
+            except FILE_ERRORS:
+                pass
     except FILE_ERRORS:
         log_data = {"entries": [], "totals": {}, "names": {}}
     return log_data
@@ -207,28 +214,24 @@ def get_monthly_log(date: str):
 
 def _collect_monthly_log_data(date: str):
     try:
-        with open(f"{_get_data_folder_path()}/monthly_log/{date}.json", "r") as jsonFile:
-            log_data = json.load(jsonFile)
+        log_data = read_log(Path(_get_data_folder_path())/"monthly_log", date)
         this_month = timecheck.create_timestamp_YYYYMM()
         if date == this_month:
             # add last entry of current day, if current month is requested
             try:
                 today = timecheck.create_timestamp_YYYYMMDD()
-                with open(f"{_get_data_folder_path()}/daily_log/{today}.json",
-                          "r") as todayJsonFile:
-                    today_log_data = json.load(todayJsonFile)
-                    if len(today_log_data["entries"]) > 0:
-                        log_data["entries"].append(today_log_data["entries"][-1])
+                last_entry = read_last_entry(Path(_get_data_folder_path())/"daily_log", today)
+                if last_entry is not None:
+                    log_data["entries"].append(last_entry)
             except FILE_ERRORS:
                 pass
         else:
             # add first entry of next month
             try:
                 next_date = timecheck.get_relative_date_string(date, month_offset=1)
-                with open(f"{_get_data_folder_path()}/monthly_log/{next_date}.json",
-                          "r") as nextJsonFile:
-                    next_log_data = json.load(nextJsonFile)
-                    log_data["entries"].append(next_log_data["entries"][0])
+                next_entry = read_first_entry(Path(_get_data_folder_path())/"monthly_log", next_date)
+                if next_entry is not None:
+                    log_data["entries"].append(next_entry)
             except FILE_ERRORS:
                 pass
     except FILE_ERRORS:
@@ -268,8 +271,7 @@ def _collect_log_data_from_date_until_now(timestamp: int):
     try:
         date = datetime.datetime.fromtimestamp(timestamp).strftime("%Y%m%d")
         try:
-            with open(f"{_get_data_folder_path()}/daily_log/{date}.json", "r") as jsonFile:
-                entries = json.load(jsonFile)["entries"]
+            entries = read_entries(Path(_get_data_folder_path())/"daily_log", date)
         except FILE_ERRORS:
             pass
         for index, entry in enumerate(entries):
@@ -293,8 +295,7 @@ def _collect_log_data_from_date_until_now(timestamp: int):
             current_date += datetime.timedelta(days=1)
         for date_str in date_list:
             try:
-                with open(f"{_get_data_folder_path()}/daily_log/{date_str}.json", "r") as jsonFile:
-                    log_data = add_to_list(log_data, json.load(jsonFile)["entries"])
+                log_data = add_to_list(log_data, read_entries(Path(_get_data_folder_path())/"daily_log", date_str))
             except FILE_ERRORS:
                 pass
         log_data = add_to_list(log_data, create_entry(LogType.DAILY, LegacySmartHomeLogData(), log_data[-1]))
@@ -308,13 +309,12 @@ def _collect_yearly_log_data(year: str):
     def add_monthly_log(month: str, check_next_month: bool = False) -> None:
         monthly_log_path = Path(__file__).resolve().parents[3]/"data"/"monthly_log"
         try:
-            with open(monthly_log_path / f"{month}.json", "r") as jsonFile:
-                content = json.load(jsonFile)
-                entries.append(content["entries"][0])
+            content = read_log(monthly_log_path, month)
+            entries.append(content["entries"][0])
             # add last entry of current file if next file is missing
             if check_next_month:
                 next_month = timecheck.get_relative_date_string(month, month_offset=1)
-                if not (monthly_log_path / (next_month+".json")).is_file():
+                if not log_exists(monthly_log_path, next_month):
                     entries.append(content["entries"][-1])
                     log.debug(f"Keine Logdatei für Monat {next_month} gefunden, "
                               f"füge letzten Datensatz von {month} ein: {entries[-1]['date']}")
@@ -324,10 +324,9 @@ def _collect_yearly_log_data(year: str):
 
     def add_daily_log(day: str) -> None:
         try:
-            with open(f"{_get_data_folder_path()}/daily_log/{day}.json", "r") as dayJsonFile:
-                day_log_data = json.load(dayJsonFile)
-                if len(day_log_data["entries"]) > 0:
-                    entries.append(day_log_data["entries"][-1])
+            last_entry = read_last_entry(Path(_get_data_folder_path())/"daily_log", day)
+            if last_entry is not None:
+                entries.append(last_entry)
         except FILE_ERRORS:
             pass
 
@@ -398,11 +397,16 @@ def analyse_percentage(entry):
         return sum(grid["energy_imported"] for grid in grids), sum(grid["energy_exported"] for grid in grids)
 
     def calc_energy_imported_by_source(energy_imported, energy_source):
-        value = (Decimal(str(energy_imported)) *
-                 Decimal(str(energy_source))).quantize(Decimal('0.001'))  # limit precision
-        value = f'{value: f}'
-        value = string_to_float(value) if "." in value else string_to_int(value)
-        return value
+        try:
+            value, negative = fixed_point.multiply(fixed_point.to_fixed(energy_imported),
+                                                   fixed_point.to_fixed(energy_source))
+            return fixed_point.quantize(value, negative)
+        except (TypeError, ValueError):
+            value = (Decimal(str(energy_imported)) *
+                     Decimal(str(energy_source))).quantize(Decimal('0.001'))  # limit precision
+            value = f'{value: f}'
+            value = string_to_float(value) if "." in value else string_to_int(value)
+            return value
 
     try:
         bat_imported = entry["bat"]["all"]["energy_imported"] if "all" in entry["bat"].keys() else 0
@@ -461,25 +465,40 @@ def analyse_percentage(entry):
 
 
 def analyse_percentage_totals(entries, totals):
+    source_totals = {}
+    for entry in entries:
+        add_to_source_totals(source_totals, entry)
+    return apply_source_totals(totals, source_totals)
+
+
+def add_to_source_totals(source_totals: Dict, entry: Dict) -> None:
+    """ addiert die nach Energiequelle aufgeteilte Energie eines Eintrags (siehe analyse_percentage) in Wh.
+    """
+    for source in ("grid", "pv", "bat", "cp"):
+        key_source = f"energy_imported_{source}"
+        if "hc" in entry.keys() and "all" in entry["hc"].keys():
+            hc_totals = source_totals.setdefault("hc", {}).setdefault("all", {})
+            hc_totals[key_source] = hc_totals.get(key_source, 0) + entry["hc"]["all"].get(key_source, 0)*1000
+        for key in entry["cp"].keys():
+            if key_source in entry["cp"][key].keys():
+                cp_totals = source_totals.setdefault("cp", {}).setdefault(key, {})
+                cp_totals[key_source] = cp_totals.get(key_source, 0) + entry["cp"][key][key_source]*1000
+        for key, counter in entry["counter"].items():
+            if counter["grid"] is False:
+                counter_totals = source_totals.setdefault("counter", {}).setdefault(key, {})
+                counter_totals[key_source] = counter_totals.get(key_source, 0) + counter[key_source]*1000
+
+
+def apply_source_totals(totals: Dict, source_totals: Dict) -> Dict:
     for section in ("hc", "cp"):
         if "all" not in totals[section].keys():
             totals[section]["all"] = {}
     for source in ("grid", "pv", "bat", "cp"):
-        totals["hc"]["all"].update({f"energy_imported_{source}": 0})
-        for entry in entries:
-            if "hc" in entry.keys() and "all" in entry["hc"].keys():
-                totals["hc"]["all"][f"energy_imported_{source}"] += entry["hc"]["all"].get(
-                    f"energy_imported_{source}", 0)*1000
-            for key in entry["cp"].keys():
-                if f"energy_imported_{source}" in entry["cp"][key].keys():
-                    if totals["cp"][key].get(f"energy_imported_{source}") is None:
-                        totals["cp"][key].update({f"energy_imported_{source}": 0})
-                    totals["cp"][key][f"energy_imported_{source}"] += entry["cp"][key][f"energy_imported_{source}"]*1000
-            for key, counter in entry["counter"].items():
-                if counter["grid"] is False:
-                    if totals["counter"][key].get(f"energy_imported_{source}") is None:
-                        totals["counter"][key].update({f"energy_imported_{source}": 0})
-                    totals["counter"][key][f"energy_imported_{source}"] += counter[f"energy_imported_{source}"]*1000
+        totals["hc"]["all"][f"energy_imported_{source}"] = source_totals.get("hc", {}).get("all", {}).get(
+            f"energy_imported_{source}", 0)
+    for section in ("cp", "counter"):
+        for key, values in source_totals.get(section, {}).items():
+            totals[section][key].update(values)
     return totals
 
 
@@ -578,7 +597,25 @@ def process_entry(entry: dict, next_entry: dict, calculation: CalculationType):
     return entry
 
 
+def _add_energy(total: float, value: float) -> float:
+    try:
+        return fixed_point.to_number(fixed_point.add(fixed_point.to_fixed(total), fixed_point.to_fixed(value)))
+    except (TypeError, ValueError):
+        # avoid floating point issues with using Decimal
+        result = f'{Decimal(str(total)) + Decimal(str(value)): f}'
+        # remove trailing zeros
+        return string_to_float(result) if "." in result else string_to_int(result)
+
+
 def _calculate_energy_difference(current_value: float, next_value: float) -> float:
+    try:
+        return fixed_point.quantize(fixed_point.subtract(fixed_point.to_fixed(next_value),
+                                                         fixed_point.to_fixed(current_value)))
+    except (TypeError, ValueError):
+        return _calculate_energy_difference_decimal(current_value, next_value)
+
+
+def _calculate_energy_difference_decimal(current_value: float, next_value: float) -> float:
     value = (Decimal(str(next_value)) - Decimal(str(current_value)))
     value = value.quantize(Decimal('0.001'))  # limit precision
     value = f'{value: f}'
@@ -587,6 +624,26 @@ def _calculate_energy_difference(current_value: float, next_value: float) -> flo
 
 def _calculate_average_power(time_diff: float, current_imported: float = 0, next_imported: float = 0,
                              current_exported: float = 0, next_exported: float = 0) -> float:
+    factor = 3600 / time_diff
+    try:
+        energy = fixed_point.subtract(
+            fixed_point.subtract(fixed_point.to_fixed(next_imported), fixed_point.to_fixed(current_imported)),
+            fixed_point.subtract(fixed_point.to_fixed(next_exported), fixed_point.to_fixed(current_exported)))
+        power, negative = fixed_point.multiply(energy, _factor_to_fixed(factor))
+        return fixed_point.quantize(power, negative)
+    except (TypeError, ValueError):
+        return _calculate_average_power_decimal(time_diff, current_imported, next_imported,
+                                                current_exported, next_exported)
+
+
+@functools.lru_cache(maxsize=64)
+def _factor_to_fixed(factor: float) -> fixed_point.Fixed:
+    # Die Einträge werden in festen Abständen geschrieben, daher wiederholt sich der Faktor.
+    return fixed_point.to_fixed(factor)
+
+
+def _calculate_average_power_decimal(time_diff: float, current_imported: float = 0, next_imported: float = 0,
+                                     current_exported: float = 0, next_exported: float = 0) -> float:
     power = (Decimal(str(next_imported)) - Decimal(str(current_imported))
              - (Decimal(str(next_exported)) - Decimal(str(current_exported)))) * Decimal(str(3600 / time_diff))  # Ws
     power = power.quantize(Decimal('0.001'))  # limit precision
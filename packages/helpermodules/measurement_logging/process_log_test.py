@@ -1,8 +1,10 @@
 from copy import deepcopy
+import json
+from random import Random
 from unittest.mock import Mock
 import pytest
 
-from helpermodules.measurement_logging import process_log
+from helpermodules.measurement_logging import fixed_point, process_log
 from helpermodules.measurement_logging.process_log import (
     analyse_percentage,
     _calculate_average_power,
@@ -77,3 +79,66 @@ def test_get_daily_log(data, expected, monkeypatch):
 
     # evaluation
     assert daily_log_processed == expected
+
+
+def random_log(seed: int):
+    random = Random(seed)
+    entries = []
+    values = {"imported": 1000.0, "exported": 100.0, "hc": 100.0}
+    for step in range(50):
+        # Zählerstände mit 3 Nachkommastellen und mit Rundungsfehlern wie beim Aufsummieren
+        values["imported"] = round(values["imported"] + random.uniform(0, 800), 3)
+        values["exported"] += random.choice([0, random.uniform(0, 300), 0.1 + 0.2])
+        values["hc"] += random.uniform(0, 50)
+        entries.append({"timestamp": 1690529761 + step * random.choice([299, 300, 301]),
+                        "date": "09:35",
+                        "cp": {"cp3": {"imported": values["imported"], "exported": 0},
+                               "all": {"imported": values["imported"], "exported": 0}},
+                        "counter": {"counter0": {"imported": values["imported"] * 2, "exported": values["exported"],
+                                                 "grid": True},
+                                    "counter2": {"imported": values["imported"], "exported": 0, "grid": False}},
+                        "pv": {"all": {"exported": values["exported"]}},
+                        "bat": {"all": {"imported": values["exported"] / 3, "exported": values["hc"]}},
+                        "sh": {},
+                        "hc": {"all": {"imported": values["hc"]}}})
+    return {"entries": entries, "names": {}}
+
+
+@pytest.mark.parametrize("log_data", [
+    pytest.param(counter_jumps_forward, id="counter jumps forward"),
+    pytest.param(regular_daily_log_entry, id="regular daily log entry"),
+    pytest.param({"entries": "daily_log_sample", "names": {}}, id="daily log sample"),
+    *[pytest.param(random_log(seed), id=f"random log {seed}") for seed in range(5)]
+])
+def test_fixed_point_equals_decimal(log_data, daily_log_sample, monkeypatch):
+    # setup
+    if log_data["entries"] == "daily_log_sample":
+        log_data = {"entries": daily_log_sample, "names": {}}
+
+    def process(data):
+        monkeypatch.setattr(process_log, "_collect_daily_log_data", Mock(return_value=deepcopy(data)))
+        process_log._factor_to_fixed.cache_clear()
+        return json.dumps(process_log.get_daily_log("20250616"))
+
+    # execution
+    fixed_point_result = process(log_data)
+    monkeypatch.setattr(fixed_point, "to_fixed", Mock(side_effect=ValueError))
+    decimal_result = process(log_data)
+
+    # evaluation
+    assert fixed_point_result == decimal_result
+
+
+def test_fixed_point_rounding():
+    # setup
+    random = Random(0)
+    values = ([round(random.uniform(-5000, 5000), random.randint(0, 9)) for _ in range(2000)] +
+              [random.uniform(-5, 5) for _ in range(2000)] + [0, 0.0, 0.0005, 0.0015, -0.0005, 1.0005, 2.5e-4])
+
+    for current, next in zip(values, values[1:]):
+        time_diff = random.choice([1, 7, 299, 300])
+        # execution and evaluation
+        assert repr(process_log._calculate_energy_difference(current, next)) == repr(
+            process_log._calculate_energy_difference_decimal(current, next))
+        assert repr(process_log._calculate_average_power(time_diff, current, next)) == repr(
+            process_log._calculate_average_power_decimal(time_diff, current, next))
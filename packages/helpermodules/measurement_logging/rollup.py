@@ -0,0 +1,290 @@
+""" Vorberechnete Tages-, Monats- und Jahreswerte für die Ansichten der Logs.
+
+Nach jedem Speichern eines Log-Eintrags wird nur das neue Intervall zwischen dem vorherigen und dem neuen Eintrag
+berechnet und an die vorberechneten Einträge des Zeitraums angehängt. Die Summen, die Aufteilung nach Energiequelle
+und der letzte Rohdatensatz werden je Zeitraum in data/log_rollup/<Typ>/<Zeitraum>.state.json abgelegt. Die
+Jahreswerte werden aus dem jeweils ersten Eintrag der Monats-Logs gebildet.
+
+Abgeschlossene Zeiträume und der laufende Zeitraum werden ohne erneutes Einlesen und Berechnen der Logs ausgeliefert.
+Fehlen die vorberechneten Werte oder passen sie nicht zum Log, werden die Werte wie bisher aus den Logs berechnet.
+"""
+import copy
+import datetime
+from enum import Enum
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from helpermodules import timecheck
+from helpermodules.measurement_logging import process_log
+from helpermodules.measurement_logging.log_storage import (append_entry, log_names, read_entries, read_first_entry,
+                                                           read_last_entry, read_log, read_meta, write_log)
+from helpermodules.measurement_logging.process_log import (CalculationType, add_to_source_totals, add_to_totals,
+                                                           analyse_percentage, apply_source_totals,
+                                                           get_empty_totals, process_entry)
+from helpermodules.measurement_logging.write_log import LegacySmartHomeLogData, LogType, create_entry
+from helpermodules.utils.json_file_handler import write_and_check
+
+log = logging.getLogger(__name__)
+
+
+class RollupType(Enum):
+    DAILY = "daily"
+    MONTHLY = "monthly"
+    YEARLY = "yearly"
+
+
+CALCULATION = {RollupType.DAILY: CalculationType.ALL,
+               RollupType.MONTHLY: CalculationType.ENERGY,
+               RollupType.YEARLY: CalculationType.ENERGY}
+STATE_SUFFIX = ".state.json"
+
+
+def _get_data_path() -> Path:
+    return Path(__file__).resolve().parents[3] / "data"
+
+
+def _rollup_path(rollup_type: RollupType) -> Path:
+    return _get_data_path() / "log_rollup" / rollup_type.value
+
+
+def _log_path(log_type: LogType) -> Path:
+    return _get_data_path() / ("daily_log" if log_type == LogType.DAILY else "monthly_log")
+
+
+def _state_path(rollup_type: RollupType, name: str) -> Path:
+    return _rollup_path(rollup_type) / f"{name}{STATE_SUFFIX}"
+
+
+def _load_state(rollup_type: RollupType, name: str) -> Optional[Dict]:
+    try:
+        with open(_state_path(rollup_type, name), "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _save_state(rollup_type: RollupType, name: str, state: Dict) -> None:
+    write_and_check(str(_state_path(rollup_type, name)), state)
+
+
+def _period_name(rollup_type: RollupType, timestamp: float) -> str:
+    return datetime.datetime.fromtimestamp(timestamp).strftime(
+        {RollupType.DAILY: "%Y%m%d", RollupType.MONTHLY: "%Y%m", RollupType.YEARLY: "%Y"}[rollup_type])
+
+
+def _previous_period_name(rollup_type: RollupType, name: str) -> str:
+    if rollup_type == RollupType.DAILY:
+        return timecheck.get_relative_date_string(name, day_offset=-1)
+    elif rollup_type == RollupType.MONTHLY:
+        return timecheck.get_relative_date_string(name, month_offset=-1)
+    else:
+        return str(int(name) - 1)
+
+
+def _process_interval(rollup_type: RollupType, entry: Dict, next_entry: Dict) -> Dict:
+    # Die Rohdaten dürfen nicht verändert werden, da sie für das nächste Intervall benötigt werden.
+    processed = process_entry(copy.deepcopy(entry), copy.deepcopy(next_entry), CALCULATION[rollup_type])
+    return analyse_percentage(processed)
+
+
+def _add_interval(rollup_type: RollupType, state: Dict, next_entry: Dict) -> Dict:
+    processed = _process_interval(rollup_type, state["last_entry"], next_entry)
+    add_to_totals(state["totals"], processed)
+    add_to_source_totals(state["source_totals"], processed)
+    state["last_entry"] = next_entry
+    state["intervals"] += 1
+    return processed
+
+
+def _get_entries_and_names(rollup_type: RollupType, name: str) -> Tuple[List[Dict], Dict]:
+    if rollup_type == RollupType.YEARLY:
+        return _first_entries_of_months(name)
+    folder = _log_path(LogType(rollup_type.value))
+    return read_entries(folder, name), read_meta(folder, name).get("names", {})
+
+
+def _first_entries_of_months(year: str) -> Tuple[List[Dict], Dict]:
+    """ gibt die ersten Einträge und die Namen der Monats-Logs eines Jahres zurück. Fehlende Monate werden in der
+    Jahresansicht gesondert behandelt, daher wird dann eine leere Liste zurückgegeben.
+    """
+    folder = _log_path(LogType.MONTHLY)
+    months = log_names(folder, year)
+    for month, next_month in zip(months, months[1:]):
+        if timecheck.get_relative_date_string(month, month_offset=1) != next_month:
+            return [], {}
+    entries, names = [], {}
+    for month in months:
+        entry = read_first_entry(folder, month)
+        if entry is not None:
+            entries.append(entry)
+        names.update(read_meta(folder, month).get("names", {}))
+    return entries, names
+
+
+def _build(rollup_type: RollupType, name: str, entries: List[Dict], names: Dict) -> Dict:
+    """ berechnet die Werte eines Zeitraums einmalig vollständig, z.B. nach einem Update.
+    """
+    _rollup_path(rollup_type).mkdir(mode=0o755, parents=True, exist_ok=True)
+    state = {"last_entry": entries[0],
+             "totals": get_empty_totals(),
+             "source_totals": {},
+             "names": names,
+             "intervals": 0,
+             "closed": False}
+    processed = [_add_interval(rollup_type, state, entry) for entry in entries[1:]]
+    write_log(_rollup_path(rollup_type), name, {"entries": processed, "names": names})
+    _save_state(rollup_type, name, state)
+    return state
+
+
+def _add_entry(rollup_type: RollupType, name: str, state: Dict, next_entry: Dict) -> None:
+    processed = _add_interval(rollup_type, state, next_entry)
+    append_entry(_rollup_path(rollup_type), name, processed, state["names"])
+
+
+def _close_previous_period(rollup_type: RollupType, name: str, first_entry: Dict) -> None:
+    """ Das erste Intervall eines Zeitraums, das vom letzten Eintrag des vorherigen Zeitraums ausgeht, gehört zum
+    vorherigen Zeitraum.
+    """
+    previous_name = _previous_period_name(rollup_type, name)
+    state = _load_state(rollup_type, previous_name)
+    if state is None:
+        try:
+            entries, names = _get_entries_and_names(rollup_type, previous_name)
+        except FileNotFoundError:
+            return
+        if not entries:
+            return
+        state = _build(rollup_type, previous_name, entries, names)
+    if rollup_type == RollupType.YEARLY and _period_name(
+            RollupType.MONTHLY, state["last_entry"]["timestamp"]) != f"{previous_name}12":
+        # Fehlt der Dezember, wird in der Jahresansicht der letzte Eintrag des Vormonats verwendet.
+        return
+    if state["closed"] is False:
+        _add_entry(rollup_type, previous_name, state, first_entry)
+        state["closed"] = True
+        _save_state(rollup_type, previous_name, state)
+
+
+def _update(rollup_type: RollupType, name: str, entries: List[Dict], names: Dict) -> None:
+    state = _load_state(rollup_type, name)
+    if len(entries) == 1:
+        _close_previous_period(rollup_type, name, entries[0])
+    if (state is None or len(entries) < 2 or
+            state["last_entry"]["timestamp"] != entries[-2]["timestamp"]):
+        # erster Eintrag oder vorberechnete Werte passen nicht zum Log
+        state = _build(rollup_type, name, entries, names)
+    else:
+        state["names"] = names
+        _add_entry(rollup_type, name, state, entries[-1])
+    _save_state(rollup_type, name, state)
+
+
+def _update_yearly(month: str, entries: List[Dict], names: Dict) -> None:
+    """ Die Jahreswerte werden aus dem ersten Eintrag jedes Monats berechnet.
+    """
+    year = month[:4]
+    if len(entries) == 1 and month.endswith("01"):
+        _close_previous_period(RollupType.YEARLY, year, entries[0])
+    state = _load_state(RollupType.YEARLY, year)
+    if state is not None and len(entries) > 1:
+        state["names"].update(names)
+    elif (state is not None and len(entries) == 1 and timecheck.get_relative_date_string(
+            _period_name(RollupType.MONTHLY, state["last_entry"]["timestamp"]), month_offset=1) == month):
+        state["names"].update(names)
+        _add_entry(RollupType.YEARLY, year, state, entries[0])
+    else:
+        first_entries, month_names = _first_entries_of_months(year)
+        if not first_entries:
+            return
+        state = _build(RollupType.YEARLY, year, first_entries, month_names)
+    _save_state(RollupType.YEARLY, year, state)
+
+
+def update_rollup(log_type: LogType, entries: Optional[List[Dict]]) -> None:
+    """ aktualisiert die vorberechneten Werte, nachdem save_log einen neuen Eintrag geschrieben hat.
+    """
+    try:
+        if not entries:
+            return
+        rollup_type = RollupType(log_type.value)
+        name = _period_name(rollup_type, entries[-1]["timestamp"])
+        names = read_meta(_log_path(log_type), name).get("names", {})
+        _update(rollup_type, name, entries, names)
+        if log_type == LogType.MONTHLY:
+            _update_yearly(name, entries, names)
+    except Exception:
+        log.exception("Fehler beim Aktualisieren der vorberechneten Log-Daten")
+
+
+def _get_view(rollup_type: RollupType, name: str, live_entry: Optional[Dict] = None) -> Optional[Dict]:
+    state = _load_state(rollup_type, name)
+    if state is None:
+        return None
+    if live_entry is None and (state["closed"] is False or state["intervals"] == 0):
+        # Bei einem Zeitraum ohne Folgeeintrag werden die Werte wie bisher aus den Logs berechnet.
+        return None
+    content = read_log(_rollup_path(rollup_type), name)
+    if len(content["entries"]) != state["intervals"]:
+        return None
+    totals = copy.deepcopy(state["totals"])
+    source_totals = copy.deepcopy(state["source_totals"])
+    if live_entry is not None:
+        processed = _process_interval(rollup_type, state["last_entry"], live_entry)
+        add_to_totals(totals, processed)
+        add_to_source_totals(source_totals, processed)
+        content["entries"].append(processed)
+    content["names"] = state["names"]
+    content["totals"] = apply_source_totals(totals, source_totals)
+    return content
+
+
+def _last_entry_matches(rollup_type: RollupType, name: str, entry: Optional[Dict]) -> bool:
+    state = _load_state(rollup_type, name)
+    return entry is not None and state is not None and state["last_entry"]["timestamp"] == entry["timestamp"]
+
+
+def get_daily_log(date: str) -> Dict:
+    data = None
+    try:
+        if date == timecheck.create_timestamp_YYYYMMDD():
+            last_entry = read_last_entry(_log_path(LogType.DAILY), date)
+            if _last_entry_matches(RollupType.DAILY, date, last_entry):
+                data = _get_view(RollupType.DAILY, date, create_entry(
+                    LogType.DAILY, LegacySmartHomeLogData(), last_entry))
+        else:
+            data = _get_view(RollupType.DAILY, date)
+    except Exception:
+        log.exception(f"Fehler beim Lesen der vorberechneten Tageswerte von {date}")
+    return data if data is not None else process_log.get_daily_log(date)
+
+
+def get_monthly_log(date: str) -> Dict:
+    data = None
+    try:
+        if date == timecheck.create_timestamp_YYYYMM():
+            if _last_entry_matches(RollupType.MONTHLY, date, read_last_entry(_log_path(LogType.MONTHLY), date)):
+                data = _get_view(RollupType.MONTHLY, date, read_last_entry(
+                    _log_path(LogType.DAILY), timecheck.create_timestamp_YYYYMMDD()))
+        else:
+            data = _get_view(RollupType.MONTHLY, date)
+    except Exception:
+        log.exception(f"Fehler beim Lesen der vorberechneten Monatswerte von {date}")
+    return data if data is not None else process_log.get_monthly_log(date)
+
+
+def get_yearly_log(year: str) -> Dict:
+    data = None
+    try:
+        if year == timecheck.create_timestamp_YYYY():
+            this_month = timecheck.create_timestamp_YYYYMM()
+            if _last_entry_matches(RollupType.YEARLY, year, read_first_entry(_log_path(LogType.MONTHLY), this_month)):
+                data = _get_view(RollupType.YEARLY, year, read_last_entry(
+                    _log_path(LogType.DAILY), timecheck.create_timestamp_YYYYMMDD()))
+        else:
+            data = _get_view(RollupType.YEARLY, year)
+    except Exception:
+        log.exception(f"Fehler beim Lesen der vorberechneten Jahreswerte von {year}")
+    return data if data is not None else process_log.get_yearly_log(year)
@@ -0,0 +1,98 @@
+import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from helpermodules.measurement_logging import process_log, rollup
+from helpermodules.measurement_logging.log_storage import append_entry, read_entries
+from helpermodules.measurement_logging.write_log import LogType
+
+
+def create_entry(timestamp: float, step: int) -> Dict:
+    return {"timestamp": int(timestamp),
+            "date": datetime.datetime.fromtimestamp(timestamp).strftime("%H:%M"),
+            "cp": {"cp3": {"imported": 1000 + step * 576.123, "exported": 0},
+                   "all": {"imported": 1000 + step * 576.123, "exported": 0}},
+            "ev": {"ev0": {"soc": 50}},
+            "counter": {"counter0": {"imported": 4686.054 + step * 746.3, "exported": 2.396 + step * 0.7,
+                                     "grid": True}},
+            "pv": {"pv1": {"exported": 804 + step * 126}, "all": {"exported": 804 + step * 126}},
+            "bat": {"bat2": {"imported": 2.42 + step * 3.1, "exported": 1742.135 + step * 275.434, "soc": 15},
+                    "all": {"imported": 2.42 + step * 3.1, "exported": 1742.135 + step * 275.434, "soc": 15}},
+            "sh": {},
+            "hc": {"all": {"imported": 100 + step * 10}}}
+
+
+@pytest.fixture
+def data_path(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(rollup, "_get_data_path", lambda: tmp_path)
+    return tmp_path
+
+
+def save_log(data_path: Path, log_type: LogType, name: str, entry: Dict) -> List[Dict]:
+    folder = data_path / ("daily_log" if log_type == LogType.DAILY else "monthly_log")
+    folder.mkdir(parents=True, exist_ok=True)
+    append_entry(folder, name, entry, {"cp3": "Ladepunkt"})
+    entries = read_entries(folder, name)
+    rollup.update_rollup(log_type, entries)
+    return entries
+
+
+def test_daily_rollup_equals_processed_log(data_path: Path, monkeypatch):
+    # setup
+    start = datetime.datetime(2023, 7, 28, 22, 0).timestamp()
+    for step in range(30):
+        timestamp = start + step * 300
+        save_log(data_path, LogType.DAILY, datetime.datetime.fromtimestamp(timestamp).strftime("%Y%m%d"),
+                 create_entry(timestamp, step))
+    raw_entries = read_entries(data_path / "daily_log", "20230728")
+    raw_entries.append(read_entries(data_path / "daily_log", "20230729")[0])
+    monkeypatch.setattr(process_log, "_collect_daily_log_data",
+                        lambda date: {"entries": raw_entries, "names": {"cp3": "Ladepunkt"}})
+    expected = process_log.get_daily_log("20230728")
+    monkeypatch.setattr(process_log, "get_daily_log", lambda date: pytest.fail("Log wurde neu berechnet"))
+
+    # execution
+    data = rollup.get_daily_log("20230728")
+
+    # evaluation
+    assert data == expected
+
+
+def test_unclosed_day_is_calculated_from_log(data_path: Path, monkeypatch):
+    # setup
+    start = datetime.datetime(2023, 7, 28, 22, 0).timestamp()
+    for step in range(3):
+        save_log(data_path, LogType.DAILY, "20230728", create_entry(start + step * 300, step))
+    monkeypatch.setattr(process_log, "get_daily_log", lambda date: {"entries": "aus dem Log berechnet"})
+
+    # execution
+    data = rollup.get_daily_log("20230728")
+
+    # evaluation
+    assert data == {"entries": "aus dem Log berechnet"}
+
+
+def test_yearly_rollup_equals_processed_log(data_path: Path, monkeypatch):
+    # setup
+    step = 0
+    for month in range(1, 13):
+        for day in (1, 15):
+            timestamp = datetime.datetime(2023, month, day, 0, 0).timestamp()
+            save_log(data_path, LogType.MONTHLY, f"2023{month:02}", create_entry(timestamp, step))
+            step += 1
+    save_log(data_path, LogType.MONTHLY, "202401",
+             create_entry(datetime.datetime(2024, 1, 1, 0, 0).timestamp(), step))
+    raw_entries = [read_entries(data_path / "monthly_log", f"2023{month:02}")[0] for month in range(1, 13)]
+    raw_entries.append(read_entries(data_path / "monthly_log", "202401")[0])
+    monkeypatch.setattr(process_log, "_collect_yearly_log_data",
+                        lambda year: {"entries": raw_entries, "names": {"cp3": "Ladepunkt"}})
+    expected = process_log.get_yearly_log("2023")
+    monkeypatch.setattr(process_log, "get_yearly_log", lambda year: pytest.fail("Log wurde neu berechnet"))
+
+    # execution
+    data = rollup.get_yearly_log("2023")
+
+    # evaluation
+    assert data == expected
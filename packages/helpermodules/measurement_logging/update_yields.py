@@ -1,4 +1,3 @@
-import json
 import logging
 from pathlib import Path
 from typing import Dict, List
@@ -9,6 +8,7 @@ from control.ev.ev import Ev
 from control.pv_all import PvAll
 from control.pv import Pv
 from helpermodules import timecheck
+from helpermodules.measurement_logging.log_storage import log_names, read_entries
 from helpermodules.measurement_logging.process_log import get_totals
 from helpermodules.pub import Pub
 
@@ -81,10 +81,9 @@ def _update_pv_monthly_yields():
     """
     try:
         pv_all_monthly_yield = 0
-        with open(f"data/monthly_log/{timecheck.create_timestamp_YYYYMM()}.json", "r") as f:
-            monthly_log = json.load(f)
+        monthly_log_entries = read_entries(_get_parent_path()/"data"/"monthly_log", timecheck.create_timestamp_YYYYMM())
         for pv_module in data.data.pv_data.values():
-            for entry in monthly_log["entries"]:
+            for entry in monthly_log_entries:
                 if entry["pv"].get(f"pv{pv_module.num}"):
                     monthly_yield = data.data.pv_data[f"pv{pv_module.num}"].data.get.exported - \
                         entry["pv"][f"pv{pv_module.num}"]["exported"]
@@ -99,11 +98,9 @@ def _update_pv_monthly_yields():
         log.exception("Fehler beim Veröffentlichen der monatlichen Erträge für PV")
 
 
-def pub_yearly_module_yield(sorted_path_list: List[str], pv_module: Pv):
-    for path in sorted_path_list:
-        with open(path, "r") as f:
-            monthly_log = json.load(f)
-        for entry in monthly_log["entries"]:
+def pub_yearly_module_yield(sorted_log_names: List[str], pv_module: Pv):
+    for name in sorted_log_names:
+        for entry in read_entries(_get_parent_path()/"data"/"monthly_log", name):
             # erster Eintrag mit PV im Jahr,falls WR erst im laufenden Jahr hinzugefügt wurden
             if entry["pv"].get(f"pv{pv_module.num}"):
                 yearly_yield = data.data.pv_data[f"pv{pv_module.num}"].data.get.exported - \
@@ -120,14 +117,12 @@ def _update_pv_yearly_yields():
     """
     try:
         pv_all_yearly_yield = 0
-        path_list = list(Path(_get_parent_path()/"data"/"monthly_log").glob(f"{timecheck.create_timestamp_YYYY()}*"))
-        sorted_path_list = sorted([str(p) for p in path_list])
+        monthly_log_path = _get_parent_path()/"data"/"monthly_log"
+        sorted_log_names = log_names(monthly_log_path, timecheck.create_timestamp_YYYY())
         for pv_module in data.data.pv_data.values():
             found_pv = False
-            for path in sorted_path_list:
-                with open(path, "r") as f:
-                    monthly_log = json.load(f)
-                for entry in monthly_log["entries"]:
+            for name in sorted_log_names:
+                for entry in read_entries(monthly_log_path, name):
                     # erster Eintrag mit PV im Jahr, falls WR erst im laufenden Jahr hinzugefügt wurden
                     if entry["pv"].get(f"pv{pv_module.num}"):
                         yearly_yield = data.data.pv_data[f"pv{pv_module.num}"].data.get.exported - \
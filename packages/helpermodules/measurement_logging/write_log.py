@@ -7,19 +7,21 @@ from pathlib import Path
 import re
 import string
 from paho.mqtt.client import Client as MqttClient, MQTTMessage
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 from control import data
 from helpermodules.broker import BrokerClient
 from helpermodules import timecheck
-from helpermodules.utils.json_file_handler import write_and_check
+from helpermodules.measurement_logging.log_storage import (append_entry, log_names, log_signature, read_entries,
+                                                           read_last_entry)
 from helpermodules.utils.topic_parser import decode_payload, get_index
 from modules.common.utils.component_parser import get_component_name_by_id
 
 log = logging.getLogger(__name__)
 
 # erstellt für jeden Tag eine Datei, die die Daten für den Langzeitgraph enthält.
-#     Dazu werden alle 5 Min folgende Daten als json-Liste gespeichert:
+#     Dazu werden alle 5 Min folgende Daten als Zeile an die Datei angehängt, die Namen liegen in einer separaten
+#     Datei (siehe log_storage). Die Lesefunktionen liefern für beide Formate:
 #     {"entries": [
 #         {
 #             "timestamp": int,
@@ -143,47 +145,76 @@ def save_log(log_type: LogType):
             file_name = timecheck.create_timestamp_YYYYMMDD()
         else:
             file_name = timecheck.create_timestamp_YYYYMM()
-        filepath = str(parent_file / f"{file_name}.json")
-
-        try:
-            with open(filepath, "r") as jsonFile:
-                content = json.load(jsonFile)
-        except FileNotFoundError:
-            content = {"entries": [], "names": {}}
-        except json.JSONDecodeError:
-            new_filepath = str(parent_file / f"{file_name}_invalid.json")
-            os.rename(filepath, new_filepath)
-            content = {"entries": [], "names": {}}
 
-        previous_entry = get_previous_entry(parent_file, content)
+        entries = _get_cached_entries(log_type, parent_file, file_name)
+        previous_entry = get_previous_entry(parent_file, file_name, entries)
 
         sh_log_data = LegacySmartHomeLogData()
         new_entry = create_entry(log_type, sh_log_data, previous_entry)
 
-        # json-Objekt in Datei einfügen
-
-        entries = content["entries"]
+        # Eintrag an Datei anhängen
+        append_entry(parent_file, file_name, new_entry, get_names(new_entry, sh_log_data.sh_names))
         entries.append(new_entry)
-        content["names"] = get_names(content["entries"][-1], sh_log_data.sh_names)
-        write_and_check(filepath, content)
-        return content["entries"]
+        _cached_entries[log_type] = (file_name, log_signature(parent_file, file_name), entries)
+        if log_type == LogType.DAILY:
+            _set_reference_entries(previous_entry, new_entry)
+        return list(entries)
     except Exception:
         log.exception("Fehler beim Speichern des Log-Eintrags")
         return None
 
 
-def get_previous_entry(parent_file: Path, content: Dict) -> Optional[Dict]:
+# Log-Typ -> (Datum, Signatur der Dateien, Einträge) des zuletzt geschriebenen Logs. Das Log wird nur nach dem Start,
+# beim Wechsel des Tages oder Monats oder nach Änderungen durch andere Schreiber (Import, Wiederherstellen einer
+# Sicherung, Migration) eingelesen, danach werden die Einträge für die vorberechneten Werte im Speicher fortgeschrieben.
+_cached_entries: Dict[LogType, Tuple[str, Tuple, List[Dict]]] = {}
+
+
+def _get_cached_entries(log_type: LogType, parent_file: Path, file_name: str) -> List[Dict]:
+    cached = _cached_entries.get(log_type)
+    signature = log_signature(parent_file, file_name)
+    if cached is not None and cached[0] == file_name and cached[1] == signature:
+        return cached[2]
+    try:
+        entries = read_entries(parent_file, file_name)
+    except FileNotFoundError:
+        entries = []
+    except json.JSONDecodeError:
+        # nur im bisherigen Format möglich, im neuen Format werden ungültige Zeilen übersprungen
+        filepath = str(parent_file / f"{file_name}.json")
+        new_filepath = str(parent_file / f"{file_name}_invalid.json")
+        os.rename(filepath, new_filepath)
+        entries = []
+        signature = log_signature(parent_file, file_name)
+    _cached_entries[log_type] = (file_name, signature, entries)
+    return entries
+
+
+# Die beiden zuletzt ins Tages-Log geschriebenen Einträge. Die Ladekosten aller Ladepunkte werden im selben Zyklus
+# daraus berechnet, ohne das Tages-Log je Ladepunkt erneut einzulesen.
+_reference_entries: Optional[List[Dict]] = None
+
+
+def _set_reference_entries(previous_entry: Optional[Dict], new_entry: Dict) -> None:
+    global _reference_entries
+    _reference_entries = [previous_entry, new_entry] if previous_entry is not None else None
+
+
+def get_reference_entries() -> Optional[List[Dict]]:
+    """ gibt den vorherigen und den aktuellen Eintrag des Tages-Logs zurück, sofern save_log seit dem Start einen
+    Eintrag mit Vorgänger geschrieben hat.
+    """
+    return _reference_entries
+
+
+def get_previous_entry(parent_file: Path, file_name: str, entries: List[Dict]) -> Optional[Dict]:
     try:
-        previous_entry = content["entries"][-1]
+        previous_entry = entries[-1]
     except IndexError:
-        # get all files in Folder
-        path_list = parent_file.glob('*.json')
-        # sort path list by name
-        path_list = sorted(path_list, key=lambda x: x.name)
+        # letzten Eintrag des vorherigen Logs verwenden
         try:
-            with open(path_list[-2], "r") as jsonFile:
-                content = json.load(jsonFile)
-            previous_entry = content["entries"][-1]
+            previous_entry = read_last_entry(parent_file, [name for name in log_names(parent_file)
+                                                           if name < file_name][-1])
         except (IndexError, FileNotFoundError, json.decoder.JSONDecodeError):
             previous_entry = None
     return previous_entry
@@ -1,7 +1,8 @@
 from unittest.mock import Mock
 
 from helpermodules.measurement_logging import write_log
-from helpermodules.measurement_logging.write_log import get_names
+from helpermodules.measurement_logging.log_storage import append_entry, read_entries, write_log as write_log_file
+from helpermodules.measurement_logging.write_log import LogType, get_names
 
 
 def test_get_names(daily_log_totals, monkeypatch):
@@ -120,3 +121,37 @@ def test_fix_values_missing_components():
                             'pv': {'all': {'exported': 3269}, 'pv1': {'exported': 0}},
                             'sh': {},
                             'timestamp': 1709109001}
+
+
+def test_get_cached_entries_reads_log_once_per_day(tmp_path, monkeypatch):
+    # setup
+    monkeypatch.setattr(write_log, "_cached_entries", {})
+    mock_read_entries = Mock(wraps=read_entries)
+    monkeypatch.setattr(write_log, "read_entries", mock_read_entries)
+    append_entry(tmp_path, "20240228", {"timestamp": 1}, {})
+
+    # execution
+    entries = write_log._get_cached_entries(LogType.DAILY, tmp_path, "20240228")
+    entries.append({"timestamp": 2})
+    cached_entries = write_log._get_cached_entries(LogType.DAILY, tmp_path, "20240228")
+    next_day_entries = write_log._get_cached_entries(LogType.DAILY, tmp_path, "20240229")
+
+    # evaluation
+    assert cached_entries == [{"timestamp": 1}, {"timestamp": 2}]
+    assert next_day_entries == []
+    assert mock_read_entries.call_count == 2
+
+
+def test_get_cached_entries_rereads_log_rewritten_by_other_writer(tmp_path, monkeypatch):
+    # setup
+    monkeypatch.setattr(write_log, "_cached_entries", {})
+    append_entry(tmp_path, "20240228", {"timestamp": 1}, {})
+    write_log._get_cached_entries(LogType.DAILY, tmp_path, "20240228")
+
+    # execution
+    # zB Import von Daten oder Wiederherstellen einer Sicherung
+    write_log_file(tmp_path, "20240228", {"entries": [{"timestamp": 10}, {"timestamp": 20}], "names": {}})
+    entries = write_log._get_cached_entries(LogType.DAILY, tmp_path, "20240228")
+
+    # evaluation
+    assert entries == [{"timestamp": 10}, {"timestamp": 20}]
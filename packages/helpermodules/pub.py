@@ -1,23 +1,127 @@
 import json
 import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Tuple
+
 import paho.mqtt.publish as publish
 
 from helpermodules.broker import InternalBrokerPublisher
+from helpermodules.update_barrier import update_barrier
 
 
 log = logging.getLogger(__name__)
 
 
 class PubSingleton:
+    # Zeit [s], nach der unveränderte Werte im Bündel-Modus trotzdem erneut veröffentlicht werden, falls das Topic
+    # außerhalb dieses Prozesses geändert wurde.
+    REPUBLISH_INTERVAL = 300
+
     def __init__(self) -> None:
         self.publisher = InternalBrokerPublisher()
         self.publisher.start_loop()
+        self.lock = threading.Lock()
+        self.batch_depth = 0
+        # Topic -> (Payload, qos, retain) der gesammelten, noch nicht veröffentlichten Werte
+        self.pending: Dict[str, Tuple[Any, int, bool]] = {}
+        # Topic -> (json-Payload, Zeitstempel) der zuletzt gebündelt veröffentlichten Werte mit retain-Flag
+        self.last_published: Dict[str, Tuple[str, float]] = {}
+        # Daten-Topic -> (set-Topic, json-Payload) der gebündelt veröffentlichten set-Topics, die SetData noch nicht
+        # übernommen hat. Erst mit der Übernahme wird der Wert in last_published vermerkt, damit ein von SetData
+        # verworfener Wert beim nächsten Mal erneut gesendet wird.
+        self.unconfirmed: Dict[str, Tuple[str, str]] = {}
 
-    def pub(self, topic: str, payload, qos: int = 0, retain: bool = True) -> None:
+    def pub(self, topic: str, payload, qos: int = 0, retain: bool = True, no_json: bool = False) -> None:
+        if self.last_published or self.unconfirmed:
+            self._forget(topic, payload)
         if payload == "":
             self.publisher.client.publish(topic, payload, qos=qos, retain=retain)
         else:
-            self.publisher.client.publish(topic, payload=json.dumps(payload), qos=qos, retain=retain)
+            update_barrier.published(topic)
+            self.publisher.client.publish(topic, payload=payload if no_json else json.dumps(payload), qos=qos,
+                                          retain=retain)
+
+    def pub_batched(self, topic: str, payload, qos: int = 0, retain: bool = True) -> None:
+        """ veröffentlicht den Wert, oder sammelt ihn, wenn der Bündel-Modus aktiv ist. Ein später gesammelter Wert für
+        das gleiche Topic ersetzt den vorherigen.
+        """
+        with self.lock:
+            if self.batch_depth > 0:
+                self.pending.pop(topic, None)
+                self.pending[topic] = (payload, qos, retain)
+                return
+        self.pub(topic, payload, qos=qos, retain=retain)
+
+    @contextmanager
+    def batch(self):
+        """ Bündel-Modus: Werte, die mit pub_batched veröffentlicht werden, werden gesammelt und beim Verlassen des
+        Kontexts bzw. mit flush veröffentlicht.
+        """
+        with self.lock:
+            self.batch_depth += 1
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+            self.flush()
+
+    def flush(self) -> None:
+        """ veröffentlicht die gesammelten Werte. Werte mit retain-Flag, die sich seit der letzten Veröffentlichung
+        nicht geändert haben, werden übersprungen. Bei set-Topics zählt nur die letzte von SetData übernommene
+        Veröffentlichung.
+        """
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            now = time.time()
+            messages = []
+            for topic, (payload, qos, retain) in pending.items():
+                serialized = payload if payload == "" else json.dumps(payload)
+                if retain:
+                    last = self.last_published.get(topic)
+                    if last is not None and last[0] == serialized and now - last[1] < self.REPUBLISH_INTERVAL:
+                        continue
+                    if topic.startswith("openWB/set/"):
+                        self.last_published.pop(topic, None)
+                        if serialized != "":
+                            self.unconfirmed[topic.replace("set/", "", 1)] = (topic, serialized)
+                    else:
+                        self.last_published[topic] = (serialized, now)
+                messages.append((topic, serialized, qos, retain))
+        for topic, serialized, qos, retain in messages:
+            if serialized != "":
+                update_barrier.published(topic)
+            self.publisher.client.publish(topic, payload=serialized, qos=qos, retain=retain)
+        if pending:
+            log.debug(f"{len(messages)} von {len(pending)} gesammelten Werten veröffentlicht.")
+
+    def _forget(self, topic: str, payload) -> None:
+        """ Wird ein Topic außerhalb des Bündel-Modus veröffentlicht, ist der zuletzt gebündelt veröffentlichte Wert
+        nicht mehr aktuell. Ausnahmen: SetData löscht verarbeitete set-Topics, und das Daten-Topic eines übernommenen
+        set-Topics bestätigt den gebündelt veröffentlichten Wert. Wird ein Daten-Topic gelöscht (zB beim Löschen eines
+        Geräts), muss auch das set-Topic erneut gesendet werden.
+        Wird für jedes veröffentlichte Topic aufgerufen, daher nur sperren, wenn das Topic vermerkt ist.
+        """
+        if topic.startswith("openWB/set/"):
+            if payload != "" and topic in self.last_published:
+                with self.lock:
+                    self.last_published.pop(topic, None)
+            return
+        if topic in self.unconfirmed:
+            with self.lock:
+                confirmed = self.unconfirmed.pop(topic, None)
+                if confirmed is not None and payload != "":
+                    self.last_published[confirmed[0]] = (confirmed[1], time.time())
+        if topic in self.last_published:
+            with self.lock:
+                self.last_published.pop(topic, None)
+        if payload == "" and topic.startswith("openWB/"):
+            set_topic = topic.replace("openWB/", "openWB/set/", 1)
+            if set_topic in self.last_published:
+                with self.lock:
+                    self.last_published.pop(set_topic, None)
 
 
 class Pub:
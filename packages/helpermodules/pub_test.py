@@ -0,0 +1,108 @@
+from unittest.mock import MagicMock, Mock, call
+
+import pytest
+
+from helpermodules import pub
+
+
+@pytest.fixture
+def pub_singleton(monkeypatch) -> pub.PubSingleton:
+    monkeypatch.setattr(pub, "InternalBrokerPublisher", Mock())
+    return pub.PubSingleton()
+
+
+def test_pub_batched_without_batch(pub_singleton: pub.PubSingleton):
+    # execution
+    pub_singleton.pub_batched("openWB/set/counter/0/get/power", 100)
+
+    # evaluation
+    pub_singleton.publisher.client.publish.assert_called_once_with(
+        "openWB/set/counter/0/get/power", payload="100", qos=0, retain=True)
+
+
+def test_batch_coalesces_topics(pub_singleton: pub.PubSingleton):
+    # execution
+    with pub_singleton.batch():
+        pub_singleton.pub_batched("openWB/set/counter/0/get/power", 100)
+        pub_singleton.pub_batched("openWB/set/counter/0/get/currents", [1.5, 2, 3])
+        pub_singleton.pub_batched("openWB/set/counter/0/get/power", 200)
+        assert pub_singleton.publisher.client.publish.call_count == 0
+
+    # evaluation
+    assert pub_singleton.publisher.client.publish.mock_calls == [
+        call("openWB/set/counter/0/get/currents", payload="[1.5, 2, 3]", qos=0, retain=True),
+        call("openWB/set/counter/0/get/power", payload="200", qos=0, retain=True)]
+
+
+def set_data_accepts(pub_singleton: pub.PubSingleton, topic: str, payload) -> None:
+    # SetData veröffentlicht den Wert im Daten-Topic und löscht das verarbeitete set-Topic
+    pub_singleton.pub(topic.replace("set/", "", 1), payload)
+    pub_singleton.pub(topic, "")
+
+
+def test_batch_skips_unchanged_retained_values(pub_singleton: pub.PubSingleton):
+    # setup
+    with pub_singleton.batch():
+        pub_singleton.pub_batched("openWB/set/counter/0/get/power", 100)
+        pub_singleton.pub_batched("openWB/set/counter/0/get/imported", 1000)
+    set_data_accepts(pub_singleton, "openWB/set/counter/0/get/power", 100)
+    set_data_accepts(pub_singleton, "openWB/set/counter/0/get/imported", 1000)
+    pub_singleton.publisher.client.publish.reset_mock()
+
+    # execution
+    with pub_singleton.batch():
+        pub_singleton.pub_batched("openWB/set/counter/0/get/power", 100)
+        pub_singleton.pub_batched("openWB/set/counter/0/get/imported", 1001)
+
+    # evaluation
+    pub_singleton.publisher.client.publish.assert_called_once_with(
+        "openWB/set/counter/0/get/imported", payload="1001", qos=0, retain=True)
+
+
+def test_batch_republishes_after_data_topic_removed(pub_singleton: pub.PubSingleton):
+    # setup
+    with pub_singleton.batch():
+        pub_singleton.pub_batched("openWB/set/counter/0/get/power", 100)
+    set_data_accepts(pub_singleton, "openWB/set/counter/0/get/power", 100)
+    pub_singleton.pub("openWB/counter/0/get/power", "")
+    pub_singleton.publisher.client.publish.reset_mock()
+
+    # execution
+    with pub_singleton.batch():
+        pub_singleton.pub_batched("openWB/set/counter/0/get/power", 100)
+
+    # evaluation
+    pub_singleton.publisher.client.publish.assert_called_once_with(
+        "openWB/set/counter/0/get/power", payload="100", qos=0, retain=True)
+
+
+def test_batch_republishes_value_rejected_by_set_data(pub_singleton: pub.PubSingleton):
+    # setup
+    with pub_singleton.batch():
+        pub_singleton.pub_batched("openWB/set/counter/0/get/power", 100)
+    # SetData verwirft den Wert und löscht nur das set-Topic
+    pub_singleton.pub("openWB/set/counter/0/get/power", "")
+    pub_singleton.publisher.client.publish.reset_mock()
+
+    # execution
+    with pub_singleton.batch():
+        pub_singleton.pub_batched("openWB/set/counter/0/get/power", 100)
+
+    # evaluation
+    pub_singleton.publisher.client.publish.assert_called_once_with(
+        "openWB/set/counter/0/get/power", payload="100", qos=0, retain=True)
+
+
+def test_pub_does_not_lock_for_unrelated_topics(pub_singleton: pub.PubSingleton):
+    # setup
+    with pub_singleton.batch():
+        pub_singleton.pub_batched("openWB/set/counter/0/get/power", 100)
+    set_data_accepts(pub_singleton, "openWB/set/counter/0/get/power", 100)
+    pub_singleton.lock = MagicMock()
+
+    # execution
+    pub_singleton.pub("openWB/set/counter/1/get/power", 200)
+    pub_singleton.pub("openWB/counter/1/get/power", 200)
+
+    # evaluation
+    pub_singleton.lock.__enter__.assert_not_called()
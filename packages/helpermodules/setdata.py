@@ -14,7 +14,7 @@ from control import data
 from helpermodules import hardware_configuration, subdata
 from helpermodules.broker import BrokerClient
 from helpermodules.pub import Pub
-from helpermodules.utils.topic_parser import decode_payload, get_index, get_index_position
+from helpermodules.utils.topic_parser import TopicRouter, decode_payload, get_index, get_index_position
 from helpermodules.update_config import UpdateConfig
 import dataclass_utils
 
@@ -35,6 +35,26 @@ class SetData:
         self.event_soc = event_soc
         self.event_subdata_initialized = event_subdata_initialized
         self.heartbeat = False
+        self.topic_router = TopicRouter([
+            ("openWB/set/vehicle/template/ev_template/", self._process_vehicle_ev_template_topic_after_init),
+            ("openWB/set/vehicle/template/charge_template/", self.process_vehicle_charge_template_topic),
+            ("openWB/set/vehicle/", self.process_vehicle_topic),
+            ("openWB/set/chargepoint/(?:.*/)?set/charge_template", self.process_vehicle_charge_template_topic),
+            ("openWB/set/chargepoint/", self.process_chargepoint_topic),
+            ("openWB/set/pv/", self.process_pv_topic),
+            ("openWB/set/bat/", self.process_bat_topic),
+            ("openWB/set/general/", self.process_general_topic),
+            ("openWB/set/(?:internal_)?io/", self.process_io_topic),
+            ("openWB/set/mqtt/", self.process_mqtt_topic),
+            ("openWB/set/optional/", self.process_optional_topic),
+            ("openWB/set/counter/", self.process_counter_topic),
+            ("openWB/set/log/", self.process_log_topic),
+            ("openWB/set/graph/", self.process_graph_topic),
+            ("openWB/set/system/", self.process_system_topic),
+            ("openWB/set/command/", self.process_command_topic),
+            ("openWB/set/internal_chargepoint/", self.process_internal_chargepoint_topic),
+            ("openWB/set/LegacySmartHome/", self.process_legacy_smart_home_topic),
+        ])
 
     def set_data(self):
         self.internal_broker_client = BrokerClient("mqttset", self.on_connect, self.on_message)
@@ -64,47 +84,12 @@ class SetData:
             enthält Topic und Payload
         """
         self.heartbeat = True
-        if decode_payload(msg.payload) != "":
-            mqtt_log.debug(f"Topic: {msg.topic}, Payload: {decode_payload(msg.payload)}")
-            if "openWB/set/vehicle/" in msg.topic:
-                if "openWB/set/vehicle/template/ev_template/" in msg.topic:
-                    self.event_ev_template.wait(5)
-                    self.process_vehicle_ev_template_topic(msg)
-                elif "openWB/set/vehicle/template/charge_template/" in msg.topic:
-                    self.process_vehicle_charge_template_topic(msg)
-                else:
-                    self.process_vehicle_topic(msg)
-            elif "openWB/set/chargepoint/" in msg.topic:
-                if "openWB/set/chargepoint/" in msg.topic and "/set/charge_template" in msg.topic:
-                    self.process_vehicle_charge_template_topic(msg)
-                else:
-                    self.process_chargepoint_topic(msg)
-            elif "openWB/set/pv/" in msg.topic:
-                self.process_pv_topic(msg)
-            elif "openWB/set/bat/" in msg.topic:
-                self.process_bat_topic(msg)
-            elif "openWB/set/general/" in msg.topic:
-                self.process_general_topic(msg)
-            elif ("openWB/set/io/" in msg.topic or "openWB/set/internal_io/" in msg.topic):
-                self.process_io_topic(msg)
-            elif "openWB/set/mqtt/" in msg.topic:
-                self.process_mqtt_topic(msg)
-            elif "openWB/set/optional/" in msg.topic:
-                self.process_optional_topic(msg)
-            elif "openWB/set/counter/" in msg.topic:
-                self.process_counter_topic(msg)
-            elif "openWB/set/log/" in msg.topic:
-                self.process_log_topic(msg)
-            elif "openWB/set/graph/" in msg.topic:
-                self.process_graph_topic(msg)
-            elif "openWB/set/system/" in msg.topic:
-                self.process_system_topic(msg)
-            elif "openWB/set/command/" in msg.topic:
-                self.process_command_topic(msg)
-            elif "openWB/set/internal_chargepoint/" in msg.topic:
-                self.process_internal_chargepoint_topic(msg)
-            elif "openWB/set/LegacySmartHome/" in msg.topic:
-                self.process_legacy_smart_home_topic(msg)
+        payload = decode_payload(msg.payload)
+        if payload != "":
+            mqtt_log.debug("Topic: %s, Payload: %s", msg.topic, payload)
+            handler = self.topic_router.resolve(msg.topic)
+            if handler is not None:
+                handler(msg)
 
     def _validate_value(self, msg: mqtt.MQTTMessage, data_type, ranges=[], collection=None, pub_json=False,
                         retain: bool = True):
@@ -438,6 +423,10 @@ class SetData:
         except Exception:
             log.exception(f"Fehler im setdata-Modul: Topic {msg.topic}, Value: {msg.payload}")
 
+    def _process_vehicle_ev_template_topic_after_init(self, msg: mqtt.MQTTMessage):
+        self.event_ev_template.wait(5)
+        self.process_vehicle_ev_template_topic(msg)
+
     def process_vehicle_ev_template_topic(self, msg: mqtt.MQTTMessage):
         try:
             if "ev_template" in msg.topic:
@@ -1053,6 +1042,8 @@ class SetData:
                 self._validate_value(msg, str)
             elif "openWB/set/system/time" in msg.topic:
                 self._validate_value(msg, float)
+            elif "openWB/set/system/cycle_timing" in msg.topic:
+                self._validate_value(msg, "json")
             elif "openWB/set/system/datastore_version" in msg.topic:
                 self._validate_value(msg, int, [(0, UpdateConfig.DATASTORE_VERSION)], collection=list)
             elif "openWB/set/system/GetRemoteSupport" in msg.topic:
@@ -1066,6 +1057,8 @@ class SetData:
                     Pub().pub(msg.topic, "")
             elif "openWB/set/system/debug_level" in msg.topic:
                 self._validate_value(msg, int, [(10, 10), (20, 20), (30, 30)])
+            elif "openWB/set/system/debug_full_state_interval" in msg.topic:
+                self._validate_value(msg, int, [(1, None)])
             elif ("openWB/set/system/ip_address" in msg.topic or
                   "openWB/set/system/hostname" in msg.topic or
                   "openWB/set/system/release_train" in msg.topic):
@@ -27,8 +27,9 @@ from helpermodules.mosquitto_dynsec.role_handler import add_acl_role, remove_acl
 from helpermodules.mosquitto_dynsec.user_handler import remove_display_user, create_display_user
 from helpermodules.utils import ProcessingCounter
 from helpermodules.utils.run_command import run_command
-from helpermodules.utils.topic_parser import decode_payload, get_index, get_second_index
+from helpermodules.utils.topic_parser import TopicRouter, decode_payload, get_index, get_second_index
 from helpermodules.pub import Pub
+from helpermodules.update_barrier import update_barrier
 from dataclass_utils import asdict, dataclass_from_dict
 from modules.common.abstract_vehicle import CalculatedSocState, GeneralVehicleConfig
 from modules.common.configurable_backup_cloud import ConfigurableBackupCloud
@@ -40,6 +41,8 @@ from modules.vehicles.manual.config import ManualSoc
 
 log = logging.getLogger(__name__)
 mqtt_log = logging.getLogger("mqtt")
+# Name nach dem letzten /
+KEY_NAME_REGEX = re.compile("/([a-z,A-Z,0-9,_]+)(?!.*/)")
 
 
 class SubData:
@@ -71,6 +74,14 @@ class SubData:
     optional_data = optional.Optional()
     system_data = {"system": system.System()}
     graph_data = graph.Graph()
+    # Generation je Objekt, wird bei jeder Änderung erhöht. Data.copy_data kopiert nur die Objekte neu, deren
+    # Generation sich seit dem letzten Kopieren geändert hat.
+    generations: Dict[str, int] = {}
+
+    @classmethod
+    def bump_generation(cls, name: str, key: str) -> None:
+        generation_key = f"{name}/{key}"
+        cls.generations[generation_key] = cls.generations.get(generation_key, 0) + 1
 
     def __init__(self,
                  event_ev_template: Event,
@@ -110,6 +121,30 @@ class SubData:
         # Wenn subdata_initialized empfangen wird, wird der Zäheler runtergezählt. Erst wenn alle subdata_initialized
         # empfangen wurden, wurden auch die vorher subskribierten Topics empfangen und der Algorithmus kann starten.
         self.processing_counter = ProcessingCounter(self.event_subdata_initialized)
+        self.topic_router = TopicRouter([
+            ("openWB/vehicle/template/charge_template/",
+             lambda client, msg: self.process_vehicle_charge_template_topic(self.ev_charge_template_data, msg)),
+            ("openWB/vehicle/template/ev_template/",
+             lambda client, msg: self.process_vehicle_ev_template_topic(self.ev_template_data, msg)),
+            ("openWB/vehicle/", lambda client, msg: self.process_vehicle_topic(client, self.ev_data, msg)),
+            ("openWB/chargepoint/template/",
+             lambda client, msg: self.process_chargepoint_template_topic(self.cp_template_data, msg)),
+            ("openWB/chargepoint/", lambda client, msg: self.process_chargepoint_topic(self.cp_data, msg)),
+            ("openWB/pv/", lambda client, msg: self.process_pv_topic(self.pv_data, msg)),
+            ("openWB/bat/", lambda client, msg: self.process_bat_topic(self.bat_data, msg)),
+            ("openWB/general/", lambda client, msg: self.process_general_topic(self.general_data, msg)),
+            ("openWB/graph/", lambda client, msg: self.process_graph_topic(self.graph_data, msg)),
+            ("openWB/io/action", lambda client, msg: self.process_io_topic(self.io_actions, msg)),
+            ("openWB/(?:internal_)?io/states", lambda client, msg: self.process_io_topic(self.io_states, msg)),
+            ("openWB/internal_chargepoint/", lambda client, msg: self.process_internal_chargepoint_topic(
+                client, self.internal_chargepoint_data, msg)),
+            ("openWB/optional/", lambda client, msg: self.process_optional_topic(self.optional_data, msg)),
+            ("openWB/counter/", lambda client, msg: self.process_counter_topic(self.counter_data, msg)),
+            ("openWB/system/", lambda client, msg: self.process_system_topic(client, self.system_data, msg)),
+            ("openWB/LegacySmartHome/", lambda client, msg: self.process_legacy_smarthome_topic(
+                client, self.counter_all_data, msg)),
+            ("openWB/command/command_completed$", lambda client, msg: self.event_command_completed.set()),
+        ])
 
     def sub_topics(self):
         self.internal_broker_client = BrokerClient("mqttsub", self.on_connect, self.on_message)
@@ -158,46 +193,16 @@ class SubData:
     def on_message(self, client: mqtt.Client, userdata, msg: mqtt.MQTTMessage):
         """ wait for incoming topics.
         """
-        mqtt_log.debug("Topic: "+str(msg.topic) +
-                       ", Payload: "+str(msg.payload.decode("utf-8")))
+        if mqtt_log.isEnabledFor(logging.DEBUG):
+            mqtt_log.debug("Topic: "+str(msg.topic) +
+                           ", Payload: "+str(msg.payload.decode("utf-8")))
         self.heartbeat = True
-        if "openWB/vehicle/template/charge_template/" in msg.topic:
-            self.process_vehicle_charge_template_topic(
-                self.ev_charge_template_data, msg)
-        elif "openWB/vehicle/template/ev_template/" in msg.topic:
-            self.process_vehicle_ev_template_topic(self.ev_template_data, msg)
-        elif "openWB/vehicle/" in msg.topic:
-            self.process_vehicle_topic(client, self.ev_data, msg)
-        elif "openWB/chargepoint/template/" in msg.topic:
-            self.process_chargepoint_template_topic(self.cp_template_data, msg)
-        elif "openWB/chargepoint/" in msg.topic:
-            self.process_chargepoint_topic(self.cp_data, msg)
-        elif "openWB/pv/" in msg.topic:
-            self.process_pv_topic(self.pv_data, msg)
-        elif "openWB/bat/" in msg.topic:
-            self.process_bat_topic(self.bat_data, msg)
-        elif "openWB/general/" in msg.topic:
-            self.process_general_topic(self.general_data, msg)
-        elif "openWB/graph/" in msg.topic:
-            self.process_graph_topic(self.graph_data, msg)
-        elif "openWB/io/action" in msg.topic:
-            self.process_io_topic(self.io_actions, msg)
-        elif "openWB/io/states" in msg.topic or "openWB/internal_io/states" in msg.topic:
-            self.process_io_topic(self.io_states, msg)
-        elif "openWB/internal_chargepoint/" in msg.topic:
-            self.process_internal_chargepoint_topic(client, self.internal_chargepoint_data, msg)
-        elif "openWB/optional/" in msg.topic:
-            self.process_optional_topic(self.optional_data, msg)
-        elif "openWB/counter/" in msg.topic:
-            self.process_counter_topic(self.counter_data, msg)
-        elif "openWB/system/" in msg.topic:
-            self.process_system_topic(client, self.system_data, msg)
-        elif "openWB/LegacySmartHome/" in msg.topic:
-            self.process_legacy_smarthome_topic(client, self.counter_all_data, msg)
-        elif "openWB/command/command_completed" == msg.topic:
-            self.event_command_completed.set()
-        else:
+        handler = self.topic_router.resolve(msg.topic)
+        if handler is None:
             log.warning("unknown subdata-topic: "+str(msg.topic))
+        else:
+            handler(client, msg)
+        update_barrier.applied(msg.topic)
 
     def set_json_payload(self, dict: Dict, msg: mqtt.MQTTMessage) -> None:
         """ dekodiert das JSON-Objekt und setzt diesen für den Value in das übergebene Dictionary, als Key wird der
@@ -211,7 +216,7 @@ class SubData:
             enthält den Payload als json-Objekt
         """
         try:
-            regex = re.search("/([a-z,A-Z,0-9,_]+)(?!.*/)", msg.topic)
+            regex = KEY_NAME_REGEX.search(msg.topic)
             if regex is None:
                 raise Exception(f"Couldn't find key-name in {msg.topic}")
             key = regex.group(1)
@@ -235,7 +240,7 @@ class SubData:
             enthält den Payload als json-Objekt
         """
         try:
-            regex = re.search("/([a-z,A-Z,0-9,_]+)(?!.*/)", msg.topic)
+            regex = KEY_NAME_REGEX.search(msg.topic)
             if regex:
                 key = regex.group(1)
                 if msg.payload:
@@ -332,6 +337,7 @@ class SubData:
                                             cp.chargepoint.data.config.ev == ev_id):
                                         cp.chargepoint.update_charge_template(
                                             self.ev_charge_template_data[f"ct{charge_template_id}"])
+                self.bump_generation("ev_data", "ev"+index)
         except Exception:
             log.exception("Fehler im subdata-Modul")
 
@@ -356,6 +362,7 @@ class SubData:
                 new_charge_template = dataclass_from_dict(ChargeTemplateData, decode_payload(msg.payload))
                 template_changed = new_charge_template != var["ct"+index].data
                 var["ct"+index].data = new_charge_template
+                self.bump_generation("ev_charge_template_data", "ct"+index)
                 if template_changed and self.general_data.data.temporary_charge_templates_active:
                     # Temporäres ChargeTemplate aktualisieren, wenn persistentes geändert wird
                     for vehicle in self.ev_data.values():
@@ -394,6 +401,7 @@ class SubData:
                     if "et"+index not in var:
                         var["et"+index] = EvTemplate()
                     var["et" + index].data = dataclass_from_dict(EvTemplateData, decode_payload(msg.payload))
+                    self.bump_generation("ev_template_data", "et"+index)
                     self.event_ev_template.set()
         except Exception:
             log.exception("Fehler im subdata-Modul")
@@ -530,6 +538,7 @@ class SubData:
                 if "cpt"+index not in var:
                     var["cpt"+index] = CpTemplate()
                 var["cpt"+index].data = dataclass_from_dict(CpTemplateData, payload)
+                self.bump_generation("cp_template_data", "cpt"+index)
         except Exception:
             log.exception("Fehler im subdata-Modul")
 
@@ -1056,7 +1065,8 @@ class SubData:
                 if "module_update_completed" in msg.topic:
                     self.event_module_update_completed.set()
                 elif ("openWB/system/available_branches" == msg.topic or
-                      "openWB/system/time" == msg.topic):
+                      "openWB/system/time" == msg.topic or
+                      "openWB/system/cycle_timing" == msg.topic):
                     # Logged in update.log, not used in data.data and removed due to readability purposes of main.log.
                     return
                 elif "openWB/system/subdata_initialized" == msg.topic:
@@ -1087,6 +1097,7 @@ class SubData:
         try:
             if re.search("/graph/config/", msg.topic) is not None:
                 self.set_json_payload_class(var.data.config, msg)
+                self.bump_generation("graph_data", "graph")
         except Exception:
             log.exception("Fehler im subdata-Modul")
 
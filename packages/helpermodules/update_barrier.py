@@ -0,0 +1,100 @@
+""" Barriere, um ohne Umweg über den Broker festzustellen, ob alle veröffentlichten Werte in SubData übernommen wurden.
+
+Veröffentlichte set-Topics werden von SetData geprüft und ohne "set/" erneut veröffentlicht, bevor SubData sie
+übernimmt. Die Barriere merkt sich je Topic in Veröffentlichungsreihenfolge den Zyklus jedes noch nicht übernommenen
+Werts, da die Werte eines Topics in derselben Reihenfolge übernommen werden. Nach einem Timeout beginnt ein neuer
+Zyklus, die ausstehenden Werte des vorherigen Zyklus werden aber weiter zugeordnet, damit ein verspätet übernommener
+alter Wert nicht als Übernahme des neuen Werts gezählt wird.
+Werden Werte von SetData verworfen oder von SubData nicht abonniert, wird die Barriere nicht frei und die Regelung
+wartet wie bisher auf das Echo des module_update_completed-Topics vom Broker. Diese Topics werden danach nicht mehr
+gezählt, bis SubData wieder einen Wert übernimmt.
+"""
+import logging
+from collections import deque
+from threading import Event, Lock
+from typing import Deque, Dict, Set
+
+log = logging.getLogger(__name__)
+
+SET_PREFIX = "openWB/set/"
+
+
+class UpdateBarrier:
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.cycle = 0
+        # Topic ohne "set/" -> Zyklen der veröffentlichten, noch nicht übernommenen Werte
+        self.pending: Dict[str, Deque[int]] = {}
+        # Anzahl der noch nicht übernommenen Werte des aktuellen Zyklus
+        self.open = 0
+        # Topics, die trotz Echo vom Broker nicht übernommen wurden (von SetData verworfen, nicht abonniert, ...)
+        self.ignored: Set[str] = set()
+        self.completed = Event()
+
+    def published(self, topic: str) -> None:
+        """ muss vor dem Veröffentlichen aufgerufen werden, damit die Übernahme nicht vor der Zählung erfolgt.
+        """
+        if topic.startswith(SET_PREFIX):
+            topic = "openWB/" + topic[len(SET_PREFIX):]
+            if topic not in self.ignored:
+                with self.lock:
+                    self.pending.setdefault(topic, deque()).append(self.cycle)
+                    self.open += 1
+
+    def applied(self, topic: str) -> None:
+        if self.ignored and topic in self.ignored:
+            # Der Wert wurde wieder übernommen, daher ab dem nächsten Veröffentlichen wieder darauf warten.
+            with self.lock:
+                self.ignored.discard(topic)
+        if self.pending:
+            with self.lock:
+                cycles = self.pending.get(topic)
+                if cycles is None:
+                    return
+                cycle = cycles.popleft()
+                if not cycles:
+                    self.pending.pop(topic)
+                if cycle == self.cycle:
+                    self.open -= 1
+                    if self.open == 0:
+                        self.completed.set()
+
+    def wait(self, timeout: float) -> bool:
+        """ wartet, bis alle im aktuellen Zyklus veröffentlichten Werte übernommen wurden.
+        """
+        with self.lock:
+            if self.open == 0:
+                return True
+            self.completed.clear()
+        return self.completed.wait(timeout)
+
+    def pending_topics(self) -> Set[str]:
+        with self.lock:
+            return {topic for topic, cycles in self.pending.items() if cycles[-1] == self.cycle}
+
+    def ignore_pending(self, pending_before_echo: Set[str]) -> None:
+        """ Das Echo vom Broker wurde empfangen. Topics, die bereits vor dem Veröffentlichen der Markierung
+        ausstanden, wurden verworfen und werden nicht mehr gezählt, bis sie wieder übernommen werden.
+        """
+        with self.lock:
+            not_applied = pending_before_echo.intersection(self.pending.keys())
+            if not_applied:
+                log.debug(f"Nicht übernommene Topics: {not_applied}")
+                self.ignored.update(not_applied)
+                for topic in not_applied:
+                    self.pending.pop(topic)
+            self._next_cycle()
+
+    def reset(self) -> None:
+        """ beginnt nach einem Timeout einen neuen Zyklus. Die ausstehenden Werte bleiben zugeordnet, bis sie übernommen
+        oder nach dem Echo vom Broker verworfen werden.
+        """
+        with self.lock:
+            self._next_cycle()
+
+    def _next_cycle(self) -> None:
+        self.cycle += 1
+        self.open = 0
+
+
+update_barrier = UpdateBarrier()
@@ -0,0 +1,72 @@
+from helpermodules.update_barrier import UpdateBarrier
+
+
+def test_wait_returns_when_all_values_applied():
+    # setup
+    barrier = UpdateBarrier()
+    barrier.published("openWB/set/counter/0/get/power")
+    barrier.published("openWB/set/counter/0/get/power")
+    barrier.published("openWB/set/counter/0/get/currents")
+
+    # execution
+    barrier.applied("openWB/counter/0/get/power")
+    barrier.applied("openWB/counter/0/get/currents")
+    partially_applied = barrier.wait(0)
+    barrier.applied("openWB/counter/0/get/power")
+
+    # evaluation
+    assert partially_applied is False
+    assert barrier.wait(0) is True
+
+
+def test_ignore_values_not_applied_before_echo():
+    # setup
+    barrier = UpdateBarrier()
+    barrier.published("openWB/set/counter/0/get/invalid")
+    pending_before_echo = barrier.pending_topics()
+    barrier.published("openWB/set/counter/0/get/power")
+
+    # execution
+    barrier.ignore_pending(pending_before_echo)
+    barrier.published("openWB/set/counter/0/get/invalid")
+    barrier.published("openWB/set/counter/0/get/power")
+
+    # evaluation
+    assert barrier.pending_topics() == {"openWB/counter/0/get/power"}
+
+
+def test_await_ignored_topic_again_after_applied():
+    # setup
+    barrier = UpdateBarrier()
+    barrier.published("openWB/set/counter/0/get/power")
+    barrier.ignore_pending(barrier.pending_topics())
+    barrier.published("openWB/set/counter/0/get/power")
+    pending_while_ignored = barrier.pending_topics()
+
+    # execution
+    barrier.applied("openWB/counter/0/get/power")
+    barrier.published("openWB/set/counter/0/get/power")
+    pending_next_cycle = barrier.pending_topics()
+    barrier.applied("openWB/counter/0/get/power")
+
+    # evaluation
+    assert pending_while_ignored == set()
+    assert pending_next_cycle == {"openWB/counter/0/get/power"}
+    assert barrier.wait(0) is True
+
+
+def test_late_echo_after_reset_not_counted_for_next_cycle():
+    # setup
+    barrier = UpdateBarrier()
+    barrier.published("openWB/set/counter/0/get/power")
+    barrier.reset()
+    barrier.published("openWB/set/counter/0/get/power")
+
+    # execution
+    barrier.applied("openWB/counter/0/get/power")
+    applied_late_echo = barrier.wait(0)
+    barrier.applied("openWB/counter/0/get/power")
+
+    # evaluation
+    assert applied_late_echo is False
+    assert barrier.wait(0) is True
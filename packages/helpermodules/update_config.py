@@ -26,6 +26,7 @@ from helpermodules.hardware_configuration import (
     update_hardware_configuration,
     get_serial_number
 )
+from helpermodules.measurement_logging.log_storage import migrate_log_folder
 from helpermodules.measurement_logging.process_log import get_default_charge_log_columns, get_totals
 from helpermodules.measurement_logging.write_log import get_names
 from helpermodules.messaging import MessageType, pub_system_message
@@ -34,6 +35,7 @@ from helpermodules.utils.json_file_handler import write_and_check
 from helpermodules.utils.run_command import run_command
 from helpermodules.utils.topic_parser import decode_payload, get_index, get_second_index
 from control import counter_all
+from control.chargelog import chargelog_storage
 from control.bat_all import BatConsiderationMode
 from control.chargepoint.charging_type import ChargingType
 from control.counter import get_counter_default_config
@@ -57,7 +59,7 @@ NO_MODULE = {"type": None, "configuration": {}}
 
 class UpdateConfig:
 
-    DATASTORE_VERSION = 112
+    DATASTORE_VERSION = 114
 
     valid_topic = [
         "^openWB/bat/config/bat_control_permitted$",
@@ -478,6 +480,7 @@ class UpdateConfig:
 
         "^openWB/system/available_branches",
         "^openWB/system/backup_cloud/config$",
+        "^openWB/system/cycle_timing$",
         "^openWB/system/boot_done$",
         "^openWB/system/configurable/backup_clouds$",
         "^openWB/system/backup_cloud/backup_before_update$",
@@ -500,6 +503,7 @@ class UpdateConfig:
         "^openWB/system/dataprotection_acknowledged$",
         "^openWB/system/installAssistantDone$",
         "^openWB/system/datastore_version",
+        "^openWB/system/debug_full_state_interval$",
         "^openWB/system/debug_level$",
         "^openWB/system/device/[0-9]+/component/[0-9]+/config$",
         "^openWB/system/device/[0-9]+/component/[0-9]+/simulation$",
@@ -647,6 +651,7 @@ class UpdateConfig:
         ("openWB/system/datastore_version", list(range(DATASTORE_VERSION))),
         ("openWB/system/usage_terms_acknowledged", False),
         ("openWB/system/debug_level", 30),
+        ("openWB/system/debug_full_state_interval", 1),
         ("openWB/system/device/module_update_completed", True),
         ("openWB/system/hostname", "unknown"),
         ("openWB/system/ip_address", "unknown"),
@@ -2858,3 +2863,14 @@ class UpdateConfig:
         run_command(['pip', 'uninstall', 'bimmer_connected', '-y'], process_exception=True)
         self._loop_all_received_topics(upgrade)
         self._append_datastore_version(112)
+
+    def upgrade_datastore_113(self) -> None:
+        # Tages- und Monats-Logs in das zeilenweise Format überführen, an das neue Einträge angehängt werden
+        migrate_log_folder(self.base_path / "data" / "daily_log")
+        migrate_log_folder(self.base_path / "data" / "monthly_log")
+        self._append_datastore_version(113)
+
+    def upgrade_datastore_114(self) -> None:
+        # Ladelogs in das zeilenweise Format mit Index überführen
+        chargelog_storage.migrate_all()
+        self._append_datastore_version(114)
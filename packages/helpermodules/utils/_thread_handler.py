@@ -1,7 +1,8 @@
 import logging
-from threading import Thread, enumerate
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import Lock, Thread, current_thread, enumerate
 import time
-from typing import List, Optional
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 
 log = logging.getLogger(__name__)
 
@@ -56,3 +57,76 @@ def thread_handler(thread: Thread) -> bool:
 
 def is_thread_alive(thread_name: str) -> bool:
     return any(running_thread.name == thread_name for running_thread in enumerate())
+
+
+class Task(NamedTuple):
+    target: Callable
+    args: Tuple = ()
+    name: str = ""
+
+
+class TaskExecutor:
+    """ persistenter Thread-Pool mit begrenzter Anzahl Threads für die zyklischen Abfragen. Im Gegensatz zu
+    joined_thread_handler werden keine Threads je Zyklus erzeugt. Eine Aufgabe, die noch nicht beendet ist (zB weil
+    ein Gerät nicht antwortet), wird nicht erneut gestartet, sodass hängende Aufgaben nicht je Zyklus einen weiteren
+    Thread belegen. Die Namen der Aufgaben müssen daher eindeutig sein.
+    """
+
+    def __init__(self,
+                 max_workers: int = 50,
+                 thread_name_prefix: str = "TaskExecutor",
+                 task_finished: Optional[Callable[[str, float], None]] = None) -> None:
+        # wird mit Name und Laufzeit [s] jeder beendeten Aufgabe aufgerufen
+        self.task_finished = task_finished
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.lock = Lock()
+        self.futures: Dict[str, Future] = {}
+
+    def run(self, tasks: List[Task], timeout: Optional[float]) -> List[str]:
+        """ führt die Aufgaben aus und wartet bis zum Timeout auf deren Ende.
+
+        Return
+        ------
+        Namen der Aufgaben, die nicht gestartet wurden oder nicht innerhalb des Timeouts beendet wurden
+        """
+        not_finished_tasks = []
+        futures: Dict[str, Future] = {}
+        with self.lock:
+            for task in tasks:
+                future = self.futures.get(task.name)
+                if future is not None and future.done() is False:
+                    log.error(f"{task.name} ist bereits aktiv und wird nicht erneut gestartet.")
+                    not_finished_tasks.append(task.name)
+                else:
+                    futures[task.name] = self.futures[task.name] = self.executor.submit(self._run_task, task)
+        if futures:
+            _, not_done = wait(futures.values(), timeout)
+            for name, future in futures.items():
+                if future in not_done:
+                    # Aufgaben, die wegen belegter Threads noch nicht gestartet wurden, verwerfen, damit sie nicht
+                    # in der Warteschlange bleiben und im nächsten Zyklus wieder gestartet werden können.
+                    if future.cancel():
+                        with self.lock:
+                            if self.futures.get(name) is future:
+                                self.futures.pop(name)
+                        log.error(f"{name} wurde nicht innerhalb des Timeouts gestartet, da alle Threads belegt sind.")
+                    else:
+                        log.error(f"{name} konnte nicht innerhalb des Timeouts abgearbeitet werden.")
+                    not_finished_tasks.append(name)
+        return not_finished_tasks
+
+    def _run_task(self, task: Task) -> None:
+        # Der Thread-Name wird für die Zuordnung der Log-Meldungen verwendet, daher wie bisher den Namen der Aufgabe
+        # verwenden.
+        thread = current_thread()
+        pool_name = thread.name
+        thread.name = task.name
+        start = time.perf_counter()
+        try:
+            task.target(*task.args)
+        except Exception:
+            log.exception(f"Fehler in {task.name}")
+        finally:
+            thread.name = pool_name
+            if self.task_finished is not None:
+                self.task_finished(task.name, time.perf_counter() - start)
@@ -0,0 +1,67 @@
+from threading import Event, current_thread
+
+from helpermodules.utils._thread_handler import Task, TaskExecutor
+
+
+def test_task_executor_runs_tasks_with_task_name():
+    # setup
+    executor = TaskExecutor(max_workers=2)
+    names = []
+
+    # execution
+    not_finished = executor.run([Task(target=lambda: names.append(current_thread().name), name="device1"),
+                                 Task(target=lambda: names.append(current_thread().name), name="device2")], 1)
+
+    # evaluation
+    assert not_finished == []
+    assert sorted(names) == ["device1", "device2"]
+
+
+def test_task_executor_does_not_restart_hung_task():
+    # setup
+    executor = TaskExecutor(max_workers=2)
+    release = Event()
+    calls = []
+
+    def hung():
+        calls.append(1)
+        release.wait(5)
+
+    # execution
+    first = executor.run([Task(target=hung, name="device1")], 0.1)
+    second = executor.run([Task(target=hung, name="device1"), Task(target=lambda: None, name="device2")], 1)
+    release.set()
+
+    # evaluation
+    assert first == ["device1"]
+    assert second == ["device1"]
+    assert len(calls) == 1
+
+
+def test_task_executor_cancels_tasks_not_started_within_timeout():
+    # setup
+    executor = TaskExecutor(max_workers=50)
+    release = Event()
+    started = []
+    rerun = []
+
+    def hung(name):
+        started.append(name)
+        release.wait(5)
+    tasks = [Task(target=hung, args=(f"device{i}",), name=f"device{i}") for i in range(60)]
+
+    # execution
+    first = executor.run(tasks, 0.2)
+    queued = sorted(set(first) - set(started))
+    queued_in_futures = [name for name in queued if name in executor.futures]
+    release.set()
+    second = executor.run([Task(target=rerun.append, args=(name,), name=name) for name in queued], 1)
+    executor.executor.shutdown(wait=True)
+
+    # evaluation
+    assert len(first) == 60
+    assert len(queued) == 10
+    assert queued_in_futures == []
+    assert second == []
+    assert sorted(rerun) == queued
+    assert len(started) == 50
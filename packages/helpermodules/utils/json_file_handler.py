@@ -1,49 +1,80 @@
+import hashlib
 import json
 import logging
 import os
-import shutil
+import stat
+import tempfile
 
 log = logging.getLogger(__name__)
 
+CHECKSUM_SUFFIX = ".sha256"
+TEMP_SUFFIX = ".tmp"
+# mkstemp legt die temporäre Datei nur für den Besitzer lesbar an. Neue Dateien erhalten wie mit open() die Rechte
+# gemäß umask.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
 
-def write_and_check(file_path, content):
+
+def write_and_check(file_path, content, checksum: bool = False):
     """
-    Schreibt den Inhalt in die Datei und überprüft, ob der Inhalt erfolgreich geschrieben wurde.
-    Falls nicht, wird die Sicherung wiederhergestellt und der Schreibvorgang einmalig erneut durchgeführt.
-    Schlägt der Schreibvorgang wieder fehl, wird die Sicherung wiederhergestellt.
+    Schreibt den Inhalt atomar in die Datei: Der Inhalt wird in eine temporäre Datei im selben Verzeichnis geschrieben,
+    mit fsync auf den Datenträger gebracht und dann über die bisherige Datei umbenannt. Anschließend wird das
+    Verzeichnis mit fsync gesichert. Wird der Schreibvorgang unterbrochen, bleibt die bisherige Datei vollständig
+    erhalten, sodass weder eine Sicherung noch das erneute Einlesen zur Prüfung nötig ist.
+    Mit checksum wird zusätzlich die SHA-256-Prüfsumme des Inhalts in <Datei>.sha256 geschrieben, siehe
+    verify_checksum.
+    Fehler werden an den Aufrufer weitergegeben, die temporäre Datei wird zuvor entfernt.
     """
-    def _write_and_check():
-        with open(file_path, 'w', encoding="utf-8") as file:
-            json.dump(content, file)
-        with open(file_path, 'r', encoding="utf-8") as file:
-            written_content = json.load(file)
-            if content != written_content:
-                raise ValueError("Der geschriebene Inhalt stimmt nicht mit dem erwarteten Inhalt überein.")
-
-    def restore_backup():
-        shutil.copyfile(backup_path, file_path)
-        log.debug("Sicherung erfolgreich wiederhergestellt.")
-
-    def handle_broken_file():
-        restore_backup()
+    data = json.dumps(content).encode("utf-8")
+    _write_atomic(file_path, data)
+    if checksum:
+        _write_atomic(file_path + CHECKSUM_SUFFIX, hashlib.sha256(data).hexdigest().encode("utf-8"))
+
+
+def verify_checksum(file_path) -> bool:
+    """ prüft, ob der Inhalt der Datei zu der mit write_and_check(..., checksum=True) geschriebenen Prüfsumme passt.
+    """
+    try:
+        with open(file_path, "rb") as file:
+            digest = hashlib.sha256(file.read()).hexdigest()
+        with open(file_path + CHECKSUM_SUFFIX, "r", encoding="utf-8") as file:
+            return file.read().strip() == digest
+    except FileNotFoundError:
+        return False
+
+
+def _write_atomic(file_path, data: bytes) -> None:
+    directory = os.path.dirname(os.path.abspath(file_path))
+    # eindeutiger Name, damit gleichzeitige Schreibvorgänge auf dieselbe Datei nicht dieselbe temporäre Datei nutzen
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(file_path) + ".", suffix=TEMP_SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
         try:
-            _write_and_check()
-        except Exception:
-            log.exception("Fehler beim Wiederherstellen und erneuten Schreiben der Datei. "
-                          "Wiederherstellen der Sicherung.")
-            restore_backup()
+            mode = stat.S_IMODE(os.stat(file_path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    _fsync_directory(directory)
 
+
+def _fsync_directory(path: str) -> None:
+    # Die Umbenennung ist erst dauerhaft, wenn auch das Verzeichnis geschrieben wurde.
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
     try:
-        backup_path = file_path + '.bak'
-        if os.path.exists(file_path):
-            shutil.copyfile(file_path, backup_path)
-            _write_and_check()
-        else:
-            with open(file_path, 'w', encoding="utf-8") as file:
-                json.dump(content, file)
-    except Exception:
-        log.exception("Fehler beim Schreiben der Datei. Wiederherstellen der Sicherung.")
-        handle_broken_file()
+        os.fsync(fd)
+    except OSError:
+        # nicht jedes Dateisystem unterstützt fsync für Verzeichnisse
+        pass
     finally:
-        if os.path.exists(backup_path):
-            os.remove(backup_path)
+        os.close(fd)
@@ -1,34 +1,104 @@
 import json
-import os
-import tempfile
+from pathlib import Path
 from unittest.mock import Mock
 
+import pytest
+
 from helpermodules.utils import json_file_handler
-from helpermodules.utils.json_file_handler import write_and_check
+from helpermodules.utils.json_file_handler import verify_checksum, write_and_check
+
+OLD_CONTENT = {"key": "value"}
+NEW_CONTENT = {"new_key": "new_value"}
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt(*args, **kwargs):
+    raise Interrupted()
+
+
+class InterruptedFile:
+    """ Datei, bei der der Schreibvorgang nach der Hälfte der Daten abbricht."""
+
+    def __init__(self, fd: int, mode: str) -> None:
+        self.file = open(fd, mode)
+
+    def write(self, data: bytes) -> None:
+        self.file.write(data[:len(data)//2])
+        raise Interrupted()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.file.close()
 
-import pytest
 
+def test_write_and_check(tmp_path: Path):
+    # setup
+    file_path = tmp_path / "test.json"
+    file_path.write_text(json.dumps(OLD_CONTENT))
 
-@pytest.mark.parametrize("load_return, expected_content", [
-    ([{"new_key": "new_value"}], {"new_key": "new_value"}),
-    ([ValueError("Ungültige Daten"), {"new_key": "new_value"}], {"new_key": "new_value"}),
-    ([ValueError("Ungültige Daten"), ValueError("Ungültige Daten")], {"key": "value"})
+    # execution
+    write_and_check(str(file_path), NEW_CONTENT)
+
+    # evaluation
+    assert json.loads(file_path.read_text()) == NEW_CONTENT
+    assert [path.name for path in tmp_path.iterdir()] == ["test.json"]
+
+
+@pytest.mark.parametrize("target, replacement, expected_content", [
+    pytest.param("tempfile.mkstemp", interrupt, OLD_CONTENT, id="temporäre Datei anlegen"),
+    pytest.param("os.fdopen", InterruptedFile, OLD_CONTENT, id="Schreiben"),
+    pytest.param("os.fsync", Mock(side_effect=Interrupted()), OLD_CONTENT, id="fsync der Datei"),
+    pytest.param("os.replace", interrupt, OLD_CONTENT, id="Umbenennen"),
+    pytest.param("_fsync_directory", interrupt, NEW_CONTENT, id="fsync des Verzeichnisses"),
 ])
-def test_backup_restore_and_corrupt_data_handling(load_return, expected_content, monkeypatch):
-    mock_json_load = Mock(side_effect=load_return)
-    monkeypatch.setattr(json_file_handler.json, "load", mock_json_load)
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-        file_path = temp_file.name
-    try:
-        with open(file_path, 'w') as file:
-            json.dump({"key": "value"}, file)
-        write_and_check(file_path, {"new_key": "new_value"})
-        with open(file_path, 'r') as file:
-            # mocked auch hier json.load, obwohl monkeypatch für json_file_handler.json.load
-            restored_content = json.loads(file.read())
-            assert restored_content == expected_content
-    finally:
-        # Lösche die temporären Dateien
-        os.remove(file_path)
-        if os.path.exists(file_path + ".bak"):
-            os.remove(file_path + ".bak")
+def test_write_and_check_interrupted(target, replacement, expected_content, tmp_path: Path, monkeypatch):
+    # setup
+    file_path = tmp_path / "test.json"
+    file_path.write_text(json.dumps(OLD_CONTENT))
+    if target == "tempfile.mkstemp":
+        monkeypatch.setattr(json_file_handler.tempfile, "mkstemp", replacement)
+    elif target.startswith("os."):
+        monkeypatch.setattr(json_file_handler.os, target[3:], replacement)
+    else:
+        monkeypatch.setattr(json_file_handler, target, replacement)
+
+    # execution
+    with pytest.raises(Interrupted):
+        write_and_check(str(file_path), NEW_CONTENT)
+
+    # evaluation
+    monkeypatch.undo()
+    assert json.loads(file_path.read_text()) == expected_content
+    assert [path.name for path in tmp_path.iterdir()] == ["test.json"]
+
+
+def test_write_and_check_keeps_permissions(tmp_path: Path):
+    # setup
+    file_path = tmp_path / "test.json"
+    file_path.write_text(json.dumps(OLD_CONTENT))
+    file_path.chmod(0o664)
+
+    # execution
+    write_and_check(str(file_path), NEW_CONTENT)
+
+    # evaluation
+    assert file_path.stat().st_mode & 0o777 == 0o664
+
+
+def test_checksum(tmp_path: Path):
+    # setup
+    file_path = tmp_path / "test.json"
+
+    # execution
+    write_and_check(str(file_path), NEW_CONTENT, checksum=True)
+    valid = verify_checksum(str(file_path))
+    file_path.write_text(json.dumps(OLD_CONTENT))
+
+    # evaluation
+    assert valid is True
+    assert verify_checksum(str(file_path)) is False
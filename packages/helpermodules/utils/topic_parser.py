@@ -1,38 +1,64 @@
+import functools
 import json
 import re
-from typing import Any
+from typing import Any, Callable, Iterable, Optional, Tuple
 
+INDEX_REGEX = re.compile('(?!/)([0-9]*)(?=/|$)')
+SECOND_INDEX_REGEX = re.compile('^.+/([0-9]*)/.+/([0-9]+)/*.*$')
 
-def get_index(topic: str) -> str:
-    """extrahiert den Index aus einem Topic (Zahl zwischen zwei // oder am Ende eines Strings)
-    """
-    regex = re.search('(?!/)([0-9]*)(?=/|$)', topic)
+
+# Es werden immer wieder die gleichen Topics empfangen, daher werden die Ergebnisse zwischengespeichert.
+@functools.lru_cache(maxsize=4096)
+def _search_index(topic: str) -> Tuple[str, int]:
+    regex = INDEX_REGEX.search(topic)
     if regex is None:
         raise ValueError(f"Couldn't find index in {topic}")
-    return regex.group()
+    return regex.group(), regex.end()
 
 
-def get_index_position(topic: str) -> int:
-    regex = re.search('(?!/)([0-9]*)(?=/|$)', topic)
+@functools.lru_cache(maxsize=4096)
+def _search_second_index(topic: str) -> Tuple[str, int]:
+    regex = SECOND_INDEX_REGEX.search(topic)
     if regex is None:
         raise ValueError(f"Couldn't find index in {topic}")
-    return regex.end()
+    return regex.group(2), regex.end(2)
+
+
+def get_index(topic: str) -> str:
+    """extrahiert den Index aus einem Topic (Zahl zwischen zwei // oder am Ende eines Strings)
+    """
+    return _search_index(topic)[0]
+
+
+def get_index_position(topic: str) -> int:
+    return _search_index(topic)[1]
 
 
 def get_second_index(topic: str) -> str:
     """extrahiert den zweiten Index aus einem Topic (Zahl zwischen zwei //)
     """
-    regex = re.search('^.+/([0-9]*)/.+/([0-9]+)/*.*$', topic)
-    if regex is None:
-        raise ValueError(f"Couldn't find index in {topic}")
-    return regex.group(2)
+    return _search_second_index(topic)[0]
 
 
 def get_second_index_position(topic: str) -> int:
-    regex = re.search('^.+/([0-9]*)/.+/([0-9]+)/*.*$', topic)
-    if regex is None:
-        raise ValueError(f"Couldn't find index in {topic}")
-    return regex.end(2)
+    return _search_second_index(topic)[1]
+
+
+class TopicRouter:
+    """ ordnet einem Topic in einem Durchlauf den Handler des ersten passenden Musters zu. Die Muster werden wie bei
+    einer if-elif-Kaskade in der angegebenen Reihenfolge geprüft und müssen ab dem Anfang des Topics passen.
+    """
+
+    def __init__(self, routes: Iterable[Tuple[str, Callable]]) -> None:
+        routes = list(routes)
+        self._handlers = [handler for _, handler in routes]
+        self._regex = re.compile("|".join(f"(?P<r{i}>{pattern})" for i, (pattern, _) in enumerate(routes)))
+
+    def resolve(self, topic: str) -> Optional[Callable]:
+        match = self._regex.match(topic)
+        if match is None:
+            return None
+        return self._handlers[int(match.lastgroup[1:])]
 
 
 def decode_payload(payload) -> Any:
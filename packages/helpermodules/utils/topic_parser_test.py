@@ -1,5 +1,6 @@
 import pytest
-from helpermodules.utils.topic_parser import get_index, get_index_position, get_second_index, get_second_index_position
+from helpermodules.utils.topic_parser import (TopicRouter, get_index, get_index_position, get_second_index,
+                                              get_second_index_position)
 
 
 @pytest.mark.parametrize(
@@ -92,3 +93,30 @@ def test_get_second_index_position_fail(topic):
     # setup & execution & evaluation
     with pytest.raises(Exception):
         get_second_index_position(topic)
+
+
+@pytest.mark.parametrize(
+    "topic, expected_handler",
+    [
+        pytest.param("openWB/chargepoint/template/1", "template", id="erstes passendes Muster"),
+        pytest.param("openWB/chargepoint/1/get/power", "chargepoint", id="allgemeines Muster"),
+        pytest.param("openWB/io/states/1/get/digital_input", "io_states", id="Alternative im Muster"),
+        pytest.param("openWB/internal_io/states/get/digital_input", "io_states", id="Alternative im Muster 2"),
+        pytest.param("openWB/command/command_completed", "command", id="exaktes Topic"),
+        pytest.param("openWB/command/command_completed/1", None, id="exaktes Topic, nicht passend"),
+        pytest.param("foo/openWB/chargepoint/1/get/power", None, id="Muster nicht am Anfang"),
+    ])
+def test_topic_router(topic, expected_handler):
+    # setup
+    router = TopicRouter([
+        ("openWB/chargepoint/template/", "template"),
+        ("openWB/chargepoint/", "chargepoint"),
+        ("openWB/(?:internal_)?io/states", "io_states"),
+        ("openWB/command/command_completed$", "command"),
+    ])
+
+    # execution
+    handler = router.resolve(topic)
+
+    # evaluation
+    assert handler == expected_handler
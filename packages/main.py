@@ -25,12 +25,15 @@ from control import data, prepare, process
 from control.algorithm import algorithm
 from helpermodules import command, setdata, subdata, timecheck, update_config
 from helpermodules.changed_values_handler import ChangedValuesContext
+from helpermodules.cycle_timing import cycle_timer
 from helpermodules.mosquitto_dynsec.mosquitto_dynsec import check_roles_at_start
+from helpermodules.measurement_logging.rollup import update_rollup
 from helpermodules.measurement_logging.update_yields import update_daily_yields, update_pv_monthly_yearly_yields
 from helpermodules.measurement_logging.write_log import LogType, save_log
 from helpermodules.modbusserver import start_modbus_server
 from helpermodules.pub import Pub
 from modules import configuration, loadvars, update_soc
+from modules.common import modbus
 from modules.internal_chargepoint_handler.internal_chargepoint_handler import GeneralInternalChargepointHandler
 from modules.internal_chargepoint_handler.gpio import InternalGpioHandler
 from modules.internal_chargepoint_handler.rfid import RfidReader
@@ -135,23 +138,35 @@ class HandlerAlgorithm:
         try:
             def handler_with_control_interval():
                 if (data.data.general_data.data.control_interval / 10) == self.interval_counter:
-                    data.data.copy_data()
-                    loadvars_.get_values()
-                    wait_for_module_update_completed(loadvars_.event_module_update_completed,
-                                                     "openWB/set/system/device/module_update_completed")
-                    data.data.copy_data()
-                    with ChangedValuesContext(loadvars_.event_module_update_completed):
-                        self.heartbeat = True
-                        if data.data.system_data["system"].data["perform_update"]:
-                            data.data.system_data["system"].perform_update()
-                            return
-                        elif data.data.system_data["system"].data["update_in_progress"]:
-                            log.info("Regelung pausiert, da ein Update durchgeführt wird.")
-                        event_global_data_initialized.set()
-                        prep.setup_algorithm()
-                        control.calc_current()
-                        proc.process_algorithm_results()
-                        data.data.graph_data.pub_graph_data()
+                    with cycle_timer.measure("cycle"):
+                        with cycle_timer.measure("copy_data"):
+                            data.data.copy_data()
+                        with cycle_timer.measure("get_values"):
+                            loadvars_.get_values()
+                        with cycle_timer.measure("wait_for_module_update_completed"):
+                            wait_for_module_update_completed(loadvars_.event_module_update_completed,
+                                                             "openWB/set/system/device/module_update_completed")
+                        with cycle_timer.measure("copy_module_data"):
+                            data.data.copy_data()
+                        with ChangedValuesContext():
+                            self.heartbeat = True
+                            if data.data.system_data["system"].data["perform_update"]:
+                                data.data.system_data["system"].perform_update()
+                                return
+                            elif data.data.system_data["system"].data["update_in_progress"]:
+                                log.info("Regelung pausiert, da ein Update durchgeführt wird.")
+                            event_global_data_initialized.set()
+                            with cycle_timer.measure("setup_algorithm"):
+                                prep.setup_algorithm()
+                            with cycle_timer.measure("calc_current"):
+                                control.calc_current()
+                            with cycle_timer.measure("process_algorithm_results"):
+                                proc.process_algorithm_results()
+                            with cycle_timer.measure("pub_graph_data"):
+                                data.data.graph_data.pub_graph_data()
+                    cycle_timer.check_control_interval(data.data.general_data.data.control_interval)
+                    cycle_timer.publish({"modbus": modbus.connection_statistics()})
+                    cycle_timer.end_cycle()
                     self.interval_counter = 1
                 else:
                     self.interval_counter = self.interval_counter + 1
@@ -179,8 +194,9 @@ class HandlerAlgorithm:
         ausführt, die nur alle 5 Minuten ausgeführt werden müssen.
         """
         try:
-            with ChangedValuesContext(loadvars_.event_module_update_completed):
+            with ChangedValuesContext():
                 totals = save_log(LogType.DAILY)
+                update_rollup(LogType.DAILY, totals)
                 update_daily_yields(totals)
                 update_pv_monthly_yearly_yields()
                 for cp in data.data.cp_data.values():
@@ -222,7 +238,7 @@ class HandlerAlgorithm:
                     general_internal_chargepoint_handler.event_start.set()
                 else:
                     general_internal_chargepoint_handler.internal_chargepoint_handler.heartbeat = False
-            with ChangedValuesContext(loadvars_.event_module_update_completed):
+            with ChangedValuesContext():
                 sub.system_data["system"].update_ip_address()
         except Exception:
             log.exception("Fehler im Main-Modul")
@@ -230,7 +246,7 @@ class HandlerAlgorithm:
     @__with_handler_lock(error_threshold=60)
     def handler_midnight(self):
         try:
-            save_log(LogType.MONTHLY)
+            update_rollup(LogType.MONTHLY, save_log(LogType.MONTHLY))
             thread_errors_path = Path(Path(__file__).resolve().parents[1]/"ramdisk"/"thread_errors.log")
             with thread_errors_path.open("w") as f:
                 f.write("")
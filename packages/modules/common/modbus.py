@@ -6,9 +6,11 @@ formatieren.
 """
 import logging
 import struct
+import threading
+import weakref
 from enum import Enum
 import time
-from typing import Any, Callable, Iterable, Optional, Union, overload, List
+from typing import Any, Callable, Dict, Iterable, Optional, Union, overload, List
 
 import pymodbus
 from pymodbus.client.sync import ModbusTcpClient, ModbusUdpClient, ModbusSerialClient
@@ -48,50 +50,176 @@ NO_VALUES = ("TCP-Client {}:{} konnte keinen Wert abfragen. Falls vorhanden, par
              "beenden und bei anhaltender Fehlermeldung Zähler neu starten.")
 
 
+# Fehler der Verbindung, nach denen die Verbindung neu aufgebaut werden muss. Fehlerantworten des Geräts (zB
+# ungültige Register-Adresse) und ausbleibende Antworten (ModbusIOException, zB falsche Unit-ID oder Gerät im
+# Standby) betreffen nur die Anfrage und lassen die Verbindung, die sich die Geräte eines Hosts teilen, intakt.
+TRANSPORT_ERRORS = (pymodbus.exceptions.ConnectionException, OSError)
+
+
+class ModbusConnection:
+    """ Verbindung zu einem Modbus-Server, die von allen Clients mit gleichen Verbindungsparametern gemeinsam genutzt
+    und über die Regelzyklen offen gehalten wird. Die Anfragen werden über den Lock serialisiert.
+    """
+
+    def __init__(self, delegate: Union[ModbusSerialClient, ModbusTcpClient, ModbusUdpClient], name: str) -> None:
+        self.delegate = delegate
+        self.name = name
+        self.lock = threading.RLock()
+        self.requests = 0
+        self.connects = 0
+        self.protocol_errors = 0
+        self.transport_errors = 0
+        self.timeouts = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def record_request(self, latency: float) -> None:
+        self.requests += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    def statistics(self) -> Dict[str, Union[int, float]]:
+        return {"requests": self.requests,
+                "connects": self.connects,
+                "protocol_errors": self.protocol_errors,
+                "transport_errors": self.transport_errors,
+                "timeouts": self.timeouts,
+                "latency_avg_ms": round(self.latency_total / self.requests * 1000, 1) if self.requests else 0,
+                "latency_max_ms": round(self.latency_max * 1000, 1)}
+
+
+# (Host, Port, Framer, weitere Parameter) -> Verbindung
+_connection_pool: "weakref.WeakValueDictionary[Any, ModbusConnection]" = weakref.WeakValueDictionary()
+_connection_pool_lock = threading.Lock()
+
+
+def get_pooled_connection(key: Any, name: str, delegate_factory: Callable[[], ModbusTcpClient]) -> ModbusConnection:
+    try:
+        hash(key)
+    except TypeError:
+        # Parameter, die nicht verglichen werden können, erhalten eine eigene Verbindung.
+        return ModbusConnection(delegate_factory(), name)
+    with _connection_pool_lock:
+        connection = _connection_pool.get(key)
+        if connection is None:
+            connection = ModbusConnection(delegate_factory(), name)
+            _connection_pool[key] = connection
+        return connection
+
+
+def connection_statistics() -> Dict[str, Dict[str, Union[int, float]]]:
+    """ Anfragen, Fehler und Latenz je gemeinsam genutzter Verbindung
+    """
+    with _connection_pool_lock:
+        connections = list(_connection_pool.values())
+    return {connection.name: connection.statistics() for connection in connections}
+
+
 class ModbusClient:
     def __init__(self,
                  delegate: Union[ModbusSerialClient, ModbusTcpClient, ModbusUdpClient],
                  address: str, port: int = 502,
-                 sleep_after_connect: Optional[int] = 0):
-        self._delegate = delegate
+                 sleep_after_connect: Optional[int] = 0,
+                 connection: Optional[ModbusConnection] = None):
+        self._connection = connection or ModbusConnection(delegate, f"{address}:{port}")
+        self._delegate = self._connection.delegate
         self.address = address
         self.port = port
         self.sleep_after_connect = sleep_after_connect
+        # Verbindung nach dem with-Block offen halten
+        self.keep_alive = connection is not None
 
     def __enter__(self):
-        try:
-            self._delegate.__enter__()
+        with self._connection.lock:
+            connected = self.is_socket_open()
+            try:
+                self._delegate.__enter__()
+                if connected is False:
+                    self._connection.connects += 1
+            except pymodbus.exceptions.ConnectionException as e:
+                self._connection.transport_errors += 1
+                e.args += (NO_CONNECTION.format(self.address, self.port),)
+                raise e
+        if connected is False:
+            # Die Wartezeit nach dem Verbindungsaufbau blockiert nicht die anderen Geräte der Verbindung.
             time.sleep(self.sleep_after_connect)
-        except pymodbus.exceptions.ConnectionException as e:
-            e.args += (NO_CONNECTION.format(self.address, self.port),)
-            raise e
         return self
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
-        self._delegate.__exit__(exc_type, exc_value, exc_traceback)
+        if self.keep_alive is False or (exc_type is not None and issubclass(exc_type, TRANSPORT_ERRORS)):
+            with self._connection.lock:
+                self._delegate.__exit__(exc_type, exc_value, exc_traceback)
 
     def connect(self) -> None:
-        self._delegate.connect()
+        with self._connection.lock:
+            self._delegate.connect()
+            self._connection.connects += 1
         time.sleep(self.sleep_after_connect)
 
     def close(self) -> None:
         try:
             log.debug("Close Modbus TCP connection")
-            self._delegate.close()
+            with self._connection.lock:
+                self._delegate.close()
         except Exception as e:
             raise Exception(__name__+" "+str(type(e))+" " + str(e)) from e
 
     def is_socket_open(self) -> bool:
         return self._delegate.is_socket_open()
 
+    def _request(self, request_method: Callable, *args, retry: bool = False, **kwargs):
+        """ führt die Anfrage aus. Bei einem Verbindungsfehler wird die Verbindung geschlossen. Wenn eine bestehende
+        Verbindung genutzt wurde, die der Server zwischenzeitlich geschlossen hat, wird die Anfrage bei retry=True
+        einmal mit einer neuen Verbindung wiederholt. Bleibt die Antwort aus, schlägt nur diese Anfrage fehl.
+        """
+        reused = self._ensure_connected()
+        try:
+            return self._send(request_method, *args, **kwargs)
+        except TRANSPORT_ERRORS:
+            if retry is False or reused is False:
+                raise
+            log.debug(f"Verbindung zu {self._connection.name} unterbrochen, neuer Verbindungsaufbau")
+            self.connect()
+            return self._send(request_method, *args, **kwargs)
+
+    def _ensure_connected(self) -> bool:
+        """ baut die Verbindung auf, falls sie nicht besteht. Gibt zurück, ob eine bestehende Verbindung genutzt wird.
+        """
+        with self._connection.lock:
+            if self.is_socket_open():
+                return True
+            self._delegate.connect()
+            self._connection.connects += 1
+        # Die Wartezeit nach dem Verbindungsaufbau blockiert nicht die anderen Geräte der Verbindung.
+        time.sleep(self.sleep_after_connect)
+        return False
+
+    def _send(self, request_method: Callable, *args, **kwargs):
+        with self._connection.lock:
+            start = time.monotonic()
+            try:
+                response = request_method(*args, **kwargs)
+            except TRANSPORT_ERRORS:
+                self._connection.transport_errors += 1
+                self.close()
+                raise
+            except pymodbus.exceptions.ModbusIOException:
+                self._connection.timeouts += 1
+                raise
+            if isinstance(response, pymodbus.exceptions.ModbusIOException):
+                self._connection.timeouts += 1
+                raise response
+            self._connection.record_request(time.monotonic() - start)
+            if response.isError():
+                self._connection.protocol_errors += 1
+            return response
+
     def __read_registers(self, read_register_method: Callable,
                          address: int,
                          types: Union[Iterable[ModbusDataType], ModbusDataType],
                          byteorder: Endian = Endian.Big,
                          wordorder: Endian = Endian.Big,
                          **kwargs):
-        if self.is_socket_open() is False:
-            self.connect()
         try:
             multi_request = isinstance(types, Iterable)
             if not multi_request:
@@ -102,8 +230,7 @@ class ModbusClient:
 
             number_of_addresses = sum(divide_rounding_up(
                 t.bits, _MODBUS_HOLDING_REGISTER_SIZE) for t in types)
-            response = read_register_method(
-                address, number_of_addresses, **kwargs)
+            response = self._request(read_register_method, address, number_of_addresses, retry=True, **kwargs)
             if response.isError():
                 raise Exception(__name__+" "+str(response))
             decoder = BinaryPayloadDecoder.fromRegisters(response.registers, byteorder, wordorder)
@@ -111,15 +238,12 @@ class ModbusClient:
                       ModbusDataType.FLOAT_16 else getattr(decoder, t.decoding_method)() for t in types]
             return result if multi_request else result[0]
         except pymodbus.exceptions.ConnectionException as e:
-            self.close()
             e.args += (NO_CONNECTION.format(self.address, self.port),)
             raise e
         except pymodbus.exceptions.ModbusIOException as e:
-            self.close()
             e.args += (NO_VALUES.format(self.address, self.port),)
             raise e
         except Exception as e:
-            self.close()
             raise Exception(__name__+" "+str(type(e))+" " + str(e)) from e
 
     @overload
@@ -176,7 +300,7 @@ class ModbusClient:
 
     def read_coils(self, address: int, count: int, **kwargs):
         try:
-            response = self._delegate.read_coils(address, count, **kwargs)
+            response = self._request(self._delegate.read_coils, address, count, **kwargs)
             if response.isError():
                 raise Exception(__name__+" "+str(response))
             return response.bits[0] if count == 1 else response.bits[:count]
@@ -211,16 +335,16 @@ class ModbusClient:
                                                     ModbusDataType.FLOAT_32,
                                                     ModbusDataType.FLOAT_64]:
                 registers = self._build_binary_payload(value, data_type, byteorder, wordorder)
-                self._delegate.write_registers(address, registers, **kwargs)
+                self._request(self._delegate.write_registers, address, registers, **kwargs)
             else:
                 # Einfache 16-bit oder kleinere Werte können direkt geschrieben werden
-                self._delegate.write_registers(address, [value], **kwargs)
+                self._request(self._delegate.write_registers, address, [value], **kwargs)
         else:
             # Fallback für bestehenden Code ohne data_type
-            self._delegate.write_registers(address, value, **kwargs)
+            self._request(self._delegate.write_registers, address, value, **kwargs)
 
     def write_single_coil(self, address: int, value: Any, **kwargs):
-        self._delegate.write_coil(address, value, **kwargs)
+        self._request(self._delegate.write_coil, address, value, **kwargs)
 
     def __read_bulk(self,
                     read_register_method: Callable,
@@ -232,10 +356,8 @@ class ModbusClient:
         Liest einen Registerbereich und gibt ein dict mit reg als Key und dekodiertem Wert als Value zurück.
         mapping: Liste von Tupeln (reg, ModbusDataType)
         """
-        if self.is_socket_open() is False:
-            self.connect()
         try:
-            response = read_register_method(start_address, count, **kwargs)
+            response = self._request(read_register_method, start_address, count, retry=True, **kwargs)
             if response.isError():
                 raise Exception(__name__+" "+str(response))
             decoder = BinaryPayloadDecoder.fromRegisters(response.registers, byteorder, wordorder)
@@ -252,15 +374,12 @@ class ModbusClient:
                 results[register_address] = val if multiple_register_requested else val[0]
             return results
         except pymodbus.exceptions.ConnectionException as e:
-            self.close()
             e.args += (NO_CONNECTION.format(self.address, self.port),)
             raise e
         except pymodbus.exceptions.ModbusIOException as e:
-            self.close()
             e.args += (NO_VALUES.format(self.address, self.port),)
             raise e
         except Exception as e:
-            self.close()
             raise Exception(__name__+" "+str(type(e))+" " + str(e)) from e
 
     def read_input_registers_bulk(self,
@@ -305,7 +424,10 @@ class ModbusTcpClient_(ModbusClient):
         host = parsed_url.host
         if parsed_url.port is not None:
             port = parsed_url.port
-        super().__init__(ModbusTcpClient(host, port, framer, **kwargs), address, port, sleep_after_connect)
+        connection = get_pooled_connection((host, port, framer, tuple(sorted(kwargs.items()))),
+                                           f"{host}:{port}",
+                                           lambda: ModbusTcpClient(host, port, framer, **kwargs))
+        super().__init__(connection.delegate, address, port, sleep_after_connect, connection)
 
 
 class ModbusUdpClient_(ModbusClient):
@@ -0,0 +1,111 @@
+import threading
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+from pymodbus.pdu import ExceptionResponse
+
+from modules.common import modbus
+from modules.common.modbus import ModbusClient, ModbusConnection, ModbusDataType, ModbusTcpClient_
+
+
+def response_mock(registers):
+    return Mock(isError=Mock(return_value=False), registers=registers)
+
+
+@pytest.fixture
+def client() -> ModbusClient:
+    delegate = MagicMock(is_socket_open=Mock(return_value=True))
+    return ModbusClient(delegate, "192.168.0.10", 502, connection=ModbusConnection(delegate, "192.168.0.10:502"))
+
+
+def test_tcp_clients_share_connection():
+    # execution
+    client_1 = ModbusTcpClient_("192.168.0.10", 502)
+    client_2 = ModbusTcpClient_("192.168.0.10", 502)
+    client_3 = ModbusTcpClient_("192.168.0.11", 502)
+
+    # evaluation
+    assert client_1._connection is client_2._connection
+    assert client_1._connection is not client_3._connection
+
+
+def test_keep_connection_after_with_block(client: ModbusClient):
+    # execution
+    with client:
+        pass
+
+    # evaluation
+    client._delegate.__exit__.assert_not_called()
+
+
+def test_protocol_error_keeps_connection(client: ModbusClient):
+    # setup
+    client._delegate.read_holding_registers.return_value = ExceptionResponse(0x03, 0x02)
+
+    # execution
+    with pytest.raises(Exception):
+        client.read_holding_registers(100, ModbusDataType.INT_16, unit=1)
+
+    # evaluation
+    client._delegate.close.assert_not_called()
+    assert client._connection.protocol_errors == 1
+    assert client._connection.transport_errors == 0
+
+
+def test_transport_error_reconnects_once(client: ModbusClient):
+    # setup
+    client._delegate.read_holding_registers.side_effect = [ConnectionException("reset"), response_mock([42])]
+
+    # execution
+    value = client.read_holding_registers(100, ModbusDataType.INT_16, unit=1)
+
+    # evaluation
+    assert value == 42
+    client._delegate.close.assert_called_once()
+    client._delegate.connect.assert_called_once()
+    assert client._connection.transport_errors == 1
+    assert client._connection.requests == 1
+
+
+def test_no_response_keeps_connection(client: ModbusClient):
+    # setup
+    client._delegate.read_holding_registers.return_value = ModbusIOException("no response")
+
+    # execution
+    with pytest.raises(ModbusIOException):
+        client.read_holding_registers(100, ModbusDataType.INT_16, unit=1)
+
+    # evaluation
+    client._delegate.close.assert_not_called()
+    client._delegate.read_holding_registers.assert_called_once()
+    assert client._connection.timeouts == 1
+    assert client._connection.transport_errors == 0
+
+
+def test_sleep_after_connect_outside_lock(client: ModbusClient, monkeypatch):
+    # setup
+    client._delegate.is_socket_open.return_value = False
+    client._delegate.read_holding_registers.return_value = response_mock([42])
+    client.sleep_after_connect = 1
+    lock_free = []
+
+    def acquire_lock():
+        acquired = client._connection.lock.acquire(timeout=0)
+        lock_free.append(acquired)
+        if acquired:
+            client._connection.lock.release()
+
+    def sleep(duration):
+        # Ein anderes Gerät der Verbindung muss den Lock während der Wartezeit erhalten können.
+        thread = threading.Thread(target=acquire_lock)
+        thread.start()
+        thread.join()
+    monkeypatch.setattr(modbus.time, "sleep", sleep)
+
+    # execution
+    value = client.read_holding_registers(100, ModbusDataType.INT_16, unit=1)
+
+    # evaluation
+    assert value == 42
+    assert lock_free == [True]
@@ -31,7 +31,9 @@ module.Endian = Mock()
 sys.modules['pymodbus.constants'] = module
 
 module = type(sys)('pymodbus.payload')
+module.BinaryPayloadBuilder = Mock()
 module.BinaryPayloadDecoder = Mock()
+module.Endian = Mock()
 sys.modules['pymodbus.payload'] = module
 
 module = type(sys)('pymodbus.transaction')
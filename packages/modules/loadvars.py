@@ -1,5 +1,5 @@
 import logging
-from threading import Event, Thread
+from threading import Event
 from typing import List
 
 from control import data
@@ -10,8 +10,9 @@ from modules.common.abstract_device import AbstractDevice
 from modules.common.component_type import ComponentType, type_to_topic_mapping
 from modules.common.store import update_values
 from modules.common.utils.component_parser import get_finished_component_obj_by_id
-from helpermodules.utils import joined_thread_handler
+from helpermodules.utils import Task, TaskExecutor
 from helpermodules.constants import NO_ERROR
+from helpermodules.cycle_timing import cycle_timer
 from helpermodules.pub import Pub
 
 log = logging.getLogger(__name__)
@@ -21,58 +22,60 @@ class Loadvars:
     def __init__(self) -> None:
         self.event_module_update_completed = Event()
         self.price_value_store = get_price_value_store()
+        self.executor = TaskExecutor(thread_name_prefix="loadvars", task_finished=cycle_timer.record_task)
 
     def get_values(self) -> None:
         topic = "openWB/set/system/device/module_update_completed"
         try:
-            not_finished_threads = self._set_values()
-            levels = data.data.counter_all_data.get_list_of_elements_per_level()
-            levels.reverse()
-            for level in levels:
-                self._update_values_of_level_buttom_top(level, not_finished_threads)
+            with Pub().batch():
+                not_finished_threads = self._set_values()
+                levels = data.data.counter_all_data.get_list_of_elements_per_level()
+                levels.reverse()
+                for level in levels:
+                    self._update_values_of_level_buttom_top(level, not_finished_threads)
+                    wait_for_module_update_completed(self.event_module_update_completed, topic)
+                    data.data.copy_module_data()
+                self._update_values_virtual_counter_uncounted_consumption(not_finished_threads)
                 wait_for_module_update_completed(self.event_module_update_completed, topic)
                 data.data.copy_module_data()
-            self._update_values_virtual_counter_uncounted_consumption(not_finished_threads)
-            wait_for_module_update_completed(self.event_module_update_completed, topic)
-            data.data.copy_module_data()
-            wait_for_module_update_completed(self.event_module_update_completed, topic)
-            joined_thread_handler(self._get_io(), data.data.general_data.data.control_interval/3)
-            joined_thread_handler(self._set_io(), data.data.general_data.data.control_interval/3)
-            wait_for_module_update_completed(self.event_module_update_completed, topic)
-            if (data.data.optional_data.data.electricity_pricing.configured):
-                self.ep_get_prices()
+                wait_for_module_update_completed(self.event_module_update_completed, topic)
+                self.executor.run(self._get_io(), data.data.general_data.data.control_interval/3)
+                self.executor.run(self._set_io(), data.data.general_data.data.control_interval/3)
+                wait_for_module_update_completed(self.event_module_update_completed, topic)
+                if (data.data.optional_data.data.electricity_pricing.configured):
+                    self.ep_get_prices()
         except Exception:
             log.exception("Fehler im loadvars-Modul")
 
     def _set_values(self) -> List[str]:
         """Threads, um Werte von Geräten abzufragen"""
-        modules_threads: List[Thread] = []
+        modules_threads: List[Task] = []
         for item in data.data.system_data.values():
             try:
                 if isinstance(item, AbstractDevice):
-                    modules_threads.append(Thread(target=item.update, args=(),
+                    modules_threads.append(Task(target=item.update, args=(),
                                            name=f"device{item.device_config.id}"))
             except Exception:
                 log.exception(f"Fehler im loadvars-Modul bei Element {item}")
         for cp in data.data.cp_data.values():
             try:
-                modules_threads.append(Thread(target=cp.chargepoint_module.get_values,
+                modules_threads.append(Task(target=cp.chargepoint_module.get_values,
                                        args=(), name=f"set values cp{cp.chargepoint_module.config.id}"))
             except Exception:
                 log.exception(f"Fehler im loadvars-Modul bei Element {cp.num}")
-        return joined_thread_handler(modules_threads, data.data.general_data.data.control_interval/3)
+        return self.executor.run(modules_threads, data.data.general_data.data.control_interval/3)
 
     def _update_values_of_level_buttom_top(self, elements, not_finished_threads: List[str]) -> None:
         """Threads, um von der niedrigsten Ebene der Hierarchie beginnend Werte ggf. miteinander zu verrechnen und zu
         veröffentlichen"""
-        modules_threads: List[Thread] = []
+        modules_threads: List[Task] = []
         for element in elements:
             try:
                 if element["type"] == ComponentType.CHARGEPOINT.value:
                     chargepoint = data.data.cp_data[f'{type_to_topic_mapping(element["type"])}{element["id"]}']
                     thread_name = f"set values cp{chargepoint.chargepoint_module.config.id}"
                     if thread_name not in not_finished_threads:
-                        modules_threads.append(Thread(
+                        modules_threads.append(Task(
                             target=update_values,
                             args=(chargepoint.chargepoint_module,),
                             name=f"update values cp{chargepoint.chargepoint_module.config.id}"))
@@ -80,14 +83,14 @@ class Loadvars:
                     component = get_finished_component_obj_by_id(element["id"], not_finished_threads)
                     if component is None:
                         continue
-                    modules_threads.append(Thread(target=update_values, args=(
+                    modules_threads.append(Task(target=update_values, args=(
                         component,), name=f"component{component.component_config.id}"))
             except Exception:
                 log.exception(f"Fehler im loadvars-Modul bei Element {element}")
-        joined_thread_handler(modules_threads, data.data.general_data.data.control_interval/3)
+        self.executor.run(modules_threads, data.data.general_data.data.control_interval/3)
 
     def _update_values_virtual_counter_uncounted_consumption(self, not_finished_threads: List[str]) -> None:
-        modules_threads: List[Thread] = []
+        modules_threads: List[Task] = []
         for counter in data.data.counter_data.values():
             try:
                 component = get_finished_component_obj_by_id(counter.num, not_finished_threads)
@@ -95,22 +98,22 @@ class Loadvars:
                     if len(data.data.counter_all_data.get_entry_of_element(counter.num)["children"]) == 0:
                         thread_name = f"component{component.component_config.id}"
                         if thread_name not in not_finished_threads:
-                            modules_threads.append(Thread(
+                            modules_threads.append(Task(
                                 target=update_values,
                                 args=(component,),
                                 name=f"component{component.component_config.id}"))
             except Exception:
                 log.exception(f"Fehler im loadvars-Modul bei Zähler {counter}")
-        joined_thread_handler(modules_threads, data.data.general_data.data.control_interval/3)
+        self.executor.run(modules_threads, data.data.general_data.data.control_interval/3)
 
-    def _get_io(self) -> List[Thread]:
-        threads = []  # type: List[Thread]
+    def _get_io(self) -> List[Task]:
+        threads = []  # type: List[Task]
         try:
-            for io_device in data.data.system_data.values():
+            for key, io_device in data.data.system_data.items():
                 try:
                     if isinstance(io_device, AbstractIoDevice):
                         threads.append(
-                            Thread(target=io_device.read, args=(), name="get io state"))
+                            Task(target=io_device.read, args=(), name=f"get io state {key}"))
                 except Exception:
                     log.exception("Fehler im loadvars-Modul")
         except Exception:
@@ -118,13 +121,13 @@ class Loadvars:
         finally:
             return threads
 
-    def _set_io(self) -> List[Thread]:
-        threads = []  # type: List[Thread]
+    def _set_io(self) -> List[Task]:
+        threads = []  # type: List[Task]
         try:
-            for io_device in data.data.system_data.values():
+            for key, io_device in data.data.system_data.items():
                 try:
                     if isinstance(io_device, AbstractIoDevice):
-                        threads.append(Thread(target=update_values, args=(io_device,), name="publish io state"))
+                        threads.append(Task(target=update_values, args=(io_device,), name=f"publish io state {key}"))
                 except Exception:
                     log.exception("Fehler im loadvars-Modul")
         except Exception:
@@ -136,7 +139,7 @@ class Loadvars:
         def append_thread_set_values(module_name: str) -> None:
             module = getattr(data.data.optional_data, f"{module_name}_module")
             if module:
-                threads_set_values.append(Thread(target=module.update, args=(),
+                threads_set_values.append(Task(target=module.update, args=(),
                                           name=f"update values {module_name}_module"))
             else:
                 # Wenn kein Modul konfiguriert ist, Fehlerstatus zurücksetzen.
@@ -152,7 +155,7 @@ class Loadvars:
                 threads_set_values = []
                 append_thread_set_values("flexible_tariff")
                 append_thread_set_values("grid_fee")
-                joined_thread_handler(threads_set_values, None)
+                self.executor.run(threads_set_values, None)
                 wait_for_module_update_completed(self.event_module_update_completed,
                                                  "openWB/set/optional/ep/module_update_completed")
                 data.data.copy_data()
@@ -1,31 +1,7 @@
 #!/usr/bin/python3
+# Kompatibilität: Aufruf als Unterprozess, im Smarthome-Prozess wird plugin.off direkt aufgerufen.
 import sys
-import os
-import logging
 
-log = logging.getLogger("acthor")
-bp = '/var/www/html/openWB/ramdisk/smarthome_device_'
+from modules.smarthome.acthor.plugin import off
 
-devicenumber = int(sys.argv[1])
-ipadr = str(sys.argv[2])
-uberschuss = int(sys.argv[3])
-file_stringpv = bp + str(devicenumber) + '_pv'
-file_stringcount = bp + str(devicenumber) + '_count'
-file_stringcount5 = bp + str(devicenumber) + '_count5'
-log.info("off devicenr %d ipadr %s ueberschuss %6d" %
-         (devicenumber, ipadr, uberschuss))
-pvmodus = 0
-if os.path.isfile(file_stringpv):
-    with open(file_stringpv, 'r') as f:
-        pvmodus = int(f.read())
-#  wenn vorher PV-Modus an, dann watt.py signalisieren einmalig 0 ueberschuss zu schicken
-if pvmodus == 1:
-    pvmodus = 99
-with open(file_stringpv, 'w') as f:
-    f.write(str(pvmodus))
-count1 = 999
-with open(file_stringcount, 'w') as f:
-    f.write(str(count1))
-count5 = 999
-with open(file_stringcount5, 'w') as f:
-    f.write(str(count5))
+off(sys.argv)
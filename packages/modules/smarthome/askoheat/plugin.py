@@ -0,0 +1,137 @@
+import codecs
+import logging
+import os
+import struct
+from typing import Any, Dict, List
+
+from smarthome.smartlog import initlog
+from smarthome.smartplugin import modbus_client
+
+log = logging.getLogger("askoheat")
+bp = '/var/www/html/openWB/ramdisk/smarthome_device_'
+
+
+def _read_register(client: Any, start: int) -> int:
+    resp = client.read_input_registers(start, 1, unit=1)
+    all = format(resp.registers[0], '04x')
+    return int(struct.unpack('>h', codecs.decode(all, 'hex'))[0])
+
+
+def watt(argv: List[str]) -> Dict[str, Any]:
+    devicenumber = int(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    forcesend = int(argv[4])
+    # forcesend = 0 default time period applies
+    # forcesend = 1 default overwritten send now
+    # forcesend = 9 default overwritten no send
+    initlog("askoheat", devicenumber)
+    file_stringpv = bp + str(devicenumber) + '_pv'
+    file_stringcount = bp + str(devicenumber) + '_count'
+    file_stringcount5 = bp + str(devicenumber) + '_count5'
+    # pv modus
+    pvmodus = 0
+    modbuswrite = 0
+    neupower = 0
+    if os.path.isfile(file_stringpv):
+        with open(file_stringpv, 'r') as f:
+            pvmodus = int(f.read())
+    with modbus_client(ipadr, 502) as client:
+        # aktuelle Leistung lesen
+        aktpower = _read_register(client, 110)
+        # Wassertemperatur lesen
+        temp0 = _read_register(client, 638)
+        if temp0 == 0:
+            temp0 = 300
+        count5 = 999
+        if os.path.isfile(file_stringcount5):
+            with open(file_stringcount5, 'r') as f:
+                count5 = int(f.read())
+        if (forcesend == 0):
+            count5 = count5 + 1
+        elif (forcesend == 1):
+            count5 = 999
+        else:
+            count5 = 1
+        if count5 > 3:
+            count5 = 0
+        with open(file_stringcount5, 'w') as f:
+            f.write(str(count5))
+        if count5 == 0:
+            # log counter
+            count1 = 999
+            if os.path.isfile(file_stringcount):
+                with open(file_stringcount, 'r') as f:
+                    count1 = int(f.read())
+            count1 = count1+1
+            neupower = aktpower + uberschuss
+            if neupower < 0:
+                neupower = 0
+            if neupower > 30000:
+                neupower = 30000
+            if pvmodus == 99:
+                modbuswrite = 1
+                neupower = 0
+                pvmodus = 0
+                with open(file_stringpv, 'w') as f:
+                    f.write(str(pvmodus))
+            # sonst wenn pv modus lauft , ueberschuss schicken
+            else:
+                if pvmodus == 1:
+                    modbuswrite = 1
+            # logschreiben
+            if count1 > 80:
+                count1 = 0
+            with open(file_stringcount, 'w') as f:
+                f.write(str(count1))
+            # mehr log schreiben
+            if count1 < 3:
+                log.info(" watt devicenr %d ipadr %s ueberschuss %6d Akt Leistung  %6d " %
+                         (devicenumber, ipadr, uberschuss, aktpower))
+                log.info(" watt devicenr %d ipadr %s Neu Leistung %6d pvmodus %1d modbuswrite %1d" %
+                         (devicenumber, ipadr, neupower, pvmodus, modbuswrite))
+            # modbus write
+            if modbuswrite == 1:
+                client.write_register(201, neupower, unit=1)
+                if count1 < 3:
+                    log.info("watt devicenr %d ipadr %s device written by modbus " %
+                             (devicenumber, ipadr))
+    return {"power": aktpower, "powerc": 0, "send": modbuswrite, "sendpower": neupower, "on": pvmodus,
+            "temp0": temp0}
+
+
+def on(argv: List[str]) -> None:
+    devicenumber = int(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    initlog("askoheat", devicenumber)
+    log.info(" on devicenr %d ipadr %s ueberschuss %6d" %
+             (devicenumber, ipadr, uberschuss))
+    with open(bp + str(devicenumber) + '_pv', 'w') as f:
+        f.write(str(1))
+    count1 = 999
+    with open(bp + str(devicenumber) + '_count', 'w') as f:
+        f.write(str(count1))
+
+
+def off(argv: List[str]) -> None:
+    devicenumber = int(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    initlog("askoheat", devicenumber)
+    file_stringpv = bp + str(devicenumber) + '_pv'
+    log.info("off devicenr %d ipadr %s ueberschuss %6d" %
+             (devicenumber, ipadr, uberschuss))
+    # wenn vorher pvmodus an, dann watt.py
+    # signaliseren einmalig 0 ueberschuss zu schicken
+    pvmodus = 0
+    if os.path.isfile(file_stringpv):
+        with open(file_stringpv, 'r') as f:
+            pvmodus = int(f.read())
+    if pvmodus == 1:
+        pvmodus = 99
+    with open(file_stringpv, 'w') as f:
+        f.write(str(pvmodus))
+    count1 = 999
+    with open(bp + str(devicenumber) + '_count', 'w') as f:
+        f.write(str(count1))
@@ -5,9 +5,10 @@ import time
 import json
 import urllib.request
 import hashlib
-import credentials
 import xml.etree.ElementTree as ET
 import logging
+from typing import Any, Dict, List, Optional
+from modules.smarthome.avmhomeautomation import credentials
 log = logging.getLogger(__name__)
 
 INVALID_SESSIONID = "0000000000000000"
@@ -19,12 +20,13 @@ LOGLEVELERROR = 2
 
 class AVMHomeAutomation:
     # Parse configuration from command line arguments as provided by /runs/smarthomehandler.py
-    def __init__(self):
-        self.devicenumber = str(sys.argv[1])
-        self.host = str(sys.argv[2])  # IP or hostname (e.g. "fritz.box")
-        self.switchname = str(sys.argv[5])
-        self.username = str(sys.argv[6])
-        self.password = str(sys.argv[7])
+    def __init__(self, argv: Optional[List[str]] = None):
+        argv = argv or sys.argv
+        self.devicenumber = str(argv[1])
+        self.host = str(argv[2])  # IP or hostname (e.g. "fritz.box")
+        self.switchname = str(argv[5])
+        self.username = str(argv[6])
+        self.password = str(argv[7])
         self.baseURL = "http://" + self.host
         self.sessionID = ""
         self.device_infos = {}
@@ -295,18 +297,16 @@ class AVMHomeAutomation:
         urllib.request.urlopen(commandURL, timeout=5)
         self.logMessage(LOGLEVELDEBUG, "end of switchDevice")
 
-    # getActualPowerForce returns current observed power and the state of the switch relays.
-    # The JSON answer is either written to the according smart home device return file
-    # or dumped to stdout if no such file exists (for local development)
-    def getActualPower(self):
+    # getActualPower returns current observed power and the state of the switch relays.
+    def getActualPower(self) -> Optional[Dict[str, Any]]:
         if self.sessionID == INVALID_SESSIONID:
             self.logMessage(LOGLEVELERROR, "Kann ohne valide Anmeldung keine neuen Daten holen.")
-            return
+            return None
         self.logMessage(LOGLEVELDEBUG, "start of getActualPower")
         self.readOrBuildDeviceInfoCache()
         if self.switchname not in self.device_infos:
             self.logMessage(LOGLEVELERROR, "no such device found at FRITZ!Box: %s" % (self.switchname))
-            return
+            return None
 
         try:
             switch = self.device_infos[self.switchname]
@@ -316,7 +316,7 @@ class AVMHomeAutomation:
                 aktpower = 0
                 self.logMessage(LOGLEVELERROR, "device does not provide power measurement, falling back to 0")
             if 'energy' in switch:
-                powerc = switch['energy']
+                powerc = float(switch['energy'])
             else:
                 powerc = 0
                 self.logMessage(LOGLEVELERROR, "device does not provide energy measurement, falling back to 0")
@@ -328,25 +328,14 @@ class AVMHomeAutomation:
             else:
                 self.logMessage(LOGLEVELERROR, "device does not provider switch state, falling back to OFF")
                 relais = 0
-            answer = '{"power":' + str(aktpower) + ',"powerc":' + str(powerc) + ',"on":' + str(relais) + '}'
+            answer = {"power": aktpower, "powerc": powerc, "on": relais}
         except Exception:
             exc_type, exc_obj, exc_tb = sys.exc_info()
             fname = os.path.split(exc_tb.tb_frame.f_code.co_filename)[1]
             self.logMessage(LOGLEVELERROR, "unexpected error getActualPower build JSON string: %s %s %s" %
                             (exc_type, fname, exc_tb.tb_lineno))
+            return None
 
-        self.logMessage(LOGLEVELDEBUG, "constructed JSON answer: %s" % (answer))
-        outFileString = '/var/www/html/openWB/ramdisk/smarthome_device_ret' + str(self.devicenumber)
-        self.logMessage(LOGLEVELDEBUG, "handing answer back to smarthomehandler via %s" % (outFileString))
-        try:
-            with open(outFileString, 'w') as f1:
-                json.dump(answer, f1)
-        except IOError as e:
-            self.logMessage(LOGLEVELERROR, "error writing power result %s" % (e))
-            log.debug(answer)  # dump answer to stdout if file cannot be written
-        except Exception:
-            exc_type, exc_obj, exc_tb = sys.exc_info()
-            fname = os.path.split(exc_tb.tb_frame.f_code.co_filename)[1]
-            self.logMessage(LOGLEVELERROR, "unexpected error getActualPower write JSON %s %s %s" %
-                            (exc_type, fname, exc_tb.tb_lineno))
+        self.logMessage(LOGLEVELDEBUG, "constructed answer: %s" % (answer))
         self.logMessage(LOGLEVELDEBUG, "end of getActualPower")
+        return answer
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
-import avmcommon
+# Kompatibilität: Aufruf als Unterprozess, im Smarthome-Prozess wird plugin.off direkt aufgerufen.
+import sys
 
-interface = avmcommon.AVMHomeAutomation()
-interface.connect()
-interface.switchDevice(False)
+from modules.smarthome.avmhomeautomation.plugin import off
+
+off(sys.argv)
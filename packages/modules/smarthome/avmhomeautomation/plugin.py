@@ -0,0 +1,21 @@
+from typing import Any, Dict, List, Optional
+
+from modules.smarthome.avmhomeautomation.avmcommon import AVMHomeAutomation
+
+
+def _connect(argv: List[str]) -> AVMHomeAutomation:
+    interface = AVMHomeAutomation(argv)
+    interface.connect()
+    return interface
+
+
+def watt(argv: List[str]) -> Optional[Dict[str, Any]]:
+    return _connect(argv).getActualPower()
+
+
+def on(argv: List[str]) -> None:
+    _connect(argv).switchDevice(True)
+
+
+def off(argv: List[str]) -> None:
+    _connect(argv).switchDevice(False)
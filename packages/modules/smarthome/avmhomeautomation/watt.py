@@ -1,6 +1,9 @@
 #!/usr/bin/python3
-import avmcommon
+# Kompatibilität: Aufruf als Unterprozess, im Smarthome-Prozess wird plugin.watt direkt aufgerufen.
+import json
+import sys
 
-interface = avmcommon.AVMHomeAutomation()
-interface.connect()
-interface.getActualPower()
+from modules.smarthome.avmhomeautomation.plugin import watt
+from smarthome.smartret import writeret
+
+writeret(json.dumps(watt(sys.argv)), int(sys.argv[1]))
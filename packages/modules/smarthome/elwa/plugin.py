@@ -0,0 +1,149 @@
+import codecs
+import logging
+import os
+import struct
+from typing import Any, Dict, List
+
+from smarthome.smartplugin import modbus_client
+
+log = logging.getLogger("elwa")
+bp = '/var/www/html/openWB/ramdisk/smarthome_device_'
+
+
+def _register(resp: Any, index: int) -> int:
+    all = format(resp.registers[index], '04x')
+    return int(struct.unpack('>h', codecs.decode(all, 'hex'))[0])
+
+
+def watt(argv: List[str]) -> Dict[str, Any]:
+    devicenumber = int(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    forcesend = int(argv[4])
+    # forcesend = 0 default time period applies
+    # forcesend = 1 default overwritten send now
+    # forcesend = 9 default overwritten no send
+    file_stringpv = bp + str(devicenumber) + '_pv'
+    file_stringcount = bp + str(devicenumber) + '_count'
+    file_stringcount5 = bp + str(devicenumber) + '_count5'
+    # PV-Modus
+    pvmodus = 0
+    modbuswrite = 0
+    neupower = 0
+    if os.path.isfile(file_stringpv):
+        with open(file_stringpv, 'r') as f:
+            pvmodus = int(f.read())
+    with modbus_client(ipadr, 502) as client:
+        # aktuelle Leistung lesen
+        resp = client.read_holding_registers(1000, 20, unit=1)
+        aktpower = _register(resp, 0)
+        # Wassertemperatur lesen
+        temp0 = _register(resp, 1) / 10
+        count5 = 999
+        if os.path.isfile(file_stringcount5):
+            with open(file_stringcount5, 'r') as f:
+                count5 = int(f.read())
+        if (forcesend == 0):
+            count5 = count5 + 1
+        elif (forcesend == 1):
+            count5 = 999
+        else:
+            count5 = 1
+        if count5 > 3:
+            count5 = 0
+        with open(file_stringcount5, 'w') as f:
+            f.write(str(count5))
+        if count5 == 0:
+            # log counter
+            count1 = 999
+            if os.path.isfile(file_stringcount):
+                with open(file_stringcount, 'r') as f:
+                    count1 = int(f.read())
+            count1 = count1+1
+            # status und fuse lesen
+            status = _register(resp, 3)
+            fuse = _register(resp, 14)
+            # logik
+            if fuse == 13:
+                faktor = 1.2
+            else:
+                faktor = 1
+            # weiche Anpassung bei negativem ueberschuss
+            if uberschuss < 0:
+                neupower = aktpower + uberschuss
+            else:
+                neupower = int(uberschuss * faktor) + aktpower
+            if neupower < 0:
+                neupower = 0
+            if neupower > 4000:
+                neupower = 4000
+            # status nach handbuch
+            #
+            # 2 Heat
+            # 3 Standby
+            # 4 Boost heat
+            # 5 Heat finished
+            # 9 Setup
+            # 201 Error Overtemp Fuse blown
+            # 202 Error Overtemp measured
+            # 203 Error Overtemp Electronics
+            # 204 Error Hardware Fault
+            # 205 Error Temp Sensor
+            # boost heat dran ?, nichts schicken
+            if status == 4:
+                neupower = 0
+                modbuswrite = 0
+            else:
+                # solar heizen dran ?
+                if status == 2:
+                    # dann 0 schicken wenn kein PV-Modus mehr
+                    if pvmodus == 0:
+                        modbuswrite = 1
+                        neupower = 0
+                        # sonst wenn PV-Modus lauft , ueberschuss schicken
+                    else:
+                        modbuswrite = 1
+                        # wenn nicht solarheizen und nicht boost heat, auch ueberschuss schicken wenn PV-Modus lauft
+                else:
+                    if pvmodus == 1:
+                        modbuswrite = 1
+            # Sonst nichts schicken
+            if count1 > 80:
+                count1 = 0
+            with open(file_stringcount, 'w') as f:
+                f.write(str(count1))
+            # mehr log schreiben
+            if count1 < 3:
+                log.info(" watt devicenr %d ipadr %s ueberschuss %6d Akt Leistung  %6d Status %2d" %
+                         (devicenumber, ipadr, uberschuss, aktpower, status))
+                log.info(" watt devicenr %d ipadr %s Neu Leistung %6d pvmodus %1d modbuswrite %1d" %
+                         (devicenumber, ipadr, neupower, pvmodus, modbuswrite))
+            # modbus write
+            if modbuswrite == 1:
+                client.write_register(1000, neupower, unit=1)
+                if count1 < 3:
+                    log.info("watt devicenr %d ipadr %s device written by modbus " %
+                             (devicenumber, ipadr))
+    return {"power": aktpower, "powerc": 0, "send": modbuswrite, "sendpower": neupower, "on": pvmodus,
+            "temp0": temp0}
+
+
+def _switch(argv: List[str], pvmodus: int) -> None:
+    devicenumber = int(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    log.info("%s devicenr %d ipadr %s ueberschuss %6d" %
+             (" on" if pvmodus == 1 else "off", devicenumber, ipadr, uberschuss))
+    with open(bp + str(devicenumber) + '_pv', 'w') as f:
+        f.write(str(pvmodus))
+    count1 = 999
+    with open(bp + str(devicenumber) + '_count', 'w') as f:
+        f.write(str(count1))
+
+
+def on(argv: List[str]) -> None:
+    _switch(argv, 1)
+
+
+def off(argv: List[str]) -> None:
+    _switch(argv, 0)
@@ -0,0 +1,17 @@
+from typing import Dict, List
+
+from modules.smarthome.json.plugin import _value
+from smarthome.smartplugin import session
+
+
+def watt(argv: List[str]) -> Dict[str, int]:
+    ipadr = str(argv[2])  # IP-ADresse des Fronius Wechselrichters, mit dem der Zähler kommuniziert
+    smid = int(argv[3])  # ID des Zählers im Wechselrichter (Hauptzähler 0, weitere fortlaufend)
+    # Abfrage-URL, die die .json Antwort liefert.
+    jsonurl = "http://"+str(ipadr)+"/solar_api/v1/GetMeterRealtimeData.cgi?Scope=Device&DeviceId="+str(smid)
+    response = session(argv[1]).get(jsonurl, timeout=3)
+    response.raise_for_status()
+    answer = response.json()
+    # json Keys mit dem aktuellen Leistungswert und dem summierten Verbrauch
+    return {"power": _value(".Body.Data.PowerReal_P_Sum", answer),
+            "powerc": _value(".Body.Data.EnergyReal_WAC_Sum_Consumed", answer)}
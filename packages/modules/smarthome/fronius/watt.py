@@ -1,33 +1,9 @@
 #!/usr/bin/python3
-import sys
+# Kompatibilität: Aufruf als Unterprozess, im Smarthome-Prozess wird plugin.watt direkt aufgerufen.
 import json
-import jq
-import urllib.request
-
-devicenumber = str(sys.argv[1])
-ipadr = str(sys.argv[2])  # IP-ADresse des Fronius Wechselrichters, mit dem der Zähler kommuniziert
-smid = int(sys.argv[3])  # ID des Zählers im Wechselrichter (Hauptzähler 0, weitere fortlaufend)
-
-# Abfrage-URL, die die .json Antwort liefert.
-jsonurl = "http://"+str(ipadr)+"/solar_api/v1/GetMeterRealtimeData.cgi?Scope=Device&DeviceId="+str(smid)
-jsonpower = ".Body.Data.PowerReal_P_Sum"  # json Key in dem der aktuelle Leistungswert steht
-jsonpowerc = ".Body.Data.EnergyReal_WAC_Sum_Consumed"  # json Key in dem der summierte Verbrauch steht
-
-answer = json.loads(str(urllib.request.urlopen(jsonurl, timeout=3).read().decode("utf-8")))
-
-try:
-    power = jq.compile(jsonpower).input(answer).first()
-    power = int(abs(power))
-except Exception:
-    power = 0
-
-try:
-    powerc = jq.compile(jsonpowerc).input(answer).first()
-    powerc = int(abs(powerc))
-except Exception:
-    powerc = 0
+import sys
 
+from modules.smarthome.fronius.plugin import watt
+from smarthome.smartret import writeret
 
-with open('/var/www/html/openWB/ramdisk/smarthome_device_ret' + str(devicenumber), 'w') as f1:
-    answer = '{"power":' + str(power) + ',"powerc":' + str(powerc) + '}'
-    json.dump(answer, f1)
+writeret(json.dumps(watt(sys.argv)), int(sys.argv[1]))
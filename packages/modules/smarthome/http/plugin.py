@@ -0,0 +1,72 @@
+import logging
+from typing import Dict, List
+from urllib.parse import urlparse
+
+import requests
+
+from smarthome.smartplugin import session
+
+log = logging.getLogger("http")
+
+
+def _add_scheme(url: str) -> str:
+    return url if urlparse(url).scheme else 'http://' + url
+
+
+def _get(devicenumber: int, url: str) -> str:
+    response = session(devicenumber).get(url, timeout=5)
+    response.raise_for_status()
+    return response.text
+
+
+def watt(argv: List[str]) -> Dict[str, int]:
+    devicenumber = int(argv[1])
+    uberschuss = int(argv[3])
+    url = _add_scheme(str(argv[4]))
+    urlc = str(argv[5]) if len(argv) > 5 else "none"
+    urlstate = str(argv[8]) if len(argv) > 8 else "none"
+    if not urlparse(urlstate).scheme and not urlstate.startswith("none"):
+        urlstate = 'http://' + urlstate
+    if uberschuss < 0:
+        uberschuss = 0
+    urlrep = url.replace("<openwb-ueberschuss>", str(uberschuss))
+    log.info('watt devicenr %d orig url %s replaced url %s urlc %s urlstate %s' %
+             (devicenumber, url, urlrep, urlc, urlstate))
+    state = 0
+    if not urlstate.startswith("none"):
+        stateurl_response = "0"
+        try:
+            stateurl_response = _get(devicenumber, urlstate)
+        except requests.HTTPError as e:
+            log.info('watt StateURL HTTP Error: %d' % (e.response.status_code))
+        except requests.RequestException as e:
+            log.info('watt StateURL URL Error: %s' % (e))
+        try:
+            state = int(stateurl_response)
+        except ValueError:
+            log.info('watt StateURL delivered no integer but: %s' % (stateurl_response))
+    try:
+        aktpower = int(float(_get(devicenumber, urlrep)))
+    except requests.HTTPError as e:
+        raise ValueError(f"Keine Daten von {urlrep}") from e
+    relais = 1 if state == 1 or aktpower > 50 else 0
+    if len(urlc) < 6:
+        powerc = 0
+    else:
+        powerc = int(float(_get(devicenumber, _add_scheme(urlc))))
+    return {"power": aktpower, "powerc": powerc, "on": relais}
+
+
+def _switch(action: str, argv: List[str]) -> None:
+    devicenumber = int(argv[1])
+    url = _add_scheme(str(argv[4]))
+    log.info('%s devicenr %d url %s' % (action, devicenumber, url))
+    _get(devicenumber, url)
+
+
+def on(argv: List[str]) -> None:
+    _switch("on", argv)
+
+
+def off(argv: List[str]) -> None:
+    _switch("off", argv)
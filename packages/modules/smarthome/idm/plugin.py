@@ -0,0 +1,173 @@
+import logging
+import os
+import struct
+from typing import Any, Dict, List
+
+from pymodbus.constants import Endian
+from pymodbus.payload import BinaryPayloadBuilder
+
+from smarthome.smartlog import initlog
+from smarthome.smartplugin import modbus_client
+
+log = logging.getLogger("idm")
+bp = '/var/www/html/openWB/ramdisk/smarthome_device_'
+
+
+def _float_registers(value: float) -> List[int]:
+    builder = BinaryPayloadBuilder(byteorder=Endian.Big,
+                                   wordorder=Endian.Little)
+    builder.add_32bit_float(value)
+    return builder.to_registers()
+
+
+def watt(argv: List[str]) -> Dict[str, Any]:
+    devicenumber = int(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    navvers = str(argv[4])
+    pvwatt = int(argv[5])
+    uberschussvz = str(argv[6])
+    maxpower = int(argv[7])
+    forcesend = int(argv[8])
+    # forcesend = 0 default time period applies
+    # forcesend = 1 default overwritten send now
+    # forcesend = 9 default overwritten no send
+    initlog("idm", devicenumber)
+    file_stringpv = bp + str(devicenumber) + '_pv'
+    file_stringcount = bp + str(devicenumber) + '_count'
+    file_stringcount5 = bp + str(devicenumber) + '_count5'
+    count5 = 999
+    if os.path.isfile(file_stringcount5):
+        with open(file_stringcount5, 'r') as f:
+            count5 = int(f.read())
+    if (forcesend == 0):
+        count5 = count5 + 1
+    elif (forcesend == 1):
+        count5 = 999
+    else:
+        count5 = 1
+    if count5 > 6:
+        count5 = 0
+    with open(file_stringcount5, 'w') as f:
+        f.write(str(count5))
+    with modbus_client(ipadr, 502) as client:
+        # aktuelle Leistung lesen
+        start = 4122
+        if navvers == "2":
+            rr = client.read_input_registers(start, 2, unit=1)
+        else:
+            rr = client.read_holding_registers(start, 2, unit=1)
+        raw = struct.pack('>HH', rr.getRegister(1), rr.getRegister(0))
+        lkw = float(struct.unpack('>f', raw)[0])
+        aktpower = int(lkw*1000)
+        modbuswrite = 0
+        neupower = 0
+        # pv modus
+        pvmodus = 0
+        if os.path.isfile(file_stringpv):
+            with open(file_stringpv, 'r') as f:
+                pvmodus = int(f.read())
+        if count5 == 0:
+            # log counter
+            count1 = 999
+            if os.path.isfile(file_stringcount):
+                with open(file_stringcount, 'r') as f:
+                    count1 = int(f.read())
+            count1 = count1+1
+            if count1 > 80:
+                count1 = 0
+            with open(file_stringcount, 'w') as f:
+                f.write(str(count1))
+            # logik nur schicken bei pvmodus
+            if pvmodus == 1:
+                modbuswrite = 1
+            neupower = uberschuss
+            # uberschuss begrenzung ?
+            if (maxpower > 0):
+                neupower = maxpower - aktpower
+                # maximaler überschuss berechnet ?
+                if (neupower > uberschuss):
+                    neupower = uberschuss
+            if (uberschussvz == 'UZ'):
+                # <option value="UP" data-option="UP">Überschuss als positive Zahl übertragen, Bezug negativ</option>
+                # <option value="UZ" data-option="UZ">Überschuss als positive Zahl übertragen, Bezug als 0</option>
+                if neupower < 0:
+                    neupower = 0
+                if neupower > 65535:
+                    neupower = 65535
+            else:
+                if neupower < -32767:
+                    neupower = -32767
+                if neupower > 32767:
+                    neupower = 32767
+            # wurde IDM gerade ausgeschaltet ?    (pvmodus == 99 ?)
+            # dann 0 schicken wenn kein pvmodus mehr
+            # und pv modus ausschalten
+            if pvmodus == 99:
+                modbuswrite = 1
+                neupower = 0
+                pvmodus = 0
+                pvwatt = 0
+                with open(file_stringpv, 'w') as f:
+                    f.write(str(pvmodus))
+            regnew = _float_registers(float(neupower)/1000)
+            pvwnew = _float_registers(float(pvwatt)/1000)
+            if count1 < 3:
+                log.info(" %d ipadr %s ueberschuss %6d Akt Leistung %6d Pv %6d"
+                         % (devicenumber, ipadr, uberschuss, aktpower, pvwatt))
+                log.info(" %d ipadr %s ueberschuss send %6d pvmodus %1d modbusw %1d"
+                         % (devicenumber, ipadr, neupower, pvmodus, modbuswrite))
+            # modbus write
+            if modbuswrite == 1:
+                client.write_registers(74, regnew, unit=1)
+                if count1 < 3:
+                    log.info("devicenr %d ipadr %s device written by modbus " %
+                             (devicenumber, ipadr))
+            client.write_registers(78, pvwnew, unit=1)
+        else:
+            if pvmodus == 99:
+                pvmodus = 0
+    # power = aktuelle Leistungsaufnahme in Watt, on = 1 pvmodus, powerc = counter in kwh
+    return {"power": aktpower, "powerc": 0, "send": modbuswrite, "sendpower": neupower, "on": pvmodus}
+
+
+def _reset_counters(devicenumber: int) -> None:
+    count1 = 999
+    with open(bp + str(devicenumber) + '_count', 'w') as f:
+        f.write(str(count1))
+    count5 = 999
+    with open(bp + str(devicenumber) + '_count5', 'w') as f:
+        f.write(str(count5))
+
+
+def on(argv: List[str]) -> None:
+    devicenumber = int(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    initlog("idm", devicenumber)
+    log.info("on.py devicenr %d ipadr %s ueberschuss %6d"
+             % (devicenumber, ipadr, uberschuss))
+    with open(bp + str(devicenumber) + '_pv', 'w') as f:
+        f.write(str(1))
+    _reset_counters(devicenumber)
+
+
+def off(argv: List[str]) -> None:
+    devicenumber = int(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    initlog("idm", devicenumber)
+    file_stringpv = bp + str(devicenumber) + '_pv'
+    log.info(" off.py devicenr %d ipadr %s ueberschuss %6d "
+             % (devicenumber, ipadr, uberschuss))
+    pvmodus = 0
+    if os.path.isfile(file_stringpv):
+        with open(file_stringpv, 'r') as f:
+            pvmodus = int(f.read())
+    # wenn vorher PV-Modus an, dann watt.py
+    # signalisieren einmalig 0 ueberschuss zu schicken
+    if pvmodus == 1:
+        pvmodus = 99
+    with open(file_stringpv, 'w') as f:
+        f.write(str(pvmodus))
+    _reset_counters(devicenumber)
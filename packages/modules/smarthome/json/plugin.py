@@ -0,0 +1,22 @@
+from typing import Dict, List
+
+import jq
+
+from smarthome.smartplugin import session
+
+
+def _value(expression: str, answer) -> int:
+    try:
+        return int(abs(jq.compile(expression).input(answer).first()))
+    except Exception:
+        return 0
+
+
+def watt(argv: List[str]) -> Dict[str, int]:
+    # Abfrage-URL, die die .json Antwort liefert, z.B.
+    # "http://192.168.0.150/solar_api/v1/GetMeterRealtimeData.cgi?Scope=Device&DeviceID=1"
+    response = session(argv[1]).get(str(argv[2]), timeout=3)
+    response.raise_for_status()
+    answer = response.json()
+    # json Keys mit dem aktuellen Leistungswert und dem summierten Verbrauch, z.B. ".Body.Data.PowerReal_P_Sum"
+    return {"power": _value(str(argv[3]), answer), "powerc": _value(str(argv[4]), answer)}
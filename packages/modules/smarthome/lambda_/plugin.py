@@ -0,0 +1,166 @@
+import codecs
+import logging
+import os
+import struct
+from typing import Any, Dict, List
+
+from pymodbus.payload import BinaryPayloadBuilder, Endian
+
+from smarthome.smartlog import initlog
+from smarthome.smartplugin import modbus_client
+
+log = logging.getLogger("lambda")
+bp = '/var/www/html/openWB/ramdisk/smarthome_device_'
+
+
+def _read_power(client: Any) -> int:
+    resp = client.read_holding_registers(103, 2, unit=1)
+    all = format(resp.registers[0], '04x')
+    return int(struct.unpack('>h', codecs.decode(all, 'hex'))[0])
+
+
+def watt(argv: List[str]) -> Dict[str, Any]:
+    devicenumber = int(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    uberschussvz = str(argv[4])
+    forcesend = int(argv[5])
+    pvwatt = int(argv[6])
+    # forcesend = 0 default acthor time period applies
+    # forcesend = 1 default overwritten send now
+    # forcesend = 9 default overwritten no send
+    initlog("lambda", devicenumber)
+    if (uberschussvz == 'UN'):
+        uberschuss = uberschuss * -1
+    file_stringpv = bp + str(devicenumber) + '_pv'
+    file_stringcount = bp + str(devicenumber) + '_count'
+    file_stringcount5 = bp + str(devicenumber) + '_count5'
+    count5 = 999
+    modbuswrite = 0
+    neupower = 0
+    if os.path.isfile(file_stringcount5):
+        with open(file_stringcount5, 'r') as f:
+            count5 = int(f.read())
+    if (forcesend == 0):
+        count5 = count5 + 1
+    elif (forcesend == 1):
+        count5 = 999
+    else:
+        count5 = 1
+    if count5 > 3:
+        count5 = 0
+    with open(file_stringcount5, 'w') as f:
+        f.write(str(count5))
+    # PV-Modus
+    pvmodus = 0
+    if os.path.isfile(file_stringpv):
+        with open(file_stringpv, 'r') as f:
+            pvmodus = int(f.read())
+    with modbus_client(ipadr, 502) as client:
+        # aktuelle Leistung lesen
+        aktpower = _read_power(client)
+        if count5 == 0:
+            # log counter
+            count1 = 999
+            if os.path.isfile(file_stringcount):
+                with open(file_stringcount, 'r') as f:
+                    count1 = int(f.read())
+            count1 = count1+1
+            if count1 > 80:
+                count1 = 0
+            with open(file_stringcount, 'w') as f:
+                f.write(str(count1))
+            # Logik nur schicken bei PV-Modus
+            if pvmodus == 1:
+                modbuswrite = 1
+            neupower = uberschuss
+            if (uberschussvz == 'UZ'):
+                neupower = pvwatt
+                if neupower < 0:
+                    neupower = 0
+                if neupower > 65535:
+                    neupower = 65535
+            else:
+                if neupower < -32767:
+                    neupower = -32767
+                if neupower > 32767:
+                    neupower = 32767
+            # wurde lambda gerade ausgeschaltet ?    (PV-Modus == 99 ?)
+            # dann 0 schicken wenn kein PV-Modus mehr
+            # und PV-Modus ausschalten
+            if pvmodus == 99:
+                modbuswrite = 1
+                neupower = 0
+                pvmodus = 0
+                with open(file_stringpv, 'w') as f:
+                    f.write(str(pvmodus))
+            if count1 < 3:
+                log.info(' %d ipadr %s ueberschuss %6d Akt Leistung %6d'
+                         % (devicenumber, ipadr, uberschuss, aktpower))
+                log.info(' %d ipadr %s neupower %6d pvmodus %1d modbusw %1d'
+                         % (devicenumber, ipadr, neupower, pvmodus, modbuswrite))
+            # modbus write
+            if modbuswrite == 1:
+                # andernfalls absturz bei negativen Zahlen
+                builder = BinaryPayloadBuilder(byteorder=Endian.Big, wordorder=Endian.Little)
+                builder.add_16bit_int(neupower)
+                pay = builder.to_registers()
+                client.write_registers(102, [pay[0]], unit=1)
+                if count1 < 3:
+                    log.info(' %d ipadr %s written %6d %#4X' %
+                             (devicenumber, ipadr, pay[0], pay[0]))
+        else:
+            if pvmodus == 99:
+                pvmodus = 0
+    return {"power": aktpower, "powerc": 0, "send": modbuswrite, "sendpower": neupower, "on": pvmodus}
+
+
+def on(argv: List[str]) -> None:
+    devicenumber = int(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    uberschussvz = str(argv[4])
+    if (uberschussvz == 'UN'):
+        uberschuss = uberschuss * -1
+    initlog("lambda", devicenumber)
+    log.info(' on.py devicenr %d ipadr %s ueberschuss %6d try to connect (modbus)'
+             % (devicenumber, ipadr, uberschuss))
+    with modbus_client(ipadr, 502) as client:
+        aktpower = _read_power(client)
+    log.info(' on.py devicenr  %d ipadr %s Akt Leistung  %6d ' %
+             (devicenumber, ipadr, aktpower))
+    with open(bp + str(devicenumber) + '_pv', 'w') as f:
+        f.write(str(1))
+    count1 = 999
+    with open(bp + str(devicenumber) + '_count', 'w') as f:
+        f.write(str(count1))
+
+
+def off(argv: List[str]) -> None:
+    devicenumber = int(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    uberschussvz = str(argv[4])
+    initlog("lambda", devicenumber)
+    if (uberschussvz == 'UN'):
+        uberschuss = uberschuss * -1
+    file_stringpv = bp + str(devicenumber) + '_pv'
+    log.info(' off.py devicenr %d ipadr %s ueberschuss %6d try to connect (modbus)'
+             % (devicenumber, ipadr, uberschuss))
+    with modbus_client(ipadr, 502) as client:
+        aktpower = _read_power(client)
+    log.info(' off.py devicenr %d ipadr %s Akt Leistung  %6d'
+             % (devicenumber, ipadr, aktpower))
+    pvmodus = 0
+    if os.path.isfile(file_stringpv):
+        with open(file_stringpv, 'r') as f:
+            pvmodus = int(f.read())
+    # wenn vorher PV-Modus an, dann watt.py
+    # signalisieren einmalig 0 ueberschuss zu schicken
+    if pvmodus == 1:
+        pvmodus = 99
+    with open(file_stringpv, 'w') as f:
+        f.write(str(pvmodus))
+    count1 = 999
+    with open(bp + str(devicenumber) + '_count', 'w') as f:
+        f.write(str(count1))
@@ -0,0 +1,84 @@
+import os
+import re
+import time
+from typing import Any, Dict, List
+
+import paho.mqtt.client as mqtt
+
+numberOfSupportedDevices = 9  # limit number of smart home devices
+
+
+def _pv_file(devicenumber: int) -> str:
+    return '/var/www/html/openWB/ramdisk/smarthome_device_' + str(devicenumber) + '_pv'
+
+
+def _loop(client: mqtt.Client, wait_time: float) -> None:
+    start_time = time.time()
+    client.connect("localhost")
+    while True:
+        client.loop()
+        if time.time() - start_time > wait_time:
+            break
+
+
+def watt(argv: List[str]) -> Dict[str, Any]:
+    devicenumber = int(argv[1])
+    uberschuss = int(argv[3])
+    values = {"Aktpower": 0, "Powerc": 0, "Tempa": '300.00', "Tempb": '300.00', "Tempc": '300.00'}
+
+    def on_connect(client, userdata, flags, rc) -> None:
+        client.subscribe("openWB/LegacySmartHome/Devices/"+str(devicenumber) + "/#", 2)
+
+    def on_message(client, userdata, msg) -> None:
+        if "openWB/LegacySmartHome/Device" not in msg.topic:
+            return
+        for key in values:
+            if key in msg.topic:
+                devicenumb = re.sub(r'\D', '', msg.topic)
+                if (1 <= int(devicenumb) <= numberOfSupportedDevices):
+                    values[key] = int(msg.payload) if key in ("Aktpower", "Powerc") else str(float(msg.payload))
+
+    client = mqtt.Client("openWB-mqttsmarthomecust" + str(devicenumber))
+    client.on_connect = on_connect
+    client.on_message = on_message
+    _loop(client, 5)
+    client.publish("openWB/set/LegacySmartHome/Devices/"+str(devicenumber) +
+                   "/Ueberschuss", payload=str(uberschuss), qos=0, retain=True)
+    client.loop(timeout=2.0)
+    client.disconnect()
+    # PV-Modus
+    pvmodus = 0
+    if os.path.isfile(_pv_file(devicenumber)):
+        with open(_pv_file(devicenumber), 'r') as f:
+            pvmodus = int(f.read())
+    return {"power": values["Aktpower"], "powerc": values["Powerc"], "on": pvmodus,
+            "temp0": float(values["Tempa"]), "temp1": float(values["Tempb"]), "temp2": float(values["Tempc"])}
+
+
+def _switch(argv: List[str], relay: int) -> None:
+    devicenumber = str(argv[1])
+    uberschuss = int(argv[3])
+
+    def on_connect(client, userdata, flags, rc) -> None:
+        client.subscribe("openWB/set/LegacySmartHome/Devices/#", 2)
+
+    client = mqtt.Client("openWB-mqttsmarthomecust")
+    client.on_connect = on_connect
+    _loop(client, 2)
+    client.publish("openWB/set/LegacySmartHome/Devices/"+str(devicenumber)+"/ReqRelay", str(relay), qos=0,
+                   retain=True)
+    client.loop(timeout=2.0)
+    client.publish("openWB/set/LegacySmartHome/Devices/"+str(devicenumber) +
+                   "/Ueberschuss", payload=str(uberschuss), qos=0, retain=True)
+    client.loop(timeout=2.0)
+    client.disconnect()
+    with open(_pv_file(int(devicenumber)), 'w') as f:
+        f.write(str(relay))
+
+
+def on(argv: List[str]) -> None:
+    _switch(argv, 1)
+
+
+def off(argv: List[str]) -> None:
+    _switch(argv, 0)
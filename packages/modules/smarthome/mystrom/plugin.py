@@ -0,0 +1,25 @@
+from typing import Any, Dict, List
+
+from smarthome.smartplugin import session
+
+
+def _get(argv: List[str], path: str):
+    response = session(argv[1]).get("http://" + str(argv[2]) + path, timeout=3)
+    response.raise_for_status()
+    return response
+
+
+def watt(argv: List[str]) -> Dict[str, Any]:
+    answer = _get(argv, "/report").json()
+    aktpower = int(answer['power'])
+    relais = 1 if str(answer['relay']).lower() == "true" else 0
+    temp = str(float(answer['temperature']))[0:5]
+    return {"power": aktpower, "powerc": 0, "on": relais, "temp0": float(temp)}
+
+
+def on(argv: List[str]) -> None:
+    _get(argv, "/relay?state=1")
+
+
+def off(argv: List[str]) -> None:
+    _get(argv, "/relay?state=0")
@@ -0,0 +1,21 @@
+from typing import Any, Dict, List
+
+from smarthome.smartplugin import modbus_client
+
+# Registers:
+# https://www.waermepumpen-24.de/fileadmin/kaelteklima/Dokumente/W%C3%A4rmepumpen/modbus-ih-s-serie-v-2335.pdf
+# 2166 power
+# 2740 configure SG Ready input A or B via Modbus
+# 2741 activate/deactive Modbus Aux function - can be enabled directly on Heatpump menu 7.4
+CurrentPowerRegisterAddress = 2166  # register for current power reading
+SERVER_PORT = 502  # TCP port to connect to, should be moved into argument as well
+
+
+def watt(argv: List[str]) -> Dict[str, Any]:
+    SERVER_HOST = str(argv[2])  # IP of server to connect to
+    with modbus_client(SERVER_HOST, SERVER_PORT) as client:
+        # Aktueller Verbrauch
+        resp = client.read_input_registers(CurrentPowerRegisterAddress, 1, unit=1)
+    if not (resp and hasattr(resp, "registers")):
+        raise ValueError("Keine gültige Antwort vom Register " + str(CurrentPowerRegisterAddress) + ": " + str(resp))
+    return {"power": resp.registers[0]}
@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from smarthome.smartplugin import session
+
+log = logging.getLogger(__name__)
+
+RAMDISK_BASE = '/var/www/html/openWB/ramdisk/smarthome_device_ret.'
+
+
+def totalPowerFromShellyJson(answer: Any, workchan: int) -> int:
+    if (workchan == 0):
+        if 'meters' in answer:
+            meters = answer['meters']   # shelly
+        else:
+            meters = answer['emeters']  # shellyEM & shelly3EM
+        total = 0
+        # shellyEM has one meter, shelly3EM has three meters:
+        for meter in meters:
+            total = total + meter['power']
+        return int(total)
+    workchan = workchan - 1
+    try:
+        total = int(answer['meters'][workchan]['power'])   # Abfrage shelly
+    except Exception:
+        total = int(answer['emeters'][workchan]['power'])  # Abfrage shellyEM
+    return int(total)
+
+
+def _parse_argv(argv: List[str]) -> Tuple[int, str, int, int, str, str]:
+    devicenumber = int(argv[1])
+    ipadr = str(argv[2])
+    try:
+        chan = int(argv[4])
+    except Exception:
+        chan = 0
+    # chan = 0 alle Meter, Kan 0
+    # chan = 1 meter 1, Kan 0
+    # chan = 2 meter 2, kan 1
+    shaut = int(argv[5])
+    user = str(argv[6])
+    pw = str(argv[7])
+    return devicenumber, ipadr, chan, shaut, user, pw
+
+
+def _get(devicenumber: int, url: str, shaut: int = 0, user: str = "", pw: str = "",
+         timeout: Optional[int] = 3) -> str:
+    auth = (user, pw) if shaut == 1 else None
+    response = session(devicenumber).get(url, auth=auth, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def _read_gen_model(ipadr: str) -> Optional[Tuple[str, str]]:
+    fnameg = RAMDISK_BASE + str(ipadr) + '_shelly_infogv1'
+    if os.path.isfile(fnameg):
+        with open(fnameg, 'r') as f:
+            jsonin = json.loads(f.read())
+            return str(jsonin['gen']), str(jsonin['model'])
+    return None
+
+
+def _get_gen_model(devicenumber: int, ipadr: str) -> Tuple[str, str]:
+    # lesen endpoint, gen bestimmem. gen 1 hat unter Umstaenden keinen Eintrag
+    gen_model = _read_gen_model(ipadr)
+    if gen_model is not None:
+        return gen_model
+    gen = '1'
+    model = '???'
+    agen = json.loads(_get(devicenumber, "http://" + str(ipadr) + "/shelly"))
+    with open(RAMDISK_BASE + str(ipadr) + '_shelly_info', 'w') as f:
+        json.dump(agen, f)
+    if 'gen' in agen:
+        gen = str(int(agen['gen']))
+    if 'model' in agen:
+        model = str(agen['model'])
+    elif 'type' in agen:
+        model = str(agen['type'])
+    with open(RAMDISK_BASE + str(ipadr) + '_shelly_infogv1', 'w') as f:
+        f.write(json.dumps({"gen": str(gen), "model": str(model)}))
+    return gen, model
+
+
+def watt(argv: List[str]) -> Dict[str, Any]:
+    devicenumber, ipadr, chan, shaut, user, pw = _parse_argv(argv)
+    # Setze Default-Werte, andernfalls wird der letzte Wert ewig fortgeschrieben.
+    # Insbesondere wichtig für aktuelle Leistung
+    # Zähler wird beim Neustart auf 0 gesetzt, darf daher nicht übergeben werden.
+    powerc = 0
+    temp0 = '0.0'
+    temp1 = '0.0'
+    temp2 = '0.0'
+    aktpower = 0
+    relais = 0
+    answer: Dict = {}
+    gen, model = _get_gen_model(devicenumber, ipadr)
+    # Versuche Daten von Shelly abzurufen.
+    try:
+        if (gen == "1"):
+            answer = json.loads(_get(devicenumber, "http://" + str(ipadr) + "/status", shaut, user, pw))
+        else:
+            answer = json.loads(_get(devicenumber, "http://" + str(ipadr) + "/rpc/Shelly.GetStatus"))
+        with open(RAMDISK_BASE + str(ipadr) + '_shelly', 'w') as f:
+            f.write(str(answer))
+    except Exception:
+        log.debug("failed to connect to device on " +
+                  ipadr + ", setting all values to 0")
+    #  Versuche Werte aus der Antwort zu extrahieren.
+    if (chan > 0):
+        workchan = chan - 1
+    else:
+        workchan = chan
+    try:
+        if (gen == "1"):
+            aktpower = totalPowerFromShellyJson(answer, chan)
+        else:
+            sw = 'switch:' + str(workchan)
+            if ("SPEM-003CE" in model):
+                if (workchan == 1):
+                    aktpower = int(answer['em:0']['a_act_power'])
+                elif (workchan == 2):
+                    aktpower = int(answer['em:0']['b_act_power'])
+                elif (workchan == 3):
+                    aktpower = int(answer['em:0']['c_act_power'])
+                else:
+                    aktpower = int(answer['em:0']['total_act_power'])
+            elif ("PM-001PCEU16" in model):
+                #   "SNPM-001PCEU16" (gen 2) und "S3PM-001PCEU16" (gen 3)
+                aktpower = int(answer['pm1:0']['apower'])
+            else:
+                aktpower = int(answer[sw]['apower'])
+    except Exception:
+        pass
+
+    try:
+        if (gen == "1"):
+            relais = int(answer['relays'][workchan]['ison'])
+        else:
+            # shelly pro 3em mit add on hat fix id 100 als switch Kanal, das Device muss auf jeden fall mit separater
+            # Leistunsmessung erfasst werden, da die Leistung auf drei verschieden Kanäle angeliefert werden kann
+            sw = 'switch:' + str(100 if "SPEM-003CE" in model else workchan)
+            relais = int(answer[sw]['output'])
+    except Exception:
+        pass
+
+    temps = [temp0, temp1, temp2]
+    for i in range(3):
+        try:
+            if gen == "1":
+                temps[i] = str(answer['ext_temperature'][str(i)]['tC'])
+            else:
+                temps[i] = str(answer['temperature:' + str(100 + i)]['tC'])
+        except Exception:
+            pass
+    return {"power": aktpower, "powerc": powerc, "on": relais,
+            "temp0": float(temps[0]), "temp1": float(temps[1]), "temp2": float(temps[2])}
+
+
+def _switch(argv: List[str], turn_on: bool) -> None:
+    devicenumber, ipadr, chan, shaut, user, pw = _parse_argv(argv)
+    gen, model = _read_gen_model(ipadr) or ("1", "???")
+    if (gen == "1"):
+        if (chan == 0):
+            url = "http://" + str(ipadr) + "/relay/0?turn=" + ("on" if turn_on else "off")
+        else:
+            url = "http://" + str(ipadr) + "/relay/" + str(chan - 1) + "?turn=" + ("on" if turn_on else "off")
+    else:
+        if (chan > 0):
+            chan = chan - 1
+        # shelly pro 3em mit add on hat fix id 100 als switch Kanal, das Device muss auf jeden fall mit separater
+        # Leistunsmessung erfasst werden, da die Leistung auf drei verschiedenenen Kanälen angeliefert werden kann
+        if ("SPEM-003CE" in model):
+            chan = 100
+        # gen 2 will das als cmd /rpc/Switch.Set?id=100&on=true
+        url = "http://" + str(ipadr) + "/rpc/Switch.Set?id=" + str(chan) + "&on=" + ("true" if turn_on else "false")
+    _get(devicenumber, url, shaut, user, pw, timeout=None)
+
+
+def on(argv: List[str]) -> None:
+    _switch(argv, True)
+
+
+def off(argv: List[str]) -> None:
+    _switch(argv, False)
@@ -0,0 +1,120 @@
+# by Markus Giessen 2021-09-30
+# adopted from Florian Wenger
+#
+# Here we only use a SMA EnergyMeter as SmartHome Device
+# Only two values are returned:
+# pconsume = current power consumption in Watt
+# pconsumecounter = cumulated value of power consumption in kWh
+# endless loop (until ctrl+c) displays measurement from SMA Energy Meter
+#
+#  this software is released under GNU General Public License, version 2.
+#  This program is free software;
+#  you can redistribute it and/or modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; version 2 of the License.
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License along with this program;
+#  if not, write to the Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# 2018-12-22 Tommi2Day small enhancements
+# 2019-08-13 datenschuft run without config
+# 2020-01-04 datenschuft changes to run with speedwiredecoder
+# 2020-01-13 Kevin Wieland changes to run with openWB
+# 2020-02-03 theHolgi added phase-wise load and power factor
+# 2021-09-01 Markus Giessen adoption for usage as Smart Home Device for energy metering
+# 2021-12-25 Markus Giessen adoption of PR 1845 due to SMA protocol change
+# 2026-10-17 called in the SmartHome process, last metering kept in memory instead of the ramdisk
+
+import logging
+import socket
+import struct
+import time
+from typing import Dict, List, Tuple
+
+from modules.smarthome.smaem.speedwiredecoder import decode_speedwire
+
+log = logging.getLogger(__name__)
+
+ipbind = '0.0.0.0'
+MCAST_GRP = '239.12.255.254'
+MCAST_PORT = 9522
+# Das EnergyMeter sendet jede Sekunde, solange Leistung bezogen wird. Ohne Timeout würde der Geräte-Thread blockieren.
+RECEIVE_TIMEOUT = 5
+
+# SmartHomeDevice-Nummer -> (Zeitpunkt der letzten Messung, letzte Antwort), ersetzt die ret- und time-Datei des
+# Skripts
+_last_metering: Dict[str, Tuple[float, Dict[str, float]]] = {}
+
+
+def _receive() -> bytes:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(('', MCAST_PORT))
+        try:
+            mreq = struct.pack("4s4s", socket.inet_aton(MCAST_GRP), socket.inet_aton(ipbind))
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+        except BaseException as e:
+            raise ValueError('Module SMAEM: Could not connect to multicast group or bind to given interface') from e
+        sock.settimeout(RECEIVE_TIMEOUT)
+        try:
+            return sock.recv(608)
+        except socket.timeout:
+            return b''
+    finally:
+        sock.close()
+
+
+def watt(argv: List[str]) -> Dict[str, float]:
+    devicenumber = str(argv[1])  # SmartHomeDevice-Nummer
+    # argv[2] ist die IP-Adresse aus der Konfiguration, das EnergyMeter sendet per Multicast
+    smaserial = argv[3]  # SMA EnergyMeter Serial number
+    # Seconds since last metering, useful for handling with more than one EnergyMeter
+    secondssincelastmetering = int(argv[4])
+
+    # The SMA EnergyMeter does not send any data package if there is no Power Consumption / no data to send
+    # Therefore we have to do a special processing for this scenario.
+    # We also have to take care if there are more than one EnergyMeter in the network sending, that's why we
+    # check the time of the last metering in scenario 2.
+    sock_data = _receive()
+    emparts: Dict = {}
+    if sock_data:
+        # Ignore data package if the length is smaller 18. If length is smaller 18, the following check for
+        # Protocol ID can't work
+        if len(sock_data) < 18:
+            raise ValueError("Module SMAEM: Invalid data package received. The length of the received data package "
+                             "is smaller than 18 Byte. This should not happen.")
+        # Ignore data package if the SMA Protocol ID is not 0x6069 - adoption of PR 1845
+        if sock_data[16:18] != b'\x60\x69':
+            raise ValueError("Module SMAEM: Invalid data package received. No need to worry, this is a normal "
+                             "situation if a SMA HomeManager (2) is sending in the network.")
+        emparts = decode_speedwire(sock_data)
+        log.debug('SMA:: smaserial: #' + str(smaserial) + '# - Current SMA serial number:#' +
+                  str(emparts['serial']) + '# - watt:#' + str(int(emparts.get("pconsume"))) + '#')
+
+    last = _last_metering.get(devicenumber)
+    # Remember: We assume that beside of our EnergyMeter there are more SMA devices present (like HomeManager 2.0 or
+    # other EnergyMeter) - so must not accept any data or smaserial = None
+    if emparts and str(emparts['serial']) == str(smaserial):
+        # Scenario 1: Our EnergyMeter is sending, so we put the current values in our output variables
+        answer = {"power": int(emparts.get("pconsume")),
+                  "powerc": float("{:.3f}".format(int(emparts.get('pconsumecounter')*1000)))}
+        _last_metering[devicenumber] = (time.time(), answer)
+        log.debug('SMA:: 1 - Our SMA EM ' + str(smaserial) + ' is sending, everything fine. ' + str(answer))
+        return answer
+    elif last is not None and int(round(time.time() - last[0], 0)) >= secondssincelastmetering:
+        # Scenario 2: Our EnergyMeter is not sending but the last metering is older than n seconds
+        # (parameter secondssincelastmetering). We set "0" as current Power Consume (pconsume) and the last value for
+        # the Power Consume Counter (pconsumecounter)
+        log.debug('SMA:: 2 - No data from our SMA EM since ' + str(int(time.time() - last[0])) + 's')
+        return {"power": 0, "powerc": last[1]["powerc"]}
+    elif last is not None:
+        # Scenario 3: Our EnergyMeter is not sending but the last metering is younger than n seconds. The last
+        # values are good enough.
+        log.debug('SMA:: 3 - The last metering is fine enough.')
+        return last[1]
+    else:
+        # Our EnergyMeter is not sending right now and it didn't send any data since start
+        raise ValueError("Module SMAEM: No data received and no historical data since boottime")
@@ -0,0 +1,42 @@
+import logging
+import os
+from typing import Any, Dict, List
+
+from smarthome.smartplugin import modbus_client
+
+log = logging.getLogger("stiebel")
+bp = '/var/www/html/openWB/ramdisk/smarthome_device_'
+
+
+def watt(argv: List[str]) -> Dict[str, Any]:
+    devicenumber = int(argv[1])
+    file_stringpv = bp + str(devicenumber) + '_pv'
+    # PV-Modus
+    pvmodus = 0
+    if os.path.isfile(file_stringpv):
+        with open(file_stringpv, 'r') as f:
+            pvmodus = int(f.read())
+    return {"power": 0, "powerc": 0, "on": pvmodus}
+
+
+def _switch(argv: List[str], pvmodus: int) -> None:
+    devicenumber = int(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    name = "on" if pvmodus == 1 else "off"
+    log.info('%s devicenr %d ipadr %s ueberschuss %6d try to connect (modbus)'
+             % (name, devicenumber, ipadr, uberschuss))
+    with modbus_client(ipadr, 502) as client:
+        # (de)activate switch one (manual 4002)
+        client.write_register(4001, pvmodus, unit=1)
+    log.info('%s devicenr %d ipadr %s ' % (name, devicenumber, ipadr))
+    with open(bp + str(devicenumber) + '_pv', 'w') as f:
+        f.write(str(pvmodus))
+
+
+def on(argv: List[str]) -> None:
+    _switch(argv, 1)
+
+
+def off(argv: List[str]) -> None:
+    _switch(argv, 0)
@@ -0,0 +1,31 @@
+from typing import Dict, List
+
+from smarthome.smartplugin import session
+
+
+def _get(argv: List[str], command: str):
+    response = session(argv[1]).get("http://" + str(argv[2]) + "/cm?cmnd=" + command, timeout=3)
+    response.raise_for_status()
+    return response
+
+
+def watt(argv: List[str]) -> Dict[str, int]:
+    try:
+        r_status = int(_get(argv, "Status").json()['Status']['Power'])
+    except Exception:
+        r_status = 0
+    answer = _get(argv, "Status%208").json()
+    try:
+        aktpower = int(answer['StatusSNS']['ENERGY']['Power'])
+    except Exception:
+        aktpower = 0
+    relais = 1 if (aktpower > 50) or (r_status == 1) else 0
+    return {"power": aktpower, "powerc": 0, "on": relais}
+
+
+def on(argv: List[str]) -> None:
+    _get(argv, "Power%20on")
+
+
+def off(argv: List[str]) -> None:
+    _get(argv, "Power%20off")
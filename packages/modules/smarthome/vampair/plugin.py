@@ -0,0 +1,128 @@
+import codecs
+import logging
+import os
+import struct
+from typing import Any, Dict, List, Optional
+
+from smarthome.smartplugin import modbus_client
+
+log = logging.getLogger(__name__)
+bp = '/var/www/html/openWB/ramdisk/smarthome_device_'
+
+# Gerätenummer -> letzte Antwort. Die Wärmepumpe wird nur bei jedem siebten Aufruf abgefragt, dazwischen bleibt die
+# letzte Antwort gültig (bisher die ret-Datei in der ramdisk).
+_answers: Dict[str, Dict[str, Any]] = {}
+
+
+def _read_power(client: Any) -> int:
+    resp = client.read_input_registers(2322, 2, unit=1)
+    all = format(resp.registers[0], '04x')
+    return int(struct.unpack('>h', codecs.decode(all, 'hex'))[0])
+
+
+def watt(argv: List[str]) -> Optional[Dict[str, Any]]:
+    devicenumber = str(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    file_stringpv = bp + str(devicenumber) + '_pv'
+    file_stringcount = bp + str(devicenumber) + '_count'
+    file_stringcount5 = bp + str(devicenumber) + '_count5'
+    count5 = 999
+    if os.path.isfile(file_stringcount5):
+        with open(file_stringcount5, 'r') as f:
+            count5 = int(f.read())
+    count5 = count5+1
+    if count5 > 6:
+        count5 = 0
+    with open(file_stringcount5, 'w') as f:
+        f.write(str(count5))
+    if count5 == 0:
+        # PV-Modus
+        pvmodus = 0
+        if os.path.isfile(file_stringpv):
+            with open(file_stringpv, 'r') as f:
+                pvmodus = int(f.read())
+        # log counter
+        count1 = 999
+        if os.path.isfile(file_stringcount):
+            with open(file_stringcount, 'r') as f:
+                count1 = int(f.read())
+        count1 = count1+1
+        if count1 > 80:
+            count1 = 0
+        with open(file_stringcount, 'w') as f:
+            f.write(str(count1))
+        with modbus_client(ipadr, 502) as client:
+            # aktuelle Leistung lesen
+            aktpower = _read_power(client)
+            # Logik nur schicken bei PV-Modus
+            modbuswrite = 0
+            if pvmodus == 1:
+                modbuswrite = 1
+            neupower = uberschuss
+            if neupower < -32767:
+                neupower = -32767
+            if neupower > 32767:
+                neupower = 32767
+            # wurde vampair gerade ausgeschaltet ?    (PV-Modus == 99 ?)
+            # dann 0 schicken wenn kein PV-Modus mehr
+            # und PV-Modus ausschalten
+            if pvmodus == 99:
+                modbuswrite = 1
+                neupower = 0
+                pvmodus = 0
+                with open(file_stringpv, 'w') as f:
+                    f.write(str(pvmodus))
+            # power = aktuelle Leistungsaufnahme in Watt, on = 1 pvmodus, powerc = counter in kwh
+            _answers[devicenumber] = {"power": aktpower, "powerc": 0, "on": pvmodus}
+            if count1 < 3:
+                log.debug('Nr %s ipadr %s ueberschuss %6d Akt Leistung %6d'
+                          % (devicenumber, ipadr, uberschuss, aktpower))
+                log.debug('Nr %s ipadr %s ueberschuss %6d pvmodus %1d modbusw %1d'
+                          % (devicenumber, ipadr, neupower, pvmodus, modbuswrite))
+            # modbus write
+            if modbuswrite == 1:
+                client.write_registers(33409, [neupower], unit=1)
+                if count1 < 3:
+                    log.debug('devicenr %s ipadr %s device written by modbus ' % (devicenumber, ipadr))
+    return _answers.get(devicenumber)
+
+
+def _connect(argv: List[str], name: str) -> None:
+    devicenumber = str(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    log.debug('%s devicenr %s ipadr %s ueberschuss %6d try to connect (modbus)'
+              % (name, devicenumber, ipadr, uberschuss))
+    with modbus_client(ipadr, 502) as client:
+        aktpower = _read_power(client)
+    log.debug('%s devicenr %s ipadr %s Akt Leistung  %6d' % (name, devicenumber, ipadr, aktpower))
+
+
+def on(argv: List[str]) -> None:
+    devicenumber = str(argv[1])
+    _connect(argv, "on.py")
+    with open(bp + str(devicenumber) + '_pv', 'w') as f:
+        f.write(str(1))
+    count1 = 999
+    with open(bp + str(devicenumber) + '_count', 'w') as f:
+        f.write(str(count1))
+
+
+def off(argv: List[str]) -> None:
+    devicenumber = str(argv[1])
+    file_stringpv = bp + str(devicenumber) + '_pv'
+    _connect(argv, "off.py")
+    pvmodus = 0
+    if os.path.isfile(file_stringpv):
+        with open(file_stringpv, 'r') as f:
+            pvmodus = int(f.read())
+    # wenn vorher PV-Modus an, dann watt.py
+    # signalisieren einmalig 0 ueberschuss zu schicken
+    if pvmodus == 1:
+        pvmodus = 99
+    with open(file_stringpv, 'w') as f:
+        f.write(str(pvmodus))
+    count1 = 999
+    with open(bp + str(devicenumber) + '_count', 'w') as f:
+        f.write(str(count1))
@@ -1,33 +1,7 @@
 #!/usr/bin/python3
+# Kompatibilität: Aufruf als Unterprozess, im Smarthome-Prozess wird plugin.off direkt aufgerufen.
 import sys
-from pymodbus.client.sync import ModbusTcpClient
-import logging
 
-log = logging.getLogger(__name__)
+from modules.smarthome.viessmann.plugin import off
 
-devicenumber = str(sys.argv[1])
-ipadr = str(sys.argv[2])
-uberschuss = int(sys.argv[3])
-# standard
-# Anzeige und Einstellung der Komfortfunktion "Einmalige Warmwasserbereitung"
-# ausserhalb des Zeitprogramms:
-# 0: "Einmalige Warmwasserbereitung" AUS
-# 1: "Einmalige Warmwasserbereitung" EIN
-# Fuer die "Einmalige Warmwasserbereitung" wird der Warmwassertemperatur-Sollwert 2 genutzt.
-# CO-17
-# coils read write boolean
-# register start 00000
-#
-log.debug(f"[Viessmann {devicenumber}] devicenr {devicenumber} ipadr {ipadr} "
-          f"ueberschuss {uberschuss:6d} try to connect (modbus)")
-client = ModbusTcpClient(ipadr, port=502)
-rq = client.write_coil(16, False, unit=1)
-log.debug(f"[Viessmann {devicenumber}] Modbus write_coil response: {rq}")
-client.close()
-log.debug(
-    f"[Viessmann {devicenumber}] devicenr {devicenumber} ipadr {ipadr} "
-    "Einmalige Warmwasseraufbereitung deaktiviert CO-17 = 0")
-pvmodus = 0
-log.debug(f"[Viessmann {devicenumber}] PV-Modus gesetzt: {pvmodus}")
-with open('/var/www/html/openWB/ramdisk/smarthome_device_' + str(devicenumber) + '_pv', 'w') as f:
-    f.write(str(pvmodus))
+off(sys.argv)
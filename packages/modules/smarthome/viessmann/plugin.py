@@ -0,0 +1,51 @@
+import logging
+import os
+from typing import Any, Dict, List
+
+from smarthome.smartplugin import modbus_client
+
+log = logging.getLogger(__name__)
+
+
+def watt(argv: List[str]) -> Dict[str, Any]:
+    devicenumber = str(argv[1])
+    file_stringpv = f'/var/www/html/openWB/ramdisk/smarthome_device_{devicenumber}_pv'
+    # PV-Modus
+    pvmodus = 0
+    if os.path.isfile(file_stringpv):
+        with open(file_stringpv, 'r') as f:
+            pvmodus = int(f.read())
+    return {"power": 0, "powerc": 0, "on": pvmodus}
+
+
+def _switch(argv: List[str], pvmodus: int) -> None:
+    devicenumber = str(argv[1])
+    ipadr = str(argv[2])
+    uberschuss = int(argv[3])
+    # Anzeige und Einstellung der Komfortfunktion "Einmalige Warmwasserbereitung"
+    # ausserhalb des Zeitprogramms:
+    # 0: "Einmalige Warmwasserbereitung" AUS
+    # 1: "Einmalige Warmwasserbereitung" EIN
+    # Fuer die "Einmalige Warmwasserbereitung" wird der Warmwassertemperatur-Sollwert 2 genutzt.
+    # CO-17
+    # coils read write boolean
+    # register start 00000
+    #
+    log.debug(f"[Viessmann {devicenumber}] devicenr {devicenumber} ipadr {ipadr} "
+              f"ueberschuss {uberschuss:6d} try to connect (modbus)")
+    with modbus_client(ipadr, 502) as client:
+        rq = client.write_coil(16, pvmodus == 1, unit=1)
+    log.debug(f"[Viessmann {devicenumber}] Modbus write_coil response: {rq}")
+    log.debug(f"[Viessmann {devicenumber}] devicenr {devicenumber} ipadr {ipadr} "
+              f"Einmalige Warmwasseraufbereitung {'aktiviert' if pvmodus == 1 else 'deaktiviert'} CO-17 = {pvmodus}")
+    log.debug(f"[Viessmann {devicenumber}] PV-Modus gesetzt: {pvmodus}")
+    with open('/var/www/html/openWB/ramdisk/smarthome_device_' + str(devicenumber) + '_pv', 'w') as f:
+        f.write(str(pvmodus))
+
+
+def on(argv: List[str]) -> None:
+    _switch(argv, 1)
+
+
+def off(argv: List[str]) -> None:
+    _switch(argv, 0)
@@ -0,0 +1,29 @@
+from typing import Any, Dict, List
+
+from pymodbus.transaction import ModbusRtuFramer
+
+from smarthome.smartplugin import modbus_client
+
+# Registers:
+# https://github.com/gituser-rk/orno-modbus-mqtt/blob/master/Register%20description%20OR-WE-514%26OR-WE-515.pdf
+# 0x131 frequency
+# 0x131 voltage
+# 0x141 power
+# 0xA001 (total energy rate1)
+TotalEnergyRegisterAddress = 0xA001  # register for total energy
+CurrentPowerRegisterAddress = 0x141  # register for current power reading
+SERVER_PORT = 502  # TCP port to connect to, should be moved into argument as well
+
+
+def watt(argv: List[str]) -> Dict[str, Any]:
+    SERVER_HOST = str(argv[2])  # IP of server to connect to
+    MODBUS_DEVICEID = int(argv[3])  # Modbus device ID
+    # need to specify framer to enable RTUoverTCP
+    with modbus_client(SERVER_HOST, SERVER_PORT, framer=ModbusRtuFramer) as client:
+        # KWH Total Import
+        resp = client.read_holding_registers(TotalEnergyRegisterAddress, 1, unit=MODBUS_DEVICEID)
+        TotalEnergy = int(resp.registers[0]) * 10  # Value is in 0.01kWh, need to convert to Wh
+        # Aktueller Verbrauch
+        resp = client.read_holding_registers(CurrentPowerRegisterAddress, 1, unit=MODBUS_DEVICEID)
+        CurrentPower = int(resp.registers[0])
+    return {"power": CurrentPower, "powerc": TotalEnergy}
@@ -3,13 +3,27 @@ from threading import Event
 
 from control import data
 from helpermodules import pub
+from helpermodules.update_barrier import update_barrier
 
 log = logging.getLogger(__name__)
 
+# Zeit [s], die auf die Übernahme der veröffentlichten Werte gewartet wird, bevor das Echo vom Broker abgewartet wird
+BARRIER_TIMEOUT = 2
+
 
 def wait_for_module_update_completed(event_module_update_completed: Event, topic: str):
     timeout = data.data.general_data.data.control_interval/2
     event_module_update_completed.clear()
+    # Gesammelte Werte veröffentlichen und für die Barriere zählen.
+    pub.Pub().flush()
+    if update_barrier.wait(min(BARRIER_TIMEOUT, timeout)):
+        event_module_update_completed.set()
+        return
+    # Rückfallebene: Echo vom Broker abwarten
+    pending_before_echo = update_barrier.pending_topics()
     pub.Pub().pub(topic, True)
     if event_module_update_completed.wait(timeout) is False:
         log.error("Daten wurden noch nicht vollständig empfangen. Timeout abgelaufen, fortsetzen der Regelung.")
+        update_barrier.reset()
+    else:
+        update_barrier.ignore_pending(pending_before_echo)
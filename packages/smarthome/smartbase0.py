@@ -4,7 +4,8 @@ import os
 import subprocess
 import logging
 from typing import Any, Dict
-from typing import List
+from typing import List, Optional
+from smarthome import smartplugin
 log = logging.getLogger(__name__)
 
 
@@ -13,6 +14,11 @@ class Sbase0:
     _prefixpy = _basePath+'/packages/modules/smarthome/'
 
     def readret(self) -> Dict[str, Any]:
+        if self._plugin_called:
+            # Antwort der im Prozess aufgerufenen Funktion statt der ramdisk-Datei
+            if self._plugin_answer is None:
+                raise ValueError("Keine Antwort vom Gerät")
+            return self._plugin_answer
         with open(self._basePath+'/ramdisk/smarthome_device_ret' +
                   str(self.device_nummer), 'r') as f1:
             answer = json.loads(json.load(f1))
@@ -125,6 +131,8 @@ class Sbase0:
         self.btchange = 0
         self._mydevicemeasure = 'none'  # type: Any
         self.device_nummer = 0
+        self._plugin_called = False
+        self._plugin_answer: Optional[Dict[str, Any]] = None
 
     def checkbefsend(self) -> int:
         newtime = int(time.time())
@@ -159,6 +167,18 @@ class Sbase0:
                         % (str(e1)))
 
     def callpro(self, argumentList: List[str]) -> None:
+        self._plugin_called = False
+        self._plugin_answer = None
+        script = argumentList[1]
+        if script.startswith(self._prefixpy):
+            plugin = smartplugin.get_plugin(script[len(self._prefixpy):])
+            if plugin is not None:
+                self._plugin_called = True
+                try:
+                    self._plugin_answer = plugin(argumentList[1:])
+                except Exception:
+                    log.exception("Fehlermeldung: argumentList %s " % script)
+                return
         try:
             my_env = os.environ.copy()
             my_env["PYTHONPATH"] = "/var/www/html/openWB/packages"
@@ -1,4 +1,5 @@
 import logging
+import os
 
 
 def initlog(name: str, devicenumber: int) -> None:
@@ -7,6 +8,10 @@ def initlog(name: str, devicenumber: int) -> None:
     log.setLevel(logging.DEBUG)
     fname = '/var/www/html/openWB/ramdisk/smarthome_device_'
     fname += str(devicenumber) + '_' + str(name) + '.log'
+    # Im Smarthome-Prozess wird initlog bei jedem Aufruf eines Plugins ausgeführt, der Handler nur einmal angelegt.
+    if any(isinstance(handler, logging.FileHandler) and handler.baseFilename == os.path.abspath(fname)
+           for handler in log.handlers):
+        return
     fh = logging.FileHandler(fname, encoding='utf8')
     fh.setLevel(logging.DEBUG)
     fh.setFormatter(formatter)
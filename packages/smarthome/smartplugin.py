@@ -0,0 +1,79 @@
+""" In-Process-Ausführung der Smarthome-Geräteskripte.
+
+Bisher wird für jede Messung sowie zum Ein- und Ausschalten ein eigener Python-Prozess gestartet (watt.py, on.py,
+off.py), der das Ergebnis über die ramdisk zurückgibt. Die mitgelieferten Gerätetypen stellen ein Modul plugin.py mit
+den Funktionen watt, on und off bereit, die stattdessen im laufenden Prozess aufgerufen werden. Die Funktionen
+erhalten die gleichen Argumente wie das Skript (argv[0] ist der Skriptname) und geben die Antwort als Dictionary
+zurück. HTTP-Verbindungen werden je Gerät über eine eigene Session offen gehalten, Modbus-Verbindungen je Host und
+Port über einen gemeinsamen Client, auf den die Geräte-Threads nacheinander zugreifen.
+Nur für eigene Skripte (z.B. im Ordner eines Gerätetyps abgelegte Skripte ohne Funktion in plugin.py) bleibt der
+Aufruf als Unterprozess erhalten.
+"""
+import importlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from pymodbus.client.sync import ModbusTcpClient
+from pymodbus.exceptions import ConnectionException
+
+log = logging.getLogger(__name__)
+
+Plugin = Callable[[List[str]], Optional[Dict[str, Any]]]
+
+PLUGIN_TYPES = ("acthor", "askoheat", "avmhomeautomation", "elwa", "fronius", "http", "idm", "json", "lambda_",
+                "mqtt", "mystrom", "nibe", "nxdacxx", "ratiotherm", "shelly", "smaem", "stiebel", "tasmota",
+                "vampair", "viessmann", "we514")
+PLUGIN_FUNCTIONS = {"watt.py": "watt", "on.py": "on", "off.py": "off"}
+
+# Gerätenummer -> Session
+_sessions: Dict[str, requests.Session] = {}
+# (Host, Port, Framer) -> (Client, Lock)
+_modbus_clients: Dict[Tuple, Tuple[ModbusTcpClient, threading.Lock]] = {}
+_lock = threading.Lock()
+
+
+def session(devicenumber: Any) -> requests.Session:
+    """ Session des Geräts, damit die Verbindungen zwischen den Abfragen offen bleiben. Eine Session wird nicht von
+    mehreren Geräte-Threads gleichzeitig genutzt.
+    """
+    with _lock:
+        device_session = _sessions.get(str(devicenumber))
+        if device_session is None:
+            device_session = requests.Session()
+            device_session.headers.update({'User-Agent': 'Mozilla/5.0'})
+            _sessions[str(devicenumber)] = device_session
+        return device_session
+
+
+@contextmanager
+def modbus_client(host: str, port: int = 502, **kwargs) -> Iterator[ModbusTcpClient]:
+    """ stellt den offen gehaltenen Modbus-Client für Host und Port bereit. Bei einem Verbindungsfehler wird die
+    Verbindung geschlossen und bei der nächsten Anfrage neu aufgebaut.
+    """
+    key = (str(host), int(port), kwargs.get("framer"))
+    with _lock:
+        entry = _modbus_clients.get(key)
+        if entry is None:
+            entry = (ModbusTcpClient(str(host), port=int(port), **kwargs), threading.Lock())
+            _modbus_clients[key] = entry
+    client, client_lock = entry
+    with client_lock:
+        try:
+            yield client
+        except (ConnectionException, OSError):
+            client.close()
+            raise
+
+
+def get_plugin(script: str) -> Optional[Plugin]:
+    """ gibt für ein Skript relativ zu modules/smarthome, z.B. "http/watt.py", die Funktion zurück, die es im
+    laufenden Prozess ersetzt.
+    """
+    device_type, _, file_name = script.partition("/")
+    if device_type not in PLUGIN_TYPES or file_name not in PLUGIN_FUNCTIONS:
+        return None
+    module = importlib.import_module(f"modules.smarthome.{device_type}.plugin")
+    return getattr(module, PLUGIN_FUNCTIONS[file_name], None)
@@ -0,0 +1,128 @@
+from unittest.mock import Mock
+
+import pytest
+from pymodbus.exceptions import ConnectionException
+
+from smarthome import smartbase0, smartplugin
+from smarthome.smartbase0 import Sbase0
+
+
+def mock_session(monkeypatch, responses) -> Mock:
+    session = Mock()
+    session.get.side_effect = [Mock(text=text, raise_for_status=Mock()) for text in responses]
+    monkeypatch.setattr(smartplugin, "_sessions", {"1": session})
+    return session
+
+
+@pytest.fixture
+def modbus_clients(monkeypatch):
+    clients = []
+
+    def create(*args, **kwargs):
+        clients.append(Mock(args=args, kwargs=kwargs))
+        return clients[-1]
+    monkeypatch.setattr(smartplugin, "_modbus_clients", {})
+    monkeypatch.setattr(smartplugin, "ModbusTcpClient", create)
+    return clients
+
+
+def test_callpro_in_process(monkeypatch):
+    # setup
+    session = mock_session(monkeypatch, ["1", "1234.5"])
+    popen = Mock()
+    monkeypatch.setattr(smartbase0.subprocess, "Popen", popen)
+    device = Sbase0()
+
+    # execution
+    device.callpro(['python3', Sbase0._prefixpy + 'http/watt.py', '1', '0', '500',
+                    '192.168.1.10/power?ueb=<openwb-ueberschuss>', 'none', '0', '0', '192.168.1.10/state'])
+
+    # evaluation
+    assert device.readret() == {"power": 1234, "powerc": 0, "on": 1}
+    assert [call.args[0] for call in session.get.call_args_list] == ["http://192.168.1.10/state",
+                                                                     "http://192.168.1.10/power?ueb=500"]
+    popen.assert_not_called()
+
+
+def test_callpro_subprocess_fallback(monkeypatch):
+    # setup
+    popen = Mock()
+    popen.return_value.communicate.return_value = ("", "")
+    monkeypatch.setattr(smartbase0.subprocess, "Popen", popen)
+    device = Sbase0()
+    argument_list = ['python3', Sbase0._prefixpy + 'shelly/custom.py', '1', '192.168.1.10', '0']
+
+    # execution
+    device.callpro(argument_list)
+
+    # evaluation
+    assert popen.call_args.args[0] == argument_list
+
+
+@pytest.mark.parametrize("device_type", smartplugin.PLUGIN_TYPES)
+def test_get_plugin_for_all_types(device_type):
+    # execution
+    plugin = smartplugin.get_plugin(device_type + "/watt.py")
+
+    # evaluation
+    assert callable(plugin)
+
+
+def test_session_per_device(monkeypatch):
+    # setup
+    monkeypatch.setattr(smartplugin, "_sessions", {})
+
+    # execution
+    first = smartplugin.session(1)
+
+    # evaluation
+    assert smartplugin.session("1") is first
+    assert smartplugin.session(2) is not first
+
+
+def test_modbus_client_kept_open(modbus_clients):
+    # execution
+    with smartplugin.modbus_client("192.168.1.10") as first:
+        pass
+    with smartplugin.modbus_client("192.168.1.10", 502) as second:
+        pass
+    with smartplugin.modbus_client("192.168.1.11") as other:
+        pass
+
+    # evaluation
+    assert first is second
+    assert other is not first
+    assert len(modbus_clients) == 2
+    first.close.assert_not_called()
+
+
+def test_modbus_client_closed_on_connection_error(modbus_clients):
+    # execution
+    with pytest.raises(ConnectionException):
+        with smartplugin.modbus_client("192.168.1.10") as client:
+            raise ConnectionException("reset")
+
+    # evaluation
+    client.close.assert_called_once()
+
+
+def test_callpro_modbus_in_process(monkeypatch, modbus_clients, tmp_path):
+    # setup
+    monkeypatch.setattr("modules.smarthome.elwa.plugin.bp", str(tmp_path) + "/smarthome_device_")
+    popen = Mock()
+    monkeypatch.setattr(smartbase0.subprocess, "Popen", popen)
+    with smartplugin.modbus_client("192.168.1.10") as client:
+        client.read_holding_registers.return_value.registers = [1500, 451] + [0] * 18
+    device = Sbase0()
+    argument_list = ['python3', Sbase0._prefixpy + 'elwa/watt.py', '1', '192.168.1.10', '500', '9']
+
+    # execution
+    device.callpro(argument_list)
+    device.callpro(argument_list)
+
+    # evaluation
+    assert device.readret() == {"power": 1500, "powerc": 0, "send": 0, "sendpower": 0, "on": 0, "temp0": 45.1}
+    assert len(modbus_clients) == 1
+    assert client.read_holding_registers.call_count == 2
+    client.close.assert_not_called()
+    popen.assert_not_called()
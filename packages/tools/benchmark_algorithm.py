@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+""" Misst die Dauer von Prepare.setup_algorithm, Algorithm.calc_current und Process.process_algorithm_results je
+Regelzyklus für synthetische Installationen unterschiedlicher Größe.
+
+Aufruf (im openWB-Verzeichnis): python3 packages/tools/benchmark_algorithm.py [Anzahl Zyklen] [Anzahl Ladepunkte ...]
+
+Die Installation besteht aus dem EVU-Zähler mit PV und Speicher, darunter je 10 Ladepunkten ein Zähler, unter dem
+die Hälfte der Ladepunkte an einem weiteren Zähler hängt. Die Fahrzeuge laden abwechselnd im Sofort- und PV-Laden,
+für das PV-Laden steht Überschuss zur Verfügung.
+Neben der Dauer wird der Exponent des Wachstums zur vorherigen Größe ausgegeben (1 = linear, 2 = quadratisch) und die
+Anzahl Ladepunkte, die rechnerisch in ein Regelintervall passt. Die Spalte Fehler zählt die während der Messung
+geloggten Fehler. Ist sie nicht 0, wurde ein Teil der Regelung übersprungen und die Messung ist nicht aussagekräftig.
+"""
+import logging
+import math
+import sys
+import time
+from pathlib import Path
+from threading import Event
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from control import data  # noqa: E402
+from control.algorithm.algorithm import Algorithm  # noqa: E402
+from control.bat import Bat  # noqa: E402
+from control.chargemode import Chargemode  # noqa: E402
+from control.chargepoint.chargepoint import Chargepoint  # noqa: E402
+from control.chargepoint.chargepoint_template import CpTemplate  # noqa: E402
+from control.counter import Counter  # noqa: E402
+from control.counter_all import CounterAll  # noqa: E402
+from control.ev.ev import Ev  # noqa: E402
+from control.io_device import IoActions  # noqa: E402
+from control.prepare import Prepare  # noqa: E402
+from control.process import Process  # noqa: E402
+from control.pv import Pv  # noqa: E402
+from helpermodules import pub  # noqa: E402
+from modules.common.abstract_chargepoint import AbstractChargepoint  # noqa: E402
+from modules.common.fault_state import ComponentInfo, FaultState  # noqa: E402
+from modules.devices.generic.virtual.config import Virtual, VirtualCounterSetup  # noqa: E402
+from modules.devices.generic.virtual.device import create_device  # noqa: E402
+
+SIZES = (10, 100, 500)
+CHARGEPOINTS_PER_COUNTER = 10
+FIRST_CP = 100
+FIRST_COUNTER = 10
+PHASES = ("setup_algorithm", "calc_current", "process_algorithm_results")
+
+
+class NoPublish:
+    def pub(self, *args, **kwargs) -> None:
+        pass
+
+    def pub_batched(self, *args, **kwargs) -> None:
+        pass
+
+
+class BenchmarkChargepointModule(AbstractChargepoint):
+    """ Ladepunkt ohne Hardware, damit nur die Regelung gemessen wird.
+    """
+
+    def __init__(self, id: int) -> None:
+        self.config = ComponentInfo(id, f"LP {id}", "chargepoint")
+        self.fault_state = FaultState(ComponentInfo(id, f"LP {id}", "chargepoint"))
+
+    def set_current(self, current: float) -> None:
+        pass
+
+    def get_values(self) -> None:
+        pass
+
+    def switch_phases(self, phases_to_use: int) -> None:
+        pass
+
+    def interrupt_cp(self, duration: int) -> None:
+        pass
+
+    def clear_rfid(self) -> None:
+        pass
+
+    def add_conversion_loss_to_current(self, current: float) -> float:
+        return current
+
+    def subtract_conversion_loss_from_current(self, current: float) -> float:
+        return current
+
+
+class ErrorCounter(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+
+
+def setup_chargepoint(num: int, counter: Counter) -> Dict:
+    cp = Chargepoint(num, None)
+    cp.template = CpTemplate()
+    cp.chargepoint_module = BenchmarkChargepointModule(num)
+    cp.data.config.ev = num
+    cp.data.config.phase_1 = num % 3 + 1
+    cp.data.get.plug_state = True
+    # Jeder vierte Ladepunkt lädt noch nicht, damit auch das Einschalten berechnet wird.
+    cp.data.get.charge_state = num % 4 != 3
+    cp.data.get.currents = [16]*3 if cp.data.get.charge_state else [0]*3
+    cp.data.get.power = 11000 if cp.data.get.charge_state else 0
+    cp.data.get.phases_in_use = 3
+    cp.data.get.evse_current = 16
+    cp.data.set.plug_time = f"12/01/2022, 15:{num % 60:02d}:11"
+    ev = Ev(num)
+    ev.charge_template.data.chargemode.selected = (
+        Chargemode.INSTANT_CHARGING.value if num % 2 == 0 else Chargemode.PV_CHARGING.value)
+    cp.data.set.charge_template = ev.charge_template
+    data.data.ev_data[f"ev{num}"] = ev
+    data.data.cp_data[f"cp{num}"] = cp
+    counter.data.get.currents = [a + b for a, b in zip(counter.data.get.currents, cp.data.get.currents)]
+    counter.data.get.power += cp.data.get.power
+    return {"id": num, "type": "cp", "children": []}
+
+
+def setup_counter(num: int, max_current: float) -> Counter:
+    # Die Namen der Zähler werden für die Meldungen des Lastmanagements aus den Komponenten ermittelt.
+    data.data.system_data["device0"].add_component(VirtualCounterSetup(name=f"Zähler {num}", id=num))
+    counter = Counter(num)
+    counter.data.config.max_currents = [max_current]*3
+    counter.data.config.max_total_power = max_current * 230 * 3
+    counter.data.get.currents = [0.0]*3
+    counter.data.get.power = 0
+    data.data.counter_data[f"counter{num}"] = counter
+    return counter
+
+
+def setup_installation(size: int) -> None:
+    event = Event()
+    event.set()
+    data.data_init(event)
+    data.data.io_actions = IoActions()
+    data.data.system_data["device0"] = create_device(Virtual(id=0))
+    data.data.bat_data["bat2"] = Bat(2)
+    data.data.bat_data["bat2"].data.get.power = -2000
+    data.data.bat_data["bat2"].data.get.soc = 50
+    data.data.pv_data["pv1"] = Pv(1)
+    data.data.pv_data["pv1"].data.get.power = -8000 * size
+    evu_counter = setup_counter(0, 32 + size * 4)
+    children = [{"id": 1, "type": "inverter", "children": []}, {"id": 2, "type": "bat", "children": []}]
+    for group in range(math.ceil(size / CHARGEPOINTS_PER_COUNTER)):
+        group_counter = setup_counter(FIRST_COUNTER + 2 * group, 63)
+        sub_counter = setup_counter(FIRST_COUNTER + 2 * group + 1, 32)
+        nums = range(FIRST_CP + group * CHARGEPOINTS_PER_COUNTER,
+                     FIRST_CP + min(size, (group + 1) * CHARGEPOINTS_PER_COUNTER))
+        half = len(nums) // 2
+        sub_children = [setup_chargepoint(num, sub_counter) for num in nums[:half]]
+        group_children = [setup_chargepoint(num, group_counter) for num in nums[half:]]
+        for parent, child in ((group_counter, sub_counter), (evu_counter, group_counter)):
+            parent.data.get.currents = [a + b for a, b in zip(parent.data.get.currents, child.data.get.currents)]
+            parent.data.get.power += child.data.get.power
+        children.append({"id": group_counter.num, "type": "counter", "children": group_children + [
+            {"id": sub_counter.num, "type": "counter", "children": sub_children}]})
+    evu_counter.data.get.power += data.data.pv_data["pv1"].data.get.power
+    data.data.counter_all_data = CounterAll()
+    data.data.counter_all_data.data.get.hierarchy = [{"id": 0, "type": "counter", "children": children}]
+
+
+def measure(cycles: int) -> List[float]:
+    prepare, algorithm, process = Prepare(), Algorithm(), Process()
+    durations = [0.0]*len(PHASES)
+    for _ in range(cycles):
+        for i, phase in enumerate((prepare.setup_algorithm, algorithm.calc_current,
+                                   process.process_algorithm_results)):
+            start = time.perf_counter()
+            phase()
+            durations[i] += time.perf_counter() - start
+    return [duration / cycles * 1000 for duration in durations]
+
+
+def main(cycles: int, sizes: List[int]) -> None:
+    pub.Pub.instance = NoPublish()
+    errors = ErrorCounter()
+    logging.getLogger().addHandler(errors)
+    print(f"{'Ladepunkte':>10}" + "".join(f" {phase + ' [ms]':>32}" for phase in PHASES) +
+          f" {'gesamt [ms]':>12} {'Exponent':>9} {'Fehler':>7}")
+    previous = None
+    for size in sizes:
+        setup_installation(size)
+        errors.count = 0
+        durations = measure(cycles)
+        total = sum(durations)
+        exponent = (f"{math.log(total / previous[1]) / math.log(size / previous[0]):.2f}"
+                    if previous and size != previous[0] else "-")
+        print(f"{size:>10}" + "".join(f" {duration:>32.2f}" for duration in durations) +
+              f" {total:>12.2f} {exponent:>9} {errors.count:>7}")
+        previous = (size, total)
+    control_interval = data.data.general_data.data.control_interval * 1000
+    print(f"Regelintervall {control_interval / 1000:.0f} s: rechnerisch bis zu "
+          f"{int(previous[0] * control_interval / previous[1])} Ladepunkte (linear hochgerechnet)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5,
+         [int(size) for size in sys.argv[2:]] or list(SIZES))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+""" Misst die Dauer von Data.copy_data je Regelzyklus in Abhängigkeit von der Anzahl Ladepunkte/Fahrzeuge, einmal mit
+vollständigem Kopieren aller Profile und einmal mit Wiederverwendung der unveränderten Profile (copy-on-write).
+
+Aufruf (im openWB-Verzeichnis): python3 packages/tools/benchmark_copy_data.py [Anzahl Zyklen]
+"""
+import sys
+import time
+from pathlib import Path
+from threading import Event
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from control import data  # noqa: E402
+from control.chargepoint.chargepoint import Chargepoint  # noqa: E402
+from control.chargepoint.chargepoint_template import CpTemplate  # noqa: E402
+from control.ev.charge_template import ChargeTemplate  # noqa: E402
+from control.ev.ev import Ev  # noqa: E402
+from control.ev.ev_template import EvTemplate  # noqa: E402
+from helpermodules.subdata import SubData  # noqa: E402
+
+SIZES = (10, 50, 100, 250)
+
+
+def setup_installation(size: int) -> None:
+    SubData.cp_data = {f"cp{i}": SimpleNamespace(chargepoint=Chargepoint(i, None)) for i in range(size)}
+    SubData.cp_template_data = {f"cpt{i}": CpTemplate() for i in range(size)}
+    SubData.ev_data = {f"ev{i}": Ev(i) for i in range(size)}
+    SubData.ev_template_data = {f"et{i}": EvTemplate() for i in range(size)}
+    SubData.ev_charge_template_data = {f"ct{i}": ChargeTemplate() for i in range(size)}
+    for i in range(size):
+        SubData.ev_data[f"ev{i}"].data.charge_template = i
+        SubData.ev_data[f"ev{i}"].data.ev_template = i
+    SubData.generations = {}
+
+
+def invalidate_all() -> None:
+    for name in ("ev_data", "cp_template_data", "ev_template_data", "ev_charge_template_data"):
+        for key in getattr(SubData, name):
+            SubData.bump_generation(name, key)
+    SubData.bump_generation("graph_data", "graph")
+
+
+def measure(cycles: int, invalidate: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(cycles):
+        if invalidate:
+            invalidate_all()
+        data.data.copy_data()
+    return (time.perf_counter() - start) / cycles * 1000
+
+
+def main(cycles: int) -> None:
+    event = Event()
+    event.set()
+    data.data_init(event)
+    print(f"{'Ladepunkte':>10} {'vollständig [ms]':>18} {'copy-on-write [ms]':>20}")
+    for size in SIZES:
+        setup_installation(size)
+        data.data.copy_data()
+        full = measure(cycles, invalidate=True)
+        cow = measure(cycles, invalidate=False)
+        print(f"{size:>10} {full:>18.2f} {cow:>20.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+""" Misst den Durchsatz des RedactingFilter mit der bisherigen (je Feld und Muster ein re.sub) und der aktuellen
+Schwärzung.
+
+Aufruf (im openWB-Verzeichnis): python3 packages/tools/benchmark_redaction.py [Log-Datei] [Wiederholungen]
+
+Als Log-Datei eignet sich ein Debug-Log, z.B. ramdisk/main.log. Ohne Log-Datei werden typische Debug-Meldungen
+erzeugt.
+"""
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from helpermodules.logger import KNOWN_SENSITIVE_FIELDS, RedactingFilter  # noqa: E402
+
+LEGACY_PATTERNS = [
+    (r'({field})[=:]([^\s&]+)', r'\1=***REDACTED***'),
+    (r'"{field}":\s*"(.*?)"', r'"{field}": "***REDACTED***"'),
+    (r'\'{field}\':\s*\'(.*?)\'', r"'{field}': '***REDACTED***'")
+]
+
+
+class LegacyRedactingFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        additional_fields = getattr(record, 'redact_fields', '')
+        fields_to_redact = KNOWN_SENSITIVE_FIELDS + KNOWN_SENSITIVE_FIELDS + [
+            field.strip() for field in additional_fields.split(',') if field.strip()]
+        for field in fields_to_redact:
+            for pattern, replacement in LEGACY_PATTERNS:
+                message = re.sub(pattern.replace('{field}', field), replacement.replace('{field}', field), message,
+                                 flags=re.IGNORECASE)
+        record.msg = message
+        record.args = ()
+        return True
+
+
+def synthetic_log() -> List[str]:
+    messages = []
+    for i in range(1000):
+        messages.extend([
+            f"Neuer Wert für openWB/counter/{i % 10}/get/power: {i * 1.5}",
+            f"Ladepunkt {i % 8}: Sollstrom 16A, Phasen 3, Lademodus instant_charging",
+            f"Modbus-Register 30775 von 192.168.1.{i % 255}:502 gelesen: [0, {i}]",
+            '{"chargepoint": {"id": 1}, "vehicle": {"id": 0, "rfid": "1234"}, "data": {"power": 11000}}',
+        ])
+        if i % 50 == 0:
+            messages.append(f'Antwort der API: {{"access_token": "abc{i}", "expires_in": 3600}}')
+    return messages
+
+
+def read_log(path: str) -> List[str]:
+    with open(path, "r", errors="replace") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def measure(log_filter: logging.Filter, messages: List[str], repetitions: int) -> float:
+    records = [logging.LogRecord("benchmark", logging.DEBUG, __file__, 0, message, (), None)
+               for message in messages] * repetitions
+    start = time.perf_counter()
+    for record in records:
+        log_filter.filter(record)
+    return len(records) / (time.perf_counter() - start)
+
+
+def main(path: str, repetitions: int) -> None:
+    messages = read_log(path) if path else synthetic_log()
+    print(f"{len(messages)} Meldungen, {repetitions} Wiederholungen")
+    print(f"bisher:  {measure(LegacyRedactingFilter(), messages, repetitions):>10.0f} Meldungen/s")
+    print(f"aktuell: {measure(RedactingFilter(), messages, repetitions):>10.0f} Meldungen/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None, int(sys.argv[2]) if len(sys.argv) > 2 else 5)
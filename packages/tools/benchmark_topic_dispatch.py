@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+""" Spielt Messwert-Topics durch SubData.on_message und SetData.on_message ab und gibt den Durchsatz aus.
+
+Aufruf (im openWB-Verzeichnis): python3 packages/tools/benchmark_topic_dispatch.py [Dump-Datei] [Wiederholungen]
+
+Die Dump-Datei hat das Format von "mosquitto_sub -v -t 'openWB/#'" (Topic und Payload durch ein Leerzeichen getrennt).
+Es werden nur Messwerte (.../get/...) von Ladepunkten, Zählern, Speichern, PV und Fahrzeugen abgespielt, da andere
+Topics Seiteneffekte (Neukonfiguration, Skripte) auslösen. Ohne Dump-Datei werden Topics für eine synthetische
+Installation erzeugt.
+"""
+import re
+import sys
+import time
+from pathlib import Path
+from threading import Event
+from types import SimpleNamespace
+from typing import List, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from control import data  # noqa: E402, F401 Import-Reihenfolge wie in main.py
+from helpermodules import pub  # noqa: E402
+from helpermodules.subdata import SubData  # noqa: E402
+from helpermodules.setdata import SetData  # noqa: E402
+from control.chargepoint.chargepoint import Chargepoint  # noqa: E402
+
+VALUE_TOPIC_REGEX = re.compile("^openWB/(?:set/)?(chargepoint|counter|bat|pv|vehicle)/([0-9]+)/get/")
+SYNTHETIC_SIZE = 50
+
+
+class NoPublish:
+    def pub(self, *args, **kwargs) -> None:
+        pass
+
+
+def synthetic_dump() -> List[Tuple[str, str]]:
+    dump = []
+    for i in range(SYNTHETIC_SIZE):
+        for prefix in ("openWB/set/", "openWB/"):
+            dump.extend([
+                (f"{prefix}chargepoint/{i}/get/power", "3680.5"),
+                (f"{prefix}chargepoint/{i}/get/currents", "[16.0, 0.0, 0.0]"),
+                (f"{prefix}chargepoint/{i}/get/imported", "12345.6"),
+                (f"{prefix}chargepoint/{i}/get/plug_state", "true"),
+                (f"{prefix}counter/{i}/get/power", "-1200.0"),
+                (f"{prefix}counter/{i}/get/currents", "[5.2, 4.1, 3.3]"),
+                (f"{prefix}counter/{i}/get/voltages", "[230.1, 229.8, 231.0]"),
+                (f"{prefix}counter/{i}/get/fault_state", "0"),
+                (f"{prefix}bat/{i}/get/soc", "55"),
+                (f"{prefix}pv/{i}/get/power", "-4200.0"),
+            ])
+    return dump
+
+
+def read_dump(path: str) -> List[Tuple[str, str]]:
+    dump = []
+    with open(path, "r") as f:
+        for line in f:
+            topic, _, payload = line.rstrip("\n").partition(" ")
+            if VALUE_TOPIC_REGEX.search(topic) and payload:
+                dump.append((topic, payload))
+    return dump
+
+
+def setup_instances(dump: List[Tuple[str, str]]) -> None:
+    for topic, _ in dump:
+        match = VALUE_TOPIC_REGEX.search(topic)
+        if match.group(1) == "chargepoint" and f"cp{match.group(2)}" not in SubData.cp_data:
+            # ChargepointStateUpdate startet einen Thread, daher nur den Ladepunkt anlegen.
+            chargepoint = Chargepoint(int(match.group(2)), None)
+            SubData.cp_data[f"cp{match.group(2)}"] = SimpleNamespace(chargepoint=chargepoint)
+
+
+def replay(on_message, dump: List[Tuple[str, str]], repetitions: int) -> float:
+    messages = [SimpleNamespace(topic=topic, payload=payload.encode("utf-8")) for topic, payload in dump]
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        for msg in messages:
+            on_message(None, None, msg)
+    return len(messages) * repetitions / (time.perf_counter() - start)
+
+
+def main(path: str, repetitions: int) -> None:
+    pub.Pub.instance = NoPublish()
+    dump = read_dump(path) if path else synthetic_dump()
+    sub = SubData(*[Event() for _ in range(16)])
+    set_ = SetData(Event(), Event(), Event(), Event())
+    setup_instances(dump)
+    sub_dump = [(topic, payload) for topic, payload in dump if not topic.startswith("openWB/set/")]
+    set_dump = [(topic, payload) for topic, payload in dump if topic.startswith("openWB/set/")]
+    print(f"{len(dump)} Topics, {repetitions} Wiederholungen")
+    # SubData zuerst, da dort Zähler, Speicher, etc. angelegt werden, deren Existenz SetData prüft.
+    print(f"SubData.on_message: {replay(sub.on_message, sub_dump, repetitions):>10.0f} Nachrichten/s")
+    print(f"SetData.on_message: {replay(set_.on_message, set_dump, repetitions):>10.0f} Nachrichten/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None, int(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -27,6 +27,7 @@ case "$1" in
 		timeout 3 mosquitto_sub -t '#' --remove-retained --retained-only -p 1886
 		echo "deleting log data"
 		rm -r "$OPENWBBASEDIR/data/charge_log/"* "$OPENWBBASEDIR/data/daily_log/"* "$OPENWBBASEDIR/data/log/"*.log "$OPENWBBASEDIR/data/monthly_log/"*
+		rm -rf "$OPENWBBASEDIR/data/log_rollup"
 		echo "reset display rotation"
 		sudo sed -i "s/^lcd_rotate=[0-3]$/lcd_rotate=0/" "/boot/config.txt"
 		if [ -n "$cloud_bridge" ]; then
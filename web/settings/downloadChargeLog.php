@@ -32,6 +32,42 @@ $csv_format = [
 	"data imported_since_plugged" => ["header" => "Energie seit Anstecken", "type" => "energy"],
 ];
 
+// Read the charge log of one month. Current logs are stored as one JSON entry per line (<YYYYMM>.jsonl),
+// legacy months as a single JSON array (<YYYYMM>.json).
+function readChargeLogMonth($charge_log_path, $file_name)
+{
+	$entries = [];
+	$jsonl_file = $charge_log_path . $file_name . ".jsonl";
+	$legacy_file = $charge_log_path . $file_name . ".json";
+	if (file_exists($jsonl_file)) {
+		$handle = fopen($jsonl_file, "r");
+		if ($handle !== false) {
+			while (($line = fgets($handle)) !== false) {
+				$line = trim($line);
+				if ($line === "") {
+					continue;
+				}
+				$entry = json_decode($line, true);
+				// skip incomplete lines, e.g. after a power failure while writing
+				if (is_array($entry) && count($entry) > 0) {
+					$entries[] = $entry;
+				}
+			}
+			fclose($handle);
+		}
+	} elseif (file_exists($legacy_file)) {
+		$legacy_entries = json_decode(file_get_contents($legacy_file), true);
+		if (is_array($legacy_entries)) {
+			foreach ($legacy_entries as $entry) {
+				if (is_array($entry) && count($entry) > 0) {
+					$entries[] = $entry;
+				}
+			}
+		}
+	}
+	return $entries;
+}
+
 // If the "year" parameter is missing or invalid, respond with HTTP 400 and return an error message.
 if (!isset($_GET["year"]) || !preg_match("/^[0-9]{4}$/", $_GET["year"])) {
     http_response_code(400);
@@ -47,14 +83,9 @@ if (isset($_GET["month"])) {
         // Format the file name based on the year and month
         $file_name = sprintf('%04d%02d', $year, $month);
         $output_file_name = $file_name;
-        $charge_log_file = $charge_log_path . $file_name . ".json";
-
-        // Attempt to load the charge log file for the specific month
-        if (file_exists($charge_log_file)) {
-            $charge_log_data = json_decode(file_get_contents($charge_log_file), true);
-        } else {
-            $charge_log_data = []; // Default to an empty array if the file does not exist
-        }
+
+        // Load the charge log for the specific month, empty if no log exists
+        $charge_log_data = readChargeLogMonth($charge_log_path, $file_name);
     } else {
         // If the "month" parameter is invalid, return HTTP 400 Bad Request
         http_response_code(400);
@@ -68,15 +99,9 @@ if (isset($_GET["month"])) {
         // Format the file name based on the year and month
         $file_name = sprintf('%04d%02d', $year, $month);
         $output_file_name = sprintf('%04d', $year);
-        $charge_log_file = $charge_log_path . $file_name . ".json";
-
-        // Append data from each month's charge log file if it exists
-        if (file_exists($charge_log_file)) {
-            $monthly_data = json_decode(file_get_contents($charge_log_file), true);
-            if (is_array($monthly_data)) {
-                $charge_log_data = array_merge($charge_log_data, $monthly_data);
-            }
-        }
+
+        // Append data from each month's charge log if it exists
+        $charge_log_data = array_merge($charge_log_data, readChargeLogMonth($charge_log_path, $file_name));
     }
 }
 